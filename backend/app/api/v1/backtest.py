@@ -0,0 +1,227 @@
+"""
+TradeForge AaaS - Backtesting API
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Backtest endpoints. Backtests run as background jobs: submitting returns a
+job ID at once, and progress is polled or streamed as server-sent events.
+
+Endpoints that touch the database or the job backend are plain `def`, so
+FastAPI runs them in its threadpool instead of on the event loop.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator
+import asyncio
+
+from app.database import get_db
+from app.models import Backtest
+from app.schemas import (
+    BacktestRequest,
+    BacktestResponse,
+    BacktestJobResponse,
+    BacktestJobStatus,
+)
+from app.services.backtest_service import get_backtest_queue
+from app.services.results_codec import load_backtest_results
+from app.core.i18n import t
+
+router = APIRouter()
+
+# Seconds between job status checks on the event stream
+EVENT_POLL_INTERVAL = 0.5
+
+TERMINAL_STATUSES = (BacktestJobStatus.COMPLETED, BacktestJobStatus.FAILED)
+
+
+def _get_job(queue: Any, job_id: str) -> BacktestJobResponse:
+    """Look up a job or raise 404."""
+    job = queue.status(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=t("backtest_job_not_found")
+        )
+    return job
+
+
+def _get_backtest(db: Session, backtest_id: int) -> Backtest:
+    """Look up a backtest or raise 404."""
+    backtest = db.get(Backtest, backtest_id)
+    if backtest is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=t("backtest_not_found")
+        )
+    return backtest
+
+
+@router.post("", response_model=BacktestJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_backtest(
+    request: BacktestRequest,
+    queue: Any = Depends(get_backtest_queue)
+) -> Any:
+    """
+    Queue a backtest.
+    
+    Args:
+        request: Backtest parameters
+        queue: Backtest job queue
+    
+    Returns:
+        Queued job status
+    """
+    job_id = queue.submit(request)
+    return _get_job(queue, job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=BacktestJobResponse)
+def get_job(
+    job_id: str,
+    queue: Any = Depends(get_backtest_queue)
+) -> Any:
+    """
+    Get backtest job status.
+    
+    Args:
+        job_id: Job ID returned on submit
+        queue: Backtest job queue
+    
+    Returns:
+        Job status and progress
+    
+    Raises:
+        HTTPException: If job does not exist
+    """
+    return _get_job(queue, job_id)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    queue: Any = Depends(get_backtest_queue)
+) -> StreamingResponse:
+    """
+    Stream job progress as server-sent events until the job finishes.
+    
+    Args:
+        job_id: Job ID returned on submit
+        queue: Backtest job queue
+    
+    Returns:
+        text/event-stream response, one event per status change
+    
+    Raises:
+        HTTPException: If job does not exist
+    """
+    await run_in_threadpool(_get_job, queue, job_id)
+
+    async def events() -> AsyncIterator[str]:
+        last = None
+        while True:
+            job = await run_in_threadpool(queue.status, job_id)
+            payload = job.model_dump_json()
+            if payload != last:
+                last = payload
+                yield f"data: {payload}\n\n"
+            if job.status in TERMINAL_STATUSES:
+                break
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    queue: Any = Depends(get_backtest_queue)
+) -> Any:
+    """
+    Get result cache counters.
+    
+    Args:
+        queue: Backtest job queue
+    
+    Returns:
+        Entries, hits, misses, evictions, expirations and hit rate
+    """
+    return queue.cache.stats()
+
+
+@router.get("/{backtest_id}", response_model=BacktestResponse)
+def get_backtest(
+    backtest_id: int,
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get a stored backtest result.
+    
+    Args:
+        backtest_id: Backtest ID
+        db: Database session
+    
+    Returns:
+        Backtest summary
+    
+    Raises:
+        HTTPException: If backtest does not exist
+    """
+    return _get_backtest(db, backtest_id)
+
+
+@router.get("/{backtest_id}/equity-curve")
+def get_equity_curve(
+    backtest_id: int,
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get a backtest's equity curve (the trade log is not decoded).
+    
+    Args:
+        backtest_id: Backtest ID
+        db: Database session
+    
+    Returns:
+        Equity per bar
+    
+    Raises:
+        HTTPException: If backtest does not exist
+    """
+    results = load_backtest_results(_get_backtest(db, backtest_id))
+    return {
+        "backtest_id": backtest_id,
+        "equity_curve": results.equity_curve().tolist() if results else [],
+    }
+
+
+@router.get("/{backtest_id}/trades")
+def get_trades(
+    backtest_id: int,
+    db: Session = Depends(get_db)
+) -> Any:
+    """
+    Get a backtest's trade log (the equity curve is not decoded).
+    
+    Args:
+        backtest_id: Backtest ID
+        db: Database session
+    
+    Returns:
+        List of trades
+    
+    Raises:
+        HTTPException: If backtest does not exist
+    """
+    results = load_backtest_results(_get_backtest(db, backtest_id))
+    return {
+        "backtest_id": backtest_id,
+        "trades": results.trades() if results else [],
+    }
+
+
+# Export for convenience
+__all__ = ["router"]
@@ -107,6 +107,11 @@ class Settings(BaseSettings):
     
     DEFAULT_NETWORK: str = "ethereum"
     
+    # Shared RPC connections (one keep-alive pool per network)
+    WEB3_POOL_SIZE: int = 20
+    WEB3_REQUEST_TIMEOUT: float = 10.0
+    WEB3_HEALTH_CHECK_INTERVAL: float = 30.0
+    
     # ============================================
     # DEFI PROTOCOLS
     # ============================================
@@ -121,6 +126,15 @@ class Settings(BaseSettings):
     # Chainlink Price Feeds (Ethereum Mainnet)
     CHAINLINK_ETH_USD: str = "0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419"
     CHAINLINK_BTC_USD: str = "0xF4030086522a5bEEa4988F8cA5B36dbC97BeE88c"
+    CHAINLINK_HEARTBEAT_SECONDS: int = 3600  # ETH/USD and BTC/USD mainnet heartbeat
+    
+    # Chainlink price cache
+    PRICE_CACHE_BACKEND: str = "memory"  # memory or redis (shared between processes)
+    PRICE_CACHE_POLL_SECONDS: float = 12.0  # about one Ethereum block
+    PRICE_CACHE_HEARTBEAT_MARGIN: float = 60.0
+    
+    # Multicall3 (same address on Ethereum, Polygon and Arbitrum)
+    MULTICALL3_ADDRESS: str = "0xcA11bde05977b3631167028862bE2a173976CA11"
     
     # ============================================
     # EXCHANGES
@@ -175,6 +189,14 @@ class Settings(BaseSettings):
     BACKTEST_DEFAULT_CAPITAL: float = 10000.0
     BACKTEST_DEFAULT_COMMISSION: float = 0.001
     BACKTEST_MAX_YEARS: int = 5
+    CANDLE_STORE_PATH: str = "./data/candles"
+    BACKTEST_QUEUE_BACKEND: str = "local"  # local (worker process pool) or celery
+    BACKTEST_LOCAL_WORKERS: int = 2
+    BACKTEST_JOB_TTL_SECONDS: int = 3600
+    BACKTEST_MAX_FINISHED_JOBS: int = 1000
+    BACKTEST_CACHE_MAX_ENTRIES: int = 1024
+    BACKTEST_CACHE_TTL_SECONDS: int = 86400
+    INDICATOR_CACHE_MAX_MB: int = 256
     
     # ============================================
     # SUBSCRIPTION & PAYMENT
@@ -341,6 +341,18 @@ TRANSLATIONS: Dict[str, Dict[str, str]] = {
         "en": "User not found",
         "id": "Pengguna tidak ditemukan"
     },
+    "backtest_not_found": {
+        "en": "Backtest not found",
+        "id": "Backtest tidak ditemukan"
+    },
+    "backtest_job_not_found": {
+        "en": "Backtest job not found",
+        "id": "Tugas backtest tidak ditemukan"
+    },
+    "backtest_cached": {
+        "en": "Backtest result loaded from cache",
+        "id": "Hasil backtest dimuat dari cache"
+    },
     "user_already_exists": {
         "en": "User with this email already exists",
         "id": "Pengguna dengan email ini sudah ada"
@@ -14,13 +14,18 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.i18n import t, Language
-# from app.api.v1 import auth, backtest, trading, defi, users
+from app.api.v1 import backtest
+from app.services.backtest_service import shutdown_backtest_queue
+from app.services.price_feed_cache import shared_price_cache
+from app.services.web3_providers import web3_providers
+# from app.api.v1 import auth, trading, defi, users
 # from app.database import engine, Base
 
 # Configure logging
@@ -47,7 +52,11 @@ async def lifespan(app: FastAPI):
     #     await conn.run_sync(Base.metadata.create_all)
     
     # TODO: Initialize Redis connection
-    # TODO: Start background tasks (if any)
+    
+    # RPC health checks for the shared Web3 providers
+    await web3_providers.start()
+    # Background refresh of cached Chainlink prices
+    await shared_price_cache(settings.DEFAULT_NETWORK).start()
     
     logger.info("✅ Application started successfully")
     
@@ -58,7 +67,10 @@ async def lifespan(app: FastAPI):
     
     # TODO: Close database connections
     # TODO: Close Redis connections
-    # TODO: Cleanup background tasks
+    await shared_price_cache(settings.DEFAULT_NETWORK).stop()
+    await web3_providers.close()
+    # Wait for running backtests and stop the worker processes
+    await asyncio.to_thread(shutdown_backtest_queue)
     
     logger.info("✅ Application shut down successfully")
 
@@ -205,7 +217,7 @@ async def api_info():
 # TODO: Include API routers when implemented
 # app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 # app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
-# app.include_router(backtest.router, prefix="/api/v1/backtest", tags=["Backtesting"])
+app.include_router(backtest.router, prefix="/api/v1/backtest", tags=["Backtesting"])
 # app.include_router(trading.router, prefix="/api/v1/trading", tags=["Trading"])
 # app.include_router(defi.router, prefix="/api/v1/defi", tags=["DeFi"])
 
@@ -244,21 +256,25 @@ async def test_translation(key: str, language: str = "en"):
 async def test_defi_price():
     """
     Test DeFi price feed endpoint.
-    Get ETH and BTC prices from Chainlink.
+    Get ETH and BTC prices from Chainlink (served from the price cache).
     """
     try:
-        from app.services.defi_service import DeFiService
-        
-        defi_service = DeFiService()
-        
-        eth_price = defi_service.get_eth_usd_price()
-        btc_price = defi_service.get_btc_usd_price()
+        # Cached rounds; only a cold cache reads the chain (one multicall for both feeds)
+        quotes = await shared_price_cache(settings.DEFAULT_NETWORK).get_many(
+            [settings.CHAINLINK_ETH_USD, settings.CHAINLINK_BTC_USD]
+        )
+        eth_quote = quotes[settings.CHAINLINK_ETH_USD]
+        btc_quote = quotes[settings.CHAINLINK_BTC_USD]
         
         return {
-            "eth_usd": float(eth_price),
-            "btc_usd": float(btc_price),
+            "eth_usd": float(eth_quote.price),
+            "btc_usd": float(btc_quote.price),
             "source": "Chainlink Price Feeds",
             "network": settings.DEFAULT_NETWORK,
+            "feeds": {
+                "eth_usd": eth_quote.metadata(),
+                "btc_usd": btc_quote.metadata(),
+            },
         }
     except Exception as e:
         logger.error(f"Failed to fetch prices: {str(e)}")
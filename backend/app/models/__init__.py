@@ -8,8 +8,10 @@ GitHub: https://github.com/AryHHAry
 SQLAlchemy models for database tables.
 """
 
-from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Text, Enum, LargeBinary
+)
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 import enum
@@ -116,7 +118,8 @@ class Backtest(Base):
     win_rate = Column(Float)
     sharpe_ratio = Column(Float)
     max_drawdown = Column(Float)
-    results_json = Column(Text)  # Full results as JSON
+    results_json = Column(Text)  # Full results as JSON (rows saved before results_blob)
+    results_blob = deferred(Column(LargeBinary))  # Compressed columnar results (results_codec)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -132,7 +135,7 @@ class Trade(Base):
     exchange = Column(String(50), nullable=False)
     symbol = Column(String(20), nullable=False)
     side = Column(String(10), nullable=False)  # BUY, SELL
-    order_type = Column(String(20))  # MARKET, LIMIT
+    order_type = Column(String(20))  # MARKET, LIMIT, STOP
     quantity = Column(Float, nullable=False)
     price = Column(Float)
     executed_price = Column(Float)
@@ -35,6 +35,15 @@ class OrderType(str, Enum):
     """Order type."""
     MARKET = "market"
     LIMIT = "limit"
+    STOP = "stop"
+
+
+class BacktestJobStatus(str, Enum):
+    """Backtest job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 
 class OrderStatus(str, Enum):
@@ -183,6 +192,7 @@ class BacktestRequest(BaseModel):
     end_date: datetime
     initial_capital: float = Field(default=10000.0, gt=0)
     commission: float = Field(default=0.001, ge=0, le=1)
+    exchange: str = Field(default="binance", min_length=1, max_length=50)
 
 
 class BacktestResponse(BaseModel):
@@ -203,6 +213,17 @@ class BacktestResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BacktestJobResponse(BaseModel):
+    """Schema for backtest job status."""
+    job_id: str
+    status: BacktestJobStatus
+    progress: float = Field(default=0.0, ge=0, le=1)
+    message: Optional[str] = None
+    backtest_id: Optional[int] = None
+    error: Optional[str] = None
+    cached: bool = False
+
+
 # ============================================
 # TRADE SCHEMAS
 # ============================================
@@ -310,6 +331,8 @@ __all__ = [
     "StrategyResponse",
     "BacktestRequest",
     "BacktestResponse",
+    "BacktestJobResponse",
+    "BacktestJobStatus",
     "TradeCreate",
     "TradeResponse",
     "SwapRequest",
@@ -0,0 +1,218 @@
+"""
+TradeForge AaaS - Backtest Result Cache
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Content-addressed cache of finished backtests.
+
+A backtest is identified by a SHA-256 of its normalized inputs (strategy,
+parameters with defaults filled in, market, date range, capital, commission)
+and a fingerprint of the stored candles in that range. Identical reruns map
+to the same key and reuse the stored Backtest row; any change to the data
+produces a new key.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.schemas import BacktestRequest
+from app.services.candle_downloader import timeframe_to_ms
+from app.services.candle_resampler import CandleResampler
+from app.services.candle_store import to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_params(strategy_class: type, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill in constructor defaults so equivalent parameter sets compare equal.
+
+    Args:
+        strategy_class: Strategy class the parameters are passed to
+        params: Stored strategy parameters
+
+    Returns:
+        Complete parameter dict with numbers as floats
+    """
+    normalized = {
+        name: parameter.default
+        for name, parameter in inspect.signature(strategy_class.__init__).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+    normalized.update(params)
+    return {
+        name: float(value) if isinstance(value, (int, float)) and not isinstance(value, bool)
+        else value
+        for name, value in normalized.items()
+    }
+
+
+def backtest_cache_key(
+    request: BacktestRequest,
+    strategy_type: str,
+    params: Dict[str, Any],
+    data_version: Tuple[int, ...],
+) -> str:
+    """
+    Hash a backtest's inputs into a cache key.
+
+    Args:
+        request: Backtest request
+        strategy_type: Strategy.strategy_type
+        params: Normalized strategy parameters
+        data_version: Fingerprint of the candles in the requested range
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {
+        "strategy_id": request.strategy_id,
+        "strategy_type": strategy_type,
+        "params": params,
+        "exchange": request.exchange.lower(),
+        "symbol": request.symbol.upper(),
+        "timeframe": request.timeframe,
+        "start": to_epoch_ms(request.start_date),
+        "end": to_epoch_ms(request.end_date),
+        "initial_capital": float(request.initial_capital),
+        "commission": float(request.commission),
+        "data": list(data_version),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def data_version(resampler: CandleResampler, request: BacktestRequest) -> Tuple[int, ...]:
+    """
+    Fingerprint the base candles a request would read.
+
+    Args:
+        resampler: Candle source the backtest reads through
+        request: Backtest request
+
+    Returns:
+        CandleStore.range_version of the underlying base series
+    """
+    # Every timeframe is derived from (or is) the base series. The last bar
+    # read is built from base candles up to the end of its bucket, which can
+    # lie after end, so the fingerprint covers the whole bucket.
+    end = to_epoch_ms(request.end_date)
+    if request.timeframe != resampler.base_timeframe:
+        timeframe_ms = timeframe_to_ms(request.timeframe)
+        end = -(-end // timeframe_ms) * timeframe_ms
+
+    return resampler.store.range_version(
+        request.exchange,
+        request.symbol,
+        resampler.base_timeframe,
+        request.start_date,
+        end,
+    )
+
+
+class BacktestResultCache:
+    """
+    LRU map from cache key to Backtest ID with a time-to-live.
+
+    Parameters:
+        max_entries: Keys kept before the least recently used is evicted
+        ttl_seconds: Seconds an entry stays valid (0 disables expiry)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.BACKTEST_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = settings.BACKTEST_CACHE_TTL_SECONDS,
+    ):
+        """Initialize empty cache."""
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[int]:
+        """
+        Look up a finished backtest.
+
+        Args:
+            key: Cache key from backtest_cache_key
+
+        Returns:
+            Backtest ID, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, backtest_id: int) -> None:
+        """
+        Remember the Backtest row produced for a key.
+
+        Args:
+            key: Cache key from backtest_cache_key
+            backtest_id: Stored Backtest ID
+        """
+        with self._lock:
+            self._entries[key] = (backtest_id, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"Evicted backtest cache entry {evicted}")
+
+    def discard(self, key: str) -> None:
+        """Forget a key (e.g. its Backtest row was deleted)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _expired(self, stored_at: float) -> bool:
+        """Whether an entry stored at the given monotonic time is past its TTL."""
+        return bool(self.ttl_seconds) and time.monotonic() - stored_at > self.ttl_seconds
+
+
+# Export for convenience
+__all__ = ["BacktestResultCache", "backtest_cache_key", "data_version", "normalize_params"]
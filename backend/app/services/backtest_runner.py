@@ -0,0 +1,291 @@
+"""
+TradeForge AaaS - Parallel Backtest Runner
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Runs strategy backtests for many (symbol, timeframe) pairs on a process pool.
+OHLCV columns are packed once into a shared memory block that workers attach
+to, so DataFrames are never pickled across processes. When several strategies
+are scanned, each dataset's strategies run in one task sharing an
+IndicatorCache, so common indicators are computed once per dataset.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Mapping
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.services.results_codec import encode_results
+from app.strategies.indicators import IndicatorCache, precision_dtype
+from app.strategies.registry import create_strategy
+
+logger = logging.getLogger(__name__)
+
+# Columns packed into shared memory, in this order
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+# (strategy_type, constructor keyword arguments)
+StrategySpec = Tuple[str, Dict[str, Any]]
+
+# Shared memory blocks attached by the current worker process
+_attached: Dict[str, SharedMemory] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to a shared memory block once per worker process."""
+    shm = _attached.get(name)
+    if shm is None:
+        shm = SharedMemory(name=name)
+        # The parent owns the block; keep the worker's tracker from unlinking it
+        resource_tracker.unregister(shm._name, "shared_memory")
+        _attached[name] = shm
+    return shm
+
+
+def _run_backtest_task(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Worker entry point: rebuild one OHLCV frame from shared memory and backtest
+    every requested strategy on it.
+
+    Args:
+        task: Task description built by BacktestRunner.scan
+
+    Returns:
+        Backtest result rows (see BacktestRunner.to_result_row), one per strategy
+    """
+    shm = _attach(task["shm_name"])
+    n_columns = len(OHLCV_COLUMNS)
+    values = np.ndarray(
+        (n_columns + 1, task["length"]),
+        dtype=np.float64,
+        buffer=shm.buf,
+        offset=task["offset"],
+    )
+    if task["datetime_index"]:
+        index = pd.DatetimeIndex(values[n_columns].view(np.int64), tz=task["tz"])
+    else:
+        index = pd.RangeIndex(task["length"])
+    df = pd.DataFrame(
+        {column: values[i] for i, column in enumerate(OHLCV_COLUMNS)},
+        index=index,
+        copy=False,
+    )
+
+    indicators = IndicatorCache(precision=task["precision"])
+    rows = []
+    for strategy_type, params in task["strategies"]:
+        results = create_strategy(strategy_type, params).backtest(
+            df,
+            initial_capital=task["initial_capital"],
+            commission=task["commission"],
+            mode=task["mode"],
+            indicators=indicators,
+        )
+        rows.append(BacktestRunner.to_result_row(task["symbol"], task["timeframe"], df, results))
+
+    return rows
+
+
+class BacktestRunner:
+    """
+    Fan strategy backtests out over a process pool.
+
+    Parameters:
+        max_workers: Worker processes (default: os.cpu_count())
+        mp_context: Optional multiprocessing context (e.g. 'spawn')
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+    ):
+        """Initialize runner settings."""
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.mp_context = mp_context
+
+    def run(
+        self,
+        datasets: Mapping[Tuple[str, str], pd.DataFrame],
+        strategy_params: Optional[Dict[str, Any]] = None,
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        mode: str = "vectorized",
+        strategy_type: str = "sma_crossover",
+        precision: str = "float64",
+    ) -> List[Dict[str, Any]]:
+        """
+        Backtest every (symbol, timeframe) dataset in parallel.
+
+        Args:
+            datasets: OHLCV DataFrames keyed by (symbol, timeframe)
+            strategy_params: Strategy keyword arguments
+            initial_capital: Starting capital
+            commission: Commission per trade (0.001 = 0.1%)
+            mode: Backtest engine passed to the strategy's backtest
+            strategy_type: Registered strategy type
+            precision: Indicator precision, 'float64' or 'float32'
+
+        Returns:
+            Result rows in input order, ready for to_backtest_model
+        """
+        rows = self.scan(
+            datasets,
+            [(strategy_type, strategy_params or {})],
+            initial_capital=initial_capital,
+            commission=commission,
+            mode=mode,
+            precision=precision,
+        )
+        return [dataset_rows[0] for dataset_rows in rows]
+
+    def scan(
+        self,
+        datasets: Mapping[Tuple[str, str], pd.DataFrame],
+        strategies: Sequence[StrategySpec],
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        mode: str = "vectorized",
+        precision: str = "float64",
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Backtest several strategies on every dataset in parallel.
+
+        Args:
+            datasets: OHLCV DataFrames keyed by (symbol, timeframe)
+            strategies: (strategy_type, params) pairs run on each dataset
+            initial_capital: Starting capital
+            commission: Commission per trade (0.001 = 0.1%)
+            mode: Backtest engine passed to each strategy's backtest
+            precision: Indicator precision, 'float64' or 'float32' (prices and
+                capital accounting stay float64)
+
+        Returns:
+            For each dataset in input order, one result row per strategy
+        """
+        if not datasets:
+            return []
+        precision_dtype(precision)
+
+        strategies = [(strategy_type, dict(params)) for strategy_type, params in strategies]
+        keys = list(datasets.keys())
+        n_columns = len(OHLCV_COLUMNS)
+        lengths = [len(datasets[key]) for key in keys]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) * (n_columns + 1) * 8
+        total_bytes = max(int(sum(lengths)) * (n_columns + 1) * 8, 1)
+
+        shm = SharedMemory(create=True, size=total_bytes)
+        try:
+            tasks = []
+            for key, length, offset in zip(keys, lengths, offsets):
+                df = datasets[key]
+                block = np.ndarray(
+                    (n_columns + 1, length), dtype=np.float64, buffer=shm.buf, offset=int(offset)
+                )
+                for i, column in enumerate(OHLCV_COLUMNS):
+                    block[i] = df[column].to_numpy(dtype=np.float64)
+
+                datetime_index = isinstance(df.index, pd.DatetimeIndex)
+                if datetime_index:
+                    block[n_columns].view(np.int64)[:] = df.index.asi8
+
+                symbol, timeframe = key
+                tasks.append({
+                    "shm_name": shm.name,
+                    "offset": int(offset),
+                    "length": length,
+                    "datetime_index": datetime_index,
+                    "tz": str(df.index.tz) if datetime_index and df.index.tz else None,
+                    "symbol": symbol,
+                    "timeframe": timeframe,
+                    "strategies": strategies,
+                    "initial_capital": initial_capital,
+                    "commission": commission,
+                    "mode": mode,
+                    "precision": precision,
+                })
+
+            results: List[Optional[List[Dict[str, Any]]]] = [None] * len(tasks)
+            workers = min(self.max_workers, len(tasks))
+
+            with ProcessPoolExecutor(max_workers=workers, mp_context=self.mp_context) as executor:
+                futures = {
+                    executor.submit(_run_backtest_task, task): i
+                    for i, task in enumerate(tasks)
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+
+            logger.info(
+                f"Ran {len(tasks) * len(strategies)} backtests over {len(tasks)} datasets "
+                f"on {workers} worker processes"
+            )
+
+            return results
+        finally:
+            shm.close()
+            shm.unlink()
+
+    @staticmethod
+    def to_result_row(
+        symbol: str,
+        timeframe: str,
+        df: pd.DataFrame,
+        results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Shape backtest() output like a Backtest table row.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            df: OHLCV data the backtest ran on
+            results: Strategy backtest output
+
+        Returns:
+            Dictionary keyed by Backtest column names
+        """
+        has_dates = isinstance(df.index, pd.DatetimeIndex) and len(df) > 0
+
+        return {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "start_date": df.index[0].to_pydatetime() if has_dates else None,
+            "end_date": df.index[-1].to_pydatetime() if has_dates else None,
+            "initial_capital": float(results["initial_capital"]),
+            "final_capital": float(results["final_capital"]),
+            "total_return": float(results["total_return"]),
+            "total_trades": int(results["total_trades"]),
+            "win_rate": float(results["win_rate"]),
+            "sharpe_ratio": float(results["sharpe_ratio"]),
+            "max_drawdown": float(results["max_drawdown"]),
+            "results_blob": encode_results(results),
+        }
+
+    @staticmethod
+    def to_backtest_model(row: Dict[str, Any], strategy_id: int) -> Any:
+        """
+        Build an unsaved Backtest model from a result row.
+
+        Args:
+            row: Result row from run
+            strategy_id: Owning strategy ID
+
+        Returns:
+            Backtest instance (add it to a session to persist)
+        """
+        # Imported lazily so worker processes never build the database engine
+        from app.models import Backtest
+
+        return Backtest(strategy_id=strategy_id, **row)
+
+
+# Export for convenience
+__all__ = ["BacktestRunner", "OHLCV_COLUMNS", "StrategySpec"]
@@ -0,0 +1,645 @@
+"""
+TradeForge AaaS - Backtest Service
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Asynchronous backtest jobs.
+
+Submitting a BacktestRequest returns a job ID immediately; the backtest runs
+on a worker and its result is stored as a Backtest row. Two queue backends
+are available (settings.BACKTEST_QUEUE_BACKEND):
+
+- local:  local worker process pool, used in development and tests
+- celery: Celery worker processes (start with `celery -A app.worker worker`)
+
+Identical requests are answered from the result cache (see backtest_cache)
+or attached to the job already running them. Finished jobs are forgotten
+after settings.BACKTEST_JOB_TTL_SECONDS or once more than
+settings.BACKTEST_MAX_FINISHED_JOBS have accumulated.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.i18n import t
+from app.database import SessionLocal
+from app.models import Backtest, Strategy
+from app.schemas import BacktestJobResponse, BacktestJobStatus, BacktestRequest
+from app.services.backtest_cache import (
+    BacktestResultCache,
+    backtest_cache_key,
+    data_version,
+    normalize_params,
+)
+from app.services.backtest_runner import BacktestRunner
+from app.services.candle_resampler import CandleResampler
+from app.services.candle_store import CandleStore
+from app.strategies.indicators import IndicatorCache
+from app.strategies.registry import get_strategy_class
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[float, str], None]
+
+# State of a LocalBacktestQueue worker process (set by _init_local_worker)
+_worker: Dict[str, Any] = {}
+
+
+def load_strategy(db: Session, strategy_id: int) -> Tuple[str, Dict[str, Any]]:
+    """
+    Look up a stored strategy's type and parameters.
+
+    Args:
+        db: Database session
+        strategy_id: Strategy ID
+
+    Returns:
+        Tuple of (strategy_type, parameters)
+
+    Raises:
+        ValueError: If the strategy does not exist or its type is not registered
+    """
+    strategy_row = db.get(Strategy, strategy_id)
+    if strategy_row is None:
+        raise ValueError(f"Strategy {strategy_id} not found")
+
+    get_strategy_class(strategy_row.strategy_type)
+    params = json.loads(strategy_row.parameters) if strategy_row.parameters else {}
+    return strategy_row.strategy_type, params
+
+
+def run_backtest(
+    request: BacktestRequest,
+    strategy_type: str,
+    params: Dict[str, Any],
+    resampler: CandleResampler,
+    progress: ProgressCallback,
+    indicators: Optional[IndicatorCache] = None,
+) -> Dict[str, Any]:
+    """
+    Load the requested candles and backtest them (no database access).
+
+    Args:
+        request: Validated backtest request
+        strategy_type: Registered strategy type
+        params: Strategy keyword arguments
+        resampler: Candle source for the requested timeframe
+        progress: Callback receiving (fraction done, message)
+        indicators: Indicator cache shared with other jobs in this process
+
+    Returns:
+        Result row (see BacktestRunner.to_result_row)
+    """
+    progress(0.2, "Loading candles")
+    df = resampler.read_frame(
+        request.exchange,
+        request.symbol,
+        request.timeframe,
+        start=request.start_date,
+        end=request.end_date,
+    )
+    if len(df) == 0:
+        raise ValueError(
+            f"No {request.timeframe} candles stored for {request.exchange} {request.symbol}"
+        )
+
+    progress(0.5, t("backtest_running"))
+    results = get_strategy_class(strategy_type)(**params).backtest(
+        df,
+        initial_capital=request.initial_capital,
+        commission=request.commission,
+        indicators=indicators,
+    )
+    return BacktestRunner.to_result_row(request.symbol, request.timeframe, df, results)
+
+
+def save_backtest(db: Session, row: Dict[str, Any], strategy_id: int) -> int:
+    """
+    Store a result row as a Backtest.
+
+    Args:
+        db: Database session
+        row: Result row from run_backtest
+        strategy_id: Owning strategy ID
+
+    Returns:
+        ID of the stored Backtest row
+    """
+    backtest = BacktestRunner.to_backtest_model(row, strategy_id=strategy_id)
+    db.add(backtest)
+    db.commit()
+    db.refresh(backtest)
+    return backtest.id
+
+
+def execute_backtest(
+    request: Dict[str, Any],
+    session_factory: Callable[[], Session],
+    resampler: CandleResampler,
+    progress: ProgressCallback,
+    indicators: Optional[IndicatorCache] = None,
+) -> int:
+    """
+    Run one backtest job end to end and store the result.
+
+    Args:
+        request: BacktestRequest as a JSON-compatible dict
+        session_factory: Callable returning a database session
+        resampler: Candle source for the requested timeframe
+        progress: Callback receiving (fraction done, message)
+        indicators: Indicator cache shared with other jobs in this process
+
+    Returns:
+        ID of the stored Backtest row
+    """
+    backtest_request = BacktestRequest.model_validate(request)
+    db = session_factory()
+    try:
+        progress(0.05, t("backtest_running"))
+        strategy_type, params = load_strategy(db, backtest_request.strategy_id)
+        row = run_backtest(backtest_request, strategy_type, params, resampler, progress, indicators)
+
+        progress(0.9, "Saving results")
+        backtest_id = save_backtest(db, row, backtest_request.strategy_id)
+
+        progress(1.0, t("backtest_complete"))
+        return backtest_id
+    finally:
+        db.close()
+
+
+def _init_local_worker(store_root: str, progress_queue: Any) -> None:
+    """
+    Set up a LocalBacktestQueue worker process.
+
+    One resampler and indicator cache per worker process, so derived
+    timeframes and indicators stay cached between jobs.
+    """
+    _worker["resampler"] = CandleResampler(CandleStore(store_root))
+    _worker["indicators"] = IndicatorCache()
+    _worker["progress"] = progress_queue
+
+
+def _run_local_job(
+    job_id: str,
+    request: Dict[str, Any],
+    strategy_type: str,
+    params: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Worker process entry point: run one job and return its result row."""
+    def progress(fraction: float, message: str) -> None:
+        _worker["progress"].put((job_id, fraction, message))
+
+    return run_backtest(
+        BacktestRequest.model_validate(request),
+        strategy_type,
+        params,
+        _worker["resampler"],
+        progress,
+        _worker["indicators"],
+    )
+
+
+class BacktestQueue:
+    """
+    Shared job bookkeeping: result cache lookups and de-duplication of
+    identical requests that are still running.
+
+    Parameters:
+        session_factory: Callable returning a database session
+        store: Candle store (default: CandleStore at settings.CANDLE_STORE_PATH)
+        cache: Result cache (default: sized from settings)
+        job_ttl: Seconds a finished job's status stays available
+        max_finished_jobs: Finished jobs kept at most (oldest are dropped first)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        store: Optional[CandleStore] = None,
+        cache: Optional[BacktestResultCache] = None,
+        job_ttl: float = settings.BACKTEST_JOB_TTL_SECONDS,
+        max_finished_jobs: int = settings.BACKTEST_MAX_FINISHED_JOBS,
+    ):
+        """Initialize queue state."""
+        self.session_factory = session_factory
+        self.resampler = CandleResampler(store or CandleStore())
+        self.cache = cache or BacktestResultCache()
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+        self._job_keys: Dict[str, str] = {}
+        self._inflight: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, request: BacktestRequest) -> str:
+        """
+        Queue a backtest, or answer it from the result cache.
+
+        Args:
+            request: Validated backtest request
+
+        Returns:
+            Job ID
+        """
+        key = self.cache_key(request)
+        if key is not None:
+            self._release_finished(key)
+            backtest_id = self._cached_backtest(key)
+            if backtest_id is not None:
+                job_id = uuid.uuid4().hex
+                with self._lock:
+                    self._jobs[job_id] = {
+                        "status": BacktestJobStatus.COMPLETED,
+                        "progress": 1.0,
+                        "message": t("backtest_cached"),
+                        "backtest_id": backtest_id,
+                        "cached": True,
+                    }
+                    self._mark_finished(job_id)
+                return job_id
+
+        with self._lock:
+            if key is not None and key in self._inflight:
+                # Same request is already running; share its job
+                return self._inflight[key]
+            job_id = uuid.uuid4().hex
+            if key is not None:
+                self._inflight[key] = job_id
+                self._job_keys[job_id] = key
+
+        self._enqueue(job_id, request)
+        return job_id
+
+    def cache_key(self, request: BacktestRequest) -> Optional[str]:
+        """
+        Content-addressed key for a request.
+
+        Args:
+            request: Validated backtest request
+
+        Returns:
+            Cache key, or None when the strategy cannot be run (the job reports why)
+        """
+        db = self.session_factory()
+        try:
+            strategy_row = db.get(Strategy, request.strategy_id)
+        finally:
+            db.close()
+        if strategy_row is None:
+            return None
+
+        try:
+            strategy_class = get_strategy_class(strategy_row.strategy_type)
+        except ValueError:
+            return None
+
+        params = json.loads(strategy_row.parameters) if strategy_row.parameters else {}
+        return backtest_cache_key(
+            request,
+            strategy_row.strategy_type,
+            normalize_params(strategy_class, params),
+            data_version(self.resampler, request),
+        )
+
+    def _cached_backtest(self, key: str) -> Optional[int]:
+        """Cached Backtest ID for a key, if its row still exists."""
+        backtest_id = self.cache.get(key)
+        if backtest_id is None:
+            return None
+
+        db = self.session_factory()
+        try:
+            exists = db.get(Backtest, backtest_id) is not None
+        finally:
+            db.close()
+        if not exists:
+            self.cache.discard(key)
+            return None
+        return backtest_id
+
+    def _finish(self, job_id: str, backtest_id: Optional[int]) -> None:
+        """Release a finished job's key and cache its result."""
+        with self._lock:
+            key = self._job_keys.pop(job_id, None)
+            if key is not None and self._inflight.get(key) == job_id:
+                del self._inflight[key]
+            if job_id in self._jobs and job_id not in self._finished:
+                self._mark_finished(job_id)
+        if key is not None and backtest_id is not None:
+            self.cache.put(key, backtest_id)
+
+    def _mark_finished(self, job_id: str) -> None:
+        """Start a finished job's TTL and drop expired or excess jobs (caller holds the lock)."""
+        now = time.monotonic()
+        self._finished[job_id] = now
+        while self._finished:
+            oldest, finished_at = next(iter(self._finished.items()))
+            if now - finished_at <= self.job_ttl and len(self._finished) <= self.max_finished_jobs:
+                break
+            del self._finished[oldest]
+            self._jobs.pop(oldest, None)
+
+    def _release_finished(self, key: str) -> None:
+        """Release a key whose in-flight job finished unnoticed (backends override)."""
+
+    def _enqueue(self, job_id: str, request: BacktestRequest) -> None:
+        """Hand a job to the backend."""
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        """Release backend resources (backends override)."""
+
+
+class LocalBacktestQueue(BacktestQueue):
+    """
+    Backtest queue backed by a local pool of worker processes.
+
+    Workers load candles and run the strategy; the API process only does the
+    database lookups and stores the result row, so backtests never compete
+    with request handling for the GIL. Workers report progress back over a
+    multiprocessing queue.
+
+    Parameters:
+        session_factory: Callable returning a database session
+        store: Candle store (default: CandleStore at settings.CANDLE_STORE_PATH)
+        cache: Result cache (default: sized from settings)
+        max_workers: Worker processes (concurrent backtests)
+        mp_context: Multiprocessing context (default: 'spawn'; forking a
+            threaded API process can deadlock the workers)
+        job_ttl: Seconds a finished job's status stays available
+        max_finished_jobs: Finished jobs kept at most (oldest are dropped first)
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        store: Optional[CandleStore] = None,
+        cache: Optional[BacktestResultCache] = None,
+        max_workers: int = settings.BACKTEST_LOCAL_WORKERS,
+        mp_context: Optional[Any] = None,
+        job_ttl: float = settings.BACKTEST_JOB_TTL_SECONDS,
+        max_finished_jobs: int = settings.BACKTEST_MAX_FINISHED_JOBS,
+    ):
+        """Initialize queue."""
+        super().__init__(session_factory, store, cache, job_ttl, max_finished_jobs)
+        context = mp_context or multiprocessing.get_context("spawn")
+        self._progress = context.SimpleQueue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_local_worker,
+            initargs=(str(self.resampler.store.root), self._progress),
+        )
+        self._listener = threading.Thread(
+            target=self._listen, name="backtest-progress", daemon=True
+        )
+        self._listener.start()
+
+    def status(self, job_id: str) -> Optional[BacktestJobResponse]:
+        """
+        Current state of a job.
+
+        Args:
+            job_id: Job ID returned by submit
+
+        Returns:
+            Job status, or None for unknown IDs
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return BacktestJobResponse(job_id=job_id, **job)
+
+    def _enqueue(self, job_id: str, request: BacktestRequest) -> None:
+        """Look up the strategy and schedule the job on the worker processes."""
+        with self._lock:
+            self._jobs[job_id] = {"status": BacktestJobStatus.QUEUED, "progress": 0.0}
+
+        db = self.session_factory()
+        try:
+            strategy_type, params = load_strategy(db, request.strategy_id)
+        except ValueError as e:
+            self._update(job_id, status=BacktestJobStatus.FAILED, error=str(e))
+            self._finish(job_id, None)
+            return
+        finally:
+            db.close()
+
+        future = self._executor.submit(
+            _run_local_job, job_id, request.model_dump(mode="json"), strategy_type, params
+        )
+        future.add_done_callback(
+            lambda done: self._complete(job_id, request.strategy_id, done)
+        )
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        """Merge fields into a job's state."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _listen(self) -> None:
+        """Apply progress reported by the workers (runs until shutdown)."""
+        while True:
+            message = self._progress.get()
+            if message is None:
+                return
+            job_id, fraction, text = message
+            with self._lock:
+                job = self._jobs.get(job_id)
+                # Progress can arrive after the job finished; never move it backwards
+                finished = job is None or job["status"] in (
+                    BacktestJobStatus.COMPLETED, BacktestJobStatus.FAILED
+                )
+                if finished or fraction < job["progress"]:
+                    continue
+                job.update(status=BacktestJobStatus.RUNNING, progress=fraction, message=text)
+
+    def _complete(self, job_id: str, strategy_id: int, future: Future) -> None:
+        """Store a worker's result row and finish the job."""
+        backtest_id = None
+        try:
+            row = future.result()
+            self._update(
+                job_id, status=BacktestJobStatus.RUNNING, progress=0.9, message="Saving results"
+            )
+            db = self.session_factory()
+            try:
+                backtest_id = save_backtest(db, row, strategy_id)
+            finally:
+                db.close()
+            self._update(
+                job_id,
+                status=BacktestJobStatus.COMPLETED,
+                progress=1.0,
+                message=t("backtest_complete"),
+                backtest_id=backtest_id,
+            )
+        except Exception as e:
+            logger.error(f"Backtest job {job_id} failed: {str(e)}", exc_info=True)
+            self._update(job_id, status=BacktestJobStatus.FAILED, error=str(e))
+        finally:
+            self._finish(job_id, backtest_id)
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones."""
+        self._executor.shutdown(wait=True)
+        self._progress.put(None)
+        self._listener.join()
+
+
+class CeleryBacktestQueue(BacktestQueue):
+    """
+    Backtest queue dispatching to Celery worker processes (see app.worker).
+
+    Workers cannot reach this process's in-flight table, so a de-duplicated
+    key is released when its job is polled to a terminal state, when an
+    identical request finds the job ready, or after job_ttl seconds.
+
+    Parameters:
+        session_factory: Callable returning a database session
+        store: Candle store (default: CandleStore at settings.CANDLE_STORE_PATH)
+        cache: Result cache (default: sized from settings)
+        job_ttl: Seconds a finished job's status stays available (and the
+            longest a submitted job is shared with identical requests)
+        max_finished_jobs: Finished jobs kept at most (oldest are dropped first)
+    """
+
+    # Celery task states -> job status
+    STATES = {
+        "PENDING": BacktestJobStatus.QUEUED,
+        "RECEIVED": BacktestJobStatus.QUEUED,
+        "STARTED": BacktestJobStatus.RUNNING,
+        "PROGRESS": BacktestJobStatus.RUNNING,
+        "RETRY": BacktestJobStatus.RUNNING,
+        "SUCCESS": BacktestJobStatus.COMPLETED,
+        "FAILURE": BacktestJobStatus.FAILED,
+        "REVOKED": BacktestJobStatus.FAILED,
+    }
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize queue."""
+        super().__init__(*args, **kwargs)
+        self._submitted: "OrderedDict[str, float]" = OrderedDict()
+
+    def _release_finished(self, key: str) -> None:
+        """Drop expired in-flight keys and settle the key's job if Celery finished it."""
+        from app.worker import celery_app
+
+        now = time.monotonic()
+        with self._lock:
+            while self._submitted:
+                oldest, submitted_at = next(iter(self._submitted.items()))
+                if now - submitted_at <= self.job_ttl:
+                    break
+                del self._submitted[oldest]
+                expired_key = self._job_keys.pop(oldest, None)
+                if expired_key is not None and self._inflight.get(expired_key) == oldest:
+                    del self._inflight[expired_key]
+            job_id = self._inflight.get(key)
+
+        if job_id is not None and celery_app.AsyncResult(job_id).ready():
+            # Reading the terminal status releases the key and caches the result
+            self.status(job_id)
+
+    def _finish(self, job_id: str, backtest_id: Optional[int]) -> None:
+        """Release a finished job's key and cache its result."""
+        with self._lock:
+            self._submitted.pop(job_id, None)
+        super()._finish(job_id, backtest_id)
+
+    def _enqueue(self, job_id: str, request: BacktestRequest) -> None:
+        """Publish a job to the Celery broker (the job ID is the task ID)."""
+        from app.worker import run_backtest_task
+
+        with self._lock:
+            self._submitted[job_id] = time.monotonic()
+        run_backtest_task.apply_async(args=[request.model_dump(mode="json")], task_id=job_id)
+
+    def status(self, job_id: str) -> Optional[BacktestJobResponse]:
+        """
+        Current state of a job from the Celery result backend.
+
+        Args:
+            job_id: Job ID returned by submit
+
+        Returns:
+            Job status (Celery reports unknown IDs as queued)
+        """
+        from app.worker import celery_app
+
+        with self._lock:
+            cached = self._jobs.get(job_id)
+        if cached is not None:
+            return BacktestJobResponse(job_id=job_id, **cached)
+
+        result = celery_app.AsyncResult(job_id)
+        status = self.STATES.get(result.state, BacktestJobStatus.RUNNING)
+        info = result.info if isinstance(result.info, dict) else {}
+
+        if status == BacktestJobStatus.COMPLETED:
+            self._finish(job_id, result.result)
+            return BacktestJobResponse(
+                job_id=job_id, status=status, progress=1.0, backtest_id=result.result
+            )
+        if status == BacktestJobStatus.FAILED:
+            self._finish(job_id, None)
+            return BacktestJobResponse(job_id=job_id, status=status, error=str(result.info))
+
+        return BacktestJobResponse(
+            job_id=job_id,
+            status=status,
+            progress=info.get("progress", 0.0),
+            message=info.get("message"),
+        )
+
+
+@lru_cache()
+def get_backtest_queue() -> BacktestQueue:
+    """
+    Get the configured backtest queue (FastAPI dependency).
+
+    Returns:
+        LocalBacktestQueue or CeleryBacktestQueue
+    """
+    if settings.BACKTEST_QUEUE_BACKEND == "celery":
+        return CeleryBacktestQueue()
+    return LocalBacktestQueue()
+
+
+def shutdown_backtest_queue() -> None:
+    """Shut down the backtest queue if one was created (application shutdown)."""
+    if get_backtest_queue.cache_info().currsize:
+        get_backtest_queue().shutdown()
+        get_backtest_queue.cache_clear()
+
+
+# Export for convenience
+__all__ = [
+    "execute_backtest",
+    "load_strategy",
+    "run_backtest",
+    "save_backtest",
+    "BacktestQueue",
+    "LocalBacktestQueue",
+    "CeleryBacktestQueue",
+    "get_backtest_queue",
+    "shutdown_backtest_queue",
+]
@@ -0,0 +1,328 @@
+"""
+TradeForge AaaS - Historical Candle Downloader
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Concurrent, resumable OHLCV backfill from CCXT exchanges into the CandleStore.
+
+Pages are requested concurrently (bounded by a semaphore and the exchange's
+rate limit) and written in timestamp order, so the store always holds a
+contiguous prefix and an interrupted download resumes from the last stored
+candle. A page that comes back short (the exchange capped the request below
+page_limit) is continued from its last candle. Gaps inside stored history can
+be detected and backfilled.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from app.services.candle_store import CandleStore, TimeLike, to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+# Timeframes offered by the Backtest page, in milliseconds
+TIMEFRAME_MS: Dict[str, int] = {
+    "1m": 60_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "1h": 3_600_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+# Exchanges available on the Live Trading page
+SUPPORTED_EXCHANGES = ("binance", "bybit", "coinbase", "kraken")
+
+# Most candles each exchange returns per fetch_ohlcv call
+OHLCV_PAGE_LIMITS: Dict[str, int] = {
+    "binance": 1000,
+    "bybit": 1000,
+    "coinbase": 300,
+    "kraken": 720,
+}
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """
+    Convert a CCXT timeframe string to milliseconds.
+
+    Args:
+        timeframe: Timeframe such as '1m', '4h' or '1d'
+
+    Returns:
+        Candle duration in milliseconds
+    """
+    if timeframe in TIMEFRAME_MS:
+        return TIMEFRAME_MS[timeframe]
+
+    units = {"m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+    try:
+        return int(timeframe[:-1]) * units[timeframe[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def create_exchange(exchange_id: str) -> Any:
+    """
+    Create a public (unauthenticated) async CCXT exchange client.
+
+    Args:
+        exchange_id: CCXT exchange ID (binance, bybit, coinbase, kraken)
+
+    Returns:
+        ccxt.async_support exchange instance (close it when done)
+    """
+    import ccxt.async_support as ccxt_async
+
+    if exchange_id not in SUPPORTED_EXCHANGES:
+        raise ValueError(f"Unsupported exchange: {exchange_id}")
+
+    # Throttling is done by CandleDownloader so pages can overlap in flight
+    return getattr(ccxt_async, exchange_id)({"enableRateLimit": False})
+
+
+class RateLimiter:
+    """
+    Space request starts at least `interval` seconds apart.
+
+    Parameters:
+        interval: Minimum seconds between two acquisitions
+    """
+
+    def __init__(self, interval: float):
+        """Initialize limiter."""
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for the next free request slot."""
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class CandleDownloader:
+    """
+    Download OHLCV history from one exchange into a CandleStore.
+
+    Parameters:
+        exchange: Async CCXT-compatible client (id, rateLimit, fetch_ohlcv)
+        store: Destination candle store
+        page_limit: Candles requested per page (capped at the exchange's known limit)
+        max_concurrency: Pages in flight at once
+        max_retries: Attempts per page before giving up
+    """
+
+    def __init__(
+        self,
+        exchange: Any,
+        store: CandleStore,
+        page_limit: int = 1000,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+    ):
+        """Initialize downloader."""
+        self.exchange = exchange
+        self.store = store
+        self.page_limit = min(page_limit, OHLCV_PAGE_LIMITS.get(exchange.id, page_limit))
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.limiter = RateLimiter(getattr(exchange, "rateLimit", 0) / 1000)
+
+    @property
+    def exchange_id(self) -> str:
+        """Exchange ID used as the store key."""
+        return self.exchange.id
+
+    async def download(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: TimeLike,
+        end: Optional[TimeLike] = None,
+    ) -> int:
+        """
+        Fetch candles from the last stored timestamp (or start) up to end.
+
+        Args:
+            symbol: Trading pair (e.g. 'BTC/USDT')
+            timeframe: Candle timeframe
+            start: Range start used when nothing is stored yet
+            end: Exclusive range end (default: start of the current, unfinished candle)
+
+        Returns:
+            Number of candles written
+        """
+        step = timeframe_to_ms(timeframe)
+        since = to_epoch_ms(start)
+        last = self.store.last_timestamp(self.exchange_id, symbol, timeframe)
+        if last is not None:
+            since = max(since, last + step)
+
+        until = to_epoch_ms(end) if end is not None else (int(time.time() * 1000) // step) * step
+        if since >= until:
+            return 0
+
+        written = await self._fetch_range(symbol, timeframe, since, until)
+        logger.info(f"Downloaded {written} {symbol} {timeframe} candles from {self.exchange_id}")
+
+        return written
+
+    def find_gaps(self, symbol: str, timeframe: str) -> List[Tuple[int, int]]:
+        """
+        Locate missing candles inside the stored history.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+
+        Returns:
+            List of (first missing timestamp, next present timestamp) in epoch ms
+        """
+        step = timeframe_to_ms(timeframe)
+        timestamps = self.store.read(self.exchange_id, symbol, timeframe).timestamp
+        if len(timestamps) < 2:
+            return []
+
+        holes = np.flatnonzero(np.diff(timestamps) > step)
+        return [(int(timestamps[i]) + step, int(timestamps[i + 1])) for i in holes]
+
+    async def backfill_gaps(self, symbol: str, timeframe: str) -> int:
+        """
+        Re-request every gap in the stored history.
+
+        Exchanges legitimately skip candles (e.g. maintenance), so gaps the
+        exchange cannot fill are left in place.
+
+        Args:
+            symbol: Trading pair
+            timeframe: Candle timeframe
+
+        Returns:
+            Number of candles written
+        """
+        gaps = self.find_gaps(symbol, timeframe)
+        written = 0
+        for gap_start, gap_end in gaps:
+            written += await self._fetch_range(symbol, timeframe, gap_start, gap_end)
+
+        if gaps:
+            logger.info(
+                f"Backfilled {written} candles across {len(gaps)} gaps in {symbol} {timeframe}"
+            )
+
+        return written
+
+    async def _fetch_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: int,
+    ) -> int:
+        """Fetch [since, until) page by page and write it to the store."""
+        step = timeframe_to_ms(timeframe)
+        page_span = step * self.page_limit
+        page_starts = list(range(since, until, page_span))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        write_lock = asyncio.Lock()
+        ready: Dict[int, List[List[float]]] = {}
+        written = 0
+        next_page = 0
+
+        async def fetch(page: int) -> None:
+            nonlocal written, next_page
+            page_start = page_starts[page]
+            page_end = min(page_start + page_span, until)
+            async with semaphore:
+                rows = await self._fetch_page(symbol, timeframe, page_start, page_end)
+            ready[page] = rows
+
+            # Write the contiguous run of finished pages so the stored
+            # history never has holes a resume could skip over; the file
+            # writes (and fsync) run in a worker thread, one page at a time
+            async with write_lock:
+                while next_page in ready:
+                    rows = ready.pop(next_page)
+                    next_page += 1
+                    if rows:
+                        await asyncio.to_thread(
+                            self.store.write, self.exchange_id, symbol, timeframe, rows
+                        )
+                        written += len(rows)
+
+        tasks = [asyncio.create_task(fetch(page)) for page in range(len(page_starts))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return written
+
+    async def _fetch_page(
+        self,
+        symbol: str,
+        timeframe: str,
+        page_start: int,
+        page_end: int,
+    ) -> List[List[float]]:
+        """
+        Fetch the rows inside [page_start, page_end).
+
+        Exchanges may return fewer candles than requested; the page is then
+        continued from the last returned candle until it is covered or the
+        exchange has nothing more.
+        """
+        step = timeframe_to_ms(timeframe)
+        page: List[List[float]] = []
+        cursor = page_start
+        while cursor < page_end:
+            rows = await self._fetch_rows(symbol, timeframe, cursor)
+            rows = [row for row in rows if cursor <= row[0] < page_end]
+            if not rows:
+                break
+            page.extend(rows)
+            cursor = int(max(row[0] for row in rows)) + step
+
+        return page
+
+    async def _fetch_rows(self, symbol: str, timeframe: str, since: int) -> List[List[float]]:
+        """One fetch_ohlcv call with retries."""
+        for attempt in range(1, self.max_retries + 1):
+            await self.limiter.acquire()
+            try:
+                return await self.exchange.fetch_ohlcv(
+                    symbol, timeframe, since=since, limit=self.page_limit
+                )
+            except Exception as e:
+                if attempt == self.max_retries:
+                    logger.error(f"Page {since} of {symbol} {timeframe} failed: {str(e)}")
+                    raise
+                logger.warning(f"Retrying page {since} of {symbol} {timeframe}: {str(e)}")
+                await asyncio.sleep(self.limiter.interval * attempt)
+
+        return []
+
+
+# Export for convenience
+__all__ = [
+    "CandleDownloader",
+    "RateLimiter",
+    "create_exchange",
+    "timeframe_to_ms",
+    "TIMEFRAME_MS",
+    "SUPPORTED_EXCHANGES",
+    "OHLCV_PAGE_LIMITS",
+]
@@ -0,0 +1,240 @@
+"""
+TradeForge AaaS - Candle Resampler
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Builds higher timeframes on the fly from base (1m) candles in the CandleStore.
+
+Aggregation is vectorized with ufunc.reduceat over bucket boundaries. Derived
+bars are kept in an LRU cache; when new base candles are appended only the
+last (possibly partial) bucket onwards is re-aggregated, while a rewrite of
+the base series triggers a full rebuild.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.services.candle_downloader import timeframe_to_ms
+from app.services.candle_store import COLUMN_DTYPES, CandleStore, Candles, TimeLike, to_epoch_ms
+
+logger = logging.getLogger(__name__)
+
+
+def aggregate_ohlcv(candles: Candles, timeframe_ms: int) -> Tuple[Candles, np.ndarray]:
+    """
+    Aggregate candles into epoch-aligned buckets of timeframe_ms.
+
+    Args:
+        candles: Base candles (timestamps in epoch ms, ascending)
+        timeframe_ms: Target bucket size in milliseconds
+
+    Returns:
+        Tuple of (aggregated candles, base row index where each bucket starts)
+    """
+    if len(candles) == 0:
+        empty = {column: np.empty(0, dtype=dtype) for column, dtype in COLUMN_DTYPES.items()}
+        return Candles(**empty), np.empty(0, dtype=np.int64)
+
+    buckets = (np.asarray(candles.timestamp) // timeframe_ms) * timeframe_ms
+    starts = np.concatenate(([0], np.flatnonzero(buckets[1:] != buckets[:-1]) + 1))
+    ends = np.concatenate((starts[1:], [len(buckets)])) - 1
+
+    aggregated = Candles(
+        timestamp=buckets[starts],
+        open=np.asarray(candles.open)[starts],
+        high=np.maximum.reduceat(np.asarray(candles.high), starts),
+        low=np.minimum.reduceat(np.asarray(candles.low), starts),
+        close=np.asarray(candles.close)[ends],
+        volume=np.add.reduceat(np.asarray(candles.volume), starts),
+    )
+    return aggregated, starts.astype(np.int64)
+
+
+@dataclass
+class _CacheEntry:
+    """Aggregated bars for one series plus the base state they were built from."""
+
+    candles: Candles
+    bucket_starts: np.ndarray
+    generation: int
+    base_length: int
+
+
+class CandleResampler:
+    """
+    Serve any timeframe derived from stored base candles, with an LRU cache.
+
+    Parameters:
+        store: Candle store holding the base timeframe
+        base_timeframe: Stored timeframe used as the source (default: '1m')
+        max_entries: Derived series kept in memory
+    """
+
+    def __init__(
+        self,
+        store: CandleStore,
+        base_timeframe: str = "1m",
+        max_entries: int = 32,
+    ):
+        """Initialize resampler."""
+        self.store = store
+        self.base_timeframe = base_timeframe
+        self.base_ms = timeframe_to_ms(base_timeframe)
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, str, str], _CacheEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.incremental_updates = 0
+        self._lock = threading.Lock()
+
+    def read(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        include_partial: bool = False,
+    ) -> Candles:
+        """
+        Read candles for any timeframe that is a multiple of the base timeframe.
+
+        Args:
+            exchange: Exchange ID
+            symbol: Trading pair
+            timeframe: Target timeframe (e.g. '4h')
+            start: Inclusive range start (matched against bar open time)
+            end: Exclusive range end
+            include_partial: Keep a trailing bar whose base candles are not all stored yet
+
+        Returns:
+            Candles for the requested range
+        """
+        if timeframe == self.base_timeframe:
+            return self.store.read(exchange, symbol, timeframe, start, end)
+
+        target_ms = timeframe_to_ms(timeframe)
+        if target_ms % self.base_ms:
+            raise ValueError(f"{timeframe} is not a multiple of {self.base_timeframe}")
+
+        with self._lock:
+            candles = self._aggregated(exchange, symbol, timeframe, target_ms)
+
+        hi = len(candles)
+        if not include_partial and hi:
+            base_last = self.store.last_timestamp(exchange, symbol, self.base_timeframe)
+            if base_last < candles.timestamp[-1] + target_ms - self.base_ms:
+                hi -= 1
+
+        lo = 0
+        if start is not None:
+            lo = int(np.searchsorted(candles.timestamp, to_epoch_ms(start), side="left"))
+        if end is not None:
+            hi = min(hi, int(np.searchsorted(candles.timestamp, to_epoch_ms(end), side="left")))
+
+        return Candles(**{column: getattr(candles, column)[lo:hi] for column in COLUMN_DTYPES})
+
+    def read_frame(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        include_partial: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Read candles for any derived timeframe as an OHLCV DataFrame.
+
+        Args:
+            exchange: Exchange ID
+            symbol: Trading pair
+            timeframe: Target timeframe
+            start: Inclusive range start
+            end: Exclusive range end
+            include_partial: Keep a trailing incomplete bar
+
+        Returns:
+            OHLCV DataFrame indexed by UTC bar open time
+        """
+        return self.read(exchange, symbol, timeframe, start, end, include_partial).to_frame()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters."""
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "incremental_updates": self.incremental_updates,
+        }
+
+    def clear(self) -> None:
+        """Drop every cached series."""
+        with self._lock:
+            self._cache.clear()
+
+    def _aggregated(self, exchange: str, symbol: str, timeframe: str, target_ms: int) -> Candles:
+        """Return cached bars for a series, refreshing them against the base state."""
+        key = (exchange, symbol, timeframe)
+        generation, base_length = self.store.version(exchange, symbol, self.base_timeframe)
+        entry = self._cache.get(key)
+        current = entry is not None and entry.generation == generation
+
+        if current and entry.base_length == base_length:
+            self.hits += 1
+        elif current and entry.base_length < base_length:
+            entry = self._extend(entry, exchange, symbol, target_ms, base_length)
+            self.incremental_updates += 1
+        else:
+            base = self.store.read(exchange, symbol, self.base_timeframe)
+            candles, bucket_starts = aggregate_ohlcv(base, target_ms)
+            entry = _CacheEntry(candles, bucket_starts, generation, base_length)
+            self.misses += 1
+
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            evicted, _ = self._cache.popitem(last=False)
+            logger.debug(f"Evicted resampled series {evicted}")
+
+        return entry.candles
+
+    def _extend(
+        self,
+        entry: _CacheEntry,
+        exchange: str,
+        symbol: str,
+        target_ms: int,
+        base_length: int,
+    ) -> _CacheEntry:
+        """Re-aggregate from the last cached bucket onwards after base appends."""
+        base = self.store.read(exchange, symbol, self.base_timeframe)
+        keep = max(len(entry.candles) - 1, 0)
+        base_from = int(entry.bucket_starts[keep]) if len(entry.bucket_starts) else 0
+
+        tail = Candles(**{
+            column: getattr(base, column)[base_from:base_length] for column in COLUMN_DTYPES
+        })
+        tail_candles, tail_starts = aggregate_ohlcv(tail, target_ms)
+
+        candles = Candles(**{
+            column: np.concatenate(
+                (getattr(entry.candles, column)[:keep], getattr(tail_candles, column))
+            )
+            for column in COLUMN_DTYPES
+        })
+        bucket_starts = np.concatenate((entry.bucket_starts[:keep], tail_starts + base_from))
+
+        return _CacheEntry(candles, bucket_starts, entry.generation, base_length)
+
+
+# Export for convenience
+__all__ = ["CandleResampler", "aggregate_ohlcv"]
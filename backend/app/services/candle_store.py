@@ -0,0 +1,443 @@
+"""
+TradeForge AaaS - Candle Store
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Local columnar OHLCV storage keyed by exchange/symbol/timeframe.
+
+Each series is a directory of fixed-width little-endian column files
+(timestamp as int64 epoch milliseconds, OHLCV as float64). Reads memory-map
+the columns and return zero-copy views for the requested date range.
+
+Appends extend the column files in place. A merge rewrite writes a complete
+new generation of columns into its own subdirectory and then atomically
+replaces the series' 'generation' file, so readers see either every old
+column or every new one.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, List, Tuple, Union
+import logging
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Column files and their on-disk dtypes
+COLUMN_DTYPES: Dict[str, np.dtype] = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+TimeLike = Union[int, datetime, pd.Timestamp, str]
+
+
+def to_epoch_ms(value: TimeLike) -> int:
+    """
+    Convert a timestamp-like value to epoch milliseconds.
+
+    Args:
+        value: Epoch milliseconds, datetime, pandas Timestamp or ISO string
+            (naive values are treated as UTC)
+
+    Returns:
+        Epoch milliseconds
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value // 1_000_000)
+
+
+@dataclass(frozen=True)
+class Candles:
+    """Column views over one stored series (timestamps in epoch milliseconds)."""
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Wrap the columns in an OHLCV DataFrame without copying them.
+
+        Returns:
+            DataFrame indexed by UTC timestamps, accepted by every strategy entry point
+        """
+        # Integer ms -> ns view avoids pandas' slower unit parsing path
+        nanos = np.asarray(self.timestamp, dtype=np.int64) * 1_000_000
+        index = pd.DatetimeIndex(nanos.view("datetime64[ns]"), name="timestamp").tz_localize("UTC")
+        return pd.DataFrame(
+            {
+                "open": self.open,
+                "high": self.high,
+                "low": self.low,
+                "close": self.close,
+                "volume": self.volume,
+            },
+            index=index,
+            copy=False,
+        )
+
+
+class CandleStore:
+    """
+    Append-only columnar candle store with memory-mapped reads.
+
+    Parameters:
+        root: Storage directory (default: settings.CANDLE_STORE_PATH)
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """Initialize store rooted at the given directory."""
+        self.root = Path(root or settings.CANDLE_STORE_PATH)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._maps: Dict[Path, Tuple[Tuple[int, int, Tuple[int, ...]], Candles]] = {}
+
+    # ============================================
+    # PATHS
+    # ============================================
+
+    def series_path(self, exchange: str, symbol: str, timeframe: str) -> Path:
+        """Directory holding one series' column files."""
+        return self.root / exchange.lower() / symbol.upper().replace("/", "_") / timeframe
+
+    def list_series(self) -> List[Tuple[str, str, str]]:
+        """
+        List stored series.
+
+        Returns:
+            List of (exchange, symbol, timeframe)
+        """
+        series = []
+        for timeframe_dir in sorted(self.root.glob("*/*/*")):
+            generation = self._generation(timeframe_dir)
+            if not (self._columns_path(timeframe_dir, generation) / "timestamp.bin").exists():
+                continue
+            series.append((
+                timeframe_dir.parent.parent.name,
+                timeframe_dir.parent.name.replace("_", "/"),
+                timeframe_dir.name,
+            ))
+        return series
+
+    # ============================================
+    # READS
+    # ============================================
+
+    @staticmethod
+    def _columns_path(path: Path, generation: int) -> Path:
+        """Directory holding a generation's column files (generation 0 is the series directory)."""
+        return path if generation == 0 else path / f"gen-{generation}"
+
+    def _length(self, path: Path, generation: Optional[int] = None) -> int:
+        """Number of complete rows (columns cut short by a crash are ignored)."""
+        if generation is None:
+            generation = self._generation(path)
+        columns_path = self._columns_path(path, generation)
+        lengths = []
+        for column, dtype in COLUMN_DTYPES.items():
+            file = columns_path / f"{column}.bin"
+            lengths.append(file.stat().st_size // dtype.itemsize if file.exists() else 0)
+        return min(lengths)
+
+    def _state(self, path: Path) -> Tuple[int, int, Tuple[int, ...]]:
+        """
+        Identify the on-disk files of a series for the memmap cache.
+
+        A rewrite by any CandleStore (in this or another process) bumps the
+        generation and moves to new column files, so the state changes even
+        when the row count does not.
+
+        Returns:
+            Tuple of (generation, row count, column file inodes)
+        """
+        generation = self._generation(path)
+        columns_path = self._columns_path(path, generation)
+        inodes = []
+        for column in COLUMN_DTYPES:
+            file = columns_path / f"{column}.bin"
+            inodes.append(file.stat().st_ino if file.exists() else 0)
+        return generation, self._length(path, generation), tuple(inodes)
+
+    def _open(self, path: Path) -> Candles:
+        """Memory-map every column of a series (cached until its files change)."""
+        state = self._state(path)
+        cached = self._maps.get(path)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        generation, length = state[0], state[1]
+        columns_path = self._columns_path(path, generation)
+
+        columns = {}
+        for column, dtype in COLUMN_DTYPES.items():
+            if length == 0:
+                columns[column] = np.empty(0, dtype=dtype)
+            else:
+                columns[column] = np.memmap(
+                    columns_path / f"{column}.bin", dtype=dtype, mode="r", shape=(length,)
+                )
+
+        candles = Candles(**columns)
+        self._maps[path] = (state, candles)
+        return candles
+
+    def read(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+    ) -> Candles:
+        """
+        Read a date range as zero-copy column views.
+
+        Args:
+            exchange: Exchange ID (e.g. 'binance')
+            symbol: Trading pair (e.g. 'BTC/USDT')
+            timeframe: Candle timeframe (e.g. '1m')
+            start: Inclusive range start
+            end: Exclusive range end
+
+        Returns:
+            Candles with memory-mapped column slices
+        """
+        candles = self._open(self.series_path(exchange, symbol, timeframe))
+        lo, hi = 0, len(candles)
+        if start is not None:
+            lo = int(np.searchsorted(candles.timestamp, to_epoch_ms(start), side="left"))
+        if end is not None:
+            hi = int(np.searchsorted(candles.timestamp, to_epoch_ms(end), side="left"))
+
+        return Candles(**{column: getattr(candles, column)[lo:hi] for column in COLUMN_DTYPES})
+
+    def read_frame(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+    ) -> pd.DataFrame:
+        """
+        Read a date range as an OHLCV DataFrame backed by the mapped columns.
+
+        Args:
+            exchange: Exchange ID
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            start: Inclusive range start
+            end: Exclusive range end
+
+        Returns:
+            OHLCV DataFrame indexed by UTC timestamps
+        """
+        return self.read(exchange, symbol, timeframe, start, end).to_frame()
+
+    def last_timestamp(self, exchange: str, symbol: str, timeframe: str) -> Optional[int]:
+        """Epoch milliseconds of the newest stored candle, or None if empty."""
+        candles = self._open(self.series_path(exchange, symbol, timeframe))
+        return int(candles.timestamp[-1]) if len(candles) else None
+
+    def count(self, exchange: str, symbol: str, timeframe: str) -> int:
+        """Number of stored candles."""
+        return self._length(self.series_path(exchange, symbol, timeframe))
+
+    def version(self, exchange: str, symbol: str, timeframe: str) -> Tuple[int, int]:
+        """
+        Identify the stored state of a series.
+
+        Appends keep the generation and grow the row count; a merge rewrite
+        bumps the generation.
+
+        Returns:
+            Tuple of (generation, row count); (0, 0) for an empty series
+        """
+        path = self.series_path(exchange, symbol, timeframe)
+        generation = self._generation(path)
+        return generation, self._length(path, generation)
+
+    def range_version(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+    ) -> Tuple[int, int, int, int]:
+        """
+        Identify the stored state of a date range.
+
+        Unlike version(), appends after the range leave it unchanged.
+
+        Returns:
+            Tuple of (generation, rows in range, first timestamp, last timestamp)
+        """
+        path = self.series_path(exchange, symbol, timeframe)
+        candles = self.read(exchange, symbol, timeframe, start, end)
+        if len(candles) == 0:
+            return self._generation(path), 0, 0, 0
+        return (
+            self._generation(path),
+            len(candles),
+            int(candles.timestamp[0]),
+            int(candles.timestamp[-1]),
+        )
+
+    @staticmethod
+    def _generation(path: Path) -> int:
+        """Number of times the series has been rewritten."""
+        file = path / "generation"
+        return int(file.read_text()) if file.exists() else 0
+
+    # ============================================
+    # WRITES
+    # ============================================
+
+    def write(
+        self,
+        exchange: str,
+        symbol: str,
+        timeframe: str,
+        ohlcv: Union[np.ndarray, List[List[float]], pd.DataFrame],
+    ) -> int:
+        """
+        Store candles, appending in place when they are newer than the series.
+
+        Rows at or before the last stored timestamp trigger a merge: the series
+        is rewritten sorted and de-duplicated by timestamp (new rows win).
+
+        Args:
+            exchange: Exchange ID
+            symbol: Trading pair
+            timeframe: Candle timeframe
+            ohlcv: Rows of [timestamp_ms, open, high, low, close, volume]
+                (CCXT fetch_ohlcv format) or an OHLCV DataFrame with a DatetimeIndex
+
+        Returns:
+            Number of rows in the series after the write
+        """
+        rows = self._normalize(ohlcv)
+        path = self.series_path(exchange, symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+
+        if len(rows["timestamp"]) == 0:
+            return self._length(path)
+
+        existing = self._open(path)
+        if len(existing) == 0 or rows["timestamp"][0] > existing.timestamp[-1]:
+            self._append(path, rows, len(existing))
+        else:
+            merged = {
+                column: np.concatenate((getattr(existing, column), rows[column]))
+                for column in COLUMN_DTYPES
+            }
+            # Keep the last occurrence of each timestamp (incoming rows win)
+            order = np.argsort(merged["timestamp"], kind="stable")
+            ts = merged["timestamp"][order]
+            keep = np.ones(len(ts), dtype=bool)
+            keep[:-1] = ts[1:] != ts[:-1]
+            self._rewrite(path, {column: values[order][keep] for column, values in merged.items()})
+
+        length = self._length(path)
+        logger.debug(f"Stored {len(rows['timestamp'])} candles for {exchange} {symbol} {timeframe}")
+        return length
+
+    @staticmethod
+    def _normalize(
+        ohlcv: Union[np.ndarray, List[List[float]], pd.DataFrame]
+    ) -> Dict[str, np.ndarray]:
+        """Convert input rows to sorted, de-duplicated column arrays."""
+        if isinstance(ohlcv, pd.DataFrame):
+            index = pd.DatetimeIndex(ohlcv.index)
+            if index.tz is None:
+                index = index.tz_localize("UTC")
+            columns = {"timestamp": (index.asi8 // 1_000_000).astype(np.int64)}
+            for column in list(COLUMN_DTYPES)[1:]:
+                columns[column] = ohlcv[column].to_numpy(dtype=np.float64)
+        else:
+            array = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(COLUMN_DTYPES))
+            columns = {"timestamp": array[:, 0].astype(np.int64)}
+            for i, column in enumerate(list(COLUMN_DTYPES)[1:], start=1):
+                columns[column] = array[:, i]
+
+        order = np.argsort(columns["timestamp"], kind="stable")
+        ts = columns["timestamp"][order]
+        keep = np.ones(len(ts), dtype=bool)
+        keep[:-1] = ts[1:] != ts[:-1]
+        return {column: values[order][keep] for column, values in columns.items()}
+
+    def _append(self, path: Path, rows: Dict[str, np.ndarray], length: int) -> None:
+        """Append rows to every column file (truncating any torn tail first)."""
+        columns_path = self._columns_path(path, self._generation(path))
+        for column, dtype in COLUMN_DTYPES.items():
+            with open(columns_path / f"{column}.bin", "ab") as f:
+                f.truncate(length * dtype.itemsize)
+                f.write(np.ascontiguousarray(rows[column], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _rewrite(self, path: Path, columns: Dict[str, np.ndarray]) -> None:
+        """
+        Write every column as a new generation, then switch to it with one atomic rename.
+
+        The previous generation stays on disk until the next rewrite so readers
+        that looked up the generation just before the switch can still map it.
+        """
+        self._maps.pop(path, None)
+        generation = self._generation(path)
+        new_path = self._columns_path(path, generation + 1)
+        # Leftovers of a rewrite that crashed before switching
+        shutil.rmtree(new_path, ignore_errors=True)
+        new_path.mkdir()
+        for column, dtype in COLUMN_DTYPES.items():
+            with open(new_path / f"{column}.bin", "wb") as f:
+                f.write(np.ascontiguousarray(columns[column], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        tmp = path / "generation.tmp"
+        with open(tmp, "w") as f:
+            f.write(str(generation + 1))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path / "generation")
+
+        self._remove_generation(path, generation - 1)
+
+    def _remove_generation(self, path: Path, generation: int) -> None:
+        """Delete a superseded generation's column files."""
+        if generation < 0:
+            return
+        if generation > 0:
+            shutil.rmtree(self._columns_path(path, generation), ignore_errors=True)
+            return
+        for column in COLUMN_DTYPES:
+            (path / f"{column}.bin").unlink(missing_ok=True)
+
+
+# Export for convenience
+__all__ = ["CandleStore", "Candles", "COLUMN_DTYPES", "to_epoch_ms"]
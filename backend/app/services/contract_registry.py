@@ -0,0 +1,309 @@
+"""
+TradeForge AaaS - Contract Registry
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Process-wide cache of contract handles for on-chain reads.
+
+A handle is keyed by (network, address, abi_id) and holds the checksummed
+address, every function's selector and ABI types parsed once, and a dict of
+static facts (e.g. ERC20 decimals) that never change for that contract.
+Calls are encoded straight from the cached types, without building a web3
+Contract object per request.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Tuple
+import logging
+import threading
+
+from eth_abi import decode, encode
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from eth_utils.abi import collapse_if_tuple
+
+logger = logging.getLogger(__name__)
+
+# ERC20 ABI (minimal)
+ERC20_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function"
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function"
+    }
+]
+
+# Chainlink AggregatorV3Interface ABI (minimal)
+AGGREGATOR_V3_ABI = [
+    {
+        "inputs": [],
+        "name": "latestRoundData",
+        "outputs": [
+            {"internalType": "uint80", "name": "roundId", "type": "uint80"},
+            {"internalType": "int256", "name": "answer", "type": "int256"},
+            {"internalType": "uint256", "name": "startedAt", "type": "uint256"},
+            {"internalType": "uint256", "name": "updatedAt", "type": "uint256"},
+            {"internalType": "uint80", "name": "answeredInRound", "type": "uint80"}
+        ],
+        "stateMutability": "view",
+        "type": "function"
+    },
+    {
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+# Multicall3 ABI (aggregate3 only)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+# ABIs every registry starts with
+DEFAULT_ABIS = {
+    "erc20": ERC20_ABI,
+    "aggregator_v3": AGGREGATOR_V3_ABI,
+    "multicall3": MULTICALL3_ABI,
+}
+
+
+class PreparedFunction:
+    """
+    Selector and ABI types of one contract function.
+    
+    Parameters:
+        abi: Function ABI entry
+    """
+    
+    __slots__ = ("name", "selector", "input_types", "output_types")
+    
+    def __init__(self, abi: Dict[str, Any]):
+        self.name: str = abi["name"]
+        self.selector: bytes = function_abi_to_4byte_selector(abi)
+        self.input_types: List[str] = [collapse_if_tuple(arg) for arg in abi.get("inputs", [])]
+        self.output_types: List[str] = [collapse_if_tuple(arg) for arg in abi.get("outputs", [])]
+    
+    def encode(self, *args: Any) -> bytes:
+        """Calldata for a call with these arguments."""
+        if not self.input_types:
+            return self.selector
+        return self.selector + encode(self.input_types, args)
+    
+    def decode(self, data: bytes) -> Any:
+        """Decode return data (one output is returned as-is, several as a tuple)."""
+        return decode_outputs(self.output_types, data)
+
+
+def decode_outputs(output_types: List[str], data: bytes) -> Any:
+    """
+    Decode ABI-encoded return data.
+    
+    Args:
+        output_types: Canonical output type strings
+        data: Return data
+    
+    Returns:
+        The value for one output, a tuple for several, None for none
+    """
+    if not output_types:
+        return None
+    values = decode(output_types, bytes(data))
+    return values[0] if len(values) == 1 else tuple(values)
+
+
+class ContractCall(NamedTuple):
+    """Encoded view call: target address, calldata and the function to decode with."""
+    
+    target: str
+    data: bytes
+    function: PreparedFunction
+
+
+class RegisteredContract:
+    """
+    Cached handle for one contract on one network.
+    
+    Parameters:
+        network: Blockchain network
+        address: Checksummed contract address
+        abi_id: Registered ABI the handle was built from
+        functions: Prepared functions by name
+    """
+    
+    __slots__ = ("network", "address", "abi_id", "functions", "constants")
+    
+    def __init__(
+        self,
+        network: str,
+        address: str,
+        abi_id: str,
+        functions: Dict[str, PreparedFunction]
+    ):
+        self.network = network
+        self.address = address
+        self.abi_id = abi_id
+        self.functions = functions
+        # Static facts read once and kept for the life of the process
+        self.constants: Dict[str, Any] = {}
+    
+    def call(self, name: str, *args: Any) -> ContractCall:
+        """
+        Encode a call to one of the contract's functions.
+        
+        Args:
+            name: Function name
+            *args: Function arguments
+        
+        Returns:
+            ContractCall for Multicall.add or DeFiService.multicall
+        """
+        try:
+            function = self.functions[name]
+        except KeyError:
+            raise ValueError(f"ABI '{self.abi_id}' has no function '{name}'") from None
+        return ContractCall(self.address, function.encode(*args), function)
+    
+    def __repr__(self) -> str:
+        return f"RegisteredContract({self.network}, {self.address}, {self.abi_id})"
+
+
+class ContractRegistry:
+    """
+    Contract handles keyed by (network, address, abi_id).
+    
+    ABIs are parsed once when registered; handles and checksummed addresses
+    are created on first use and kept. The built-in ABIs are registered as
+    'erc20', 'aggregator_v3' and 'multicall3'.
+    """
+    
+    def __init__(self):
+        self._abis: Dict[str, Dict[str, PreparedFunction]] = {}
+        self._contracts: Dict[Tuple[str, str, str], RegisteredContract] = {}
+        self._checksums: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        
+        for abi_id, abi in DEFAULT_ABIS.items():
+            self.register_abi(abi_id, abi)
+    
+    def register_abi(self, abi_id: str, abi: List[Dict[str, Any]]) -> None:
+        """
+        Parse and register an ABI under an id.
+        
+        Args:
+            abi_id: Name handles refer to the ABI by
+            abi: Contract ABI (only function entries are used)
+        """
+        functions = {
+            entry["name"]: PreparedFunction(entry)
+            for entry in abi
+            if entry.get("type", "function") == "function"
+        }
+        with self._lock:
+            self._abis[abi_id] = functions
+            # Handles built from a previous ABI under this id are dropped
+            for key in [key for key in self._contracts if key[2] == abi_id]:
+                del self._contracts[key]
+    
+    def checksum(self, address: str) -> str:
+        """Checksummed form of an address (cached)."""
+        checksummed = self._checksums.get(address)
+        if checksummed is None:
+            checksummed = to_checksum_address(address)
+            self._checksums[address] = checksummed
+        return checksummed
+    
+    def get(self, network: str, address: str, abi_id: str) -> RegisteredContract:
+        """
+        Handle for a contract, created on first use.
+        
+        Args:
+            network: Blockchain network
+            address: Contract address (any case)
+            abi_id: Registered ABI id
+        
+        Returns:
+            Cached RegisteredContract
+        """
+        key = (network, address.lower(), abi_id)
+        contract = self._contracts.get(key)
+        if contract is not None:
+            return contract
+        
+        if abi_id not in self._abis:
+            raise ValueError(f"Unknown ABI id '{abi_id}'")
+        
+        with self._lock:
+            contract = self._contracts.get(key)
+            if contract is None:
+                contract = RegisteredContract(
+                    network, self.checksum(address), abi_id, self._abis[abi_id]
+                )
+                self._contracts[key] = contract
+                logger.debug(f"Registered {contract}")
+        return contract
+    
+    def clear(self) -> None:
+        """Drop every handle and cached fact (registered ABIs are kept)."""
+        with self._lock:
+            self._contracts.clear()
+            self._checksums.clear()
+    
+    def __len__(self) -> int:
+        return len(self._contracts)
+
+
+# Registry shared by every DeFiService in the process
+contract_registry = ContractRegistry()
+
+
+# Export for convenience
+__all__ = [
+    "ContractRegistry",
+    "RegisteredContract",
+    "ContractCall",
+    "PreparedFunction",
+    "decode_outputs",
+    "contract_registry",
+    "ERC20_ABI",
+    "AGGREGATOR_V3_ABI",
+    "MULTICALL3_ABI",
+]
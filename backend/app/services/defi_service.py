@@ -6,21 +6,179 @@ GitHub: https://github.com/AryHHAry
 © 2026
 
 DeFi operations for Uniswap V3, Aave V3, and Chainlink price feeds.
+
+All RPC access goes through AsyncWeb3, so on-chain reads await the network
+instead of blocking the event loop.
 """
 
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Sequence, Tuple, Union
 from decimal import Decimal
-from web3 import Web3
-from web3.contract import Contract
+from web3 import AsyncWeb3
+from web3.contract.async_contract import AsyncContractFunction
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
+from eth_utils.abi import collapse_if_tuple
+from hexbytes import HexBytes
+import asyncio
 import logging
 
 from app.core.config import settings
+from app.services.contract_registry import (
+    AGGREGATOR_V3_ABI,
+    ERC20_ABI,
+    MULTICALL3_ABI,
+    ContractCall,
+    ContractRegistry,
+    PreparedFunction,
+    contract_registry,
+    decode_outputs,
+)
+from app.services.price_feed_cache import ChainlinkPriceCache, PriceQuote, shared_price_cache
+from app.services.web3_providers import Web3ProviderManager, web3_providers
 
 
 logger = logging.getLogger(__name__)
 
+# Calls per aggregate3 request; larger sets are split, all pinned to one block
+MULTICALL_BATCH_SIZE = 500
+
+# Block tags that move between requests (resolved to a number before splitting)
+_MOVING_BLOCK_TAGS = ("latest", "pending", "safe", "finalized")
+
+_AGGREGATE3 = PreparedFunction(MULTICALL3_ABI[0])
+
+
+class Multicall:
+    """
+    Batch of contract view calls executed through Multicall3 aggregate3.
+    
+    Calls are queued with add() and sent by execute() as one eth_call per
+    batch_size calls; every batch reads the same block, and results are
+    decoded in bulk with the ABI of each queued function.
+    
+    Parameters:
+        w3: AsyncWeb3 instance
+        address: Multicall3 contract address (default: settings.MULTICALL3_ADDRESS)
+        batch_size: Maximum calls per eth_call
+        registry: Contract registry used to checksum the address
+    """
+    
+    def __init__(
+        self,
+        w3: AsyncWeb3,
+        address: Optional[str] = None,
+        batch_size: int = MULTICALL_BATCH_SIZE,
+        registry: Optional[ContractRegistry] = None
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        
+        registry = registry or contract_registry
+        self.w3 = w3
+        self.address = registry.checksum(address or settings.MULTICALL3_ADDRESS)
+        self.batch_size = batch_size
+        self._calls: List[Tuple[str, bool, bytes, List[str]]] = []
+    
+    def __len__(self) -> int:
+        return len(self._calls)
+    
+    def add(
+        self,
+        call: Union[ContractCall, AsyncContractFunction],
+        allow_failure: bool = False
+    ) -> int:
+        """
+        Queue a view call.
+        
+        Args:
+            call: ContractCall from the contract registry, or a web3 contract
+                function with its arguments bound (token.functions.decimals())
+            allow_failure: Return None for this call instead of reverting the batch
+        
+        Returns:
+            Index of the call's result in execute()
+        """
+        if isinstance(call, ContractCall):
+            entry = (call.target, allow_failure, call.data, call.function.output_types)
+        else:
+            entry = (
+                call.address,
+                allow_failure,
+                HexBytes(call._encode_transaction_data()),
+                [collapse_if_tuple(output) for output in call.abi.get("outputs", [])],
+            )
+        self._calls.append(entry)
+        return len(self._calls) - 1
+    
+    async def execute(self, block_identifier: Any = "latest") -> List[Any]:
+        """
+        Send the queued calls and clear the queue.
+        
+        Batches are sent concurrently.
+        
+        Args:
+            block_identifier: Block to read (number, hash or tag)
+        
+        Returns:
+            Decoded results in the order the calls were added. Functions with
+            one output return the value itself, others a tuple; failed calls
+            added with allow_failure return None
+        """
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+        
+        if len(calls) > self.batch_size and block_identifier in _MOVING_BLOCK_TAGS:
+            block_identifier = await self.w3.eth.block_number
+        
+        batches = [
+            calls[start:start + self.batch_size]
+            for start in range(0, len(calls), self.batch_size)
+        ]
+        returned = await asyncio.gather(
+            *(self._aggregate3(batch, block_identifier) for batch in batches)
+        )
+        
+        results: List[Any] = []
+        for batch, batch_results in zip(batches, returned):
+            for (target, allow_failure, _, output_types), (success, data) in zip(
+                batch, batch_results
+            ):
+                results.append(self._decode(target, allow_failure, output_types, success, data))
+        
+        logger.debug(f"Multicall executed {len(calls)} calls in {len(batches)} request(s)")
+        return results
+    
+    async def _aggregate3(
+        self,
+        batch: List[Tuple[str, bool, bytes, List[str]]],
+        block_identifier: Any
+    ) -> List[Tuple[bool, bytes]]:
+        """Send one aggregate3 eth_call and return its (success, returnData) pairs."""
+        data = _AGGREGATE3.encode(
+            [(target, allow_failure, data) for target, allow_failure, data, _ in batch]
+        )
+        return _AGGREGATE3.decode(
+            await self.w3.eth.call({"to": self.address, "data": data}, block_identifier)
+        )
+    
+    def _decode(
+        self,
+        target: str,
+        allow_failure: bool,
+        output_types: List[str],
+        success: bool,
+        data: bytes
+    ) -> Any:
+        """Decode one aggregate3 result."""
+        # A call to an address without code succeeds with empty return data
+        if not success or (output_types and not data):
+            if allow_failure:
+                return None
+            raise ValueError(f"Call to {target} returned no data")
+        
+        return decode_outputs(output_types, data)
+
 
 class DeFiService:
     """
@@ -31,7 +189,11 @@ class DeFiService:
     def __init__(
         self,
         network: str = "ethereum",
-        private_key: Optional[str] = None
+        private_key: Optional[str] = None,
+        w3: Optional[AsyncWeb3] = None,
+        registry: Optional[ContractRegistry] = None,
+        providers: Optional[Web3ProviderManager] = None,
+        price_cache: Optional[ChainlinkPriceCache] = None
     ):
         """
         Initialize DeFi service.
@@ -39,9 +201,19 @@ class DeFiService:
         Args:
             network: Blockchain network (ethereum, polygon, arbitrum)
             private_key: Wallet private key (optional)
+            w3: AsyncWeb3 instance to use instead of the shared one for the network
+            registry: Contract registry (defaults to the process-wide one)
+            providers: Web3 provider manager (defaults to the process-wide one)
+            price_cache: Chainlink price cache for the USD price and quote helpers
+                (defaults to the network's shared cache, or one of this service's own
+                when w3 is given)
         """
         self.network = network
-        self.w3 = self._get_web3_instance(network)
+        self.providers = providers or web3_providers
+        self._shared_w3 = w3 is None
+        self.w3 = w3 or self._get_web3_instance(network)
+        self._price_cache = price_cache
+        self.contracts = registry or contract_registry
         self.account: Optional[LocalAccount] = None
         
         if private_key:
@@ -52,24 +224,27 @@ class DeFiService:
         self.uniswap_v3_factory = settings.UNISWAP_V3_FACTORY
         self.aave_v3_pool = settings.AAVE_V3_POOL
         self.aave_v3_data_provider = settings.AAVE_V3_POOL_DATA_PROVIDER
+        self.multicall3 = settings.MULTICALL3_ADDRESS
         
         logger.info(f"DeFi service initialized for {network}")
     
-    def _get_web3_instance(self, network: str) -> Web3:
-        """Get Web3 instance for specified network."""
-        rpc_urls = {
-            "ethereum": settings.ETH_RPC_URL,
-            "polygon": settings.POLYGON_RPC_URL,
-            "arbitrum": settings.ARBITRUM_RPC_URL,
-        }
-        
-        rpc_url = rpc_urls.get(network, settings.ETH_RPC_URL)
-        w3 = Web3(Web3.HTTPProvider(rpc_url))
-        
-        if not w3.is_connected():
-            raise ConnectionError(f"Failed to connect to {network} network")
-        
-        return w3
+    def _get_web3_instance(self, network: str) -> AsyncWeb3:
+        """Get the shared AsyncWeb3 instance for specified network."""
+        # Connectivity comes from the manager's background checks, not a handshake here
+        health = self.providers.health(network)
+        if health is not None and not health.healthy:
+            raise ConnectionError(f"Failed to connect to {network} network: {health.error}")
+        
+        return self.providers.get(network)
+    
+    @property
+    def price_cache(self) -> ChainlinkPriceCache:
+        """Chainlink price cache used by the USD price and quote helpers."""
+        if self._price_cache is None:
+            self._price_cache = (
+                shared_price_cache(self.network) if self._shared_w3 else ChainlinkPriceCache(self)
+            )
+        return self._price_cache
     
     def set_account(self, private_key: str) -> None:
         """
@@ -84,7 +259,7 @@ class DeFiService:
         self.account = Account.from_key(private_key)
         logger.info(f"Account set: {self.account.address}")
     
-    def get_balance(self, address: Optional[str] = None) -> Decimal:
+    async def get_balance(self, address: Optional[str] = None) -> Decimal:
         """
         Get ETH/native token balance.
         
@@ -99,12 +274,34 @@ class DeFiService:
         if not addr:
             raise ValueError("No address provided and no account set")
         
-        balance_wei = self.w3.eth.get_balance(addr)
+        balance_wei = await self.w3.eth.get_balance(addr)
         balance_eth = self.w3.from_wei(balance_wei, 'ether')
         
         return Decimal(str(balance_eth))
     
-    def get_token_balance(
+    async def multicall(
+        self,
+        calls: Sequence[Union[ContractCall, AsyncContractFunction]],
+        block_identifier: Any = "latest",
+        allow_failure: bool = False
+    ) -> List[Any]:
+        """
+        Run contract view calls in as few eth_call requests as possible.
+        
+        Args:
+            calls: ContractCalls from the registry or bound web3 contract functions
+            block_identifier: Block to read (number, hash or tag)
+            allow_failure: Return None for failed calls instead of raising
+        
+        Returns:
+            Decoded results in call order
+        """
+        batch = Multicall(self.w3, self.multicall3, registry=self.contracts)
+        for call in calls:
+            batch.add(call, allow_failure)
+        return await batch.execute(block_identifier)
+    
+    async def get_token_balance(
         self,
         token_address: str,
         wallet_address: Optional[str] = None
@@ -119,38 +316,49 @@ class DeFiService:
         Returns:
             Token balance
         """
+        balances = await self.get_token_balances([token_address], wallet_address)
+        return balances[token_address]
+    
+    async def get_token_balances(
+        self,
+        token_addresses: Sequence[str],
+        wallet_address: Optional[str] = None
+    ) -> Dict[str, Decimal]:
+        """
+        Get several ERC20 token balances in one multicall.
+        
+        Args:
+            token_addresses: Token contract addresses
+            wallet_address: Wallet address (uses account address if not provided)
+        
+        Returns:
+            Token balance per token address (keys as given)
+        """
         addr = wallet_address or (self.account.address if self.account else None)
         
         if not addr:
             raise ValueError("No address provided and no account set")
         
-        # ERC20 ABI (minimal)
-        erc20_abi = [
-            {
-                "constant": True,
-                "inputs": [{"name": "_owner", "type": "address"}],
-                "name": "balanceOf",
-                "outputs": [{"name": "balance", "type": "uint256"}],
-                "type": "function"
-            },
-            {
-                "constant": True,
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"name": "", "type": "uint8"}],
-                "type": "function"
-            }
-        ]
-        
-        token_contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(token_address),
-            abi=erc20_abi
-        )
-        
-        balance = token_contract.functions.balanceOf(addr).call()
-        decimals = token_contract.functions.decimals().call()
-        
-        return Decimal(balance) / Decimal(10 ** decimals)
+        owner = self.contracts.checksum(addr)
+        tokens = [self.contracts.get(self.network, token, "erc20") for token in token_addresses]
+        # Decimals never change, so each token's is only read once per process
+        needs_decimals = ["decimals" not in token.constants for token in tokens]
+        
+        batch = Multicall(self.w3, self.multicall3, registry=self.contracts)
+        for token, needs in zip(tokens, needs_decimals):
+            batch.add(token.call("balanceOf", owner))
+            if needs:
+                batch.add(token.call("decimals"))
+        results = iter(await batch.execute())
+        
+        balances = {}
+        for token_address, token, needs in zip(token_addresses, tokens, needs_decimals):
+            balance = next(results)
+            if needs:
+                token.constants["decimals"] = next(results)
+            balances[token_address] = Decimal(balance) / Decimal(10 ** token.constants["decimals"])
+        
+        return balances
     
     async def swap_uniswap_v3(
         self,
@@ -190,12 +398,13 @@ class DeFiService:
             min_amount_out = amount_in * Decimal(1 - slippage_tolerance / 100)
             
             # Prepare swap parameters
+            latest_block = await self.w3.eth.get_block('latest')
             swap_params = {
                 "tokenIn": token_in,
                 "tokenOut": token_out,
                 "fee": fee_tier,
                 "recipient": self.account.address,
-                "deadline": self.w3.eth.get_block('latest')['timestamp'] + 300,  # 5 min
+                "deadline": latest_block['timestamp'] + 300,  # 5 min
                 "amountIn": int(amount_in * Decimal(10**18)),
                 "amountOutMinimum": int(min_amount_out * Decimal(10**18)),
                 "sqrtPriceLimitX96": 0
@@ -213,7 +422,7 @@ class DeFiService:
                 "estimated_output": float(min_amount_out),
                 "note": "This is a simulation. Implement actual swap in production."
             }
-            
+        
         except Exception as e:
             logger.error(f"Swap failed: {str(e)}")
             raise
@@ -282,7 +491,7 @@ class DeFiService:
                 "recipient": recipient,
                 "note": "This is a simulation. Implement actual deposit in production."
             }
-            
+        
         except Exception as e:
             logger.error(f"Deposit failed: {str(e)}")
             raise
@@ -328,7 +537,7 @@ class DeFiService:
                 "interest_rate_mode": "variable" if interest_rate_mode == 2 else "stable",
                 "note": "This is a simulation. Implement actual borrow in production."
             }
-            
+        
         except Exception as e:
             logger.error(f"Borrow failed: {str(e)}")
             raise
@@ -372,12 +581,12 @@ class DeFiService:
                 "amount": float(amount),
                 "note": "This is a simulation. Implement actual repay in production."
             }
-            
+        
         except Exception as e:
             logger.error(f"Repay failed: {str(e)}")
             raise
     
-    def get_chainlink_price(self, feed_address: str) -> Tuple[Decimal, int]:
+    async def get_chainlink_price(self, feed_address: str) -> Tuple[Decimal, int]:
         """
         Get latest price from Chainlink price feed.
         
@@ -387,57 +596,103 @@ class DeFiService:
         Returns:
             Tuple of (price, decimals)
         """
-        # Chainlink AggregatorV3Interface ABI (minimal)
-        aggregator_abi = [
-            {
-                "inputs": [],
-                "name": "latestRoundData",
-                "outputs": [
-                    {"internalType": "uint80", "name": "roundId", "type": "uint80"},
-                    {"internalType": "int256", "name": "answer", "type": "int256"},
-                    {"internalType": "uint256", "name": "startedAt", "type": "uint256"},
-                    {"internalType": "uint256", "name": "updatedAt", "type": "uint256"},
-                    {"internalType": "uint80", "name": "answeredInRound", "type": "uint80"}
-                ],
-                "stateMutability": "view",
-                "type": "function"
-            },
-            {
-                "inputs": [],
-                "name": "decimals",
-                "outputs": [{"internalType": "uint8", "name": "", "type": "uint8"}],
-                "stateMutability": "view",
-                "type": "function"
-            }
-        ]
+        prices = await self.get_chainlink_prices([feed_address])
+        return prices[feed_address]
+    
+    async def get_chainlink_prices(
+        self,
+        feed_addresses: Sequence[str]
+    ) -> Dict[str, Tuple[Decimal, int]]:
+        """
+        Get latest prices from several Chainlink price feeds in one multicall.
         
-        feed_contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(feed_address),
-            abi=aggregator_abi
-        )
+        Args:
+            feed_addresses: Chainlink price feed addresses
         
-        # Get latest price
-        round_data = feed_contract.functions.latestRoundData().call()
-        price_raw = round_data[1]  # answer
+        Returns:
+            Tuple of (price, decimals) per feed address (keys as given)
+        """
+        rounds = await self.get_chainlink_rounds(feed_addresses)
+        return {feed: (data["price"], data["decimals"]) for feed, data in rounds.items()}
+    
+    async def get_chainlink_rounds(
+        self,
+        feed_addresses: Sequence[str],
+        block_identifier: Any = "latest"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the latest round of several Chainlink price feeds in one multicall.
         
-        # Get decimals
-        decimals = feed_contract.functions.decimals().call()
+        Args:
+            feed_addresses: Chainlink price feed addresses
+            block_identifier: Block to read (number, hash or tag)
         
-        # Convert to decimal
-        price = Decimal(price_raw) / Decimal(10 ** decimals)
+        Returns:
+            Per feed address (keys as given): price, decimals, answer, round_id
+            and updated_at (unix seconds)
+        """
+        feeds = [self.contracts.get(self.network, feed, "aggregator_v3") for feed in feed_addresses]
+        needs_decimals = ["decimals" not in feed.constants for feed in feeds]
+        
+        batch = Multicall(self.w3, self.multicall3, registry=self.contracts)
+        for feed, needs in zip(feeds, needs_decimals):
+            batch.add(feed.call("latestRoundData"))
+            if needs:
+                batch.add(feed.call("decimals"))
+        results = iter(await batch.execute(block_identifier))
+        
+        rounds = {}
+        for feed_address, feed, needs in zip(feed_addresses, feeds, needs_decimals):
+            round_id, answer, _, updated_at, _ = next(results)
+            if needs:
+                feed.constants["decimals"] = next(results)
+            decimals = feed.constants["decimals"]
+            rounds[feed_address] = {
+                "price": Decimal(answer) / Decimal(10 ** decimals),
+                "decimals": decimals,
+                "answer": answer,
+                "round_id": round_id,
+                "updated_at": updated_at,
+            }
         
-        return price, decimals
+        return rounds
+    
+    async def get_usd_quote(self, feed_address: str) -> PriceQuote:
+        """
+        Get a Chainlink USD quote with its round and staleness (served from the price cache).
+        
+        Args:
+            feed_address: Chainlink price feed address
+        
+        Returns:
+            PriceQuote; metadata() reports age_seconds and stale
+        """
+        quote = await self.price_cache.get(feed_address)
+        if quote.is_stale():
+            logger.warning(
+                f"Chainlink feed {feed_address} on {self.network} is stale: "
+                f"last update {quote.age():.0f}s ago, heartbeat {quote.heartbeat}s"
+            )
+        return quote
+    
+    async def get_eth_usd_quote(self) -> PriceQuote:
+        """Get the ETH/USD quote with staleness metadata (see get_usd_quote)."""
+        return await self.get_usd_quote(settings.CHAINLINK_ETH_USD)
+    
+    async def get_btc_usd_quote(self) -> PriceQuote:
+        """Get the BTC/USD quote with staleness metadata (see get_usd_quote)."""
+        return await self.get_usd_quote(settings.CHAINLINK_BTC_USD)
     
-    def get_eth_usd_price(self) -> Decimal:
-        """Get ETH/USD price from Chainlink."""
-        price, _ = self.get_chainlink_price(settings.CHAINLINK_ETH_USD)
-        return price
+    async def get_eth_usd_price(self) -> Decimal:
+        """Get ETH/USD price from Chainlink (get_eth_usd_quote has the staleness)."""
+        quote = await self.get_eth_usd_quote()
+        return quote.price
     
-    def get_btc_usd_price(self) -> Decimal:
-        """Get BTC/USD price from Chainlink."""
-        price, _ = self.get_chainlink_price(settings.CHAINLINK_BTC_USD)
-        return price
+    async def get_btc_usd_price(self) -> Decimal:
+        """Get BTC/USD price from Chainlink (get_btc_usd_quote has the staleness)."""
+        quote = await self.get_btc_usd_quote()
+        return quote.price
 
 
 # Export for convenience
-__all__ = ["DeFiService"]
+__all__ = ["DeFiService", "Multicall", "ERC20_ABI", "AGGREGATOR_V3_ABI", "MULTICALL3_ABI"]
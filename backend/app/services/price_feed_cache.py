@@ -0,0 +1,405 @@
+"""
+TradeForge AaaS - Chainlink Price Cache
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+In-memory cache of Chainlink feed rounds with heartbeat-aware refresh.
+
+A Chainlink answer only changes when the feed's deviation threshold is
+crossed or its heartbeat expires, and either way a new round lands in a new
+block. The cache keeps (answer, updatedAt, roundId) per feed, serves reads
+from memory, and a background task re-reads every tracked feed in one
+multicall only when the block number has moved or a feed is within
+`heartbeat_margin` seconds of its heartbeat. Reads never rely on that task
+alone: a stale quote (older than its heartbeat) is re-read before it is
+served, and so is a quote near its heartbeat when no background task is
+running (caches of networks the app does not poll, or of services with their
+own Web3), at most once per `poll_interval`. Every quote carries staleness
+metadata computed at read time. An optional Redis store shares quotes
+between processes so a fresh worker starts warm.
+"""
+
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+import asyncio
+import json
+import logging
+import time
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.defi_service import DeFiService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """One Chainlink round as read from the feed."""
+    
+    feed: str
+    price: Decimal
+    decimals: int
+    answer: int
+    round_id: int
+    updated_at: int
+    block_number: Optional[int]
+    fetched_at: float
+    heartbeat: int
+    
+    def age(self, now: Optional[float] = None) -> float:
+        """Seconds since the feed last updated its answer."""
+        return (time.time() if now is None else now) - self.updated_at
+    
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        """Whether the answer is older than the feed's heartbeat."""
+        return self.age(now) > self.heartbeat
+    
+    def metadata(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Staleness metadata for API responses.
+        
+        Args:
+            now: Unix time to measure against (default: now)
+        
+        Returns:
+            Dictionary with round_id, updated_at, age_seconds, heartbeat_seconds,
+            stale, block_number and cache_age_seconds
+        """
+        now = time.time() if now is None else now
+        return {
+            "round_id": self.round_id,
+            "updated_at": self.updated_at,
+            "age_seconds": round(self.age(now), 3),
+            "heartbeat_seconds": self.heartbeat,
+            "stale": self.is_stale(now),
+            "block_number": self.block_number,
+            "cache_age_seconds": round(now - self.fetched_at, 3),
+        }
+    
+    def to_json(self) -> str:
+        """Serialize for a shared store."""
+        return json.dumps({**asdict(self), "price": str(self.price)})
+    
+    @classmethod
+    def from_json(cls, text: str) -> "PriceQuote":
+        """Inverse of to_json."""
+        values = json.loads(text)
+        values["price"] = Decimal(values["price"])
+        return cls(**values)
+
+
+class RedisPriceStore:
+    """
+    Quotes shared between processes through Redis.
+    
+    Parameters:
+        url: Redis URL (default: settings.REDIS_URL)
+        prefix: Key prefix; keys are <prefix>:<network>:<feed>
+        ttl_seconds: Expiry of stored quotes
+    """
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        prefix: str = "chainlink",
+        ttl_seconds: int = 86400
+    ):
+        import redis.asyncio as redis
+        
+        self.client = redis.from_url(url or settings.REDIS_URL)
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+    
+    def _key(self, network: str, feed: str) -> str:
+        return f"{self.prefix}:{network}:{feed.lower()}"
+    
+    async def load(self, network: str, feed: str) -> Optional[PriceQuote]:
+        """Stored quote for a feed, if any."""
+        text = await self.client.get(self._key(network, feed))
+        return PriceQuote.from_json(text) if text else None
+    
+    async def save(self, network: str, quote: PriceQuote) -> None:
+        """Store a quote."""
+        await self.client.set(
+            self._key(network, quote.feed), quote.to_json(), ex=self.ttl_seconds
+        )
+
+
+class ChainlinkPriceCache:
+    """
+    Cached Chainlink rounds for one network, refreshed in the background.
+    
+    Parameters:
+        service: DeFiService the feeds are read through
+        heartbeats: Heartbeat in seconds per feed address
+        default_heartbeat: Heartbeat of feeds not in heartbeats
+        heartbeat_margin: Refresh a feed this many seconds before its heartbeat expires
+        poll_interval: Seconds between block number polls of the background task
+        store: Optional shared store (e.g. RedisPriceStore)
+        clock: Unix time source
+    """
+    
+    def __init__(
+        self,
+        service: "DeFiService",
+        heartbeats: Optional[Dict[str, int]] = None,
+        default_heartbeat: int = settings.CHAINLINK_HEARTBEAT_SECONDS,
+        heartbeat_margin: float = settings.PRICE_CACHE_HEARTBEAT_MARGIN,
+        poll_interval: float = settings.PRICE_CACHE_POLL_SECONDS,
+        store: Optional[RedisPriceStore] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.service = service
+        self.heartbeats = {feed.lower(): seconds for feed, seconds in (heartbeats or {}).items()}
+        self.default_heartbeat = default_heartbeat
+        self.heartbeat_margin = heartbeat_margin
+        self.poll_interval = poll_interval
+        self.store = store
+        self.clock = clock
+        
+        self._quotes: Dict[str, PriceQuote] = {}
+        self._block_number: Optional[int] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+    
+    @property
+    def network(self) -> str:
+        return self.service.network
+    
+    def heartbeat(self, feed: str) -> int:
+        """Heartbeat of a feed in seconds."""
+        return self.heartbeats.get(feed.lower(), self.default_heartbeat)
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background refresh task is running."""
+        return self._task is not None and not self._task.done()
+    
+    def peek(self, feed: str) -> Optional[PriceQuote]:
+        """Cached quote without any I/O (None if the feed is not cached)."""
+        return self._quotes.get(feed.lower())
+    
+    def _is_due(self, quote: PriceQuote, now: float) -> bool:
+        """Whether a quote is within heartbeat_margin of its heartbeat (or past it)."""
+        return now >= quote.updated_at + quote.heartbeat - self.heartbeat_margin
+    
+    def _is_current(self, quote: Optional[PriceQuote], now: float) -> bool:
+        """Whether a quote can be served without reading the chain."""
+        if quote is None:
+            return False
+        if now - quote.fetched_at < self.poll_interval:
+            # Checked recently; a feed the chain stopped updating is not re-read per request
+            return True
+        return not quote.is_stale(now) and (self.running or not self._is_due(quote, now))
+    
+    async def get(self, feed: str) -> PriceQuote:
+        """
+        Latest cached quote for a feed, read from the chain on first use.
+        
+        Stale quotes, and quotes near their heartbeat while no background task
+        is running, are re-read first (see get_many).
+        
+        Args:
+            feed: Chainlink price feed address
+        
+        Returns:
+            PriceQuote (check metadata() / is_stale() for staleness)
+        """
+        quote = self._quotes.get(feed.lower())
+        if self._is_current(quote, self.clock()):
+            self.hits += 1
+            return quote
+        
+        quotes = await self.get_many([feed])
+        return quotes[feed]
+    
+    async def get_many(self, feeds: Sequence[str]) -> Dict[str, PriceQuote]:
+        """
+        Cached quotes for several feeds; missing or outdated ones are read together.
+        
+        A cached quote is re-read when it is stale, or when it is within
+        heartbeat_margin of its heartbeat and no background task is running,
+        unless it was fetched less than poll_interval ago.
+        
+        Args:
+            feeds: Chainlink price feed addresses
+        
+        Returns:
+            PriceQuote per feed address (keys as given)
+        """
+        outdated = self._outdated(feeds)
+        self.hits += len(feeds) - len(outdated)
+        if outdated:
+            self.misses += len(outdated)
+            async with self._lock:
+                # Another caller may have read them while we waited
+                outdated = self._outdated(outdated)
+                if self.store is not None and outdated:
+                    now = self.clock()
+                    for feed in outdated:
+                        quote = await self.store.load(self.network, feed)
+                        if self._is_current(quote, now):
+                            self._quotes[feed.lower()] = quote
+                    outdated = self._outdated(outdated)
+                if outdated:
+                    await self._refresh(outdated, "latest")
+        
+        return {feed: self._quotes[feed.lower()] for feed in feeds}
+    
+    def _outdated(self, feeds: Sequence[str]) -> List[str]:
+        """Feeds without a current cached quote."""
+        now = self.clock()
+        return [feed for feed in feeds if not self._is_current(self._quotes.get(feed.lower()), now)]
+    
+    async def refresh(
+        self,
+        feeds: Optional[Sequence[str]] = None,
+        block_identifier: Any = "latest"
+    ) -> Dict[str, PriceQuote]:
+        """
+        Re-read feeds from the chain now.
+        
+        Args:
+            feeds: Feeds to read (default: every cached feed)
+            block_identifier: Block to read
+        
+        Returns:
+            Fresh PriceQuote per feed
+        """
+        async with self._lock:
+            return await self._refresh(
+                list(feeds) if feeds is not None else [q.feed for q in self._quotes.values()],
+                block_identifier,
+            )
+    
+    async def _refresh(self, feeds: List[str], block_identifier: Any) -> Dict[str, PriceQuote]:
+        """Read feeds in one multicall and store the quotes (caller holds the lock)."""
+        if not feeds:
+            return {}
+        
+        rounds = await self.service.get_chainlink_rounds(feeds, block_identifier)
+        fetched_at = self.clock()
+        block_number = block_identifier if isinstance(block_identifier, int) else None
+        
+        quotes = {}
+        for feed, data in rounds.items():
+            quote = PriceQuote(
+                feed=feed,
+                price=data["price"],
+                decimals=data["decimals"],
+                answer=data["answer"],
+                round_id=data["round_id"],
+                updated_at=data["updated_at"],
+                block_number=block_number,
+                fetched_at=fetched_at,
+                heartbeat=self.heartbeat(feed),
+            )
+            previous = self._quotes.get(feed.lower())
+            if previous is not None and previous.round_id != quote.round_id:
+                logger.debug(f"Chainlink feed {feed} moved to round {quote.round_id}")
+            self._quotes[feed.lower()] = quote
+            quotes[feed] = quote
+            if self.store is not None:
+                await self.store.save(self.network, quote)
+        
+        self.refreshes += 1
+        return quotes
+    
+    def due(self, now: Optional[float] = None) -> List[str]:
+        """Cached feeds within heartbeat_margin of their heartbeat (or past it)."""
+        now = self.clock() if now is None else now
+        return [quote.feed for quote in self._quotes.values() if self._is_due(quote, now)]
+    
+    async def poll(self) -> bool:
+        """
+        Refresh the cached feeds if a new block arrived or a heartbeat is near.
+        
+        Returns:
+            Whether the feeds were re-read
+        """
+        if not self._quotes:
+            return False
+        
+        block_number = await self.service.w3.eth.block_number
+        new_block = block_number != self._block_number
+        if not new_block and not self.due():
+            return False
+        
+        await self.refresh(block_identifier=block_number)
+        self._block_number = block_number
+        return True
+    
+    async def start(self) -> None:
+        """Start background refreshes on the running loop (no-op if running)."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run(), name=f"chainlink-cache-{self.network}")
+    
+    async def _run(self) -> None:
+        """Refresh loop run by the background task."""
+        while True:
+            try:
+                await self.poll()
+            except Exception as e:
+                # Keep serving the cached quotes; their metadata shows the age
+                logger.warning(f"Chainlink price refresh failed on {self.network}: {str(e)}")
+            await asyncio.sleep(self.poll_interval)
+    
+    async def stop(self) -> None:
+        """Stop background refreshes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "feeds": len(self._quotes),
+            "block_number": self._block_number,
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Process-wide caches by network
+_shared_caches: Dict[str, ChainlinkPriceCache] = {}
+
+
+def shared_price_cache(network: str = settings.DEFAULT_NETWORK) -> ChainlinkPriceCache:
+    """
+    Process-wide price cache of a network (created on first use).
+    
+    Args:
+        network: Blockchain network
+    
+    Returns:
+        ChainlinkPriceCache reading through the shared Web3 provider
+    """
+    cache = _shared_caches.get(network)
+    if cache is None:
+        # Imported here: defi_service imports this module
+        from app.services.defi_service import DeFiService
+        
+        store = RedisPriceStore() if settings.PRICE_CACHE_BACKEND == "redis" else None
+        cache = ChainlinkPriceCache(DeFiService(network), store=store)
+        _shared_caches[network] = cache
+    return cache
+
+
+# Export for convenience
+__all__ = ["ChainlinkPriceCache", "PriceQuote", "RedisPriceStore", "shared_price_cache"]
@@ -0,0 +1,294 @@
+"""
+TradeForge AaaS - Backtest Results Codec
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Compact binary encoding for backtest equity curves and trade logs.
+
+Layout:
+    magic (4 bytes) | codec (1 byte) | header length (uint32 LE) | JSON header | column blocks
+
+Every column is a typed little-endian array, byte-shuffled and compressed on
+its own, and the header records where each block lives. Readers decompress
+only the columns they ask for, so listing trades never touches the equity
+curve. zstd or lz4 is used when installed, zlib otherwise.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+import json
+import logging
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"TFR1"
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_LZ4 = 3
+
+# Trade log columns and their stored dtypes ('date' is added separately)
+TRADE_COLUMNS: Dict[str, str] = {
+    "side": "<i1",
+    "price": "<f8",
+    "shares": "<f8",
+    "capital": "<f8",
+    "pnl": "<f8",
+    "pnl_pct": "<f8",
+}
+
+SIDES = {"BUY": 1, "SELL": -1}
+
+_PREFIX = struct.Struct("<4sBI")
+
+
+def _available_codec() -> int:
+    """Best compressor installed (zstd > lz4 > zlib)."""
+    try:
+        import zstandard  # noqa: F401
+        return CODEC_ZSTD
+    except ImportError:
+        pass
+    try:
+        import lz4.frame  # noqa: F401
+        return CODEC_LZ4
+    except ImportError:
+        return CODEC_ZLIB
+
+
+def _compress(data: bytes, codec: int) -> bytes:
+    """Compress one column block."""
+    if codec == CODEC_ZSTD:
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if codec == CODEC_LZ4:
+        import lz4.frame
+        return lz4.frame.compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(data: bytes, codec: int) -> bytes:
+    """Decompress one column block."""
+    if codec == CODEC_ZSTD:
+        import zstandard
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_LZ4:
+        import lz4.frame
+        return lz4.frame.decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown results codec: {codec}")
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Group the n-th byte of every element together (compresses floats far better)."""
+    raw = np.ascontiguousarray(values).view(np.uint8)
+    return raw.reshape(-1, values.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(data: bytes, dtype: np.dtype, length: int) -> np.ndarray:
+    """Inverse of _shuffle."""
+    raw = np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, length)
+    return np.ascontiguousarray(raw.T).view(dtype).reshape(length)
+
+
+def _trade_columns(trades: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Convert a trade list to typed columns (missing fields become NaN)."""
+    return {
+        name: np.array(
+            [SIDES[trade["type"]] if name == "side" else trade.get(name, np.nan)
+             for trade in trades],
+            dtype=dtype,
+        )
+        for name, dtype in TRADE_COLUMNS.items()
+    }
+
+
+def encode_results(results: Dict[str, Any], codec: Optional[int] = None) -> bytes:
+    """
+    Encode a backtest() result's trade log and equity curve.
+
+    Args:
+        results: SMACrossoverStrategy.backtest output (uses 'trades' and 'equity_curve')
+        codec: Force a codec (default: best available)
+
+    Returns:
+        Encoded bytes for Backtest.results_blob
+    """
+    codec = codec or _available_codec()
+    trades = results["trades"]
+
+    columns: Dict[str, np.ndarray] = {
+        "equity_curve": np.asarray(results["equity_curve"], dtype="<f8"),
+    }
+    dates = pd.Index([trade["date"] for trade in trades])
+    meta: Dict[str, Any] = {"date_kind": "integer", "tz": None}
+    if isinstance(dates, pd.DatetimeIndex):
+        meta = {"date_kind": "datetime", "tz": str(dates.tz) if dates.tz else None}
+        columns["trades.date"] = dates.as_unit("ns").asi8.astype("<i8")
+    elif len(dates) == 0 or pd.api.types.is_integer_dtype(dates):
+        columns["trades.date"] = np.asarray(dates, dtype="<i8")
+    else:
+        # Any other index is stored as JSON text (non-JSON values via str)
+        meta = {"date_kind": "object", "tz": None}
+        text = json.dumps(dates.tolist(), separators=(",", ":"), default=str)
+        columns["trades.date"] = np.frombuffer(text.encode(), dtype=np.uint8)
+    for name, values in _trade_columns(trades).items():
+        columns[f"trades.{name}"] = values
+
+    header: Dict[str, Any] = {"meta": meta, "columns": {}}
+    blocks = []
+    offset = 0
+    for name, values in columns.items():
+        block = _compress(_shuffle(values), codec)
+        header["columns"][name] = {
+            "dtype": values.dtype.str,
+            "length": len(values),
+            "offset": offset,
+            "size": len(block),
+        }
+        blocks.append(block)
+        offset += len(block)
+
+    header_bytes = json.dumps(header, separators=(",", ":")).encode()
+    return _PREFIX.pack(MAGIC, codec, len(header_bytes)) + header_bytes + b"".join(blocks)
+
+
+class ResultsReader:
+    """
+    Lazy reader over encoded results; columns are decoded on first access.
+
+    Parameters:
+        blob: Bytes produced by encode_results
+    """
+
+    def __init__(self, blob: Union[bytes, memoryview]):
+        """Parse the header only."""
+        self._blob = memoryview(blob)
+        magic, self.codec, header_length = _PREFIX.unpack_from(self._blob, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an encoded backtest result")
+        header_end = _PREFIX.size + header_length
+        header = json.loads(bytes(self._blob[_PREFIX.size:header_end]))
+        self.meta: Dict[str, Any] = header["meta"]
+        self.columns: Dict[str, Dict[str, Any]] = header["columns"]
+        self._data_start = header_end
+        self._decoded: Dict[str, np.ndarray] = {}
+
+    @property
+    def trade_count(self) -> int:
+        """Number of trades (no decompression)."""
+        return self.columns["trades.side"]["length"]
+
+    @property
+    def bar_count(self) -> int:
+        """Equity curve length (no decompression)."""
+        return self.columns["equity_curve"]["length"]
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Decode one column.
+
+        Args:
+            name: Column name (e.g. 'equity_curve', 'trades.pnl')
+
+        Returns:
+            Read-only typed array
+        """
+        if name not in self._decoded:
+            info = self.columns[name]
+            start = self._data_start + info["offset"]
+            data = _decompress(bytes(self._blob[start:start + info["size"]]), self.codec)
+            values = _unshuffle(data, np.dtype(info["dtype"]), info["length"])
+            values.flags.writeable = False
+            self._decoded[name] = values
+        return self._decoded[name]
+
+    def equity_curve(self) -> np.ndarray:
+        """Equity per bar."""
+        return self.column("equity_curve")
+
+    def trades_frame(self) -> pd.DataFrame:
+        """
+        Decode the trade log (the equity curve is left untouched).
+
+        Returns:
+            DataFrame with date, type, price, shares, capital, pnl, pnl_pct
+        """
+        dates: Any = self.column("trades.date")
+        if self.meta["date_kind"] == "object":
+            dates = json.loads(dates.tobytes())
+        elif self.meta["date_kind"] == "datetime":
+            dates = pd.DatetimeIndex(dates.view("datetime64[ns]"))
+            if self.meta["tz"]:
+                dates = dates.tz_localize("UTC").tz_convert(self.meta["tz"])
+
+        frame = pd.DataFrame({"date": dates})
+        frame["type"] = np.where(self.column("trades.side") > 0, "BUY", "SELL")
+        for name in list(TRADE_COLUMNS)[1:]:
+            frame[name] = self.column(f"trades.{name}")
+        return frame
+
+    def trades(self) -> List[Dict[str, Any]]:
+        """Trade log as the list of dicts backtest() returns."""
+        records = self.trades_frame().to_dict("records")
+        for record in records:
+            if record["type"] == "BUY":
+                del record["pnl"], record["pnl_pct"]
+        return records
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Decode everything into {'trades': [...], 'equity_curve': [...]}."""
+        return {"trades": self.trades(), "equity_curve": self.equity_curve().tolist()}
+
+
+def decode_results(blob: Union[bytes, memoryview]) -> Dict[str, Any]:
+    """
+    Decode a full results blob.
+
+    Args:
+        blob: Bytes produced by encode_results
+
+    Returns:
+        Dictionary with 'trades' and 'equity_curve'
+    """
+    return ResultsReader(blob).to_dict()
+
+
+def load_backtest_results(backtest: Any) -> Optional[ResultsReader]:
+    """
+    Open a Backtest row's stored results, including rows saved as JSON before
+    results_blob existed.
+
+    Args:
+        backtest: Backtest model instance
+
+    Returns:
+        ResultsReader, or None if the row has no detailed results
+    """
+    if backtest.results_blob:
+        return ResultsReader(backtest.results_blob)
+    if backtest.results_json:
+        payload = json.loads(backtest.results_json)
+        for trade in payload["trades"]:
+            # json.dumps(default=str) turned timestamps into strings
+            if isinstance(trade["date"], str):
+                trade["date"] = pd.Timestamp(trade["date"])
+        return ResultsReader(encode_results(payload, codec=CODEC_ZLIB))
+    return None
+
+
+# Export for convenience
+__all__ = [
+    "encode_results",
+    "decode_results",
+    "load_backtest_results",
+    "ResultsReader",
+    "TRADE_COLUMNS",
+]
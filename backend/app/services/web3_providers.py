@@ -0,0 +1,236 @@
+"""
+TradeForge AaaS - Web3 Provider Manager
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Long-lived AsyncWeb3 connections shared by every DeFiService.
+
+Each network gets one AsyncWeb3 instance whose provider sends every request
+through one aiohttp session with a keep-alive connection pool, so concurrent
+requests overlap their RPC latency on the event loop. Instances are created
+on first use and reused, so services start without a connect handshake; a
+background task checks each network's RPC (eth_blockNumber) on an interval
+and services refuse networks whose last check failed.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+
+import aiohttp
+from web3 import AsyncWeb3
+from web3.providers import AsyncHTTPProvider
+from web3.providers.async_base import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ProviderHealth:
+    """Outcome of the last health check of one network's RPC."""
+    
+    healthy: bool
+    checked_at: float
+    latency_ms: float
+    block_number: Optional[int] = None
+    error: Optional[str] = None
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that posts through its own pooled aiohttp session.
+    
+    The session is created on the first request in a running event loop
+    (and again if the loop it belongs to has changed).
+    
+    Parameters:
+        endpoint_uri: RPC URL
+        pool_size: Maximum open connections
+        timeout: Request timeout in seconds
+    """
+    
+    def __init__(self, endpoint_uri: str, pool_size: int, timeout: float):
+        super().__init__(
+            endpoint_uri, request_kwargs={"timeout": aiohttp.ClientTimeout(total=timeout)}
+        )
+        self.pool_size = pool_size
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled session of the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60)
+            )
+            self._loop = loop
+        return self._session
+    
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+        async with self.session().post(
+            self.endpoint_uri, data=request_data, **self.get_request_kwargs()
+        ) as response:
+            response.raise_for_status()
+            raw_response = await response.read()
+        return self.decode_rpc_response(raw_response)
+    
+    async def disconnect(self) -> None:
+        """Close the session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+class Web3ProviderManager:
+    """
+    One pooled AsyncWeb3 instance per network plus background health checks.
+    
+    Parameters:
+        rpc_urls: RPC URL per network (default: ethereum/polygon/arbitrum from settings)
+        pool_size: Keep-alive connections per network
+        timeout: HTTP request timeout in seconds
+        health_check_interval: Seconds between background health checks
+        provider_factory: Builds the provider for an RPC URL (default: pooled AsyncHTTPProvider)
+    """
+    
+    def __init__(
+        self,
+        rpc_urls: Optional[Dict[str, str]] = None,
+        pool_size: int = settings.WEB3_POOL_SIZE,
+        timeout: float = settings.WEB3_REQUEST_TIMEOUT,
+        health_check_interval: float = settings.WEB3_HEALTH_CHECK_INTERVAL,
+        provider_factory: Optional[Callable[[str], AsyncBaseProvider]] = None
+    ):
+        self.rpc_urls = rpc_urls or {
+            "ethereum": settings.ETH_RPC_URL,
+            "polygon": settings.POLYGON_RPC_URL,
+            "arbitrum": settings.ARBITRUM_RPC_URL,
+        }
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.provider_factory = provider_factory or self._http_provider
+        
+        self._instances: Dict[str, AsyncWeb3] = {}
+        self._health: Dict[str, ProviderHealth] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def rpc_url(self, network: str) -> str:
+        """RPC URL of a network (unknown networks use the Ethereum URL)."""
+        return self.rpc_urls.get(network, settings.ETH_RPC_URL)
+    
+    def _http_provider(self, rpc_url: str) -> PooledAsyncHTTPProvider:
+        """Provider with a keep-alive connection pool."""
+        return PooledAsyncHTTPProvider(rpc_url, self.pool_size, self.timeout)
+    
+    def get(self, network: str) -> AsyncWeb3:
+        """
+        Shared AsyncWeb3 instance for a network, created on first use.
+        
+        Args:
+            network: Blockchain network (ethereum, polygon, arbitrum)
+        
+        Returns:
+            AsyncWeb3 instance (no connection is made here)
+        """
+        w3 = self._instances.get(network)
+        if w3 is None:
+            w3 = AsyncWeb3(self.provider_factory(self.rpc_url(network)))
+            self._instances[network] = w3
+            logger.info(f"Web3 provider created for {network}")
+        return w3
+    
+    def health(self, network: str) -> Optional[ProviderHealth]:
+        """Result of the network's last health check (None if never checked)."""
+        return self._health.get(network)
+    
+    async def check(self, network: Optional[str] = None) -> Dict[str, ProviderHealth]:
+        """
+        Check RPC health now (networks are checked concurrently).
+        
+        Args:
+            network: Network to check (default: every network in use)
+        
+        Returns:
+            Health per checked network
+        """
+        networks = [network] if network else list(self._instances)
+        results = await asyncio.gather(*(self._check(name) for name in networks))
+        return dict(zip(networks, results))
+    
+    async def _check(self, network: str) -> ProviderHealth:
+        """Check one network and record the result."""
+        w3 = self.get(network)
+        started = time.perf_counter()
+        try:
+            block_number = await asyncio.wait_for(w3.eth.block_number, self.timeout)
+            health = ProviderHealth(
+                healthy=True,
+                checked_at=time.time(),
+                latency_ms=(time.perf_counter() - started) * 1000,
+                block_number=block_number,
+            )
+        except Exception as e:
+            health = ProviderHealth(
+                healthy=False,
+                checked_at=time.time(),
+                latency_ms=(time.perf_counter() - started) * 1000,
+                error=str(e) or type(e).__name__,
+            )
+            logger.warning(f"{network} RPC health check failed: {health.error}")
+        
+        previous = self._health.get(network)
+        if previous is not None and previous.healthy != health.healthy:
+            logger.info(f"{network} RPC is {'healthy' if health.healthy else 'unhealthy'}")
+        self._health[network] = health
+        return health
+    
+    async def start(self) -> None:
+        """Start background health checks on the running loop (no-op if running)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._run_checks(), name="web3-health-check")
+    
+    async def _run_checks(self) -> None:
+        """Health check loop run by the background task."""
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_check_interval)
+    
+    async def stop(self) -> None:
+        """Stop background health checks."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def close(self) -> None:
+        """Stop health checks, close the providers' sessions and drop all instances."""
+        await self.stop()
+        for w3 in self._instances.values():
+            disconnect = getattr(w3.provider, "disconnect", None)
+            if disconnect is not None:
+                await disconnect()
+        self._instances.clear()
+        self._health.clear()
+
+
+# Manager shared by every DeFiService in the process
+web3_providers = Web3ProviderManager()
+
+
+# Export for convenience
+__all__ = ["Web3ProviderManager", "PooledAsyncHTTPProvider", "ProviderHealth", "web3_providers"]
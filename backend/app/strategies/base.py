@@ -0,0 +1,798 @@
+"""
+TradeForge AaaS - Strategy Base Class
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Shared backtest engines for long-only, event-driven strategies.
+
+A strategy only has to describe its entries and exits: calculate_indicators
+adds a 'position' column holding 2 on bars that signal a BUY and -2 on bars
+that signal a SELL (the diff of a +1/-1 regime column produces exactly
+that). Position sizing, intrabar stop loss / take profit / trailing stop
+exits, both backtest engines and the performance metrics live here.
+
+Strategies whose indicators only read close prices also implement
+indicator_arrays, which works on the close array alone and returns compact
+float32 indicator / int8 event arrays (optionally into caller buffers). The
+engines, signal extraction and get_current_signal use it through
+signal_events, so they never copy the OHLCV frame.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Any, Optional, List, Sequence, Tuple, Union
+import logging
+
+from app.strategies.indicators import ArrayLike, IndicatorCache, IndicatorSeries
+
+logger = logging.getLogger(__name__)
+
+# Available backtest execution engines
+BACKTEST_MODES = ("vectorized", "loop")
+
+# Relative slack of the affordability check, so an entry whose cost only
+# exceeds capital by rounding (e.g. 100% position size, zero commission) fills
+AFFORDABILITY_TOLERANCE = 1e-9
+
+
+class BaseStrategy:
+    """
+    Base class for strategies run by the backtest engines.
+    
+    Parameters:
+        stop_loss_pct: Stop loss percentage (default: 2.0)
+        take_profit_pct: Take profit percentage (default: 5.0)
+        position_size_pct: Position size as percent of capital (default: 100.0)
+        trailing_stop_pct: Trailing stop percentage below the highest high
+            since entry (default: None)
+    
+    Stop loss, take profit and trailing stop are disabled with None or 0.
+    
+    Backtest fill policy for these exits:
+    - Entries fill at the signal bar's close, so exits are checked from the next bar
+    - A bar that opens through a level exits at the open (gap)
+    - Otherwise the exit fills at the level touched by the bar's low or high
+    - If the stop and the take profit are both inside one bar, the stop wins
+    - The trailing stop follows the highest high of the bars before the current one
+    - Intrabar exits happen before the close, so a BUY signal on the same bar re-enters
+    """
+    
+    # Strategy.strategy_type value this class is registered under
+    strategy_type: str = ""
+    
+    def __init__(
+        self,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
+        position_size_pct: float = 100.0,
+        trailing_stop_pct: Optional[float] = None,
+    ):
+        """Initialize risk parameters."""
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.position_size_pct = position_size_pct
+        self.trailing_stop_pct = trailing_stop_pct
+    
+    @property
+    def warmup_bars(self) -> int:
+        """First bar the backtest engines trade on (indicator warm-up)."""
+        raise NotImplementedError
+    
+    @property
+    def uses_stops(self) -> bool:
+        """Whether any intrabar exit (stop loss, take profit, trailing stop) is enabled."""
+        return bool(self.stop_loss_pct or self.take_profit_pct or self.trailing_stop_pct)
+    
+    def can_afford_entries(self, commission: float) -> bool:
+        """
+        Whether an entry of position_size_pct of capital plus commission fits in capital.
+        
+        The rule only depends on the position size fraction, so both engines
+        apply it identically to every entry whatever the capital level.
+        
+        Args:
+            commission: Commission per trade
+        
+        Returns:
+            True when entries fill (within AFFORDABILITY_TOLERANCE)
+        """
+        return self.position_size_pct / 100 * (1 + commission) <= 1 + AFFORDABILITY_TOLERANCE
+    
+    def exit_levels(self, entry_price: Any, peak: Any) -> Tuple[Any, Any]:
+        """
+        Stop and take-profit prices of an open position.
+        
+        Works on scalars and arrays alike, so both backtest engines share
+        the exact same arithmetic.
+        
+        Args:
+            entry_price: Position entry price
+            peak: Highest price seen since entry (entry price included)
+        
+        Returns:
+            Tuple of (stop price, take-profit price); -inf / inf when disabled
+        """
+        stop = entry_price * (1 - self.stop_loss_pct / 100) if self.stop_loss_pct else -np.inf
+        if self.trailing_stop_pct:
+            stop = np.maximum(stop, peak * (1 - self.trailing_stop_pct / 100))
+        take = entry_price * (1 + self.take_profit_pct / 100) if self.take_profit_pct else np.inf
+        return stop, take
+    
+    def calculate_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate technical indicators and entry/exit events.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
+        
+        Returns:
+            DataFrame with added indicator columns and the 'position' column
+        """
+        raise NotImplementedError
+    
+    def indicator_arrays(
+        self,
+        close: Union[ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate the calculate_indicators columns from close prices alone.
+        
+        Optional for strategies; without it signal_events falls back to
+        calculate_indicators.
+        
+        Args:
+            close: Close prices, or an IndicatorSeries already bound to a cache
+            indicators: Shared indicator cache (default: one private to this call)
+            out: Buffers to write columns into, keyed by column name
+            columns: Columns to return (default: all)
+        
+        Returns:
+            Column name -> array; indicators as float32, 'signal' and
+            'position' as int8 (see pack_arrays)
+        """
+        raise NotImplementedError
+    
+    def signal_events(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Entry/exit events of df as a compact array.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
+            out: int8 buffer of len(df) to write the events into
+        
+        Returns:
+            int8 array with 2 on BUY bars, -2 on SELL bars and 0 elsewhere
+        """
+        buffers = None if out is None else {'position': out}
+        if type(self).indicator_arrays is not BaseStrategy.indicator_arrays:
+            arrays = self.indicator_arrays(df['close'], indicators, buffers, ('position',))
+            return arrays['position']
+        
+        position = self.calculate_indicators(df, indicators)['position'].to_numpy(dtype=np.float64)
+        events = {'position': np.nan_to_num(position).astype(np.int8)}
+        return self.pack_arrays(events, buffers)['position']
+    
+    @staticmethod
+    def close_series(
+        data: Union[pd.DataFrame, ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache]
+    ) -> IndicatorSeries:
+        """
+        Bind close prices to an indicator cache.
+        
+        Args:
+            data: DataFrame with OHLCV data, close prices, or an IndicatorSeries
+                (returned unchanged, so one call chain keeps one binding)
+            indicators: Shared cache, or None for a throwaway one (skips hashing)
+        
+        Returns:
+            IndicatorSeries over the close prices
+        """
+        if isinstance(data, IndicatorSeries):
+            return data
+        close = data['close'] if isinstance(data, pd.DataFrame) else data
+        if indicators is None:
+            return IndicatorCache().series(close, key="close")
+        return indicators.series(close)
+    
+    @staticmethod
+    def pack_arrays(
+        arrays: Dict[str, np.ndarray],
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Select and downcast indicator_arrays output.
+        
+        Float arrays become float32 copies (cached float64 arrays are never
+        handed out), integer and boolean arrays become int8. A buffer in out
+        receives its column instead, cast to the buffer's dtype.
+        
+        Args:
+            arrays: Column name -> full precision array
+            out: Buffers keyed by column name
+            columns: Columns to return (default: all)
+        
+        Returns:
+            Column name -> compact array (or the caller's buffer)
+        """
+        packed = {}
+        for name in (arrays if columns is None else columns):
+            value = arrays[name]
+            buffer = out.get(name) if out else None
+            if buffer is not None:
+                if buffer.shape != value.shape:
+                    raise ValueError(
+                        f"Buffer for '{name}' has shape {buffer.shape}, expected {value.shape}"
+                    )
+                np.copyto(buffer, value, casting='same_kind')
+                packed[name] = buffer
+            elif value.dtype.kind == 'f':
+                packed[name] = value.astype(np.float32)
+            else:
+                packed[name] = value.astype(np.int8, copy=False)
+        return packed
+    
+    @staticmethod
+    def regime(up: np.ndarray, down: np.ndarray) -> np.ndarray:
+        """
+        Build a 'signal' column from bullish and bearish conditions.
+        
+        Args:
+            up: Bars where the bullish condition holds
+            down: Bars where the bearish condition holds
+        
+        Returns:
+            int8 array: 1 where up, -1 where down, 0 elsewhere
+        """
+        up = np.ascontiguousarray(up, dtype=bool).view(np.int8)
+        down = np.ascontiguousarray(down, dtype=bool).view(np.int8)
+        return up - down
+    
+    @staticmethod
+    def crossings(signal: np.ndarray) -> np.ndarray:
+        """
+        Build a 'position' column from a 'signal' column (its diff, 0 on the first bar).
+        
+        Args:
+            signal: int8 regime from regime()
+        
+        Returns:
+            int8 array: 2 where the signal flips up, -2 where it flips down
+        """
+        position = np.zeros(len(signal), dtype=np.int8)
+        np.subtract(signal[1:], signal[:-1], out=position[1:])
+        return position
+    
+    @staticmethod
+    def events(enter: np.ndarray, exit_: np.ndarray) -> np.ndarray:
+        """
+        Build a 'position' column from entry and exit conditions.
+        
+        Args:
+            enter: Bars where the entry condition holds
+            exit_: Bars where the exit condition holds
+        
+        Returns:
+            int8 array: 2 where the entry condition turns on, -2 where the exit
+            condition turns on, 0 elsewhere
+        """
+        enter = np.asarray(enter, dtype=bool)
+        exit_ = np.asarray(exit_, dtype=bool)
+        position = np.zeros(len(enter), dtype=np.int8)
+        position[1:][enter[1:] & ~enter[:-1]] = 2
+        position[1:][exit_[1:] & ~exit_[:-1]] = -2
+        return position
+    
+    def backtest(
+        self,
+        df: pd.DataFrame,
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        mode: str = "vectorized",
+        indicators: Optional[IndicatorCache] = None,
+        precision: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Backtest the strategy.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            initial_capital: Starting capital
+            commission: Commission per trade (0.001 = 0.1%)
+            mode: Execution engine, 'vectorized' (array kernel) or 'loop' (row-by-row reference)
+            indicators: Indicator cache shared with other strategies on the same data
+            precision: Indicator precision, 'float64' or 'float32' (default: the
+                cache's, float64 without one). Prices, fills and capital
+                accounting always stay float64.
+        
+        Returns:
+            Dictionary with backtest results
+        """
+        if mode not in BACKTEST_MODES:
+            raise ValueError(f"Unknown backtest mode '{mode}'. Use one of {BACKTEST_MODES}")
+        if precision is not None:
+            if indicators is None:
+                indicators = IndicatorCache(precision=precision)
+            elif indicators.precision != precision:
+                raise ValueError(
+                    f"Indicator cache precision '{indicators.precision}' "
+                    f"does not match precision '{precision}'"
+                )
+        
+        events = self.signal_events(df, indicators)
+        
+        if mode == "loop":
+            trades, equity_curve, final_capital = self._backtest_loop(
+                df, events, initial_capital, commission
+            )
+        else:
+            trades, equity_curve, final_capital = self._backtest_vectorized(
+                df, events, initial_capital, commission
+            )
+        
+        return self._summarize_backtest(trades, equity_curve, initial_capital, final_capital)
+    
+    def _backtest_loop(
+        self,
+        df: pd.DataFrame,
+        events: np.ndarray,
+        initial_capital: float,
+        commission: float
+    ) -> Tuple[List[Dict[str, Any]], List[float], float]:
+        """
+        Row-by-row reference engine.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            events: signal_events output for df
+            initial_capital: Starting capital
+            commission: Commission per trade
+        
+        Returns:
+            Tuple of (trades, equity_curve, final_capital)
+        """
+        # Initialize portfolio
+        capital = initial_capital
+        position = 0
+        entry_price = 0
+        peak = 0
+        trades = []
+        equity_curve = [initial_capital]
+        uses_stops = self.uses_stops
+        affordable = self.can_afford_entries(commission)
+        
+        for i in range(self.warmup_bars, len(df)):
+            row = df.iloc[i]
+            exit_price = None
+            
+            # Check intrabar exits (positions opened on an earlier bar's close)
+            if position > 0 and uses_stops:
+                bar_open = row.get('open', row['close'])
+                high = row.get('high', row['close'])
+                low = row.get('low', row['close'])
+                stop, take = self.exit_levels(entry_price, peak)
+                
+                if bar_open <= stop or bar_open >= take:
+                    exit_price = bar_open
+                elif low <= stop:
+                    exit_price = stop
+                elif high >= take:
+                    exit_price = take
+                else:
+                    peak = max(peak, high)
+            
+            # Check for SELL signal
+            if exit_price is None and events[i] == -2 and position > 0:
+                exit_price = row['close']
+            
+            if exit_price is not None:
+                proceeds = position * exit_price * (1 - commission)
+                capital += proceeds
+                
+                pnl = proceeds - (position * entry_price)
+                pnl_pct = (pnl / (position * entry_price)) * 100
+                
+                trades.append({
+                    'date': row.name,
+                    'type': 'SELL',
+                    'price': exit_price,
+                    'shares': position,
+                    'capital': capital,
+                    'pnl': pnl,
+                    'pnl_pct': pnl_pct,
+                })
+                
+                position = 0
+                entry_price = 0
+            
+            # Check for BUY signal
+            if events[i] == 2 and position == 0:
+                # Calculate position size
+                position_value = capital * (self.position_size_pct / 100)
+                shares = position_value / row['close']
+                cost = shares * row['close'] * (1 + commission)
+                
+                if affordable:
+                    position = shares
+                    entry_price = row['close']
+                    peak = entry_price
+                    # Cash left over by rounding alone (full-size entries) is zero
+                    if capital - cost <= capital * AFFORDABILITY_TOLERANCE:
+                        capital = 0.0
+                    else:
+                        capital -= cost
+                    
+                    trades.append({
+                        'date': row.name,
+                        'type': 'BUY',
+                        'price': row['close'],
+                        'shares': shares,
+                        'capital': capital,
+                    })
+            
+            # Update equity curve
+            portfolio_value = capital + (position * row['close'] if position > 0 else 0)
+            equity_curve.append(portfolio_value)
+        
+        final_capital = capital + (position * df.iloc[-1]['close'] if position > 0 else 0)
+        
+        return trades, equity_curve, final_capital
+    
+    def _backtest_vectorized(
+        self,
+        df: pd.DataFrame,
+        events: np.ndarray,
+        initial_capital: float,
+        commission: float
+    ) -> Tuple[List[Dict[str, Any]], List[float], float]:
+        """
+        Array-based engine, equivalent to _backtest_loop.
+        
+        Crossovers are paired with searchsorted, intrabar exits are found with
+        _first_stop_exits, capital is compounded per trade with cumprod and the
+        equity curve is filled from the resulting cash/share steps, so no
+        Python work is done per bar.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            events: signal_events output for df
+            initial_capital: Starting capital
+            commission: Commission per trade
+        
+        Returns:
+            Tuple of (trades, equity_curve, final_capital)
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        cross = events
+        start = self.warmup_bars
+        n = len(close)
+        
+        if n <= start:
+            return [], [initial_capital], initial_capital
+        
+        if self.uses_stops:
+            entries, exits, exit_prices = self._pair_with_stops(df, cross, start)
+        else:
+            entries, exits = self._pair_crossovers(cross, start)
+            exit_prices = close[exits]
+        
+        # Same rule as the loop: it does not depend on the capital level
+        fraction = self.position_size_pct / 100
+        if not self.can_afford_entries(commission):
+            entries = entries[:0]
+            exits = exits[:0]
+            exit_prices = exit_prices[:0]
+        
+        entry_prices = close[entries]
+        n_closed = len(exits)
+        
+        # Capital available before each entry, compounded over closed trades
+        growth = (1 - fraction * (1 + commission)) + (
+            fraction * (1 - commission) * exit_prices / entry_prices[:n_closed]
+        )
+        capital_before = initial_capital * np.concatenate(([1.0], np.cumprod(growth)))
+        capital_before = capital_before[:len(entries)]
+        
+        shares = capital_before * fraction / entry_prices
+        cash_after_buy = capital_before - shares * entry_prices * (1 + commission)
+        cash_after_buy[cash_after_buy <= capital_before * AFFORDABILITY_TOLERANCE] = 0.0
+        proceeds = shares[:n_closed] * exit_prices * (1 - commission)
+        cash_after_sell = cash_after_buy[:n_closed] + proceeds
+        cost_basis = shares[:n_closed] * entry_prices[:n_closed]
+        pnl = proceeds - cost_basis
+        pnl_pct = (pnl / cost_basis) * 100
+        
+        # Cash/share state steps: initial, entry k, exit k, entry k+1, ...
+        # (an intrabar exit may share its bar with the next entry; the later step wins)
+        n_events = 1 + len(entries) + n_closed
+        event_bars = np.empty(n_events, dtype=np.int64)
+        event_cash = np.empty(n_events, dtype=np.float64)
+        event_shares = np.zeros(n_events, dtype=np.float64)
+        event_bars[0] = start - 1
+        event_cash[0] = initial_capital
+        event_bars[1::2] = entries
+        event_cash[1::2] = cash_after_buy
+        event_shares[1::2] = shares
+        event_bars[2::2] = exits
+        event_cash[2::2] = cash_after_sell
+        
+        bars = np.arange(start, n)
+        step = np.searchsorted(event_bars, bars, side='right') - 1
+        cash = event_cash[step]
+        held = event_shares[step]
+        equity = cash + held * close[start:]
+        
+        equity_curve = [initial_capital] + equity.tolist()
+        final_capital = equity[-1]
+        
+        index = df.index
+        trades = []
+        for k in range(len(entries)):
+            trades.append({
+                'date': index[entries[k]],
+                'type': 'BUY',
+                'price': entry_prices[k],
+                'shares': shares[k],
+                'capital': cash_after_buy[k],
+            })
+            if k < n_closed:
+                trades.append({
+                    'date': index[exits[k]],
+                    'type': 'SELL',
+                    'price': exit_prices[k],
+                    'shares': shares[k],
+                    'capital': cash_after_sell[k],
+                    'pnl': pnl[k],
+                    'pnl_pct': pnl_pct[k],
+                })
+        
+        return trades, equity_curve, final_capital
+    
+    @staticmethod
+    def _pair_crossovers(cross: np.ndarray, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Pair BUY events (golden crosses) with the SELL event (death cross) that closes them.
+        
+        A golden cross opens a position only when a death cross occurred since
+        the previous golden cross (or it is the first one); every entry exits
+        on the first death cross after it.
+        
+        Args:
+            cross: signal_events output
+            start: First bar the engine trades on
+        
+        Returns:
+            Tuple of (entry bar indices, exit bar indices)
+        """
+        golden = np.flatnonzero(cross[start:] == 2) + start
+        death = np.flatnonzero(cross[start:] == -2) + start
+        
+        deaths_before = np.searchsorted(death, golden, side='right')
+        is_entry = np.empty(len(golden), dtype=bool)
+        is_entry[:1] = True
+        is_entry[1:] = deaths_before[1:] != deaths_before[:-1]
+        entries = golden[is_entry]
+        
+        exit_slot = deaths_before[is_entry]
+        exits = death[exit_slot[exit_slot < len(death)]]
+        
+        return entries, exits
+    
+    def _pair_with_stops(
+        self,
+        df: pd.DataFrame,
+        cross: np.ndarray,
+        start: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pair golden crosses with their exits when intrabar exits are enabled.
+        
+        Every golden cross is treated as a candidate entry whose position
+        would close at the first intrabar exit or, failing that, the next death
+        cross. Taken entries are then chained: after an exit, the next entry is
+        the first golden cross on or after the exit bar. The chaining step runs
+        once per trade, never per bar.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            cross: signal_events output
+            start: First bar the engine trades on
+        
+        Returns:
+            Tuple of (entry bar indices, exit bar indices, exit fill prices)
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        n = len(close)
+        golden = np.flatnonzero(cross[start:] == 2) + start
+        death = np.flatnonzero(cross[start:] == -2) + start
+        
+        # Death cross that would close each candidate (n when none follows)
+        next_death = np.searchsorted(death, golden, side='right')
+        signal_exit = np.append(death, n)[next_death]
+        
+        bar_open, high, low = (
+            df[column].to_numpy(dtype=np.float64) if column in df.columns else close
+            for column in ('open', 'high', 'low')
+        )
+        stop_bars, stop_prices = self._first_stop_exits(
+            bar_open, high, low, golden, close[golden], np.minimum(signal_exit, n - 1)
+        )
+        has_stop = stop_bars >= 0
+        exit_bars = np.where(has_stop, stop_bars, signal_exit)
+        exit_prices = np.where(has_stop, stop_prices, close[np.minimum(signal_exit, n - 1)])
+        
+        taken = []
+        candidate = 0
+        while candidate < len(golden):
+            taken.append(candidate)
+            if exit_bars[candidate] >= n:
+                break
+            candidate = int(np.searchsorted(golden, exit_bars[candidate], side='left'))
+        
+        taken = np.array(taken, dtype=np.int64)
+        closed = taken[exit_bars[taken] < n]
+        
+        return golden[taken], exit_bars[closed], exit_prices[closed]
+    
+    def _first_stop_exits(
+        self,
+        bar_open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        entries: np.ndarray,
+        entry_prices: np.ndarray,
+        last_bars: np.ndarray,
+        window: int = 64
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the first intrabar exit after each entry.
+        
+        All pending entries are scanned together as a 2-D block of the bars
+        following them; entries without a breach inside the block are retried
+        with a four times wider block, so total work stays proportional to the
+        bars actually searched.
+        
+        Args:
+            bar_open: Open prices
+            high: High prices
+            low: Low prices
+            entries: Entry bar indices (positions open at these bars' close)
+            entry_prices: Entry fill prices
+            last_bars: Last bar to search per entry (inclusive)
+            window: Initial block width in bars
+        
+        Returns:
+            Tuple of (exit bar, fill price) per entry; bar is -1 where no exit was hit
+        """
+        n = len(bar_open)
+        exit_bars = np.full(len(entries), -1, dtype=np.int64)
+        exit_prices = np.full(len(entries), np.nan)
+        pending = np.flatnonzero(last_bars > entries)
+        
+        while len(pending):
+            bars = entries[pending, None] + 1 + np.arange(window)
+            in_range = bars <= last_bars[pending, None]
+            np.minimum(bars, n - 1, out=bars)
+            opens, highs, lows = bar_open[bars], high[bars], low[bars]
+            
+            # Peak before each bar: the entry price, then the highs seen since
+            entry = entry_prices[pending, None]
+            peak = np.empty_like(highs)
+            peak[:, :1] = entry
+            np.maximum(highs[:, :-1], entry, out=peak[:, 1:])
+            np.maximum.accumulate(peak, axis=1, out=peak)
+            stop, take = self.exit_levels(entry, peak)
+            stop = np.broadcast_to(stop, bars.shape)
+            take = np.broadcast_to(take, bars.shape)
+            
+            hit = in_range & ((lows <= stop) | (highs >= take))
+            found = hit.any(axis=1)
+            rows = np.flatnonzero(found)
+            cols = hit[rows].argmax(axis=1)
+            
+            o = opens[rows, cols]
+            s = stop[rows, cols]
+            t = take[rows, cols]
+            gap = (o <= s) | (o >= t)
+            exit_bars[pending[rows]] = bars[rows, cols]
+            exit_prices[pending[rows]] = np.where(
+                gap, o, np.where(lows[rows, cols] <= s, s, t)
+            )
+            
+            pending = pending[~found & in_range[:, -1]]
+            window *= 4
+        
+        return exit_bars, exit_prices
+    
+    def _summarize_backtest(
+        self,
+        trades: List[Dict[str, Any]],
+        equity_curve: List[float],
+        initial_capital: float,
+        final_capital: float
+    ) -> Dict[str, Any]:
+        """
+        Compute performance metrics shared by every backtest engine.
+        
+        Args:
+            trades: Executed trades
+            equity_curve: Portfolio value per bar
+            initial_capital: Starting capital
+            final_capital: Ending portfolio value
+        
+        Returns:
+            Dictionary with backtest results
+        """
+        total_return = ((final_capital - initial_capital) / initial_capital) * 100
+        
+        # Calculate winning trades
+        closed_trades = [t for t in trades if 'pnl' in t]
+        winning_trades = [t for t in closed_trades if t['pnl'] > 0]
+        win_rate = (len(winning_trades) / len(closed_trades)) * 100 if closed_trades else 0
+        
+        # Calculate max drawdown
+        equity_series = pd.Series(equity_curve)
+        running_max = equity_series.expanding().max()
+        drawdown = (equity_series - running_max) / running_max * 100
+        max_drawdown = drawdown.min()
+        
+        # Calculate Sharpe ratio (simplified)
+        returns = equity_series.pct_change().dropna()
+        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if len(returns) > 0 else 0
+        
+        results = {
+            'initial_capital': initial_capital,
+            'final_capital': final_capital,
+            'total_return': total_return,
+            'total_trades': len(trades),
+            'winning_trades': len(winning_trades),
+            'win_rate': win_rate,
+            'max_drawdown': max_drawdown,
+            'sharpe_ratio': sharpe_ratio,
+            'trades': trades,
+            'equity_curve': equity_curve,
+        }
+        
+        logger.info(f"Backtest complete: Return={total_return:.2f}%, Win Rate={win_rate:.2f}%")
+        
+        return results
+    
+    def get_current_signal(self, df: pd.DataFrame) -> Optional[str]:
+        """
+        Get current signal based on latest data.
+        
+        Args:
+            df: DataFrame with OHLCV data
+        
+        Returns:
+            'BUY', 'SELL', or None
+        """
+        latest = self.signal_events(df)[-1]
+        
+        if latest == 2:
+            return 'BUY'
+        elif latest == -2:
+            return 'SELL'
+        else:
+            return None
+
+
+# Export for convenience
+__all__ = ["BaseStrategy", "BACKTEST_MODES", "AFFORDABILITY_TOLERANCE"]
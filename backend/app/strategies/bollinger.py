@@ -0,0 +1,124 @@
+"""
+TradeForge AaaS - Trading Strategy: Bollinger Bands
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Bollinger Bands Mean-Reversion Strategy
+
+Strategy Logic:
+- BUY when the close drops below the lower band
+- SELL when the close rises back above the middle band (the SMA)
+"""
+
+from typing import Dict, Optional, Sequence, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import ArrayLike, IndicatorCache, IndicatorSeries
+
+logger = logging.getLogger(__name__)
+
+
+class BollingerBandsStrategy(BaseStrategy):
+    """
+    Bollinger Bands Trading Strategy.
+
+    Parameters:
+        period: SMA and standard deviation window (default: 20)
+        num_std: Band width in standard deviations (default: 2.0)
+        stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct:
+            See BaseStrategy
+    """
+
+    strategy_type = "bollinger"
+
+    def __init__(
+        self,
+        period: int = 20,
+        num_std: float = 2.0,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
+        position_size_pct: float = 100.0,
+        trailing_stop_pct: Optional[float] = None,
+    ):
+        """Initialize strategy parameters."""
+        super().__init__(stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct)
+        if period < 2 or num_std <= 0:
+            raise ValueError("Period must be at least 2 and num_std positive")
+
+        self.period = period
+        self.num_std = num_std
+
+        logger.info(f"Initialized Bollinger Bands Strategy: period={period}, std={num_std}")
+
+    @property
+    def warmup_bars(self) -> int:
+        """Trading starts once the bands are defined."""
+        return self.period
+
+    def calculate_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate the bands and band-crossing events.
+
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
+
+        Returns:
+            DataFrame with BB_middle, BB_upper, BB_lower and position columns
+        """
+        middle, upper, lower = self.close_series(df, indicators).bollinger(
+            self.period, self.num_std
+        )
+        close = df['close'].to_numpy(dtype=float)
+
+        df = df.copy()
+        df['BB_middle'] = middle
+        df['BB_upper'] = upper
+        df['BB_lower'] = lower
+        df['position'] = self.events(close < lower, close > middle)
+
+        return df
+
+    def indicator_arrays(
+        self,
+        close: Union[ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate the bands and band-crossing events from close prices alone.
+
+        Args:
+            close: Close prices, or an IndicatorSeries already bound to a cache
+            indicators: Shared indicator cache (default: one private to this call)
+            out: Buffers to write columns into, keyed by column name
+            columns: Columns to return (default: all)
+
+        Returns:
+            BB_middle, BB_upper, BB_lower (float32) and position (int8)
+        """
+        close = self.close_series(close, indicators)
+        middle, upper, lower = close.bollinger(self.period, self.num_std)
+
+        arrays = {
+            'BB_middle': middle,
+            'BB_upper': upper,
+            'BB_lower': lower,
+            'position': self.events(close.values < lower, close.values > middle),
+        }
+        return self.pack_arrays(arrays, out, columns)
+
+
+# Export for convenience
+__all__ = ["BollingerBandsStrategy"]
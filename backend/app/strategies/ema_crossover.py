@@ -0,0 +1,126 @@
+"""
+TradeForge AaaS - Trading Strategy: EMA Crossover
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Exponential Moving Average (EMA) Crossover Strategy
+
+Strategy Logic:
+- BUY when fast EMA crosses above slow EMA
+- SELL when fast EMA crosses below slow EMA
+"""
+
+from typing import Dict, Optional, Sequence, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import ArrayLike, IndicatorCache, IndicatorSeries
+
+logger = logging.getLogger(__name__)
+
+
+class EMACrossoverStrategy(BaseStrategy):
+    """
+    Exponential Moving Average (EMA) Crossover Trading Strategy.
+
+    Parameters:
+        fast_period: Period for fast EMA (default: 12)
+        slow_period: Period for slow EMA (default: 26)
+        stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct:
+            See BaseStrategy
+    """
+
+    strategy_type = "ema_crossover"
+
+    def __init__(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
+        position_size_pct: float = 100.0,
+        trailing_stop_pct: Optional[float] = None,
+    ):
+        """Initialize strategy parameters."""
+        super().__init__(stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct)
+        if fast_period >= slow_period:
+            raise ValueError("Fast period must be less than slow period")
+
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+
+        logger.info(f"Initialized EMA Crossover Strategy: fast={fast_period}, slow={slow_period}")
+
+    @property
+    def warmup_bars(self) -> int:
+        """EMAs are seeded from the first close; give the slow one a full period."""
+        return self.slow_period
+
+    def calculate_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate EMAs and crossover events.
+
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
+
+        Returns:
+            DataFrame with EMA_fast, EMA_slow, signal and position columns
+        """
+        close = self.close_series(df, indicators)
+        fast = close.ema(self.fast_period)
+        slow = close.ema(self.slow_period)
+        signal = (fast > slow).astype(np.int8) - (fast < slow).astype(np.int8)
+
+        df = df.copy()
+        df['EMA_fast'] = fast
+        df['EMA_slow'] = slow
+        df['signal'] = signal
+        df['position'] = df['signal'].diff()
+
+        return df
+
+    def indicator_arrays(
+        self,
+        close: Union[ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate EMAs and crossovers from close prices alone.
+
+        Args:
+            close: Close prices, or an IndicatorSeries already bound to a cache
+            indicators: Shared indicator cache (default: one private to this call)
+            out: Buffers to write columns into, keyed by column name
+            columns: Columns to return (default: all)
+
+        Returns:
+            EMA_fast, EMA_slow (float32), signal and position (int8)
+        """
+        close = self.close_series(close, indicators)
+        fast = close.ema(self.fast_period)
+        slow = close.ema(self.slow_period)
+        signal = self.regime(fast > slow, fast < slow)
+
+        arrays = {
+            'EMA_fast': fast,
+            'EMA_slow': slow,
+            'signal': signal,
+            'position': self.crossings(signal),
+        }
+        return self.pack_arrays(arrays, out, columns)
+
+
+# Export for convenience
+__all__ = ["EMACrossoverStrategy"]
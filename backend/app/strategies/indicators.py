@@ -0,0 +1,296 @@
+"""
+TradeForge AaaS - Technical Indicators
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Indicator kernels and a cache shared by every strategy in a run.
+
+Results are keyed by (series, indicator, params), where the series is
+identified by a hash of its values (or an explicit key), so RSI(14) computed
+by one strategy is reused by any other strategy backtested on the same
+prices. Composite indicators are built from cached parts: MACD reuses the
+EMAs, Bollinger Bands reuse the SMA.
+
+A cache can store its arrays in float32 (precision='float32') to halve
+indicator memory for large batches. Kernels always run in float64 and are
+rounded once when stored; the MACD line, a difference of nearly equal EMAs,
+is then taken from float64 EMAs rather than the rounded cached ones.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+import hashlib
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ArrayLike = Union[np.ndarray, pd.Series]
+
+# Storage precisions for indicator arrays
+PRECISIONS = ("float64", "float32")
+
+
+def precision_dtype(precision: str) -> np.dtype:
+    """
+    NumPy dtype for a precision name.
+
+    Args:
+        precision: One of PRECISIONS
+
+    Returns:
+        Matching float dtype
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision '{precision}'. Use one of {PRECISIONS}")
+    return np.dtype(precision)
+
+
+def sma(values: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average (NaN during warm-up)."""
+    return pd.Series(values).rolling(window=period).mean().to_numpy()
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """Exponential moving average with span=period, seeded with the first value."""
+    return pd.Series(values).ewm(span=period, adjust=False).mean().to_numpy()
+
+
+def rolling_std(values: np.ndarray, period: int) -> np.ndarray:
+    """Population standard deviation over a rolling window."""
+    return pd.Series(values).rolling(window=period).std(ddof=0).to_numpy()
+
+
+def wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothed average of values[1:], seeded with the mean of its first period values.
+
+    Returns:
+        Array aligned with values, NaN before index period
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) > period:
+        seeded = values[period:].astype(np.float64)
+        seeded[0] = values[1:period + 1].mean()
+        out[period:] = pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+    return out
+
+
+def rsi(values: np.ndarray, period: int) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing (NaN for the first period bars)."""
+    delta = np.diff(np.asarray(values, dtype=np.float64), prepend=np.nan)
+    gain = wilder_average(np.clip(delta, 0, None), period)
+    loss = wilder_average(np.clip(-delta, 0, None), period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - 100 / (1 + gain / loss)
+
+
+def series_key(values: np.ndarray) -> str:
+    """Fingerprint of a price series' values."""
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    return hashlib.sha1(memoryview(values), usedforsecurity=False).hexdigest()
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache of indicator arrays, bounded by total size.
+
+    Parameters:
+        max_bytes: Cached array bytes kept before the least recently used
+            entry is evicted (default: settings.INDICATOR_CACHE_MAX_MB)
+        precision: Storage precision of float arrays, 'float64' or 'float32'
+            (default: 'float64')
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, precision: str = "float64"):
+        """Initialize empty cache."""
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else settings.INDICATOR_CACHE_MAX_MB * 1024 * 1024
+        )
+        self.precision = precision
+        self.dtype = precision_dtype(precision)
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def series(self, values: ArrayLike, key: Optional[Hashable] = None) -> "IndicatorSeries":
+        """
+        Bind a price series to this cache.
+
+        Args:
+            values: Prices (e.g. df['close'])
+            key: Identifies the series; defaults to a hash of its values.
+                Only pass a key that changes whenever the values do.
+
+        Returns:
+            IndicatorSeries computing indicators through the cache
+        """
+        values = np.asarray(values, dtype=np.float64)
+        return IndicatorSeries(self, series_key(values) if key is None else key, values)
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return a cached result, computing and storing it on a miss.
+
+        Args:
+            key: (series key, indicator name, params)
+            compute: Builds the array (or tuple of arrays)
+
+        Returns:
+            Read-only array or tuple of arrays
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Computed outside the lock; a concurrent miss at worst computes twice
+        value = compute()
+        if self.dtype != np.float64:
+            value = self._astype(value)
+        arrays = value if isinstance(value, tuple) else (value,)
+        for array in arrays:
+            array.flags.writeable = False
+        size = sum(array.nbytes for array in arrays)
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes and len(self._entries) > 1:
+                    evicted, (_, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+                    logger.debug(f"Evicted indicator {evicted[1:]}")
+        return value
+
+    def _astype(self, value: Any) -> Any:
+        """Round float arrays (or a tuple of them) to the storage precision."""
+        if isinstance(value, tuple):
+            return tuple(self._astype(array) for array in value)
+        if value.dtype.kind == "f":
+            return value.astype(self.dtype, copy=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached array."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters and size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "precision": self.precision,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class IndicatorSeries:
+    """
+    One price series bound to an IndicatorCache.
+
+    Parameters:
+        cache: Cache the results are stored in
+        key: Series key (see IndicatorCache.series)
+        values: Prices as float64
+    """
+
+    def __init__(self, cache: IndicatorCache, key: Hashable, values: np.ndarray):
+        """Bind the series."""
+        self.cache = cache
+        self.key = key
+        self.values = values
+
+    def _get(self, name: str, params: Tuple, compute: Callable[[], Any]) -> Any:
+        """Look up (series, name, params) in the cache."""
+        return self.cache.get_or_compute((self.key, name, params), compute)
+
+    def sma(self, period: int) -> np.ndarray:
+        """Simple moving average."""
+        return self._get("sma", (period,), lambda: sma(self.values, period))
+
+    def ema(self, period: int) -> np.ndarray:
+        """Exponential moving average."""
+        return self._get("ema", (period,), lambda: ema(self.values, period))
+
+    def std(self, period: int) -> np.ndarray:
+        """Rolling population standard deviation."""
+        return self._get("std", (period,), lambda: rolling_std(self.values, period))
+
+    def rsi(self, period: int = 14) -> np.ndarray:
+        """Relative Strength Index."""
+        return self._get("rsi", (period,), lambda: rsi(self.values, period))
+
+    def macd(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Moving Average Convergence Divergence.
+
+        Returns:
+            Tuple of (MACD line, signal line, histogram)
+        """
+        def compute() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            if self.cache.dtype == np.float64:
+                line = self.ema(fast_period) - self.ema(slow_period)
+            else:
+                line = ema(self.values, fast_period) - ema(self.values, slow_period)
+            signal = ema(line, signal_period)
+            return line, signal, line - signal
+
+        return self._get("macd", (fast_period, slow_period, signal_period), compute)
+
+    def bollinger(
+        self,
+        period: int = 20,
+        num_std: float = 2.0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bollinger Bands around the SMA.
+
+        Returns:
+            Tuple of (middle, upper, lower) bands
+        """
+        def compute() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            middle = self.sma(period)
+            width = num_std * self.std(period)
+            return middle, middle + width, middle - width
+
+        return self._get("bollinger", (period, float(num_std)), compute)
+
+
+# Export for convenience
+__all__ = [
+    "IndicatorCache",
+    "IndicatorSeries",
+    "PRECISIONS",
+    "precision_dtype",
+    "series_key",
+    "sma",
+    "ema",
+    "rolling_std",
+    "rsi",
+    "wilder_average",
+]
@@ -0,0 +1,133 @@
+"""
+TradeForge AaaS - Trading Strategy: MACD Signal
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Moving Average Convergence Divergence (MACD) Strategy
+
+Strategy Logic:
+- BUY when the MACD line crosses above its signal line
+- SELL when the MACD line crosses below its signal line
+"""
+
+from typing import Dict, Optional, Sequence, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import ArrayLike, IndicatorCache, IndicatorSeries
+
+logger = logging.getLogger(__name__)
+
+
+class MACDStrategy(BaseStrategy):
+    """
+    MACD Signal-Line Crossover Trading Strategy.
+
+    Parameters:
+        fast_period: Fast EMA period (default: 12)
+        slow_period: Slow EMA period (default: 26)
+        signal_period: Signal line EMA period (default: 9)
+        stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct:
+            See BaseStrategy
+    """
+
+    strategy_type = "macd"
+
+    def __init__(
+        self,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
+        position_size_pct: float = 100.0,
+        trailing_stop_pct: Optional[float] = None,
+    ):
+        """Initialize strategy parameters."""
+        super().__init__(stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct)
+        if fast_period >= slow_period:
+            raise ValueError("Fast period must be less than slow period")
+
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+
+        logger.info(
+            f"Initialized MACD Strategy: fast={fast_period}, slow={slow_period}, "
+            f"signal={signal_period}"
+        )
+
+    @property
+    def warmup_bars(self) -> int:
+        """The signal line is an EMA of the MACD line, so both warm-ups add up."""
+        return self.slow_period + self.signal_period
+
+    def calculate_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate MACD and signal-line crossover events.
+
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
+
+        Returns:
+            DataFrame with MACD, MACD_signal, MACD_hist, signal and position columns
+        """
+        line, signal_line, hist = self.close_series(df, indicators).macd(
+            self.fast_period, self.slow_period, self.signal_period
+        )
+
+        df = df.copy()
+        df['MACD'] = line
+        df['MACD_signal'] = signal_line
+        df['MACD_hist'] = hist
+        df['signal'] = (hist > 0).astype(np.int8) - (hist < 0).astype(np.int8)
+        df['position'] = df['signal'].diff()
+
+        return df
+
+    def indicator_arrays(
+        self,
+        close: Union[ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate MACD and signal-line crossovers from close prices alone.
+
+        Args:
+            close: Close prices, or an IndicatorSeries already bound to a cache
+            indicators: Shared indicator cache (default: one private to this call)
+            out: Buffers to write columns into, keyed by column name
+            columns: Columns to return (default: all)
+
+        Returns:
+            MACD, MACD_signal, MACD_hist (float32), signal and position (int8)
+        """
+        line, signal_line, hist = self.close_series(close, indicators).macd(
+            self.fast_period, self.slow_period, self.signal_period
+        )
+        signal = self.regime(hist > 0, hist < 0)
+
+        arrays = {
+            'MACD': line,
+            'MACD_signal': signal_line,
+            'MACD_hist': hist,
+            'signal': signal,
+            'position': self.crossings(signal),
+        }
+        return self.pack_arrays(arrays, out, columns)
+
+
+# Export for convenience
+__all__ = ["MACDStrategy"]
@@ -0,0 +1,181 @@
+"""
+TradeForge AaaS - Monte Carlo Trade Resampling
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Robustness check for backtest results.
+
+Closed trades are reduced to per-trade capital growth factors, then many
+alternative trade sequences are generated, either by bootstrap (sampling
+trades with replacement) or by shuffling their order. Each chunk of paths is
+one 2-D array, so returns and drawdowns are computed for all paths at once
+while memory stays bounded by max_batch_cells.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("bootstrap", "shuffle")
+
+
+def trade_growth_factors(trades: List[Dict[str, Any]], initial_capital: float) -> np.ndarray:
+    """
+    Capital multiplier of every closed trade.
+
+    Cash only changes when a trade closes, so trade k grows capital by
+    (cash after SELL k) / (cash after SELL k-1).
+
+    Args:
+        trades: Trades from SMACrossoverStrategy.backtest
+        initial_capital: Capital the backtest started with
+
+    Returns:
+        Growth factor per closed trade
+    """
+    capital = np.array([trade['capital'] for trade in trades if trade['type'] == 'SELL'])
+    previous = np.concatenate(([initial_capital], capital[:-1]))
+    return capital / previous
+
+
+def path_metrics(growth: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+    """
+    Total return and max drawdown for a batch of trade sequences.
+
+    Args:
+        growth: Growth factors, shape (paths, trades)
+        initial_capital: Starting capital
+
+    Returns:
+        Dictionary with 'equity' (paths, trades + 1), 'total_return' and
+        'max_drawdown' (percent, per path)
+    """
+    paths, n = growth.shape
+    equity = np.empty((paths, n + 1), dtype=np.float64)
+    equity[:, 0] = initial_capital
+    np.cumprod(growth, axis=1, out=equity[:, 1:])
+    equity[:, 1:] *= initial_capital
+
+    running_max = np.maximum.accumulate(equity, axis=1)
+    drawdown = (equity / running_max).min(axis=1)
+
+    return {
+        "equity": equity,
+        "total_return": (equity[:, -1] - initial_capital) / initial_capital * 100,
+        "max_drawdown": (drawdown - 1) * 100,
+    }
+
+
+class MonteCarloSimulator:
+    """
+    Resample a backtest's trades into many alternative equity paths.
+
+    Parameters:
+        n_paths: Number of simulated trade sequences
+        method: 'bootstrap' (with replacement) or 'shuffle' (reorder only)
+        percentiles: Percentiles reported for distributions and equity bands
+        max_batch_cells: Upper bound on paths x trades per evaluation chunk
+        band_paths: Paths kept for the per-trade equity bands
+        seed: Random seed for reproducible runs
+    """
+
+    def __init__(
+        self,
+        n_paths: int = 10000,
+        method: str = "bootstrap",
+        percentiles: Sequence[float] = (5, 25, 50, 75, 95),
+        max_batch_cells: int = 1_000_000,
+        band_paths: int = 2000,
+        seed: Optional[int] = None,
+    ):
+        """Initialize simulation settings."""
+        if method not in METHODS:
+            raise ValueError(f"Unknown method '{method}'. Use one of {METHODS}")
+
+        self.n_paths = n_paths
+        self.method = method
+        self.percentiles = list(percentiles)
+        self.max_batch_cells = max_batch_cells
+        self.band_paths = band_paths
+        self.seed = seed
+
+    def run(self, trades: List[Dict[str, Any]], initial_capital: float = 10000.0) -> Dict[str, Any]:
+        """
+        Simulate trade sequences and summarize their distribution.
+
+        Args:
+            trades: Trades from SMACrossoverStrategy.backtest
+            initial_capital: Capital the backtest started with
+
+        Returns:
+            Dictionary with per-path 'total_return' and 'max_drawdown' arrays,
+            their percentiles, the probability of a loss, per-trade equity
+            bands and the metrics of the original trade order
+        """
+        growth = trade_growth_factors(trades, initial_capital)
+        n = len(growth)
+        if n == 0:
+            raise ValueError("Monte Carlo simulation needs at least one closed trade")
+
+        rng = np.random.default_rng(self.seed)
+        chunk = max(1, self.max_batch_cells // n)
+        total_return = np.empty(self.n_paths)
+        max_drawdown = np.empty(self.n_paths)
+        band_rows = min(self.band_paths, self.n_paths)
+        band_equity = np.empty((band_rows, n + 1))
+
+        for lo in range(0, self.n_paths, chunk):
+            hi = min(lo + chunk, self.n_paths)
+            if self.method == "bootstrap":
+                sampled = growth[rng.integers(0, n, size=(hi - lo, n))]
+            else:
+                sampled = rng.permuted(np.broadcast_to(growth, (hi - lo, n)), axis=1)
+
+            metrics = path_metrics(sampled, initial_capital)
+            total_return[lo:hi] = metrics["total_return"]
+            max_drawdown[lo:hi] = metrics["max_drawdown"]
+            if lo < band_rows:
+                band_equity[lo:min(hi, band_rows)] = metrics["equity"][:band_rows - lo]
+
+        original = path_metrics(growth[None, :], initial_capital)
+        bands = np.percentile(band_equity, self.percentiles, axis=0)
+
+        logger.info(
+            f"Monte Carlo ({self.method}) over {self.n_paths} paths of {n} trades: "
+            f"median return={np.median(total_return):.2f}%"
+        )
+
+        return {
+            "method": self.method,
+            "n_paths": self.n_paths,
+            "n_trades": n,
+            "total_return": total_return,
+            "max_drawdown": max_drawdown,
+            "percentiles": pd.DataFrame(
+                {
+                    "total_return": np.percentile(total_return, self.percentiles),
+                    "max_drawdown": np.percentile(max_drawdown, self.percentiles),
+                },
+                index=pd.Index(self.percentiles, name="percentile"),
+            ),
+            "probability_of_loss": float((total_return < 0).mean()),
+            "equity_bands": pd.DataFrame(
+                bands.T,
+                columns=[f"p{p:g}" for p in self.percentiles],
+                index=pd.RangeIndex(n + 1, name="trade"),
+            ),
+            "original": {
+                "total_return": float(original["total_return"][0]),
+                "max_drawdown": float(original["max_drawdown"][0]),
+            },
+        }
+
+
+# Export for convenience
+__all__ = ["MonteCarloSimulator", "trade_growth_factors", "path_metrics", "METHODS"]
@@ -0,0 +1,551 @@
+"""
+TradeForge AaaS - SMA Crossover Parameter Optimizer
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Grid search over SMA crossover parameters.
+
+Every distinct rolling window is computed once and shared by all parameter
+combinations that use it. Combinations are then evaluated in batches as 2-D
+arrays (one row per combination), reproducing the metrics of
+SMACrossoverStrategy.backtest without running it once per combination.
+
+Stop loss, take profit and trailing stop exits follow the strategy's fill
+policy and default to the strategy defaults (2% / 5% / none). With every stop
+disabled, positions are tracked with a running max over the crossover events;
+otherwise the candidate trades of all combinations are paired with their
+intrabar exits (BaseStrategy._first_stop_exits) and chained in one pass. The
+stop loss is also a grid axis (build_grid's stop_loss_pcts).
+
+With precision='float32' the shared SMA table and the per-batch SMA stacks
+are float32 (the rolling means themselves are computed in float64 and
+rounded once); prices, capital compounding and the metrics stay float64.
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Any, Dict, Optional, List, Iterable, Sequence, Tuple
+import logging
+
+from app.strategies.base import AFFORDABILITY_TOLERANCE, BaseStrategy
+from app.strategies.indicators import precision_dtype
+
+logger = logging.getLogger(__name__)
+
+# Metrics results can be ranked by (higher is better for all of them)
+RANK_METRICS = ("sharpe_ratio", "total_return", "max_drawdown")
+
+
+def rolling_means(
+    close: np.ndarray,
+    windows: Iterable[int],
+    precision: str = "float64",
+) -> Dict[int, np.ndarray]:
+    """
+    Compute the simple moving average of close once per distinct window.
+
+    Args:
+        close: Close prices
+        windows: Window lengths (duplicates are computed once)
+        precision: Storage precision of the SMA arrays ('float64' or 'float32')
+
+    Returns:
+        Dictionary mapping window length to SMA array (NaN during warm-up)
+    """
+    dtype = precision_dtype(precision)
+    series = pd.Series(np.asarray(close, dtype=np.float64))
+    return {
+        window: series.rolling(window=window).mean().to_numpy().astype(dtype, copy=False)
+        for window in sorted(set(int(w) for w in windows))
+    }
+
+
+def ohlc_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Open, high and low prices for intrabar exits.
+
+    Args:
+        df: DataFrame with OHLCV data
+
+    Returns:
+        Dictionary of float64 'open', 'high' and 'low' arrays (close where a column is missing)
+    """
+    close = df['close'].to_numpy(dtype=np.float64)
+    return {
+        column: df[column].to_numpy(dtype=np.float64) if column in df.columns else close
+        for column in ('open', 'high', 'low')
+    }
+
+
+def _stop_percents(value: Any, batch: int) -> np.ndarray:
+    """
+    Stop percent per combination.
+
+    Args:
+        value: One percent for every combination, or a sequence with one per combination
+        batch: Number of combinations
+
+    Returns:
+        Float array of shape (batch,), 0.0 where the stop is disabled (None, 0 or NaN)
+    """
+    values = list(value) if np.ndim(value) else [value] * batch
+    if len(values) != batch:
+        raise ValueError(f"Expected {batch} stop percentages, got {len(values)}")
+    return np.nan_to_num(np.array([v or 0.0 for v in values], dtype=np.float64), nan=0.0)
+
+
+def _pair_crossovers(cross: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Held and entry masks when positions only exit on death crosses.
+
+    A position is held while the latest crossover event so far is a golden cross.
+
+    Args:
+        cross: Crossover events per combination (+2 golden, -2 death), shape (batch, n)
+
+    Returns:
+        Tuple of (held at the bar's close, entry on the bar) masks, shape (batch, n)
+    """
+    n = cross.shape[1]
+    # Bar numbers (and the 2 * bar event encoding below) fit int32 for any realistic history
+    bars = np.arange(n, dtype=np.int32 if 2 * n + 1 < 2**31 else np.int64)
+    is_event = (cross == 2) | (cross == -2)
+
+    # Events are encoded as 2 * bar + is_golden so a single running max carries both
+    encoded = np.where(is_event, 2 * bars + (cross == 2), bars.dtype.type(-1))
+    np.maximum.accumulate(encoded, axis=1, out=encoded)
+    held = (encoded >= 0) & (encoded % 2 == 1)
+
+    entry = held.copy()
+    entry[:, 1:] &= ~held[:, :-1]
+    return held, entry
+
+
+def _pair_with_stops(
+    close: np.ndarray,
+    prices: Dict[str, np.ndarray],
+    cross: np.ndarray,
+    stops: np.ndarray,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Trades of every combination when intrabar exits are enabled.
+
+    Batched form of BaseStrategy._pair_with_stops: the golden crosses of all
+    combinations are candidate entries keyed by row * (n + 1) + bar, each
+    closing at its first intrabar exit or the next death cross of its row.
+    Candidates sharing a stop configuration are scanned together; chaining the
+    taken entries then only follows precomputed next-candidate indices.
+
+    Args:
+        close: Close prices, shape (n,)
+        prices: 'open', 'high' and 'low' arrays, shape (n,)
+        cross: Crossover events per combination (+2 golden, -2 death), shape (batch, n)
+        stops: (stop loss, take profit, trailing stop) percent per combination, shape (batch, 3)
+
+    Returns:
+        Tuple of (entry rows, entry bars, exit rows, exit bars, exit fill prices),
+        in row-major order
+    """
+    n = cross.shape[1]
+    stride = n + 1
+    golden_rows, golden = np.nonzero(cross == 2)
+    death_rows, death = np.nonzero(cross == -2)
+    golden_key = golden_rows * stride + golden
+    death_key = death_rows * stride + death
+
+    # Death cross that would close each candidate (n when none follows in its row)
+    next_death = np.append(death_key, -1)[np.searchsorted(death_key, golden_key, side='right')]
+    signal_exit = np.where(next_death // stride == golden_rows, next_death % stride, n)
+
+    exit_bars = signal_exit.copy()
+    exit_prices = close[np.minimum(signal_exit, n - 1)]
+    if len(golden):
+        configs, group = np.unique(stops[golden_rows], axis=0, return_inverse=True)
+        group = group.reshape(-1)
+        for k, (stop_loss_pct, take_profit_pct, trailing_stop_pct) in enumerate(configs):
+            if not (stop_loss_pct or take_profit_pct or trailing_stop_pct):
+                continue
+            members = np.flatnonzero(group == k)
+            levels = BaseStrategy(
+                stop_loss_pct=float(stop_loss_pct),
+                take_profit_pct=float(take_profit_pct),
+                trailing_stop_pct=float(trailing_stop_pct),
+            )
+            stop_bars, stop_prices = levels._first_stop_exits(
+                prices['open'], prices['high'], prices['low'], golden[members],
+                close[golden[members]], np.minimum(signal_exit[members], n - 1)
+            )
+            has_stop = stop_bars >= 0
+            exit_bars[members[has_stop]] = stop_bars[has_stop]
+            exit_prices[members[has_stop]] = stop_prices[has_stop]
+
+    # After an exit, the next entry is the first golden cross of the row on or after
+    # the exit bar; len(golden) ends a chain (a trade still open keys past its row)
+    following = np.searchsorted(golden_key, golden_rows * stride + exit_bars, side='left')
+    same_row = np.append(golden_rows, -1)[following] == golden_rows
+    following = np.where(same_row, following, len(golden)).tolist()
+
+    taken = []
+    for candidate in np.unique(golden_rows, return_index=True)[1].tolist():
+        while candidate < len(golden):
+            taken.append(candidate)
+            candidate = following[candidate]
+
+    taken = np.array(taken, dtype=np.int64)
+    closed = taken[exit_bars[taken] < n]
+
+    return (
+        golden_rows[taken], golden[taken], golden_rows[closed], exit_bars[closed],
+        exit_prices[closed],
+    )
+
+
+def evaluate_crossovers(
+    close: np.ndarray,
+    sma_fast: np.ndarray,
+    sma_slow: np.ndarray,
+    start: np.ndarray,
+    initial_capital: float = 10000.0,
+    commission: float = 0.001,
+    position_size_pct: float = 100.0,
+    include_equity: bool = False,
+    stop_loss_pct: Any = None,
+    take_profit_pct: Any = None,
+    trailing_stop_pct: Any = None,
+    prices: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate a batch of crossover combinations as 2-D arrays.
+
+    Follows the SMACrossoverStrategy.backtest rules: positions open on golden
+    crosses (on or after the start bar) and close on the next death cross or
+    an earlier intrabar stop loss / take profit / trailing stop exit, and
+    capital compounds from one closed trade to the next.
+
+    Args:
+        close: Close prices, shape (n,)
+        sma_fast: Fast SMA per combination, shape (batch, n), float64 or float32
+        sma_slow: Slow SMA per combination, shape (batch, n), float64 or float32
+        start: First traded bar per combination, shape (batch,)
+        initial_capital: Starting capital
+        commission: Commission per trade (0.001 = 0.1%)
+        position_size_pct: Position size as percent of capital
+        include_equity: Also return the equity curves, shape (batch, n)
+        stop_loss_pct: Stop loss percent, one value or one per combination (default: disabled)
+        take_profit_pct: Take profit percent, one value or one per combination (default: disabled)
+        trailing_stop_pct: Trailing stop percent, one value or one per combination
+            (default: disabled)
+        prices: 'open', 'high' and 'low' arrays for intrabar exits (default: close)
+
+    Returns:
+        Dictionary of metric arrays, each of shape (batch,)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    batch, n = sma_fast.shape
+    start = np.asarray(start, dtype=np.int64).reshape(batch, 1)
+    stops = np.column_stack([
+        _stop_percents(stop_loss_pct, batch),
+        _stop_percents(take_profit_pct, batch),
+        _stop_percents(trailing_stop_pct, batch),
+    ])
+
+    # Signal and crossover events (+2 golden, -2 death)
+    signal = (sma_fast > sma_slow).astype(np.int8) - (sma_fast < sma_slow).astype(np.int8)
+    cross = np.zeros((batch, n), dtype=np.int8)
+    cross[:, 1:] = signal[:, 1:] - signal[:, :-1]
+    cross[np.arange(n) < start] = 0
+    del signal
+
+    fraction = position_size_pct / 100
+    if fraction * (1 + commission) > 1 + AFFORDABILITY_TOLERANCE:
+        # Positions are never affordable, see BaseStrategy.can_afford_entries
+        cross[:] = 0
+
+    if stops.any():
+        prices = {
+            column: np.asarray(prices[column], dtype=np.float64)
+            if prices is not None and column in prices else close
+            for column in ('open', 'high', 'low')
+        }
+        entry_rows, entry_bars, exit_rows, exit_bars, exit_prices = _pair_with_stops(
+            close, prices, cross, stops
+        )
+        entry = np.zeros((batch, n), dtype=bool)
+        entry[entry_rows, entry_bars] = True
+        # Open from the entry bar's close until the exit bar (entries and exits are
+        # unique per row and bar, a re-entry on an exit bar cancels out)
+        opened = np.zeros((batch, n + 1), dtype=np.int8)
+        opened[entry_rows, entry_bars] += 1
+        opened[exit_rows, exit_bars] -= 1
+        held = np.cumsum(opened, axis=1, dtype=np.int8)[:, :n] > 0
+        del opened
+    else:
+        held, entry = _pair_crossovers(cross)
+        exit_ = np.zeros_like(held)
+        exit_[:, 1:] = held[:, :-1] & ~held[:, 1:]
+        exit_rows, exit_bars = np.nonzero(exit_)
+        exit_prices = close[exit_bars]
+        del exit_
+
+    # Entry price of the current trade; a trade closing on bar i was held at bar i - 1
+    last_entry = np.where(entry, np.arange(n), 0)
+    np.maximum.accumulate(last_entry, axis=1, out=last_entry)
+    entry_price = close[last_entry]
+    del last_entry
+    exit_entry_prices = entry_price[exit_rows, exit_bars - 1]
+
+    # Capital after every closed trade, compounded along the bars
+    growth = np.ones((batch, n), dtype=np.float64)
+    growth[exit_rows, exit_bars] = (1 - fraction * (1 + commission)) + (
+        fraction * (1 - commission) * exit_prices / exit_entry_prices
+    )
+    capital = np.cumprod(growth, axis=1, out=growth)
+    capital *= initial_capital
+    held_value = close / entry_price
+    held_value *= fraction
+    held_value += 1 - fraction * (1 + commission)
+    held_value *= capital
+    equity = np.where(held, held_value, capital)
+    del capital, held_value
+
+    # Returns over the traded range; equity before start stays at
+    # initial_capital, so those bars contribute zero returns
+    returns = np.empty_like(equity)
+    returns[:, 0] = equity[:, 0] / initial_capital
+    np.divide(equity[:, 1:], equity[:, :-1], out=returns[:, 1:])
+    returns -= 1
+    count = np.maximum(n - start[:, 0], 0)
+    mean = returns.sum(axis=1) / np.maximum(count, 1)
+    # Sum of squares about the mean over the traded bars only (subtracting
+    # count * mean ** 2 afterwards cancels when the variance is tiny)
+    returns -= mean[:, None]
+    returns[np.arange(n) < start] = 0
+    np.square(returns, out=returns)
+    variance = returns.sum(axis=1) / np.maximum(count - 1, 1)
+    # Like pandas: NaN for a single return, 0 without any
+    sharpe_ratio = np.where(count > 0, np.nan, 0.0)
+    sample = count > 1
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # A flat equity curve has no volatility: inf, or NaN without gains
+        sharpe_ratio[sample] = mean[sample] / np.sqrt(variance[sample]) * np.sqrt(252)
+
+    # Drawdown against the running peak (initial_capital included)
+    running_max = np.maximum.accumulate(equity, axis=1, out=returns)
+    np.maximum(running_max, initial_capital, out=running_max)
+    np.divide(equity, running_max, out=running_max)
+    drawdown = np.minimum((running_max.min(axis=1) - 1) * 100, 0.0)
+
+    n_entries = entry.sum(axis=1)
+    n_exits = np.bincount(exit_rows, minlength=batch)
+    wins = np.bincount(
+        exit_rows[(1 - commission) * exit_prices > exit_entry_prices], minlength=batch
+    )
+    final_capital = equity[:, -1]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        win_rate = np.where(n_exits > 0, wins / n_exits * 100, 0.0)
+
+    metrics = {
+        "final_capital": final_capital,
+        "total_return": (final_capital - initial_capital) / initial_capital * 100,
+        "total_trades": n_entries + n_exits,
+        "winning_trades": wins,
+        "win_rate": win_rate,
+        "max_drawdown": drawdown,
+        "sharpe_ratio": sharpe_ratio,
+    }
+    if include_equity:
+        metrics["equity"] = equity
+
+    return metrics
+
+
+class SMACrossoverOptimizer:
+    """
+    Grid optimizer for SMACrossoverStrategy parameters.
+
+    Parameters:
+        initial_capital: Starting capital (default: 10000.0)
+        commission: Commission per trade (default: 0.001)
+        position_size_pct: Position size percent (default: 100.0)
+        stop_loss_pct: Stop loss percent of grids without a stop axis (default: 2.0)
+        take_profit_pct: Take profit percent (default: 5.0)
+        trailing_stop_pct: Trailing stop percent (default: None)
+        max_batch_cells: Upper bound on batch size x bars per evaluation pass
+        precision: SMA precision, 'float64' or 'float32' (default: 'float64')
+
+    The stop defaults match SMACrossoverStrategy; stops are disabled with None or 0.
+    """
+
+    def __init__(
+        self,
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+        position_size_pct: float = 100.0,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
+        trailing_stop_pct: Optional[float] = None,
+        max_batch_cells: int = 1_000_000,
+        precision: str = "float64",
+    ):
+        """Initialize optimizer settings."""
+        precision_dtype(precision)
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.position_size_pct = position_size_pct
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.trailing_stop_pct = trailing_stop_pct
+        self.max_batch_cells = max_batch_cells
+        self.precision = precision
+
+    def build_grid(
+        self,
+        fast_periods: Sequence[int],
+        slow_periods: Sequence[int],
+        stop_loss_pcts: Optional[Sequence[Optional[float]]] = None
+    ) -> List[tuple]:
+        """
+        Build the valid (fast, slow, stop loss) combinations.
+
+        Args:
+            fast_periods: Candidate fast SMA periods
+            slow_periods: Candidate slow SMA periods
+            stop_loss_pcts: Candidate stop loss percents, None for no stop loss
+                (default: the optimizer's stop_loss_pct only)
+
+        Returns:
+            List of (fast_period, slow_period, stop_loss_pct) with fast < slow
+        """
+        if stop_loss_pcts is None:
+            stop_loss_pcts = [self.stop_loss_pct]
+        return [
+            (int(fast), int(slow), float(stop) if stop else None)
+            for fast in fast_periods
+            for slow in slow_periods
+            if fast < slow
+            for stop in stop_loss_pcts
+        ]
+
+    def run(
+        self,
+        df: pd.DataFrame,
+        fast_periods: Sequence[int],
+        slow_periods: Sequence[int],
+        rank_by: str = "sharpe_ratio",
+        top_n: Optional[int] = None,
+        stop_loss_pcts: Optional[Sequence[Optional[float]]] = None,
+    ) -> pd.DataFrame:
+        """
+        Evaluate every (fast, slow, stop loss) combination and rank the results.
+
+        Args:
+            df: DataFrame with OHLCV data
+            fast_periods: Candidate fast SMA periods
+            slow_periods: Candidate slow SMA periods
+            rank_by: Metric to rank by ('sharpe_ratio', 'total_return' or 'max_drawdown')
+            top_n: Only return the best N combinations
+            stop_loss_pcts: Candidate stop loss percents (see build_grid)
+
+        Returns:
+            DataFrame with one row per combination, best first
+        """
+        if rank_by not in RANK_METRICS:
+            raise ValueError(f"Unknown rank metric '{rank_by}'. Use one of {RANK_METRICS}")
+
+        grid = self.build_grid(fast_periods, slow_periods, stop_loss_pcts)
+        if not grid:
+            raise ValueError("Parameter grid is empty (fast period must be less than slow period)")
+
+        close = df['close'].to_numpy(dtype=np.float64)
+        smas = rolling_means(close, [w for combo in grid for w in combo[:2]], self.precision)
+
+        results = self.evaluate(close, smas, grid, prices=ohlc_arrays(df))
+        results = results.sort_values(rank_by, ascending=False, kind="stable", na_position="last")
+        results = results.reset_index(drop=True)
+
+        if top_n is not None:
+            results = results.head(top_n)
+
+        logger.info(
+            f"Optimized {len(grid)} SMA combinations over {len(close)} bars, "
+            f"best {rank_by}={results[rank_by].iloc[0]:.4f}"
+        )
+
+        return results
+
+    def evaluate(
+        self,
+        close: np.ndarray,
+        smas: Dict[int, np.ndarray],
+        grid: List[tuple],
+        start: Optional[np.ndarray] = None,
+        prices: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
+        """
+        Evaluate combinations against precomputed SMA arrays.
+
+        Args:
+            close: Close prices
+            smas: SMA arrays keyed by window (see rolling_means)
+            grid: List of (fast_period, slow_period[, stop_loss_pct]); combinations
+                without a stop loss entry use the optimizer's stop_loss_pct
+            start: First traded bar per combination (default: its slow period)
+            prices: 'open', 'high' and 'low' arrays for intrabar exits (default: close)
+
+        Returns:
+            DataFrame with parameters and metrics, in grid order
+            (stop_loss_pct is NaN where the stop loss is disabled)
+        """
+        n = len(close)
+        fast = np.array([combo[0] for combo in grid], dtype=np.int64)
+        slow = np.array([combo[1] for combo in grid], dtype=np.int64)
+        stop_loss = _stop_percents(
+            [combo[2] if len(combo) > 2 else self.stop_loss_pct for combo in grid], len(grid)
+        )
+        if start is None:
+            start = slow
+        start = np.asarray(start, dtype=np.int64)
+
+        batch_size = max(1, self.max_batch_cells // max(n, 1))
+        metrics: Dict[str, List[np.ndarray]] = {}
+
+        for lo in range(0, len(grid), batch_size):
+            hi = min(lo + batch_size, len(grid))
+            batch = evaluate_crossovers(
+                close,
+                np.stack([smas[w] for w in fast[lo:hi]]),
+                np.stack([smas[w] for w in slow[lo:hi]]),
+                start[lo:hi],
+                initial_capital=self.initial_capital,
+                commission=self.commission,
+                position_size_pct=self.position_size_pct,
+                stop_loss_pct=stop_loss[lo:hi],
+                take_profit_pct=self.take_profit_pct,
+                trailing_stop_pct=self.trailing_stop_pct,
+                prices=prices,
+            )
+            for key, values in batch.items():
+                metrics.setdefault(key, []).append(values)
+
+        results = pd.DataFrame({
+            "fast_period": fast,
+            "slow_period": slow,
+            "stop_loss_pct": np.where(stop_loss > 0, stop_loss, np.nan),
+        })
+        for key, chunks in metrics.items():
+            results[key] = np.concatenate(chunks)
+
+        return results
+
+
+# Export for convenience
+__all__ = [
+    "SMACrossoverOptimizer",
+    "rolling_means",
+    "ohlc_arrays",
+    "evaluate_crossovers",
+    "RANK_METRICS",
+]
@@ -0,0 +1,285 @@
+"""
+TradeForge AaaS - Portfolio Backtester
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+SMA crossover backtest over a basket of symbols sharing one capital pool.
+
+Indicators are computed on each symbol's own bars and crossovers for all
+symbols at once on a time-aligned close matrix; bars where a symbol has no
+SMA (warm-up, or a timestamp it has no bar for) are skipped when diffing its
+signal, so every symbol trades the crossovers its single-asset backtest()
+would. Only bars with at least one crossover are stepped, with every step
+operating on whole symbol vectors; the equity curve is then rebuilt from the
+cash/share snapshots in one pass. Risk limits follow Settings: at most
+MAX_OPEN_POSITIONS positions, each sized at MAX_POSITION_SIZE_PERCENT of
+current portfolio equity. Positions exit on death crosses only: the
+strategy's stop loss, take profit and trailing stop are disabled, and the
+results report them as None.
+"""
+
+from typing import Any, Dict, List, Mapping, Tuple, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.strategies.sma_crossover import SMACrossoverStrategy
+
+logger = logging.getLogger(__name__)
+
+
+class PortfolioBacktester:
+    """
+    Shared-capital SMA crossover backtester for many symbols.
+
+    Parameters:
+        fast_period: Fast SMA period (default: 20)
+        slow_period: Slow SMA period (default: 50)
+        max_open_positions: Concurrent positions (default: settings.MAX_OPEN_POSITIONS)
+        max_position_size_pct: Position size as percent of equity
+            (default: settings.MAX_POSITION_SIZE_PERCENT)
+    """
+
+    def __init__(
+        self,
+        fast_period: int = 20,
+        slow_period: int = 50,
+        max_open_positions: int = settings.MAX_OPEN_POSITIONS,
+        max_position_size_pct: float = settings.MAX_POSITION_SIZE_PERCENT,
+    ):
+        """Initialize portfolio settings."""
+        if max_open_positions < 1:
+            raise ValueError("max_open_positions must be at least 1")
+
+        self.strategy = SMACrossoverStrategy(
+            fast_period=fast_period,
+            slow_period=slow_period,
+            stop_loss_pct=None,
+            take_profit_pct=None,
+            trailing_stop_pct=None,
+            position_size_pct=max_position_size_pct,
+        )
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.max_open_positions = max_open_positions
+        self.max_position_size_pct = max_position_size_pct
+
+    @staticmethod
+    def align_closes(datasets: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Align per-symbol OHLCV frames on their union of timestamps.
+
+        Args:
+            datasets: OHLCV DataFrames keyed by symbol
+
+        Returns:
+            Close matrix (timestamps x symbols), NaN where a symbol has no bar
+        """
+        return pd.concat({symbol: df['close'] for symbol, df in datasets.items()}, axis=1)
+
+    def backtest(
+        self,
+        closes: Union[pd.DataFrame, Mapping[str, pd.DataFrame]],
+        initial_capital: float = 10000.0,
+        commission: float = 0.001,
+    ) -> Dict[str, Any]:
+        """
+        Run the strategy on every symbol with one shared capital pool.
+
+        On each bar, exits are processed before entries. When more symbols
+        cross up than there are free slots, the widest fast/slow spread wins.
+
+        Args:
+            closes: Close matrix (timestamps x symbols) or OHLCV frames keyed by symbol
+            initial_capital: Starting capital
+            commission: Commission per trade (0.001 = 0.1%)
+
+        Returns:
+            SMACrossoverStrategy.backtest metrics for the portfolio, with
+            trades tagged by 'symbol', plus 'symbols', per-bar 'open_positions'
+            and the (disabled) stop_loss_pct / take_profit_pct / trailing_stop_pct
+        """
+        if not isinstance(closes, pd.DataFrame):
+            closes = self.align_closes(closes)
+
+        symbols = [str(symbol) for symbol in closes.columns]
+        close = closes.to_numpy(dtype=np.float64)
+        n_bars, n_symbols = close.shape
+        start = self.slow_period
+
+        # Crossovers for every symbol at once. Bars without both SMAs are
+        # masked and the signal carried over them, so a crossover spanning a
+        # missing bar is reported on the symbol's next bar.
+        sma_fast = self._rolling_mean(closes, self.fast_period)
+        sma_slow = self._rolling_mean(closes, self.slow_period)
+        signal = (sma_fast > sma_slow).astype(np.int8) - (sma_fast < sma_slow).astype(np.int8)
+        valid = ~(np.isnan(sma_fast) | np.isnan(sma_slow))
+        signal = pd.DataFrame(np.where(valid, signal, np.nan)).ffill().fillna(0).to_numpy()
+        cross = np.zeros_like(signal, dtype=np.int8)
+        cross[1:] = signal[1:] - signal[:-1]
+        cross[:start] = 0
+        golden = cross == 2
+        death = cross == -2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            spread = (sma_fast - sma_slow) / sma_slow
+
+        # Last known price, used to value positions across missing bars
+        mark = closes.ffill().to_numpy(dtype=np.float64)
+
+        event_bars = np.flatnonzero(golden.any(axis=1) | death.any(axis=1))
+        golden_symbols, golden_offsets = self._symbols_per_bar(golden, event_bars)
+        death_symbols, death_offsets = self._symbols_per_bar(death, event_bars)
+        cash = initial_capital
+        shares = np.zeros(n_symbols)
+        entry_price = np.zeros(n_symbols)
+        held = np.zeros(n_symbols, dtype=bool)
+        n_open = 0
+        fraction = self.max_position_size_pct / 100
+
+        # Row 0 is the state before the first event
+        cash_steps = np.full(len(event_bars) + 1, initial_capital)
+        share_steps = np.zeros((len(event_bars) + 1, n_symbols))
+        fills: List[Tuple[int, int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+
+        for step, bar in enumerate(event_bars):
+            price = close[bar]
+
+            sells = death_symbols[death_offsets[step]:death_offsets[step + 1]]
+            sells = sells[held[sells]]
+            if len(sells):
+                proceeds = shares[sells] * price[sells] * (1 - commission)
+                cash_after = cash + np.cumsum(proceeds)
+                cash = cash_after[-1]
+                fills.append((bar, -1, sells, shares[sells], cash_after, entry_price[sells]))
+                held[sells] = False
+                shares[sells] = 0.0
+                n_open -= len(sells)
+
+            slots = self.max_open_positions - n_open
+            candidates = golden_symbols[golden_offsets[step]:golden_offsets[step + 1]]
+            if slots > 0 and len(candidates):
+                candidates = candidates[~held[candidates]]
+                candidates = candidates[np.argsort(-spread[bar, candidates], kind="stable")][:slots]
+                equity = cash + np.dot(shares[held], mark[bar, held])
+                value = equity * fraction
+                cost = value * (1 + commission)
+                affordable = cost * np.arange(1, len(candidates) + 1) <= cash
+                buys = candidates[affordable]
+                if len(buys):
+                    shares[buys] = value / price[buys]
+                    entry_price[buys] = price[buys]
+                    held[buys] = True
+                    n_open += len(buys)
+                    cash_after = cash - cost * np.arange(1, len(buys) + 1)
+                    cash = cash_after[-1]
+                    fills.append((bar, 1, buys, shares[buys], cash_after, price[buys]))
+
+            cash_steps[step + 1] = cash
+            share_steps[step + 1] = shares
+
+        # Rebuild cash and holdings on every bar from the event snapshots
+        state = np.searchsorted(event_bars, np.arange(n_bars), side="right")
+        cash_per_bar = cash_steps[state]
+        holdings = share_steps[state]
+        held_value = np.where(holdings > 0, holdings * np.nan_to_num(mark), 0.0).sum(axis=1)
+        equity = cash_per_bar + held_value
+
+        trades = self._build_trades(fills, closes.index, symbols, close, commission)
+        equity_curve = [initial_capital] + equity[start:].tolist()
+        final_capital = float(equity[-1]) if n_bars else initial_capital
+
+        results = self.strategy._summarize_backtest(
+            trades, equity_curve, initial_capital, final_capital
+        )
+        results['symbols'] = symbols
+        results['stop_loss_pct'] = self.strategy.stop_loss_pct
+        results['take_profit_pct'] = self.strategy.take_profit_pct
+        results['trailing_stop_pct'] = self.strategy.trailing_stop_pct
+        results['open_positions'] = pd.Series(
+            (holdings > 0).sum(axis=1), index=closes.index, name="open_positions"
+        )
+
+        logger.info(
+            f"Portfolio backtest over {n_symbols} symbols and {n_bars} bars: "
+            f"{len(trades)} trades on {len(event_bars)} signal bars"
+        )
+
+        return results
+
+    @staticmethod
+    def _rolling_mean(closes: pd.DataFrame, window: int) -> np.ndarray:
+        """
+        Rolling mean of each symbol over its own bars, aligned to the close matrix.
+
+        Returns:
+            Array (timestamps x symbols), NaN during warm-up and where a symbol has no bar
+        """
+        close = closes.to_numpy(dtype=np.float64)
+        # Move each symbol's bars to the top of its column (in time order), roll
+        # all columns in one call and scatter the means back; the NaN tail only
+        # produces NaN windows, which land on the missing bars
+        order = np.argsort(np.isnan(close), axis=0, kind="stable")
+        compact = np.take_along_axis(close, order, axis=0)
+        rolled = pd.DataFrame(compact).rolling(window=window).mean().to_numpy()
+        means = np.empty_like(close)
+        np.put_along_axis(means, order, rolled, axis=0)
+        return means
+
+    @staticmethod
+    def _symbols_per_bar(mask: np.ndarray, bars: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Symbols set in each of the given rows of a bars x symbols mask.
+
+        Returns:
+            Tuple of (symbol indices, offsets); row i owns symbols[offsets[i]:offsets[i + 1]]
+        """
+        rows, symbols = np.nonzero(mask[bars])
+        return symbols, np.searchsorted(rows, np.arange(len(bars) + 1))
+
+    @staticmethod
+    def _build_trades(
+        fills: List[Tuple[int, int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]],
+        index: pd.Index,
+        symbols: List[str],
+        close: np.ndarray,
+        commission: float,
+    ) -> List[Dict[str, Any]]:
+        """Convert recorded fills to backtest() style trade dicts."""
+        if not fills:
+            return []
+
+        counts = [len(fill[2]) for fill in fills]
+        bars = np.repeat([fill[0] for fill in fills], counts)
+        sides = np.repeat([fill[1] for fill in fills], counts)
+        columns = {
+            key: np.concatenate([fill[i] for fill in fills])
+            for i, key in enumerate(("symbol", "shares", "cash", "entry_price"), start=2)
+        }
+        price = close[bars, columns["symbol"]]
+        cost_basis = columns["shares"] * columns["entry_price"]
+        pnl = columns["shares"] * price * (1 - commission) - cost_basis
+
+        trades = []
+        for k in range(len(bars)):
+            trade = {
+                'date': index[bars[k]],
+                'symbol': symbols[columns["symbol"][k]],
+                'type': 'BUY' if sides[k] > 0 else 'SELL',
+                'price': price[k],
+                'shares': columns["shares"][k],
+                'capital': columns["cash"][k],
+            }
+            if sides[k] < 0:
+                trade['pnl'] = pnl[k]
+                trade['pnl_pct'] = pnl[k] / cost_basis[k] * 100
+            trades.append(trade)
+
+        return trades
+
+
+# Export for convenience
+__all__ = ["PortfolioBacktester"]
@@ -0,0 +1,183 @@
+"""
+TradeForge AaaS - Reduced Precision Accuracy Report
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Checks what float32 indicators cost in accuracy before a sweep relies on them.
+
+Each report runs the same work in float64 and float32 and compares the
+resulting metrics. Indicators are the only float32 part, so differences come
+from crossovers decided differently on near-equal indicator values; trade
+counts and the best-ranked combination show whether that happened.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import IndicatorCache
+from app.strategies.optimizer import SMACrossoverOptimizer, ohlc_arrays, rolling_means
+
+logger = logging.getLogger(__name__)
+
+# Metrics compared between precisions
+REPORT_METRICS = (
+    "final_capital",
+    "total_return",
+    "total_trades",
+    "winning_trades",
+    "win_rate",
+    "max_drawdown",
+    "sharpe_ratio",
+)
+
+
+def _errors(reference: np.ndarray, reduced: np.ndarray) -> Dict[str, float]:
+    """Largest absolute and relative difference (NaN == NaN counts as equal)."""
+    reference = np.asarray(reference, dtype=np.float64)
+    reduced = np.asarray(reduced, dtype=np.float64)
+    both_nan = np.isnan(reference) & np.isnan(reduced)
+    diff = np.where(both_nan, 0.0, np.abs(reduced - reference))
+    scale = np.where(both_nan, 1.0, np.maximum(np.abs(reference), np.finfo(np.float64).tiny))
+    rel = np.where(diff == 0, 0.0, diff / scale)
+    return {
+        "max_abs_error": float(np.nan_to_num(diff, nan=np.inf).max(initial=0.0)),
+        "max_rel_error": float(np.nan_to_num(rel, nan=np.inf).max(initial=0.0)),
+    }
+
+
+def backtest_accuracy(
+    strategy: BaseStrategy,
+    df: pd.DataFrame,
+    initial_capital: float = 10000.0,
+    commission: float = 0.001,
+    mode: str = "vectorized",
+) -> Dict[str, Any]:
+    """
+    Compare one backtest run with float64 and float32 indicators.
+
+    Args:
+        strategy: Strategy to backtest
+        df: DataFrame with OHLCV data
+        initial_capital: Starting capital
+        commission: Commission per trade (0.001 = 0.1%)
+        mode: Backtest engine
+
+    Returns:
+        Dictionary with per-metric float64/float32 values and errors,
+        trades_match, max_equity_rel_error and max_rel_error
+    """
+    runs = {
+        precision: strategy.backtest(
+            df, initial_capital, commission, mode, indicators=IndicatorCache(precision=precision)
+        )
+        for precision in ("float64", "float32")
+    }
+    reference, reduced = runs["float64"], runs["float32"]
+
+    metrics = {}
+    for name in REPORT_METRICS:
+        metrics[name] = {
+            "float64": reference[name],
+            "float32": reduced[name],
+            **_errors(reference[name], reduced[name]),
+        }
+
+    trades_match = [(t["date"], t["type"]) for t in reference["trades"]] == [
+        (t["date"], t["type"]) for t in reduced["trades"]
+    ]
+    equity = (
+        _errors(reference["equity_curve"], reduced["equity_curve"])["max_rel_error"]
+        if trades_match
+        else float("nan")
+    )
+
+    report = {
+        "metrics": metrics,
+        "trades_match": trades_match,
+        "max_equity_rel_error": equity,
+        "max_rel_error": max(values["max_rel_error"] for values in metrics.values()),
+    }
+    logger.info(
+        f"float32 backtest accuracy: trades_match={trades_match}, "
+        f"max_rel_error={report['max_rel_error']:.3g}"
+    )
+    return report
+
+
+def optimizer_accuracy(
+    df: pd.DataFrame,
+    fast_periods: Sequence[int],
+    slow_periods: Sequence[int],
+    rank_by: str = "sharpe_ratio",
+    optimizer: Optional[SMACrossoverOptimizer] = None,
+) -> Dict[str, Any]:
+    """
+    Compare an SMA grid search run with float64 and float32 SMAs.
+
+    Args:
+        df: DataFrame with OHLCV data
+        fast_periods: Candidate fast SMA periods
+        slow_periods: Candidate slow SMA periods
+        rank_by: Metric the grid is ranked by
+        optimizer: Settings to use (its precision is ignored)
+
+    Returns:
+        Dictionary with per-metric errors across combinations, the number of
+        combinations whose trade count changed, the best combination per
+        precision, same_best, and SMA table bytes per precision
+    """
+    optimizer = optimizer or SMACrossoverOptimizer()
+    grid = optimizer.build_grid(fast_periods, slow_periods)
+    if not grid:
+        raise ValueError("Parameter grid is empty (fast period must be less than slow period)")
+
+    close = df['close'].to_numpy(dtype=np.float64)
+    windows = [w for combo in grid for w in combo[:2]]
+    prices = ohlc_arrays(df)
+
+    results = {}
+    table_bytes = {}
+    for precision in ("float64", "float32"):
+        smas = rolling_means(close, windows, precision)
+        table_bytes[precision] = sum(values.nbytes for values in smas.values())
+        results[precision] = optimizer.evaluate(close, smas, grid, prices=prices)
+        del smas
+    reference, reduced = results["float64"], results["float32"]
+
+    def best(results: pd.DataFrame) -> tuple:
+        ranked = results.sort_values(rank_by, ascending=False, kind="stable", na_position="last")
+        row = ranked.iloc[0]
+        return int(row["fast_period"]), int(row["slow_period"])
+
+    metrics = {
+        name: _errors(reference[name].to_numpy(), reduced[name].to_numpy())
+        for name in REPORT_METRICS
+    }
+    report = {
+        "combinations": len(grid),
+        "metrics": metrics,
+        "trade_count_mismatches": int(
+            (reference["total_trades"].to_numpy() != reduced["total_trades"].to_numpy()).sum()
+        ),
+        "best_float64": best(reference),
+        "best_float32": best(reduced),
+        "sma_bytes": table_bytes,
+        "max_rel_error": max(values["max_rel_error"] for values in metrics.values()),
+    }
+    report["same_best"] = report["best_float64"] == report["best_float32"]
+
+    logger.info(
+        f"float32 optimizer accuracy over {len(grid)} combinations: "
+        f"same_best={report['same_best']}, max_rel_error={report['max_rel_error']:.3g}"
+    )
+    return report
+
+
+# Export for convenience
+__all__ = ["backtest_accuracy", "optimizer_accuracy", "REPORT_METRICS"]
@@ -0,0 +1,118 @@
+"""
+TradeForge AaaS - Strategy Registry
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Maps Strategy.strategy_type values to strategy classes.
+
+The built-in strategies are registered here; plugins register their own
+BaseStrategy subclasses with the register_strategy decorator:
+
+    @register_strategy("my_breakout")
+    class BreakoutStrategy(BaseStrategy):
+        ...
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Type
+import logging
+import threading
+
+from app.strategies.base import BaseStrategy
+from app.strategies.bollinger import BollingerBandsStrategy
+from app.strategies.ema_crossover import EMACrossoverStrategy
+from app.strategies.macd import MACDStrategy
+from app.strategies.rsi import RSIStrategy
+from app.strategies.sma_crossover import SMACrossoverStrategy
+
+logger = logging.getLogger(__name__)
+
+_registry: Dict[str, Type[BaseStrategy]] = {
+    cls.strategy_type: cls
+    for cls in (
+        SMACrossoverStrategy,
+        EMACrossoverStrategy,
+        RSIStrategy,
+        MACDStrategy,
+        BollingerBandsStrategy,
+    )
+}
+_lock = threading.Lock()
+
+
+def register_strategy(strategy_type: str) -> Callable[[Type[BaseStrategy]], Type[BaseStrategy]]:
+    """
+    Class decorator registering a strategy under a strategy_type.
+
+    Args:
+        strategy_type: Value stored in Strategy.strategy_type
+
+    Returns:
+        Decorator that registers the class and returns it unchanged
+    """
+    def decorator(cls: Type[BaseStrategy]) -> Type[BaseStrategy]:
+        if not issubclass(cls, BaseStrategy):
+            raise TypeError(f"{cls.__name__} must subclass BaseStrategy")
+        with _lock:
+            existing = _registry.get(strategy_type)
+            if existing is not None and existing is not cls:
+                raise ValueError(
+                    f"Strategy type '{strategy_type}' is already registered to {existing.__name__}"
+                )
+            cls.strategy_type = strategy_type
+            _registry[strategy_type] = cls
+        logger.info(f"Registered strategy type '{strategy_type}': {cls.__name__}")
+        return cls
+
+    return decorator
+
+
+def get_strategy_class(strategy_type: Optional[str]) -> Type[BaseStrategy]:
+    """
+    Look up the class for a strategy_type.
+
+    Args:
+        strategy_type: Strategy.strategy_type value
+
+    Returns:
+        Registered BaseStrategy subclass
+
+    Raises:
+        ValueError: If the type is not registered
+    """
+    strategy_class = _registry.get(strategy_type or "")
+    if strategy_class is None:
+        raise ValueError(f"Unsupported strategy type: {strategy_type}")
+    return strategy_class
+
+
+def create_strategy(
+    strategy_type: Optional[str],
+    params: Optional[Dict[str, Any]] = None,
+) -> BaseStrategy:
+    """
+    Instantiate a registered strategy.
+
+    Args:
+        strategy_type: Strategy.strategy_type value
+        params: Constructor keyword arguments (Strategy.parameters)
+
+    Returns:
+        Strategy instance
+    """
+    return get_strategy_class(strategy_type)(**(params or {}))
+
+
+def available_strategies() -> List[str]:
+    """Registered strategy types, sorted."""
+    return sorted(_registry)
+
+
+# Export for convenience
+__all__ = [
+    "register_strategy",
+    "get_strategy_class",
+    "create_strategy",
+    "available_strategies",
+]
@@ -0,0 +1,122 @@
+"""
+TradeForge AaaS - Trading Strategy: RSI Oversold/Overbought
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Relative Strength Index (RSI) Mean-Reversion Strategy
+
+Strategy Logic:
+- BUY when RSI crosses back above the oversold level
+- SELL when RSI crosses above the overbought level
+"""
+
+from typing import Dict, Optional, Sequence, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import ArrayLike, IndicatorCache, IndicatorSeries
+
+logger = logging.getLogger(__name__)
+
+
+class RSIStrategy(BaseStrategy):
+    """
+    RSI Oversold/Overbought Trading Strategy.
+
+    Parameters:
+        rsi_period: RSI period (default: 14)
+        oversold: Oversold level (default: 30)
+        overbought: Overbought level (default: 70)
+        stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct:
+            See BaseStrategy
+    """
+
+    strategy_type = "rsi"
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        oversold: float = 30.0,
+        overbought: float = 70.0,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
+        position_size_pct: float = 100.0,
+        trailing_stop_pct: Optional[float] = None,
+    ):
+        """Initialize strategy parameters."""
+        super().__init__(stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct)
+        if not 0 < oversold < overbought < 100:
+            raise ValueError("Levels must satisfy 0 < oversold < overbought < 100")
+
+        self.rsi_period = rsi_period
+        self.oversold = oversold
+        self.overbought = overbought
+
+        logger.info(
+            f"Initialized RSI Strategy: period={rsi_period}, "
+            f"oversold={oversold}, overbought={overbought}"
+        )
+
+    @property
+    def warmup_bars(self) -> int:
+        """The first RSI value needs rsi_period changes; crossings need one more bar."""
+        return self.rsi_period + 1
+
+    def calculate_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate RSI and level-crossing events.
+
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
+
+        Returns:
+            DataFrame with RSI and position columns
+        """
+        rsi = self.close_series(df, indicators).rsi(self.rsi_period)
+
+        df = df.copy()
+        df['RSI'] = rsi
+        df['position'] = self.events(rsi > self.oversold, rsi > self.overbought)
+
+        return df
+
+    def indicator_arrays(
+        self,
+        close: Union[ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate RSI and level-crossing events from close prices alone.
+
+        Args:
+            close: Close prices, or an IndicatorSeries already bound to a cache
+            indicators: Shared indicator cache (default: one private to this call)
+            out: Buffers to write columns into, keyed by column name
+            columns: Columns to return (default: all)
+
+        Returns:
+            RSI (float32) and position (int8)
+        """
+        rsi = self.close_series(close, indicators).rsi(self.rsi_period)
+
+        arrays = {
+            'RSI': rsi,
+            'position': self.events(rsi > self.oversold, rsi > self.overbought),
+        }
+        return self.pack_arrays(arrays, out, columns)
+
+
+# Export for convenience
+__all__ = ["RSIStrategy"]
@@ -10,6 +10,7 @@ Simple Moving Average (SMA) Crossover Strategy
 Strategy Logic:
 - BUY when fast SMA crosses above slow SMA (Golden Cross)
 - SELL when fast SMA crosses below slow SMA (Death Cross)
+- SELL earlier when the bar range hits the stop loss, trailing stop or take profit
 
 This is a basic example strategy for educational purposes.
 Always backtest thoroughly before using in live trading.
@@ -17,14 +18,17 @@ Always backtest thoroughly before using in live trading.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List, Tuple
-from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, List, Sequence, Union
 import logging
+import math
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import ArrayLike, IndicatorCache, IndicatorSeries
 
 logger = logging.getLogger(__name__)
 
 
-class SMACrossoverStrategy:
+class SMACrossoverStrategy(BaseStrategy):
     """
     Simple Moving Average (SMA) Crossover Trading Strategy.
     
@@ -33,22 +37,28 @@ class SMACrossoverStrategy:
         slow_period: Period for slow SMA (default: 50)
         stop_loss_pct: Stop loss percentage (default: 2.0)
         take_profit_pct: Take profit percentage (default: 5.0)
+        position_size_pct: Position size as percent of capital (default: 100.0)
+        trailing_stop_pct: Trailing stop percentage below the highest high
+            since entry (default: None)
+    
+    Stop loss, take profit and trailing stop follow BaseStrategy's fill policy.
     """
     
+    strategy_type = "sma_crossover"
+    
     def __init__(
         self,
         fast_period: int = 20,
         slow_period: int = 50,
-        stop_loss_pct: float = 2.0,
-        take_profit_pct: float = 5.0,
+        stop_loss_pct: Optional[float] = 2.0,
+        take_profit_pct: Optional[float] = 5.0,
         position_size_pct: float = 100.0,
+        trailing_stop_pct: Optional[float] = None,
     ):
         """Initialize strategy parameters."""
+        super().__init__(stop_loss_pct, take_profit_pct, position_size_pct, trailing_stop_pct)
         self.fast_period = fast_period
         self.slow_period = slow_period
-        self.stop_loss_pct = stop_loss_pct
-        self.take_profit_pct = take_profit_pct
-        self.position_size_pct = position_size_pct
         
         # Validate parameters
         if fast_period >= slow_period:
@@ -57,24 +67,35 @@ class SMACrossoverStrategy:
         logger.info(
             f"Initialized SMA Crossover Strategy: "
             f"fast={fast_period}, slow={slow_period}, "
-            f"SL={stop_loss_pct}%, TP={take_profit_pct}%"
+            f"SL={stop_loss_pct}%, TP={take_profit_pct}%, trailing={trailing_stop_pct}%"
         )
     
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    @property
+    def warmup_bars(self) -> int:
+        """Trading starts once the slow SMA is defined."""
+        return self.slow_period
+    
+    def calculate_indicators(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
         """
         Calculate technical indicators.
         
         Args:
             df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
         
         Returns:
             DataFrame with added indicator columns
         """
+        close = self.close_series(df, indicators)
         df = df.copy()
         
         # Calculate SMAs
-        df['SMA_fast'] = df['close'].rolling(window=self.fast_period).mean()
-        df['SMA_slow'] = df['close'].rolling(window=self.slow_period).mean()
+        df['SMA_fast'] = close.sma(self.fast_period)
+        df['SMA_slow'] = close.sma(self.slow_period)
         
         # Calculate crossover signals
         df['signal'] = 0
@@ -86,186 +107,319 @@ class SMACrossoverStrategy:
         
         return df
     
-    def generate_signals(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def indicator_arrays(
+        self,
+        close: Union[ArrayLike, IndicatorSeries],
+        indicators: Optional[IndicatorCache] = None,
+        out: Optional[Dict[str, np.ndarray]] = None,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Dict[str, np.ndarray]:
         """
-        Generate trading signals from price data.
+        Calculate SMAs and crossovers from close prices alone.
+        
+        Crossovers are decided on the SMAs as the cache stores them: with the
+        default float64 cache they match calculate_indicators exactly, with a
+        precision='float32' cache they compare the rounded SMAs, so a crossover
+        where the two SMAs are within float32 rounding can move or vanish.
+        
+        Args:
+            close: Close prices, or an IndicatorSeries already bound to a cache
+            indicators: Shared indicator cache (default: one private to this call)
+            out: Buffers to write columns into, keyed by column name
+            columns: Columns to return (default: all)
+        
+        Returns:
+            SMA_fast, SMA_slow (float32), signal and position (int8)
+        """
+        close = self.close_series(close, indicators)
+        fast = close.sma(self.fast_period)
+        slow = close.sma(self.slow_period)
+        signal = self.regime(fast > slow, fast < slow)
+        
+        arrays = {
+            'SMA_fast': fast,
+            'SMA_slow': slow,
+            'signal': signal,
+            'position': self.crossings(signal),
+        }
+        return self.pack_arrays(arrays, out, columns)
+    
+    def extract_signals(
+        self,
+        df: pd.DataFrame,
+        indicators: Optional[IndicatorCache] = None
+    ) -> pd.DataFrame:
+        """
+        Extract crossover signals as a columnar frame.
+        
+        Crossovers are located with boolean masks over the int8 position
+        array from indicator_arrays, so the cost does not grow with per-row
+        Python work and df is never copied.
         
         Args:
             df: DataFrame with OHLCV data
+            indicators: Shared indicator cache (default: one private to this call)
         
         Returns:
-            List of signal dictionaries
+            DataFrame indexed by signal timestamp with columns:
+            bar (row number), side (1 = BUY, -1 = SELL), price, stop_loss,
+            take_profit (NaN for SELL), fast_sma, slow_sma
         """
-        df = self.calculate_indicators(df)
+        close = self.close_series(df, indicators)
+        cross = self.indicator_arrays(close, columns=('position',))['position']
         
-        signals = []
+        bars = np.flatnonzero((cross == 2) | (cross == -2))
+        side = np.where(cross[bars] > 0, 1, -1).astype(np.int8)
+        price = close.values[bars]
+        is_buy = side > 0
+        stop_loss, take_profit = self.exit_levels(price, price)
         
-        for i in range(len(df)):
-            row = df.iloc[i]
-            
+        signals = pd.DataFrame(
+            {
+                'bar': bars.astype(np.int64),
+                'side': side,
+                'price': price,
+                'stop_loss': np.where(is_buy & np.isfinite(stop_loss), stop_loss, np.nan),
+                'take_profit': np.where(is_buy & np.isfinite(take_profit), take_profit, np.nan),
+                'fast_sma': close.sma(self.fast_period)[bars],
+                'slow_sma': close.sma(self.slow_period)[bars],
+            },
+            index=df.index[bars],
+        )
+        
+        logger.debug(
+            f"Extracted {int(is_buy.sum())} BUY and {int((~is_buy).sum())} SELL signals"
+        )
+        
+        return signals
+    
+    def iter_signal_dicts(self, signals: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily convert extract_signals output to signal dictionaries.
+        
+        Args:
+            signals: DataFrame returned by extract_signals
+        
+        Yields:
+            Signal dictionaries in the generate_signals format
+        """
+        columns = zip(
+            signals.index,
+            signals['side'].to_numpy(),
+            signals['price'].to_numpy(),
+            signals['stop_loss'].to_numpy(),
+            signals['take_profit'].to_numpy(),
+            signals['fast_sma'].to_numpy(),
+            signals['slow_sma'].to_numpy(),
+        )
+        
+        for timestamp, side, price, stop_loss, take_profit, fast_sma, slow_sma in columns:
             # Golden Cross (bullish signal)
-            if row['position'] == 2:
-                signal = {
-                    'timestamp': row.name if isinstance(row.name, datetime) else df.index[i],
+            if side > 0:
+                yield {
+                    'timestamp': timestamp,
                     'type': 'BUY',
-                    'price': row['close'],
+                    'price': price,
                     'reason': 'Golden Cross (Fast SMA crossed above Slow SMA)',
-                    'stop_loss': row['close'] * (1 - self.stop_loss_pct / 100),
-                    'take_profit': row['close'] * (1 + self.take_profit_pct / 100),
+                    'stop_loss': stop_loss,
+                    'take_profit': take_profit,
                     'position_size': self.position_size_pct,
                     'indicators': {
-                        'fast_sma': row['SMA_fast'],
-                        'slow_sma': row['SMA_slow'],
+                        'fast_sma': fast_sma,
+                        'slow_sma': slow_sma,
                     }
                 }
-                signals.append(signal)
-                logger.info(f"BUY signal at {row['close']}")
             
             # Death Cross (bearish signal)
-            elif row['position'] == -2:
-                signal = {
-                    'timestamp': row.name if isinstance(row.name, datetime) else df.index[i],
+            else:
+                yield {
+                    'timestamp': timestamp,
                     'type': 'SELL',
-                    'price': row['close'],
+                    'price': price,
                     'reason': 'Death Cross (Fast SMA crossed below Slow SMA)',
                     'indicators': {
-                        'fast_sma': row['SMA_fast'],
-                        'slow_sma': row['SMA_slow'],
+                        'fast_sma': fast_sma,
+                        'slow_sma': slow_sma,
                     }
                 }
-                signals.append(signal)
-                logger.info(f"SELL signal at {row['close']}")
-        
-        return signals
     
-    def backtest(
-        self,
-        df: pd.DataFrame,
-        initial_capital: float = 10000.0,
-        commission: float = 0.001
-    ) -> Dict[str, Any]:
+    def generate_signals(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
-        Backtest the strategy.
+        Generate trading signals from price data.
         
         Args:
             df: DataFrame with OHLCV data
-            initial_capital: Starting capital
-            commission: Commission per trade (0.001 = 0.1%)
         
         Returns:
-            Dictionary with backtest results
+            List of signal dictionaries
+        """
+        return list(self.iter_signal_dicts(self.extract_signals(df)))
+    
+    def create_stream(self, history: Optional[pd.DataFrame] = None) -> "SMACrossoverStream":
         """
-        df = self.calculate_indicators(df)
+        Create an incremental evaluator for live bars.
         
-        # Initialize portfolio
-        capital = initial_capital
-        position = 0
-        entry_price = 0
-        trades = []
-        equity_curve = [initial_capital]
+        Args:
+            history: Optional OHLCV DataFrame used to warm up the SMAs
+                (only the last slow_period + 1 closes are read)
         
-        for i in range(self.slow_period, len(df)):
-            row = df.iloc[i]
-            
-            # Check for BUY signal
-            if row['position'] == 2 and position == 0:
-                # Calculate position size
-                position_value = capital * (self.position_size_pct / 100)
-                shares = position_value / row['close']
-                cost = shares * row['close'] * (1 + commission)
-                
-                if cost <= capital:
-                    position = shares
-                    entry_price = row['close']
-                    capital -= cost
-                    
-                    trades.append({
-                        'date': row.name,
-                        'type': 'BUY',
-                        'price': row['close'],
-                        'shares': shares,
-                        'capital': capital,
-                    })
-            
-            # Check for SELL signal
-            elif row['position'] == -2 and position > 0:
-                proceeds = position * row['close'] * (1 - commission)
-                capital += proceeds
-                
-                pnl = proceeds - (position * entry_price)
-                pnl_pct = (pnl / (position * entry_price)) * 100
-                
-                trades.append({
-                    'date': row.name,
-                    'type': 'SELL',
-                    'price': row['close'],
-                    'shares': position,
-                    'capital': capital,
-                    'pnl': pnl,
-                    'pnl_pct': pnl_pct,
-                })
-                
-                position = 0
-                entry_price = 0
-            
-            # Update equity curve
-            portfolio_value = capital + (position * row['close'] if position > 0 else 0)
-            equity_curve.append(portfolio_value)
-        
-        # Calculate metrics
-        final_capital = capital + (position * df.iloc[-1]['close'] if position > 0 else 0)
-        total_return = ((final_capital - initial_capital) / initial_capital) * 100
-        
-        # Calculate winning trades
-        winning_trades = [t for t in trades if t.get('pnl', 0) > 0]
-        win_rate = (len(winning_trades) / len([t for t in trades if 'pnl' in t])) * 100 if trades else 0
-        
-        # Calculate max drawdown
-        equity_series = pd.Series(equity_curve)
-        running_max = equity_series.expanding().max()
-        drawdown = (equity_series - running_max) / running_max * 100
-        max_drawdown = drawdown.min()
-        
-        # Calculate Sharpe ratio (simplified)
-        returns = equity_series.pct_change().dropna()
-        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if len(returns) > 0 else 0
-        
-        results = {
-            'initial_capital': initial_capital,
-            'final_capital': final_capital,
-            'total_return': total_return,
-            'total_trades': len(trades),
-            'winning_trades': len(winning_trades),
-            'win_rate': win_rate,
-            'max_drawdown': max_drawdown,
-            'sharpe_ratio': sharpe_ratio,
-            'trades': trades,
-            'equity_curve': equity_curve,
-        }
+        Returns:
+            SMACrossoverStream for this strategy's periods
+        """
+        stream = SMACrossoverStream(self.fast_period, self.slow_period)
         
-        logger.info(f"Backtest complete: Return={total_return:.2f}%, Win Rate={win_rate:.2f}%")
+        if history is not None:
+            for close in history['close'].to_numpy(dtype=np.float64)[-(self.slow_period + 1):]:
+                stream.update(close)
         
-        return results
+        return stream
+
+
+class SMACrossoverStream:
+    """
+    Incremental SMA crossover evaluator.
+    
+    Keeps a ring buffer of the last slow_period closes and running sums for
+    both windows, so each new bar is O(1). Signals match get_current_signal
+    evaluated on the full history up to ties: running sums and the batch
+    rolling sums round differently, so on a bar where the two SMAs are equal
+    (or on the bar after) one path can see a crossover the other does not.
+    
+    Parameters:
+        fast_period: Period for fast SMA
+        slow_period: Period for slow SMA
+    """
+    
+    # Running sums are recomputed from the buffer this often to cancel drift
+    RESYNC_INTERVAL = 1024
     
-    def get_current_signal(self, df: pd.DataFrame) -> Optional[str]:
+    def __init__(self, fast_period: int, slow_period: int):
+        """Initialize empty stream state."""
+        if fast_period >= slow_period:
+            raise ValueError("Fast period must be less than slow period")
+        
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self._buffer = [0.0] * slow_period
+        self._count = 0
+        self._fast_sum = 0.0
+        self._slow_sum = 0.0
+        self._signal: Optional[int] = None
+    
+    @property
+    def bars_seen(self) -> int:
+        """Number of bars consumed so far."""
+        return self._count
+    
+    @property
+    def fast_sma(self) -> float:
+        """Current fast SMA (NaN until fast_period bars are seen)."""
+        if self._count < self.fast_period:
+            return float('nan')
+        return self._fast_sum / self.fast_period
+    
+    @property
+    def slow_sma(self) -> float:
+        """Current slow SMA (NaN until slow_period bars are seen)."""
+        if self._count < self.slow_period:
+            return float('nan')
+        return self._slow_sum / self.slow_period
+    
+    def update(self, close: float) -> Optional[str]:
         """
-        Get current signal based on latest data.
+        Consume one closed bar.
         
         Args:
-            df: DataFrame with OHLCV data
+            close: Bar close price
         
         Returns:
-            'BUY', 'SELL', or None
+            'BUY' on a golden cross, 'SELL' on a death cross, otherwise None
         """
-        df = self.calculate_indicators(df)
-        latest = df.iloc[-1]
+        close = float(close)
+        slot = self._count % self.slow_period
         
-        if latest['position'] == 2:
-            return 'BUY'
-        elif latest['position'] == -2:
-            return 'SELL'
+        if self._count >= self.fast_period:
+            self._fast_sum -= self._buffer[(self._count - self.fast_period) % self.slow_period]
+        if self._count >= self.slow_period:
+            self._slow_sum -= self._buffer[slot]
+        
+        self._buffer[slot] = close
+        self._fast_sum += close
+        self._slow_sum += close
+        self._count += 1
+        
+        if self._count % self.RESYNC_INTERVAL == 0:
+            self._resync()
+        
+        fast_sma = self.fast_sma
+        slow_sma = self.slow_sma
+        if fast_sma > slow_sma:
+            signal = 1
+        elif fast_sma < slow_sma:
+            signal = -1
         else:
+            signal = 0
+        
+        previous = self._signal
+        self._signal = signal
+        
+        if previous is None:
             return None
+        if signal - previous == 2:
+            return 'BUY'
+        if signal - previous == -2:
+            return 'SELL'
+        return None
+    
+    def _resync(self) -> None:
+        """Recompute running sums exactly from the ring buffer."""
+        window = [
+            self._buffer[(self._count - k) % self.slow_period]
+            for k in range(1, min(self._count, self.slow_period) + 1)
+        ]
+        self._fast_sum = math.fsum(window[:self.fast_period])
+        self._slow_sum = math.fsum(window)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Capture the stream state.
+        
+        Returns:
+            JSON-serializable state dictionary (see restore)
+        """
+        return {
+            'fast_period': self.fast_period,
+            'slow_period': self.slow_period,
+            'buffer': list(self._buffer),
+            'count': self._count,
+            'fast_sum': self._fast_sum,
+            'slow_sum': self._slow_sum,
+            'signal': self._signal,
+        }
+    
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> "SMACrossoverStream":
+        """
+        Rebuild a stream from a snapshot.
+        
+        Args:
+            state: Dictionary returned by snapshot
+        
+        Returns:
+            SMACrossoverStream continuing exactly where the snapshot left off
+        """
+        stream = cls(state['fast_period'], state['slow_period'])
+        
+        if len(state['buffer']) != stream.slow_period:
+            raise ValueError("Snapshot buffer does not match slow period")
+        
+        stream._buffer = [float(value) for value in state['buffer']]
+        stream._count = int(state['count'])
+        stream._fast_sum = float(state['fast_sum'])
+        stream._slow_sum = float(state['slow_sum'])
+        stream._signal = state['signal']
+        
+        return stream
 
 
 # Example usage
@@ -0,0 +1,924 @@
+"""
+TradeForge AaaS - Tick Simulator
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Event-driven simulation of market, limit and stop orders on trade ticks and
+top-of-book quotes.
+
+Market data is loaded as structured arrays (TRADE_DTYPE / QUOTE_DTYPE, from
+.npy or .csv files), merged once into a time-ordered EVENT_DTYPE array and
+replayed in chunks. Everything the simulation schedules itself (order
+arrivals after latency, cancels, strategy timers) goes through a heap that is
+drained before each market event with the same or a later timestamp.
+Orders and fills are __slots__ objects and callbacks receive plain scalars,
+so the per-event cost stays at a few attribute reads when no order can fill.
+
+Fill model (FillModel):
+- Orders and cancels reach the exchange latency_ms after submission
+- Market orders take the opposite quote (the last trade price without
+  quotes), paying slippage_bps plus impact_bps per multiple of the displayed
+  size they exceed
+- Limit orders that are marketable on arrival fill like market orders, but
+  never beyond the limit; otherwise they rest and fill at the limit when a
+  trade prints through it or the opposite quote crosses it. At the limit
+  price, trades first consume the displayed size that was queued ahead
+- Stop orders trigger when a trade reaches the stop price (or the opposite
+  quote does) and then fill like market orders at the triggering price, so
+  gaps fill beyond the stop
+- Entry orders with stop_loss / take_profit get a one-cancels-other stop and
+  limit exit for the filled quantity. These exits only ever reduce the
+  position: if it was closed another way, they fill what is left of it and
+  the pair is cancelled
+- Cash and (without allow_short) position are checked on arrival, counting
+  sells already resting, and again at every fill: an order that has become
+  unaffordable or would go short fills what it still can and the rest fails
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import heapq
+import itertools
+import logging
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.schemas import OrderSide, OrderStatus, OrderType, TradeCreate
+
+logger = logging.getLogger(__name__)
+
+# Market data file layouts (timestamps in epoch milliseconds; side is the
+# aggressor: 1 buy, -1 sell, 0 unknown)
+TRADE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("price", "<f8"),
+    ("size", "<f8"),
+    ("side", "i1"),
+])
+QUOTE_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("bid_size", "<f8"),
+    ("ask_size", "<f8"),
+])
+
+# Merged replay layout; for quotes price/size hold the bid and its size
+EVENT_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("symbol", "<u2"),
+    ("kind", "u1"),
+    ("side", "i1"),
+    ("price", "<f8"),
+    ("size", "<f8"),
+    ("ask", "<f8"),
+    ("ask_size", "<f8"),
+])
+TRADE = 0
+QUOTE = 1
+
+# Events converted to Python scalars at a time
+CHUNK_EVENTS = 65536
+
+# Scheduled event kinds
+_ARRIVAL = 0
+_CANCEL = 1
+_TIMER = 2
+
+TickFile = Union[str, Path]
+
+
+def load_ticks(path: TickFile) -> np.ndarray:
+    """
+    Load trade ticks or quotes from a local file.
+
+    .npy files must hold TRADE_DTYPE or QUOTE_DTYPE records and are memory
+    mapped. .csv files need timestamp (epoch ms or ISO 8601) plus either
+    price, size/amount and optional side (buy/sell or 1/-1), or bid, ask
+    and optional bid_size/ask_size.
+
+    Args:
+        path: File path
+
+    Returns:
+        Structured array with TRADE_DTYPE or QUOTE_DTYPE
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        ticks = np.load(path, mmap_mode="r")
+        if ticks.dtype not in (TRADE_DTYPE, QUOTE_DTYPE):
+            raise ValueError(f"{path} holds {ticks.dtype}, expected TRADE_DTYPE or QUOTE_DTYPE")
+        return ticks
+
+    frame = pd.read_csv(path)
+    if pd.api.types.is_numeric_dtype(frame["timestamp"]):
+        timestamps = frame["timestamp"].to_numpy(dtype=np.int64)
+    else:
+        parsed = pd.to_datetime(frame["timestamp"], utc=True, format="ISO8601")
+        timestamps = pd.DatetimeIndex(parsed).asi8 // 1_000_000
+
+    if {"bid", "ask"} <= set(frame.columns):
+        ticks = np.zeros(len(frame), dtype=QUOTE_DTYPE)
+        for column in ("bid", "ask", "bid_size", "ask_size"):
+            if column in frame.columns:
+                ticks[column] = frame[column].to_numpy(dtype=np.float64)
+    else:
+        ticks = np.zeros(len(frame), dtype=TRADE_DTYPE)
+        ticks["price"] = frame["price"].to_numpy(dtype=np.float64)
+        size = frame["size"] if "size" in frame.columns else frame["amount"]
+        ticks["size"] = size.to_numpy(dtype=np.float64)
+        if "side" in frame.columns:
+            side = frame["side"]
+            if side.dtype == object:
+                side = side.str.lower().map({"buy": 1, "sell": -1}).fillna(0)
+            ticks["side"] = np.sign(side.to_numpy(dtype=np.float64)).astype(np.int8)
+    ticks["timestamp"] = timestamps
+
+    logger.info(f"Loaded {len(ticks)} {'quotes' if ticks.dtype == QUOTE_DTYPE else 'trades'}")
+    return ticks
+
+
+def save_ticks(path: TickFile, ticks: np.ndarray) -> None:
+    """
+    Store trade ticks or quotes as a .npy file readable by load_ticks.
+
+    Args:
+        path: Destination (.npy)
+        ticks: Structured array with TRADE_DTYPE or QUOTE_DTYPE
+    """
+    if ticks.dtype not in (TRADE_DTYPE, QUOTE_DTYPE):
+        raise ValueError(f"Expected TRADE_DTYPE or QUOTE_DTYPE, got {ticks.dtype}")
+    np.save(Path(path), np.ascontiguousarray(ticks))
+
+
+@dataclass(frozen=True)
+class FillModel:
+    """Execution assumptions of the simulated exchange (see module docstring)."""
+
+    latency_ms: int = 0
+    slippage_bps: float = 0.0
+    impact_bps: float = 0.0
+    commission: float = 0.001
+    queue_position: bool = True
+
+    def taker_price(self, sign: int, reference: float, quantity: float, depth: float) -> float:
+        """
+        Fill price of an aggressive order.
+
+        Args:
+            sign: 1 for buys, -1 for sells
+            reference: Opposite quote or last trade price
+            quantity: Order quantity
+            depth: Displayed size at the reference (0 or NaN if unknown)
+
+        Returns:
+            Price including slippage and size impact
+        """
+        bps = self.slippage_bps
+        if depth > 0 and quantity > depth:
+            bps += self.impact_bps * (quantity / depth - 1)
+        return reference * (1 + sign * bps / 10_000)
+
+
+class Order:
+    """One simulated order; price is the limit or the stop trigger."""
+
+    __slots__ = (
+        "id", "symbol", "sign", "order_type", "quantity", "price", "stop_loss",
+        "take_profit", "status", "filled_quantity", "average_price", "commission",
+        "submitted_at", "reference_price", "queue_ahead", "oco", "brackets", "reduce_only",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        symbol: int,
+        sign: int,
+        order_type: OrderType,
+        quantity: float,
+        price: Optional[float],
+        submitted_at: int,
+        reference_price: float,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+    ):
+        """Initialize a pending order."""
+        self.id = order_id
+        self.symbol = symbol
+        self.sign = sign
+        self.order_type = order_type
+        self.quantity = quantity
+        self.price = price
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.status = OrderStatus.PENDING
+        self.filled_quantity = 0.0
+        self.average_price = 0.0
+        self.commission = 0.0
+        self.submitted_at = submitted_at
+        self.reference_price = reference_price
+        self.queue_ahead = 0.0
+        self.oco: Optional["Order"] = None
+        self.brackets: Optional[Tuple["Order", "Order"]] = None
+        self.reduce_only = False
+
+    @property
+    def remaining(self) -> float:
+        """Quantity still to fill."""
+        return self.quantity - self.filled_quantity
+
+    @property
+    def side(self) -> OrderSide:
+        """Order side."""
+        return OrderSide.BUY if self.sign > 0 else OrderSide.SELL
+
+
+class Fill:
+    """One execution of an order."""
+
+    __slots__ = (
+        "order_id", "symbol", "timestamp", "sign", "price", "quantity",
+        "commission", "liquidity", "slippage_bps",
+    )
+
+    def __init__(
+        self,
+        order_id: int,
+        symbol: str,
+        timestamp: int,
+        sign: int,
+        price: float,
+        quantity: float,
+        commission: float,
+        liquidity: str,
+        slippage_bps: float,
+    ):
+        """Record the execution."""
+        self.order_id = order_id
+        self.symbol = symbol
+        self.timestamp = timestamp
+        self.sign = sign
+        self.price = price
+        self.quantity = quantity
+        self.commission = commission
+        self.liquidity = liquidity
+        self.slippage_bps = slippage_bps
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fill as a plain dictionary."""
+        return {
+            "order_id": self.order_id,
+            "symbol": self.symbol,
+            "timestamp": pd.Timestamp(self.timestamp, unit="ms", tz="UTC"),
+            "side": OrderSide.BUY.value if self.sign > 0 else OrderSide.SELL.value,
+            "price": self.price,
+            "quantity": self.quantity,
+            "commission": self.commission,
+            "liquidity": self.liquidity,
+            "slippage_bps": self.slippage_bps,
+        }
+
+
+class TickStrategy:
+    """
+    Callbacks of a tick-level strategy; override the ones you need.
+
+    Callbacks that are not overridden are never called, so unused hooks
+    cost nothing per event.
+    """
+
+    def on_start(self, sim: "TickSimulator") -> None:
+        """Called before the first event."""
+
+    def on_trade(
+        self,
+        sim: "TickSimulator",
+        timestamp: int,
+        symbol: str,
+        price: float,
+        size: float,
+        side: int,
+    ) -> None:
+        """Called for every trade tick, after resting orders were matched."""
+
+    def on_quote(
+        self,
+        sim: "TickSimulator",
+        timestamp: int,
+        symbol: str,
+        bid: float,
+        ask: float,
+        bid_size: float,
+        ask_size: float,
+    ) -> None:
+        """Called for every top-of-book update, after resting orders were matched."""
+
+    def on_fill(self, sim: "TickSimulator", fill: Fill, order: Order) -> None:
+        """Called for every (partial) fill."""
+
+    def on_timer(self, sim: "TickSimulator", timestamp: int, data: Any) -> None:
+        """Called for timers scheduled with TickSimulator.schedule."""
+
+    def on_finish(self, sim: "TickSimulator") -> None:
+        """Called after the last event."""
+
+
+class TickSimulator:
+    """
+    Replay market data through a strategy and a simulated exchange.
+
+    Parameters:
+        strategy: TickStrategy receiving the callbacks
+        initial_capital: Starting cash (default: 10000.0)
+        fill_model: Execution assumptions (default: FillModel())
+        allow_short: Accept sells beyond the current position (default: False)
+        exchange: Exchange name put on orders built by place_order
+    """
+
+    def __init__(
+        self,
+        strategy: TickStrategy,
+        initial_capital: float = 10000.0,
+        fill_model: Optional[FillModel] = None,
+        allow_short: bool = False,
+        exchange: str = "simulator",
+    ):
+        """Initialize an empty simulation."""
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.fill_model = fill_model or FillModel()
+        self.allow_short = allow_short
+        self.exchange = exchange
+
+        self.cash = initial_capital
+        self.now = 0
+        self.orders: Dict[int, Order] = {}
+        self.fills: List[Fill] = []
+        self.equity_curve: List[Tuple[int, float]] = []
+
+        self._feeds: List[Tuple[int, int, np.ndarray]] = []
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._positions: List[float] = []
+        self._last: List[float] = []
+        self._bid: List[float] = []
+        self._ask: List[float] = []
+        self._bid_size: List[float] = []
+        self._ask_size: List[float] = []
+        self._resting: List[List[Order]] = []
+        # Trades at or below _trigger_lo / at or above _trigger_hi may fill a resting order
+        self._trigger_lo: List[float] = []
+        self._trigger_hi: List[float] = []
+        self._heap: List[Tuple[int, int, int, Any]] = []
+        self._sequence = itertools.count()
+        self._order_ids = itertools.count(1)
+        self._on_fill = self._callback("on_fill")
+
+    # ------------------------------------------------------------------
+    # Setup
+    # ------------------------------------------------------------------
+
+    def _symbol_id(self, symbol: str) -> int:
+        """Index of a symbol, registering it on first use."""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self._symbols)
+            self._symbol_ids[symbol] = symbol_id
+            self._symbols.append(symbol)
+            for state, initial in (
+                (self._positions, 0.0),
+                (self._last, math.nan),
+                (self._bid, math.nan),
+                (self._ask, math.nan),
+                (self._bid_size, 0.0),
+                (self._ask_size, 0.0),
+                (self._trigger_lo, -math.inf),
+                (self._trigger_hi, math.inf),
+            ):
+                state.append(initial)
+            self._resting.append([])
+        return symbol_id
+
+    def add_trades(self, symbol: str, trades: Union[np.ndarray, TickFile]) -> None:
+        """
+        Add a trade tick feed.
+
+        Args:
+            symbol: Trading pair
+            trades: TRADE_DTYPE array or a file for load_ticks
+        """
+        if not isinstance(trades, np.ndarray):
+            trades = load_ticks(trades)
+        if trades.dtype != TRADE_DTYPE:
+            raise ValueError(f"Expected TRADE_DTYPE trades, got {trades.dtype}")
+        self._feeds.append((self._symbol_id(symbol), TRADE, trades))
+
+    def add_quotes(self, symbol: str, quotes: Union[np.ndarray, TickFile]) -> None:
+        """
+        Add a top-of-book quote feed.
+
+        Args:
+            symbol: Trading pair
+            quotes: QUOTE_DTYPE array or a file for load_ticks
+        """
+        if not isinstance(quotes, np.ndarray):
+            quotes = load_ticks(quotes)
+        if quotes.dtype != QUOTE_DTYPE:
+            raise ValueError(f"Expected QUOTE_DTYPE quotes, got {quotes.dtype}")
+        self._feeds.append((self._symbol_id(symbol), QUOTE, quotes))
+
+    def _merged_events(self) -> np.ndarray:
+        """All feeds as one EVENT_DTYPE array in time order (ties keep feed order)."""
+        total = sum(len(ticks) for _, _, ticks in self._feeds)
+        events = np.empty(total, dtype=EVENT_DTYPE)
+        offset = 0
+        for symbol_id, kind, ticks in self._feeds:
+            block = events[offset:offset + len(ticks)]
+            block["timestamp"] = ticks["timestamp"]
+            block["symbol"] = symbol_id
+            block["kind"] = kind
+            if kind == TRADE:
+                block["side"] = ticks["side"]
+                block["price"] = ticks["price"]
+                block["size"] = ticks["size"]
+                block["ask"] = math.nan
+                block["ask_size"] = 0.0
+            else:
+                block["side"] = 0
+                block["price"] = ticks["bid"]
+                block["size"] = ticks["bid_size"]
+                block["ask"] = ticks["ask"]
+                block["ask_size"] = ticks["ask_size"]
+            offset += len(ticks)
+
+        if len(self._feeds) > 1 or np.any(np.diff(events["timestamp"]) < 0):
+            events = events[np.argsort(events["timestamp"], kind="stable")]
+        return events
+
+    def _callback(self, name: str) -> Optional[Callable]:
+        """Bound strategy callback, or None if the strategy keeps the no-op default."""
+        if getattr(type(self.strategy), name) is getattr(TickStrategy, name):
+            return None
+        return getattr(self.strategy, name)
+
+    # ------------------------------------------------------------------
+    # Event loop
+    # ------------------------------------------------------------------
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Replay every feed through the strategy.
+
+        Returns:
+            Dictionary with capital, return, positions, fills, order counts,
+            execution statistics and throughput
+        """
+        events = self._merged_events()
+        on_trade = self._callback("on_trade")
+        on_quote = self._callback("on_quote")
+        heap = self._heap
+        names = self._symbols
+        last = self._last
+        bids, asks = self._bid, self._ask
+        bid_sizes, ask_sizes = self._bid_size, self._ask_size
+        trigger_lo, trigger_hi = self._trigger_lo, self._trigger_hi
+        match_trade, match_quote = self._match_trade, self._match_quote
+
+        started = time.perf_counter()
+        self.strategy.on_start(self)
+
+        for chunk_start in range(0, len(events), CHUNK_EVENTS):
+            chunk = events[chunk_start:chunk_start + CHUNK_EVENTS]
+            columns = [chunk[field].tolist() for field in EVENT_DTYPE.names]
+            for timestamp, symbol, kind, side, price, size, ask, ask_size in zip(*columns):
+                if heap and heap[0][0] <= timestamp:
+                    self._run_scheduled(timestamp)
+                self.now = timestamp
+
+                if kind == TRADE:
+                    last[symbol] = price
+                    if price <= trigger_lo[symbol] or price >= trigger_hi[symbol]:
+                        match_trade(symbol, price, size, side)
+                    if on_trade is not None:
+                        on_trade(self, timestamp, names[symbol], price, size, side)
+                else:
+                    bids[symbol] = price
+                    asks[symbol] = ask
+                    bid_sizes[symbol] = size
+                    ask_sizes[symbol] = ask_size
+                    if price <= trigger_lo[symbol] or ask >= trigger_hi[symbol]:
+                        match_quote(symbol, price, ask, size, ask_size)
+                    if on_quote is not None:
+                        on_quote(self, timestamp, names[symbol], price, ask, size, ask_size)
+
+        # Work due by the last market event still runs; anything later never
+        # happens (those orders stay open), as the data ends there
+        if len(events):
+            self._run_scheduled(int(events["timestamp"][-1]))
+        self.strategy.on_finish(self)
+        elapsed = time.perf_counter() - started
+
+        return self._summarize(len(events), elapsed)
+
+    def _run_scheduled(self, until: float) -> None:
+        """Process scheduled events up to (and including) a timestamp."""
+        heap = self._heap
+        while heap and heap[0][0] <= until:
+            timestamp, _, kind, payload = heapq.heappop(heap)
+            self.now = timestamp
+            if kind == _ARRIVAL:
+                self._arrive(payload)
+            elif kind == _CANCEL:
+                self._cancel_now(payload)
+            else:
+                self.strategy.on_timer(self, timestamp, payload)
+
+    def _push(self, timestamp: int, kind: int, payload: Any) -> None:
+        """Schedule an event (ties run in scheduling order)."""
+        heapq.heappush(self._heap, (timestamp, next(self._sequence), kind, payload))
+
+    # ------------------------------------------------------------------
+    # Strategy API
+    # ------------------------------------------------------------------
+
+    def submit_order(self, trade: TradeCreate) -> Order:
+        """
+        Submit an order; it reaches the exchange after the fill model's latency.
+
+        Args:
+            trade: Order request; price is the limit for LIMIT orders and the
+                trigger for STOP orders
+
+        Returns:
+            The pending Order
+        """
+        if trade.order_type != OrderType.MARKET and trade.price is None:
+            raise ValueError(f"{trade.order_type.value} orders need a price")
+
+        symbol = self._symbol_id(trade.symbol)
+        order = Order(
+            next(self._order_ids),
+            symbol,
+            1 if trade.side == OrderSide.BUY else -1,
+            trade.order_type,
+            trade.quantity,
+            trade.price,
+            self.now,
+            self._mid(symbol),
+            trade.stop_loss,
+            trade.take_profit,
+        )
+        self.orders[order.id] = order
+        self._push(self.now + self.fill_model.latency_ms, _ARRIVAL, order)
+        return order
+
+    def place_order(
+        self,
+        symbol: str,
+        side: Union[OrderSide, str],
+        quantity: float,
+        order_type: Union[OrderType, str] = OrderType.MARKET,
+        price: Optional[float] = None,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+    ) -> Order:
+        """Build a TradeCreate and submit it (see submit_order)."""
+        return self.submit_order(TradeCreate(
+            exchange=self.exchange,
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+        ))
+
+    def cancel(self, order: Order) -> None:
+        """Request a cancel; it reaches the exchange after the fill model's latency."""
+        self._push(self.now + self.fill_model.latency_ms, _CANCEL, order)
+
+    def schedule(self, timestamp: int, data: Any = None) -> None:
+        """Call strategy.on_timer(sim, timestamp, data) at a future time."""
+        self._push(max(int(timestamp), self.now), _TIMER, data)
+
+    def position(self, symbol: str) -> float:
+        """Signed position in a symbol."""
+        symbol_id = self._symbol_ids.get(symbol)
+        return 0.0 if symbol_id is None else self._positions[symbol_id]
+
+    def quote(self, symbol: str) -> Tuple[float, float]:
+        """Latest (bid, ask) of a symbol, NaN when unknown."""
+        symbol_id = self._symbol_ids[symbol]
+        return self._bid[symbol_id], self._ask[symbol_id]
+
+    def last_price(self, symbol: str) -> float:
+        """Latest trade price of a symbol, NaN when unknown."""
+        return self._last[self._symbol_ids[symbol]]
+
+    def equity(self) -> float:
+        """Cash plus positions marked at the latest mid (or trade) price."""
+        value = self.cash
+        for symbol_id, position in enumerate(self._positions):
+            if position:
+                value += position * self._mid(symbol_id)
+        return value
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _mid(self, symbol: int) -> float:
+        """Mid quote, falling back to the last trade price."""
+        bid, ask = self._bid[symbol], self._ask[symbol]
+        if bid == bid and ask == ask:
+            return (bid + ask) / 2
+        return self._last[symbol]
+
+    def _taker_reference(self, order: Order) -> Tuple[float, float]:
+        """Opposite quote and its size, or the last trade price with unknown size."""
+        symbol = order.symbol
+        if order.sign > 0 and self._ask[symbol] == self._ask[symbol]:
+            return self._ask[symbol], self._ask_size[symbol]
+        if order.sign < 0 and self._bid[symbol] == self._bid[symbol]:
+            return self._bid[symbol], self._bid_size[symbol]
+        return self._last[symbol], 0.0
+
+    def _arrive(self, order: Order) -> None:
+        """An order reaches the exchange: fill, rest or reject it."""
+        if order.status != OrderStatus.PENDING:
+            return
+
+        reference, depth = self._taker_reference(order)
+        if reference != reference:
+            self._reject(order, "no market price")
+            return
+        estimate = order.price if order.order_type != OrderType.MARKET else reference
+        cost = order.quantity * estimate * (1 + self.fill_model.commission)
+        if order.sign > 0 and cost > self.cash:
+            self._reject(order, "insufficient cash")
+            return
+        if (order.sign < 0 and not self.allow_short
+                and order.quantity > self._unsold(order.symbol) + 1e-12):
+            self._reject(order, "insufficient position")
+            return
+
+        if order.order_type == OrderType.MARKET:
+            price = self.fill_model.taker_price(order.sign, reference, order.quantity, depth)
+            self._fill(order, price, order.quantity, "taker")
+        elif order.order_type == OrderType.LIMIT:
+            if order.sign * (order.price - reference) >= 0:
+                price = self.fill_model.taker_price(order.sign, reference, order.quantity, depth)
+                price = min(price, order.price) if order.sign > 0 else max(price, order.price)
+                self._fill(order, price, order.quantity, "taker")
+            else:
+                self._rest(order)
+        else:
+            if order.sign * (reference - order.price) >= 0:
+                price = self.fill_model.taker_price(order.sign, reference, order.quantity, depth)
+                self._fill(order, price, order.quantity, "taker")
+            else:
+                self._rest(order)
+
+    def _rest(self, order: Order) -> None:
+        """Add an order to its symbol's resting orders."""
+        if order.order_type == OrderType.LIMIT and self.fill_model.queue_position:
+            symbol = order.symbol
+            if order.sign > 0 and self._bid[symbol] == order.price:
+                order.queue_ahead = self._bid_size[symbol]
+            elif order.sign < 0 and self._ask[symbol] == order.price:
+                order.queue_ahead = self._ask_size[symbol]
+        self._resting[order.symbol].append(order)
+        self._refresh_triggers(order.symbol)
+
+    def _refresh_triggers(self, symbol: int) -> None:
+        """Recompute the trade prices that can fill a resting order of a symbol."""
+        lo, hi = -math.inf, math.inf
+        for order in self._resting[symbol]:
+            # Buy limits and sell stops fill on falling prices, the others on rising ones
+            if (order.sign > 0) == (order.order_type == OrderType.LIMIT):
+                lo = max(lo, order.price)
+            else:
+                hi = min(hi, order.price)
+        self._trigger_lo[symbol] = lo
+        self._trigger_hi[symbol] = hi
+
+    def _match_trade(self, symbol: int, price: float, size: float, side: int) -> None:
+        """Fill resting orders a trade tick reaches."""
+        model = self.fill_model
+        for order in list(self._resting[symbol]):
+            if order.status != OrderStatus.PENDING:
+                continue
+            sign = order.sign
+            if order.order_type == OrderType.LIMIT:
+                through = sign * (order.price - price)
+                if through > 0:
+                    self._fill(order, order.price, order.remaining, "maker")
+                elif through == 0 and sign * side <= 0:
+                    available = size
+                    if model.queue_position:
+                        used = min(order.queue_ahead, available)
+                        order.queue_ahead -= used
+                        available -= used
+                    if available > 0:
+                        self._fill(order, order.price, min(order.remaining, available), "maker")
+            elif sign * (price - order.price) >= 0:
+                fill_price = model.taker_price(sign, price, order.remaining, 0.0)
+                self._fill(order, fill_price, order.remaining, "taker")
+
+    def _match_quote(
+        self,
+        symbol: int,
+        bid: float,
+        ask: float,
+        bid_size: float,
+        ask_size: float,
+    ) -> None:
+        """Fill resting orders a quote update crosses."""
+        model = self.fill_model
+        for order in list(self._resting[symbol]):
+            if order.status != OrderStatus.PENDING:
+                continue
+            sign = order.sign
+            opposite = ask if sign > 0 else bid
+            if order.order_type == OrderType.LIMIT:
+                if sign * (order.price - opposite) > 0:
+                    self._fill(order, order.price, order.remaining, "maker")
+            elif sign * (opposite - order.price) >= 0:
+                depth = ask_size if sign > 0 else bid_size
+                fill_price = model.taker_price(sign, opposite, order.remaining, depth)
+                self._fill(order, fill_price, order.remaining, "taker")
+
+    def _fill(self, order: Order, price: float, quantity: float, liquidity: str) -> None:
+        """Execute part or all of an order and settle cash and position."""
+        sign = order.sign
+        fillable = self._fillable(order, price)
+        if quantity > fillable + 1e-12:
+            # Position or cash changed since the order was accepted: fill what
+            # is left, drop the rest (bracket exits also drop their pair)
+            order.quantity = order.filled_quantity + fillable
+            quantity = fillable
+            if order.reduce_only and order.oco is not None:
+                self._cancel_now(order.oco)
+            if quantity <= 1e-12:
+                if order.reduce_only or order.filled_quantity > 0:
+                    self._cancel_now(order)
+                else:
+                    self._unrest(order)
+                    reason = "insufficient cash" if sign > 0 else "insufficient position"
+                    self._reject(order, reason)
+                return
+        commission = quantity * price * self.fill_model.commission
+        self.cash -= sign * quantity * price + commission
+        self._positions[order.symbol] += sign * quantity
+
+        filled = order.filled_quantity + quantity
+        order.average_price = (
+            order.average_price * order.filled_quantity + price * quantity
+        ) / filled
+        order.filled_quantity = filled
+        order.commission += commission
+        reference = order.reference_price
+        slippage = sign * (price - reference) / reference * 10_000 if reference else math.nan
+
+        fill = Fill(
+            order.id, self._symbols[order.symbol], self.now, sign, price, quantity,
+            commission, liquidity, slippage,
+        )
+        self.fills.append(fill)
+
+        if order.remaining <= 1e-12:
+            order.status = OrderStatus.FILLED
+            self._unrest(order)
+        if order.stop_loss is not None or order.take_profit is not None:
+            self._protect(order, quantity)
+        sibling = order.oco
+        if sibling is not None and sibling.status == OrderStatus.PENDING:
+            sibling.quantity -= quantity
+            if sibling.remaining <= 1e-12:
+                self._cancel_now(sibling)
+
+        self.equity_curve.append((self.now, self.equity()))
+        if self._on_fill is not None:
+            self._on_fill(self, fill, order)
+
+    def _fillable(self, order: Order, price: float) -> float:
+        """Largest quantity of an order that can fill now without overspending or shorting."""
+        position = self._positions[order.symbol]
+        if order.reduce_only:
+            return max(-order.sign * position, 0.0)
+        if order.sign > 0:
+            return max(self.cash, 0.0) / (price * (1 + self.fill_model.commission))
+        return math.inf if self.allow_short else max(position, 0.0)
+
+    def _unsold(self, symbol: int) -> float:
+        """Position not yet committed to resting sells (bracket exits excluded)."""
+        committed = sum(
+            order.remaining for order in self._resting[symbol]
+            if order.sign < 0 and not order.reduce_only and order.status == OrderStatus.PENDING
+        )
+        return self._positions[symbol] - committed
+
+    def _protect(self, entry: Order, quantity: float) -> None:
+        """Place (or grow) the one-cancels-other exits of an entry order."""
+        if entry.brackets is not None:
+            for exit_order in entry.brackets:
+                if exit_order is not None and exit_order.status == OrderStatus.PENDING:
+                    exit_order.quantity += quantity
+            return
+
+        exits = []
+        for order_type, price in ((OrderType.STOP, entry.stop_loss),
+                                  (OrderType.LIMIT, entry.take_profit)):
+            if price is None:
+                exits.append(None)
+                continue
+            exit_order = Order(
+                next(self._order_ids), entry.symbol, -entry.sign, order_type, quantity,
+                price, self.now, self._mid(entry.symbol),
+            )
+            exit_order.reduce_only = True
+            self.orders[exit_order.id] = exit_order
+            self._rest(exit_order)
+            exits.append(exit_order)
+        stop, take = exits
+        if stop is not None and take is not None:
+            stop.oco, take.oco = take, stop
+        entry.brackets = (stop, take)
+
+    def _unrest(self, order: Order) -> None:
+        """Remove an order from the resting orders, if it was resting."""
+        resting = self._resting[order.symbol]
+        if order in resting:
+            resting.remove(order)
+            self._refresh_triggers(order.symbol)
+
+    def _cancel_now(self, order: Order) -> None:
+        """Cancel whatever is left of an order."""
+        if order.status == OrderStatus.PENDING:
+            order.status = OrderStatus.CANCELLED
+            self._unrest(order)
+
+    def _reject(self, order: Order, reason: str) -> None:
+        """Reject an order on arrival."""
+        order.status = OrderStatus.FAILED
+        logger.debug(f"Order {order.id} rejected: {reason}")
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def _summarize(self, events: int, elapsed: float) -> Dict[str, Any]:
+        """Build the run's result dictionary."""
+        final_capital = self.equity()
+        statuses = [order.status for order in self.orders.values()]
+        slippage = [fill.slippage_bps for fill in self.fills if not math.isnan(fill.slippage_bps)]
+        taker = sum(1 for fill in self.fills if fill.liquidity == "taker")
+
+        results = {
+            "initial_capital": self.initial_capital,
+            "final_capital": final_capital,
+            "total_return": (final_capital - self.initial_capital) / self.initial_capital * 100,
+            "positions": dict(zip(self._symbols, self._positions)),
+            "total_fills": len(self.fills),
+            "taker_fills": taker,
+            "maker_fills": len(self.fills) - taker,
+            "filled_orders": statuses.count(OrderStatus.FILLED),
+            "cancelled_orders": statuses.count(OrderStatus.CANCELLED),
+            "rejected_orders": statuses.count(OrderStatus.FAILED),
+            "open_orders": statuses.count(OrderStatus.PENDING),
+            "avg_slippage_bps": float(np.mean(slippage)) if slippage else 0.0,
+            "total_commission": sum(fill.commission for fill in self.fills),
+            "fills": [fill.to_dict() for fill in self.fills],
+            "equity_curve": self.equity_curve,
+            "events_processed": events,
+            "elapsed_seconds": elapsed,
+            "events_per_second": events / elapsed if elapsed > 0 else math.inf,
+        }
+
+        logger.info(
+            f"Tick simulation complete: {events} events in {elapsed:.2f}s, "
+            f"{len(self.fills)} fills, Return={results['total_return']:.2f}%"
+        )
+        return results
+
+
+# Export for convenience
+__all__ = [
+    "TickSimulator",
+    "TickStrategy",
+    "FillModel",
+    "Order",
+    "Fill",
+    "load_ticks",
+    "save_ticks",
+    "TRADE_DTYPE",
+    "QUOTE_DTYPE",
+    "EVENT_DTYPE",
+]
@@ -0,0 +1,249 @@
+"""
+TradeForge AaaS - Walk-Forward Analysis
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Walk-forward validation for SMA crossover parameters.
+
+The history is split into consecutive in-sample / out-of-sample windows. Each
+in-sample window is grid-optimized, the winning parameters are traded on the
+following out-of-sample window, and the out-of-sample equity is stitched into
+one curve. SMAs are computed once over the full history and sliced per
+window; windows are evaluated concurrently on a thread pool, which shares
+those arrays without copying (the NumPy kernels release the GIL).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.optimizer import (
+    RANK_METRICS,
+    SMACrossoverOptimizer,
+    evaluate_crossovers,
+    ohlc_arrays,
+    rolling_means,
+)
+
+logger = logging.getLogger(__name__)
+
+# (in-sample start, in-sample end, out-of-sample start, out-of-sample end), end exclusive
+Window = Tuple[int, int, int, int]
+
+
+class WalkForwardAnalyzer:
+    """
+    Rolling or anchored walk-forward analysis on top of SMACrossoverOptimizer.
+
+    Parameters:
+        in_sample_bars: Bars each optimization window covers
+        out_of_sample_bars: Bars each window is traded on (also the step size)
+        anchored: Grow in-sample windows from the first bar instead of rolling them
+        optimizer: Optimizer providing capital, commission, position size and stops
+        max_workers: Threads evaluating windows (default: os.cpu_count())
+    """
+
+    def __init__(
+        self,
+        in_sample_bars: int,
+        out_of_sample_bars: int,
+        anchored: bool = False,
+        optimizer: Optional[SMACrossoverOptimizer] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Initialize analyzer settings."""
+        if in_sample_bars < 2 or out_of_sample_bars < 2:
+            raise ValueError("Windows must span at least 2 bars")
+
+        self.in_sample_bars = in_sample_bars
+        self.out_of_sample_bars = out_of_sample_bars
+        self.anchored = anchored
+        self.optimizer = optimizer or SMACrossoverOptimizer()
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def windows(self, n: int) -> List[Window]:
+        """
+        Split n bars into walk-forward windows.
+
+        Args:
+            n: Number of bars in the history
+
+        Returns:
+            List of window bounds; a trailing partial out-of-sample window is kept
+        """
+        windows = []
+        oos_start = self.in_sample_bars
+        while oos_start < n:
+            is_start = 0 if self.anchored else oos_start - self.in_sample_bars
+            oos_end = min(oos_start + self.out_of_sample_bars, n)
+            if oos_end - oos_start < 2:
+                break
+            windows.append((is_start, oos_start, oos_start, oos_end))
+            oos_start += self.out_of_sample_bars
+        return windows
+
+    def run(
+        self,
+        df: pd.DataFrame,
+        fast_periods: Sequence[int],
+        slow_periods: Sequence[int],
+        rank_by: str = "sharpe_ratio",
+        stop_loss_pcts: Optional[Sequence[Optional[float]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Optimize on every in-sample window and trade the next out-of-sample window.
+
+        Args:
+            df: DataFrame with OHLCV data
+            fast_periods: Candidate fast SMA periods
+            slow_periods: Candidate slow SMA periods
+            rank_by: Metric used to pick each window's parameters
+            stop_loss_pcts: Candidate stop loss percents (see SMACrossoverOptimizer.build_grid)
+
+        Returns:
+            Dictionary with per-window results, the stitched out-of-sample
+            equity curve and its summary metrics
+        """
+        if rank_by not in RANK_METRICS:
+            raise ValueError(f"Unknown rank metric '{rank_by}'. Use one of {RANK_METRICS}")
+
+        grid = self.optimizer.build_grid(fast_periods, slow_periods, stop_loss_pcts)
+        if not grid:
+            raise ValueError("Parameter grid is empty (fast period must be less than slow period)")
+
+        close = df['close'].to_numpy(dtype=np.float64)
+        windows = self.windows(len(close))
+        if not windows:
+            raise ValueError(
+                f"Need more than {self.in_sample_bars} bars for one walk-forward window"
+            )
+
+        # Indicators only look back, so full-history SMAs sliced per window
+        # equal SMAs computed inside the window (minus the warm-up loss)
+        smas = rolling_means(
+            close, [w for combo in grid for w in combo[:2]], self.optimizer.precision
+        )
+        prices = ohlc_arrays(df)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(windows))) as executor:
+            rows = list(executor.map(
+                lambda window: self._run_window(close, prices, smas, grid, window, rank_by),
+                windows,
+            ))
+
+        results = self._stitch(df, windows, rows)
+        logger.info(
+            f"Walk-forward over {len(windows)} windows: "
+            f"out-of-sample return={results['total_return']:.2f}%"
+        )
+
+        return results
+
+    def _run_window(
+        self,
+        close: np.ndarray,
+        prices: Dict[str, np.ndarray],
+        smas: Dict[int, np.ndarray],
+        grid: List[tuple],
+        window: Window,
+        rank_by: str,
+    ) -> Dict[str, Any]:
+        """Optimize one in-sample window and evaluate its out-of-sample window."""
+        is_start, is_end, oos_start, oos_end = window
+        slow = np.array([combo[1] for combo in grid], dtype=np.int64)
+
+        in_sample = self.optimizer.evaluate(
+            close[is_start:is_end],
+            {w: values[is_start:is_end] for w, values in smas.items()},
+            grid,
+            start=np.maximum(slow - is_start, 0),
+            prices={column: values[is_start:is_end] for column, values in prices.items()},
+        )
+        ranked = in_sample[rank_by].to_numpy()
+        best = int(np.nanargmax(ranked)) if np.isfinite(ranked).any() else 0
+        fast_period, slow_period, stop_loss_pct = grid[best]
+
+        out_of_sample = evaluate_crossovers(
+            close[oos_start:oos_end],
+            smas[fast_period][None, oos_start:oos_end],
+            smas[slow_period][None, oos_start:oos_end],
+            np.array([max(slow_period - oos_start, 0)]),
+            initial_capital=self.optimizer.initial_capital,
+            commission=self.optimizer.commission,
+            position_size_pct=self.optimizer.position_size_pct,
+            include_equity=True,
+            stop_loss_pct=stop_loss_pct,
+            take_profit_pct=self.optimizer.take_profit_pct,
+            trailing_stop_pct=self.optimizer.trailing_stop_pct,
+            prices={column: values[oos_start:oos_end] for column, values in prices.items()},
+        )
+
+        return {
+            "fast_period": fast_period,
+            "slow_period": slow_period,
+            "stop_loss_pct": stop_loss_pct,
+            f"in_sample_{rank_by}": float(ranked[best]),
+            "in_sample_return": float(in_sample["total_return"].iloc[best]),
+            "total_return": float(out_of_sample["total_return"][0]),
+            "sharpe_ratio": float(out_of_sample["sharpe_ratio"][0]),
+            "max_drawdown": float(out_of_sample["max_drawdown"][0]),
+            "total_trades": int(out_of_sample["total_trades"][0]),
+            "equity": out_of_sample["equity"][0],
+        }
+
+    def _stitch(
+        self,
+        df: pd.DataFrame,
+        windows: List[Window],
+        rows: List[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Chain out-of-sample windows into one equity curve.
+
+        Each window starts flat; a position still open at its end is valued at
+        the last close and that value becomes the next window's capital.
+        """
+        initial_capital = self.optimizer.initial_capital
+        curves = []
+        capital = initial_capital
+        for row in rows:
+            equity = row.pop("equity")
+            curves.append(equity * (capital / initial_capital))
+            capital = curves[-1][-1]
+
+        oos_index = np.concatenate([np.arange(w[2], w[3]) for w in windows])
+        equity_curve = pd.Series(np.concatenate(curves), index=df.index[oos_index], name="equity")
+
+        table = pd.DataFrame(rows)
+        table.insert(0, "window", np.arange(len(windows)))
+        for i, column in enumerate(
+            ["in_sample_start", "in_sample_end", "out_of_sample_start", "out_of_sample_end"]
+        ):
+            # Store the last bar of each range (inclusive) as a label from the index
+            bounds = np.array([w[i] for w in windows]) - (i % 2)
+            table.insert(i + 1, column, df.index[bounds])
+
+        running_max = np.maximum.accumulate(np.maximum(equity_curve.to_numpy(), initial_capital))
+        returns = equity_curve.pct_change().dropna()
+        sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252) if len(returns) > 0 else 0
+
+        return {
+            "windows": table,
+            "equity_curve": equity_curve,
+            "initial_capital": initial_capital,
+            "final_capital": float(capital),
+            "total_return": (capital - initial_capital) / initial_capital * 100,
+            "total_trades": int(table["total_trades"].sum()),
+            "max_drawdown": float(min((equity_curve.to_numpy() / running_max).min() - 1, 0) * 100),
+            "sharpe_ratio": sharpe_ratio,
+        }
+
+
+# Export for convenience
+__all__ = ["WalkForwardAnalyzer"]
@@ -0,0 +1,64 @@
+"""
+TradeForge AaaS - Celery Worker
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Celery application for background backtests (BACKTEST_QUEUE_BACKEND=celery).
+
+Start a worker with:
+    celery -A app.worker worker --loglevel=info
+"""
+
+from typing import Any, Dict
+import logging
+
+from celery import Celery
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.services.backtest_service import execute_backtest
+from app.services.candle_resampler import CandleResampler
+from app.services.candle_store import CandleStore
+from app.strategies.indicators import IndicatorCache
+
+logger = logging.getLogger(__name__)
+
+celery_app = Celery(
+    "tradeforge",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+)
+
+# One resampler and indicator cache per worker process so derived timeframes
+# and indicators stay cached between jobs
+_resampler = CandleResampler(CandleStore())
+_indicators = IndicatorCache()
+
+
+@celery_app.task(bind=True, name="backtest.run")
+def run_backtest_task(self, request: Dict[str, Any]) -> int:
+    """
+    Run a queued backtest.
+
+    Args:
+        request: BacktestRequest as a JSON-compatible dict
+
+    Returns:
+        ID of the stored Backtest row
+    """
+    def progress(fraction: float, message: str) -> None:
+        self.update_state(state="PROGRESS", meta={"progress": fraction, "message": message})
+
+    return execute_backtest(request, SessionLocal, _resampler, progress, _indicators)
+
+
+# Export for convenience
+__all__ = ["celery_app", "run_backtest_task"]
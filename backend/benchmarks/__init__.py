@@ -0,0 +1,20 @@
+"""
+TradeForge AaaS - Benchmarks
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Performance benchmarks for the strategy and backtest hot paths.
+
+Run from the backend directory:
+
+    python -m benchmarks                      # 10k and 1M bars, compared to baseline.json
+    python -m benchmarks --sizes 10k,1m,10m   # include the 10M-bar datasets
+    python -m benchmarks --save-baseline      # record the current numbers as the baseline
+
+Every case is timed (best of --repeat runs) and then run once more under
+tracemalloc for peak and retained memory. Cases with several engines (row
+loop vs vectorized) report the speedup over the slowest engine, and any case
+slower or hungrier than the baseline beyond the thresholds fails the run.
+"""
@@ -0,0 +1,72 @@
+"""
+TradeForge AaaS - Benchmark Runner
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Command line entry point: python -m benchmarks --help
+"""
+
+import argparse
+import fnmatch
+import logging
+import sys
+
+from benchmarks.cases import LOOP_MAX_BARS, default_cases
+from benchmarks.harness import (
+    DEFAULT_BASELINE,
+    DEFAULT_MEMORY_THRESHOLD,
+    DEFAULT_TIME_THRESHOLD,
+    compare,
+    format_report,
+    load_baseline,
+    parse_size,
+    run_suite,
+    save_baseline,
+)
+
+
+def main(argv=None) -> int:
+    """Run the suite; exit status 1 when a result regressed against the baseline."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--sizes", default="10k,1m", help="Bar counts, e.g. 10k,1m,10m")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--only", default="*", help="Glob on case names, e.g. 'backtest*'")
+    parser.add_argument(
+        "--loop-max-bars", type=parse_size, default=LOOP_MAX_BARS,
+        help="Largest dataset the row-by-row engines run on",
+    )
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store these results as the baseline"
+    )
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    cases = [
+        case for case in default_cases(args.loop_max_bars)
+        if fnmatch.fnmatch(case.name, args.only)
+    ]
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+
+    results = run_suite(cases, sizes, repeat=args.repeat)
+    regressed = compare(
+        results, load_baseline(args.baseline), args.time_threshold, args.memory_threshold
+    )
+    print(format_report(results))
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if regressed:
+        print(f"\n{len(regressed)} result(s) regressed against {args.baseline}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+TradeForge AaaS - Benchmark Cases
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Synthetic OHLCV data and the functions the benchmark suite measures.
+
+Each case names a function ('backtest') and an engine ('loop',
+'vectorized'); engines of one function do the same work, so their timings
+compare directly.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from app.strategies.optimizer import SMACrossoverOptimizer
+from app.strategies.sma_crossover import SMACrossoverStrategy
+
+logger = logging.getLogger(__name__)
+
+# Row-by-row engines only run up to this many bars by default
+LOOP_MAX_BARS = 100_000
+
+# Grid searched by the optimizer cases
+GRID_FAST_PERIODS = (5, 10, 20)
+GRID_SLOW_PERIODS = (50, 100, 200)
+
+
+def make_ohlcv(n: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Build a geometric random-walk OHLCV frame with consistent bar ranges.
+
+    Args:
+        n: Number of 1-minute bars
+        seed: Random seed
+
+    Returns:
+        DataFrame with open, high, low, close and volume columns
+    """
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.empty(n)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.normal(0, 0.001, n))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + wick),
+            "low": np.minimum(open_, close) * (1 - wick),
+            "close": close,
+            "volume": rng.integers(1_000, 10_000, n).astype(np.float64),
+        },
+        index=pd.date_range("2020-01-01", periods=n, freq="1min"),
+    )
+
+
+def row_scan_signals(strategy: SMACrossoverStrategy, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Per-row signal scan generate_signals replaced (kept as the reference engine)."""
+    df = strategy.calculate_indicators(df)
+    signals = []
+    for i in range(len(df)):
+        row = df.iloc[i]
+        if row['position'] == 2 or row['position'] == -2:
+            signals.append({
+                'timestamp': row.name,
+                'type': 'BUY' if row['position'] == 2 else 'SELL',
+                'price': row['close'],
+            })
+    return signals
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One measured function/engine pair."""
+
+    function: str
+    engine: str
+    run: Callable[[pd.DataFrame], Any]
+    max_bars: Optional[int] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.function}[{self.engine}]"
+
+
+def default_cases(loop_max_bars: int = LOOP_MAX_BARS) -> List[BenchmarkCase]:
+    """
+    The hot paths of SMACrossoverStrategy.
+
+    Args:
+        loop_max_bars: Largest dataset the row-by-row engines run on
+
+    Returns:
+        List of benchmark cases
+    """
+    strategy = SMACrossoverStrategy(fast_period=20, slow_period=50, position_size_pct=95.0)
+    crossover_only = SMACrossoverStrategy(
+        fast_period=20,
+        slow_period=50,
+        stop_loss_pct=None,
+        take_profit_pct=None,
+        position_size_pct=95.0,
+    )
+
+    return [
+        BenchmarkCase("calculate_indicators", "pandas", strategy.calculate_indicators),
+        BenchmarkCase(
+            "calculate_indicators", "arrays", lambda df: strategy.indicator_arrays(df["close"])
+        ),
+        BenchmarkCase("generate_signals", "columnar", strategy.generate_signals),
+        BenchmarkCase(
+            "generate_signals", "row_scan",
+            lambda df: row_scan_signals(strategy, df), max_bars=loop_max_bars,
+        ),
+        BenchmarkCase(
+            "backtest", "loop",
+            lambda df: strategy.backtest(df, mode="loop"), max_bars=loop_max_bars,
+        ),
+        BenchmarkCase("backtest", "vectorized", lambda df: strategy.backtest(df)),
+        BenchmarkCase(
+            "backtest_crossover_only", "loop",
+            lambda df: crossover_only.backtest(df, mode="loop"), max_bars=loop_max_bars,
+        ),
+        BenchmarkCase("backtest_crossover_only", "vectorized", crossover_only.backtest),
+        *(
+            BenchmarkCase(
+                "optimize_grid", precision,
+                lambda df, optimizer=SMACrossoverOptimizer(precision=precision): optimizer.run(
+                    df, GRID_FAST_PERIODS, GRID_SLOW_PERIODS
+                ),
+            )
+            for precision in ("float64", "float32")
+        ),
+    ]
+
+
+# Export for convenience
+__all__ = ["BenchmarkCase", "default_cases", "make_ohlcv", "row_scan_signals", "LOOP_MAX_BARS"]
@@ -0,0 +1,293 @@
+"""
+TradeForge AaaS - Benchmark Harness
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Measurement, baseline comparison and reporting for the benchmark suite.
+
+Wall time is the best of several untraced runs. Memory comes from one extra
+run under tracemalloc (NumPy reports its buffers to it): the peak traced
+size during the call, and the blocks/bytes allocated by the call that are
+still alive when it returns (its result included).
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+import gc
+import json
+import logging
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.cases import BenchmarkCase, make_ohlcv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# A result regresses when it exceeds baseline * threshold and baseline + slack
+DEFAULT_TIME_THRESHOLD = 1.5
+DEFAULT_MEMORY_THRESHOLD = 1.25
+TIME_SLACK_SECONDS = 0.005
+MEMORY_SLACK_MB = 1.0
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(size: Union[str, int]) -> int:
+    """
+    Parse a bar count such as '10k', '1m' or '250000'.
+
+    Args:
+        size: Bar count, optionally with a k/m suffix
+
+    Returns:
+        Number of bars
+    """
+    text = str(size).strip().lower().replace("_", "")
+    if text and text[-1] in _SUFFIXES:
+        return int(float(text[:-1]) * _SUFFIXES[text[-1]])
+    return int(text)
+
+
+def format_size(bars: int) -> str:
+    """Short label for a bar count (10k, 1m, ...)."""
+    for suffix, factor in (("m", 1_000_000), ("k", 1_000)):
+        if bars >= factor and bars % factor == 0:
+            return f"{bars // factor}{suffix}"
+    return str(bars)
+
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time and trace one function.
+
+    Args:
+        fn: Zero-argument callable
+        repeat: Timed runs (the best one is reported)
+
+    Returns:
+        Dictionary with seconds, peak_mb, retained_mb and retained_blocks
+    """
+    timings = []
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    stats = snapshot.statistics("filename")
+
+    return {
+        "seconds": min(timings),
+        "peak_mb": peak / 2**20,
+        "retained_mb": sum(stat.size for stat in stats) / 2**20,
+        "retained_blocks": sum(stat.count for stat in stats),
+    }
+
+
+def run_suite(
+    cases: Sequence[BenchmarkCase],
+    sizes: Iterable[int],
+    repeat: int = 3,
+    datasets: Optional[Callable[[int], pd.DataFrame]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Measure every case on every dataset size.
+
+    Args:
+        cases: Benchmark cases
+        sizes: Bar counts
+        repeat: Timed runs per case
+        datasets: Builds the frame for a size (default: make_ohlcv)
+
+    Returns:
+        One result dict per (case, size); cases above their max_bars are
+        reported with skipped=True
+    """
+    datasets = datasets or make_ohlcv
+    results = []
+    for bars in sizes:
+        df = datasets(bars)
+        for case in cases:
+            row: Dict[str, Any] = {
+                "key": f"{case.name}@{format_size(bars)}",
+                "function": case.function,
+                "engine": case.engine,
+                "bars": bars,
+            }
+            if case.max_bars is not None and bars > case.max_bars:
+                row["skipped"] = True
+            else:
+                logger.info(f"Running {row['key']}")
+                row.update(measure(lambda: case.run(df), repeat))
+            results.append(row)
+        del df
+
+    _add_speedups(results)
+    return results
+
+
+def _add_speedups(results: List[Dict[str, Any]]) -> None:
+    """Speedup of each engine over the slowest engine of the same function and size."""
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for row in results:
+        if not row.get("skipped"):
+            groups.setdefault((row["function"], row["bars"]), []).append(row)
+    for rows in groups.values():
+        slowest = max(row["seconds"] for row in rows)
+        for row in rows:
+            row["speedup"] = slowest / row["seconds"] if row["seconds"] > 0 else float("inf")
+
+
+def machine_info() -> Dict[str, str]:
+    """Environment the numbers were recorded on."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def load_baseline(path: Union[str, Path] = DEFAULT_BASELINE) -> Dict[str, Dict[str, float]]:
+    """
+    Read stored baseline results.
+
+    Args:
+        path: Baseline JSON file
+
+    Returns:
+        Results keyed by case key, empty if the file does not exist
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def save_baseline(results: List[Dict[str, Any]], path: Union[str, Path] = DEFAULT_BASELINE) -> None:
+    """
+    Store measured results as the new baseline (merged into an existing file).
+
+    Args:
+        results: Output of run_suite
+        path: Baseline JSON file
+    """
+    path = Path(path)
+    stored = load_baseline(path)
+    for row in results:
+        if not row.get("skipped"):
+            stored[row["key"]] = {
+                metric: round(row[metric], 6)
+                for metric in ("seconds", "peak_mb", "retained_mb", "retained_blocks")
+            }
+    payload = {"machine": machine_info(), "results": dict(sorted(stored.items()))}
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+    logger.info(f"Saved {len(stored)} baseline results to {path}")
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Dict[str, float]],
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    memory_threshold: float = DEFAULT_MEMORY_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Flag results that regressed against the baseline.
+
+    Adds 'time_ratio', 'memory_ratio' and 'regressions' (list of metric
+    names) to every measured result that has a baseline entry.
+
+    Args:
+        results: Output of run_suite
+        baseline: Output of load_baseline
+        time_threshold: Allowed seconds ratio
+        memory_threshold: Allowed peak memory ratio
+
+    Returns:
+        The regressed results
+    """
+    regressed = []
+    for row in results:
+        base = baseline.get(row["key"])
+        if row.get("skipped") or base is None:
+            continue
+
+        row["time_ratio"] = row["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        row["memory_ratio"] = row["peak_mb"] / base["peak_mb"] if base["peak_mb"] else 1.0
+        row["regressions"] = []
+        if (row["seconds"] > base["seconds"] * time_threshold
+                and row["seconds"] > base["seconds"] + TIME_SLACK_SECONDS):
+            row["regressions"].append("time")
+        if (row["peak_mb"] > base["peak_mb"] * memory_threshold
+                and row["peak_mb"] > base["peak_mb"] + MEMORY_SLACK_MB):
+            row["regressions"].append("memory")
+        if row["regressions"]:
+            regressed.append(row)
+
+    return regressed
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    """
+    Render results as a fixed-width table.
+
+    Args:
+        results: Output of run_suite (optionally passed through compare)
+
+    Returns:
+        Report text
+    """
+    header = (
+        f"{'case':<40} {'time (s)':>10} {'speedup':>8} {'peak MB':>9} "
+        f"{'kept MB':>8} {'blocks':>8} {'vs base':>8}  status"
+    )
+    lines = [header, "-" * len(header)]
+    for row in results:
+        if row.get("skipped"):
+            lines.append(f"{row['key']:<40} {'skipped':>10}")
+            continue
+
+        ratio = f"{row['time_ratio']:.2f}x" if "time_ratio" in row else "-"
+        status = (
+            "REGRESSED (" + ", ".join(row["regressions"]) + ")" if row.get("regressions")
+            else "ok" if "regressions" in row else "new"
+        )
+        lines.append(
+            f"{row['key']:<40} {row['seconds']:>10.4f} {row['speedup']:>7.1f}x "
+            f"{row['peak_mb']:>9.1f} {row['retained_mb']:>8.1f} {row['retained_blocks']:>8d} "
+            f"{ratio:>8}  {status}"
+        )
+    return "\n".join(lines)
+
+
+# Export for convenience
+__all__ = [
+    "measure",
+    "run_suite",
+    "compare",
+    "format_report",
+    "load_baseline",
+    "save_baseline",
+    "parse_size",
+    "format_size",
+    "machine_info",
+    "DEFAULT_BASELINE",
+]
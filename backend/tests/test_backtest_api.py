@@ -0,0 +1,171 @@
+"""
+TradeForge AaaS - Backtest API Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the backtest job endpoints running on the local queue.
+"""
+
+import json
+import time
+
+import pytest
+
+from app.main import app
+from app.models import Backtest, Strategy, User
+from app.services.backtest_service import LocalBacktestQueue, get_backtest_queue
+from app.services.candle_store import CandleStore, to_epoch_ms
+from tests.conftest import TestingSessionLocal
+from tests.test_candle_store import make_rows
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Local queue over a candle store with five days of 1m candles."""
+    store = CandleStore(tmp_path)
+    store.write("binance", "BTC/USDT", "1m", make_rows(to_epoch_ms("2024-01-01"), 5 * 1440))
+    queue = LocalBacktestQueue(session_factory=TestingSessionLocal, store=store)
+    app.dependency_overrides[get_backtest_queue] = lambda: queue
+    yield queue
+    queue.shutdown()
+
+
+@pytest.fixture
+def strategy(db):
+    """SMA crossover strategy owned by a test user."""
+    user = User(email="quant@example.com", username="quant", hashed_password="x")
+    db.add(user)
+    db.commit()
+    strategy = Strategy(
+        user_id=user.id,
+        name="Fast SMA",
+        strategy_type="sma_crossover",
+        parameters=json.dumps({"fast_period": 10, "slow_period": 30, "position_size_pct": 50.0}),
+    )
+    db.add(strategy)
+    db.commit()
+    return strategy
+
+
+def backtest_request(strategy_id: int, **overrides) -> dict:
+    """Backtest request body for the seeded candles."""
+    body = {
+        "strategy_id": strategy_id,
+        "symbol": "BTC/USDT",
+        "timeframe": "15m",
+        "start_date": "2024-01-01T00:00:00Z",
+        "end_date": "2024-01-05T00:00:00Z",
+    }
+    body.update(overrides)
+    return body
+
+
+def wait_for(client, job_id: str, timeout: float = 10.0) -> dict:
+    """Poll a job until it reaches a terminal state."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/api/v1/backtest/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+def test_submit_and_poll(client, queue, strategy, db):
+    """Submitting returns a job at once; the finished job points at a stored Backtest."""
+    response = client.post("/api/v1/backtest", json=backtest_request(strategy.id))
+    
+    assert response.status_code == 202
+    assert response.json()["status"] in ("queued", "running", "completed")
+    
+    job = wait_for(client, response.json()["job_id"])
+    
+    assert job["status"] == "completed"
+    assert job["progress"] == 1.0
+    
+    backtest = db.get(Backtest, job["backtest_id"])
+    assert backtest.strategy_id == strategy.id
+    assert backtest.timeframe == "15m"
+    assert backtest.total_trades > 0
+    
+    curve = client.get(f"/api/v1/backtest/{job['backtest_id']}/equity-curve").json()
+    trades = client.get(f"/api/v1/backtest/{job['backtest_id']}/trades").json()
+    assert len(curve["equity_curve"]) > 0
+    assert len(trades["trades"]) == backtest.total_trades
+    
+    result = client.get(f"/api/v1/backtest/{job['backtest_id']}")
+    assert result.status_code == 200
+    assert result.json()["final_capital"] == pytest.approx(backtest.final_capital)
+
+
+def test_failed_job_reports_error(client, queue, strategy):
+    """A request without stored candles fails the job instead of the API call."""
+    response = client.post(
+        "/api/v1/backtest", json=backtest_request(strategy.id, symbol="ETH/USDT")
+    )
+    
+    job = wait_for(client, response.json()["job_id"])
+    
+    assert job["status"] == "failed"
+    assert "No 15m candles" in job["error"]
+
+
+def test_event_stream_ends_with_terminal_status(client, queue, strategy):
+    """The SSE stream emits status changes and closes once the job is done."""
+    job_id = client.post("/api/v1/backtest", json=backtest_request(strategy.id)).json()["job_id"]
+    
+    response = client.get(f"/api/v1/backtest/jobs/{job_id}/events")
+    events = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert events[-1]["status"] == "completed"
+
+
+def test_unknown_ids_return_404(client, queue):
+    """Unknown jobs and backtests are 404s."""
+    assert client.get("/api/v1/backtest/jobs/missing").status_code == 404
+    assert client.get("/api/v1/backtest/999").status_code == 404
+
+
+def test_identical_request_is_served_from_cache(client, queue, strategy):
+    """Re-running the same request reuses the stored Backtest without a new job run."""
+    first = wait_for(client, client.post(
+        "/api/v1/backtest", json=backtest_request(strategy.id)
+    ).json()["job_id"])
+    
+    response = client.post("/api/v1/backtest", json=backtest_request(strategy.id))
+    
+    assert response.json()["status"] == "completed"
+    assert response.json()["cached"] is True
+    assert response.json()["backtest_id"] == first["backtest_id"]
+    
+    stats = client.get("/api/v1/backtest/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_finished_jobs_are_pruned(client, tmp_path, strategy):
+    """Finished jobs beyond max_finished_jobs are forgotten, oldest first."""
+    store = CandleStore(tmp_path)
+    store.write("binance", "BTC/USDT", "1m", make_rows(to_epoch_ms("2024-01-01"), 5 * 1440))
+    queue = LocalBacktestQueue(
+        session_factory=TestingSessionLocal, store=store, max_workers=1, max_finished_jobs=1
+    )
+    app.dependency_overrides[get_backtest_queue] = lambda: queue
+    try:
+        first = wait_for(client, client.post(
+            "/api/v1/backtest", json=backtest_request(strategy.id)
+        ).json()["job_id"])
+        second = client.post("/api/v1/backtest", json=backtest_request(strategy.id)).json()
+        
+        assert second["cached"] is True
+        assert client.get(f"/api/v1/backtest/jobs/{first['job_id']}").status_code == 404
+        assert client.get(f"/api/v1/backtest/jobs/{second['job_id']}").status_code == 200
+    finally:
+        queue.shutdown()
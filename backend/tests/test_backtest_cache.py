@@ -0,0 +1,118 @@
+"""
+TradeForge AaaS - Backtest Result Cache Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for content-addressed backtest cache keys and eviction.
+"""
+
+import time
+
+import pytest
+
+from app.schemas import BacktestRequest
+from app.services.backtest_cache import (
+    BacktestResultCache,
+    backtest_cache_key,
+    data_version,
+    normalize_params,
+)
+from app.services.candle_resampler import CandleResampler
+from app.services.candle_store import CandleStore, to_epoch_ms
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_candle_store import make_rows
+
+
+def make_request(**overrides) -> BacktestRequest:
+    """BacktestRequest over the first day of January 2024."""
+    fields = {
+        "strategy_id": 1,
+        "symbol": "BTC/USDT",
+        "timeframe": "1h",
+        "start_date": "2024-01-01T00:00:00Z",
+        "end_date": "2024-01-02T00:00:00Z",
+    }
+    fields.update(overrides)
+    return BacktestRequest(**fields)
+
+
+def test_equivalent_requests_share_a_key():
+    """Defaults, int/float spelling and symbol case do not change the key."""
+    explicit = normalize_params(SMACrossoverStrategy, {"fast_period": 20.0, "slow_period": 50})
+    implicit = normalize_params(SMACrossoverStrategy, {})
+    
+    key = backtest_cache_key(make_request(), "sma_crossover", explicit, (0, 10, 0, 1))
+    
+    assert key == backtest_cache_key(
+        make_request(symbol="btc/usdt"), "sma_crossover", implicit, (0, 10, 0, 1)
+    )
+    assert key != backtest_cache_key(
+        make_request(commission=0.002), "sma_crossover", implicit, (0, 10, 0, 1)
+    )
+    assert key != backtest_cache_key(make_request(), "sma_crossover", implicit, (1, 10, 0, 1))
+
+
+def test_data_version_tracks_the_requested_range(tmp_path):
+    """Appends after the range keep the fingerprint; a rewrite inside it changes it."""
+    store = CandleStore(tmp_path)
+    start = to_epoch_ms("2024-01-01")
+    rows = make_rows(start, 3 * 1440)
+    store.write("binance", "BTC/USDT", "1m", rows[:2000])
+    resampler = CandleResampler(store)
+    request = make_request()
+    
+    before = data_version(resampler, request)
+    store.write("binance", "BTC/USDT", "1m", rows[2000:])
+    
+    assert data_version(resampler, request) == before
+    
+    store.write("binance", "BTC/USDT", "1m", rows[100:101])
+    
+    assert data_version(resampler, request) != before
+
+
+def test_data_version_covers_the_last_bar_bucket(tmp_path):
+    """Base candles after end but inside the last bar's bucket change the fingerprint."""
+    store = CandleStore(tmp_path)
+    rows = make_rows(to_epoch_ms("2024-01-01"), 12 * 60)
+    store.write("binance", "BTC/USDT", "1m", rows[:10 * 60 + 30])
+    resampler = CandleResampler(store)
+    request = make_request(timeframe="4h", end_date="2024-01-01T10:00:00Z")
+    
+    before = data_version(resampler, request)
+    bars = resampler.read("binance", "BTC/USDT", "4h", request.start_date, request.end_date)
+    store.write("binance", "BTC/USDT", "1m", rows[10 * 60 + 30:])
+    
+    # The 08:00 bar is now complete, so the backtest would read one more bar
+    after = resampler.read("binance", "BTC/USDT", "4h", request.start_date, request.end_date)
+    assert len(after) == len(bars) + 1
+    assert data_version(resampler, request) != before
+
+
+def test_lru_eviction_and_hit_rate():
+    """The least recently used key is evicted first and lookups are counted."""
+    cache = BacktestResultCache(max_entries=2, ttl_seconds=0)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    
+    cache.put("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hit_rate"] == pytest.approx(2 / 3)
+
+
+def test_ttl_expiry():
+    """Entries older than the TTL are misses."""
+    cache = BacktestResultCache(max_entries=10, ttl_seconds=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+    
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
@@ -0,0 +1,86 @@
+"""
+TradeForge AaaS - Backtest Runner Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the process-pool backtest runner.
+"""
+
+import pytest
+
+from app.models import Backtest
+from app.services.backtest_runner import BacktestRunner
+from app.services.results_codec import decode_results
+from app.strategies.registry import create_strategy
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_sma_crossover import make_ohlcv
+
+
+def test_parallel_runner_matches_in_process_backtest():
+    """Rows from worker processes match backtests run in-process."""
+    datasets = {
+        ("BTC/USDT", "1h"): make_ohlcv(n=1200, seed=1),
+        ("ETH/USDT", "1h"): make_ohlcv(n=900, seed=2),
+        ("SOL/USDT", "4h"): make_ohlcv(n=600, seed=3).tz_localize("UTC"),
+    }
+    params = {"fast_period": 5, "slow_period": 20, "position_size_pct": 90.0}
+    
+    rows = BacktestRunner(max_workers=2).run(datasets, strategy_params=params)
+    
+    assert [(row["symbol"], row["timeframe"]) for row in rows] == list(datasets)
+    for row, df in zip(rows, datasets.values()):
+        expected = SMACrossoverStrategy(**params).backtest(df)
+        assert row["final_capital"] == pytest.approx(expected["final_capital"])
+        assert row["total_trades"] == expected["total_trades"]
+        assert row["start_date"] == df.index[0].to_pydatetime()
+        assert row["end_date"] == df.index[-1].to_pydatetime()
+        payload = decode_results(row["results_blob"])
+        assert len(payload["equity_curve"]) == len(expected["equity_curve"])
+
+
+def test_scan_runs_every_strategy_per_dataset():
+    """A scan returns one row per strategy for each dataset, in order."""
+    datasets = {
+        ("BTC/USDT", "1h"): make_ohlcv(n=800, seed=4),
+        ("ETH/USDT", "1h"): make_ohlcv(n=800, seed=5),
+    }
+    strategies = [
+        ("sma_crossover", {"fast_period": 5, "slow_period": 20, "position_size_pct": 90.0}),
+        ("macd", {"position_size_pct": 90.0}),
+        ("rsi", {"position_size_pct": 90.0}),
+    ]
+    
+    rows = BacktestRunner(max_workers=2).scan(datasets, strategies)
+    
+    assert len(rows) == len(datasets)
+    for dataset_rows, df in zip(rows, datasets.values()):
+        assert len(dataset_rows) == len(strategies)
+        for row, (strategy_type, params) in zip(dataset_rows, strategies):
+            expected = create_strategy(strategy_type, params).backtest(df)
+            assert row["final_capital"] == pytest.approx(expected["final_capital"])
+    
+    reduced = BacktestRunner(max_workers=2).scan(datasets, strategies, precision="float32")
+    assert [[row["total_trades"] for row in dataset_rows] for dataset_rows in reduced] == [
+        [row["total_trades"] for row in dataset_rows] for dataset_rows in rows
+    ]
+
+
+def test_result_row_builds_backtest_model():
+    """Result rows map directly onto the Backtest model."""
+    df = make_ohlcv(n=300)
+    results = SMACrossoverStrategy(fast_period=5, slow_period=20).backtest(df)
+    row = BacktestRunner.to_result_row("BTC/USDT", "1h", df, results)
+    
+    backtest = BacktestRunner.to_backtest_model(row, strategy_id=7)
+    
+    assert isinstance(backtest, Backtest)
+    assert backtest.strategy_id == 7
+    assert backtest.symbol == "BTC/USDT"
+    assert backtest.final_capital == row["final_capital"]
+
+
+def test_runner_with_no_datasets():
+    """An empty batch returns no rows without starting workers."""
+    assert BacktestRunner().run({}) == []
@@ -0,0 +1,78 @@
+"""
+TradeForge AaaS - Benchmark Harness Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the benchmark suite's measurement and baseline comparison.
+"""
+
+import numpy as np
+import pytest
+
+from benchmarks.cases import BenchmarkCase, default_cases, make_ohlcv
+from benchmarks.harness import (
+    compare,
+    format_report,
+    load_baseline,
+    measure,
+    parse_size,
+    run_suite,
+    save_baseline,
+)
+
+
+def test_parse_size_suffixes():
+    """Sizes accept k/m suffixes."""
+    assert parse_size("10k") == 10_000
+    assert parse_size("1m") == 1_000_000
+    assert parse_size("2.5M") == 2_500_000
+    assert parse_size("250_000") == 250_000
+
+
+def test_synthetic_ohlcv_is_consistent():
+    """Generated bars keep low <= open, close <= high."""
+    df = make_ohlcv(5000, seed=3)
+    
+    assert len(df) == 5000
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+
+
+def test_measure_traces_numpy_allocations():
+    """Peak memory reflects NumPy buffers allocated by the call."""
+    metrics = measure(lambda: np.ones(2**20), repeat=1)
+    
+    assert metrics["seconds"] > 0
+    assert metrics["peak_mb"] >= 8
+    assert metrics["retained_mb"] >= 8
+
+
+def test_suite_reports_speedups_and_skips_large_loops():
+    """Engines of one function are compared; loop engines skip oversized datasets."""
+    cases = [case for case in default_cases(loop_max_bars=3000) if case.function == "backtest"]
+    
+    results = run_suite(cases, [2000, 4000], repeat=1)
+    
+    by_key = {row["key"]: row for row in results}
+    assert by_key["backtest[loop]@4k"]["skipped"]
+    assert by_key["backtest[loop]@2k"]["speedup"] == pytest.approx(1.0)
+    assert by_key["backtest[vectorized]@2k"]["speedup"] > 1
+    assert "skipped" in format_report(results)
+
+
+def test_compare_flags_regressions(tmp_path):
+    """Results beyond the thresholds are reported as regressions."""
+    case = BenchmarkCase("sum", "numpy", lambda df: df["close"].to_numpy().sum())
+    results = run_suite([case], [1000], repeat=1)
+    path = tmp_path / "baseline.json"
+    save_baseline(results, path)
+    baseline = load_baseline(path)
+    
+    assert compare(results, baseline) == []
+    
+    baseline["sum[numpy]@1k"]["seconds"] = results[0]["seconds"] / 100 - 1.0
+    regressed = compare(results, baseline)
+    assert [row["regressions"] for row in regressed] == [["time"]]
+    assert "REGRESSED (time)" in format_report(results)
@@ -0,0 +1,138 @@
+"""
+TradeForge AaaS - Candle Downloader Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the concurrent historical candle downloader against a fake exchange.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.candle_downloader import CandleDownloader, timeframe_to_ms
+from app.services.candle_store import CandleStore, to_epoch_ms
+
+START = to_epoch_ms("2024-01-01")
+MINUTE = 60_000
+
+
+class FakeExchange:
+    """In-memory exchange serving synthetic 1m pages in CCXT format."""
+    
+    id = "fake"
+    rateLimit = 0
+    
+    def __init__(self, n_candles: int, missing=(), fail_once=(), max_limit=None):
+        self.n_candles = n_candles
+        self.max_limit = max_limit
+        self.missing = set(missing)
+        self.fail_once = set(fail_once)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.calls.append(since)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if since in self.fail_once:
+                self.fail_once.discard(since)
+                raise ConnectionError("temporary failure")
+            first = (since - START) // MINUTE
+            limit = min(limit, self.max_limit or limit)
+            rows = []
+            for i in range(max(first, 0), min(first + limit, self.n_candles)):
+                if i in self.missing:
+                    continue
+                price = 100.0 + i
+                rows.append([START + i * MINUTE, price, price + 1, price - 1, price, 1.0])
+            return rows
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty candle store in a temporary directory."""
+    return CandleStore(tmp_path)
+
+
+async def test_download_pages_concurrently(store):
+    """A multi-page range is fetched concurrently and stored contiguously."""
+    exchange = FakeExchange(n_candles=5000, fail_once={START + 2000 * MINUTE})
+    downloader = CandleDownloader(exchange, store, page_limit=500, max_concurrency=4)
+    
+    written = await downloader.download("BTC/USDT", "1m", START, START + 5000 * MINUTE)
+    
+    candles = store.read("fake", "BTC/USDT", "1m")
+    assert written == 5000
+    assert len(candles) == 5000
+    assert np.all(np.diff(candles.timestamp) == MINUTE)
+    assert 1 < exchange.max_in_flight <= 4
+
+
+async def test_download_resumes_from_last_candle(store):
+    """A second download only requests pages after the stored history."""
+    exchange = FakeExchange(n_candles=3000)
+    downloader = CandleDownloader(exchange, store, page_limit=1000)
+    await downloader.download("BTC/USDT", "1m", START, START + 2000 * MINUTE)
+    exchange.calls.clear()
+    
+    written = await downloader.download("BTC/USDT", "1m", START, START + 3000 * MINUTE)
+    
+    assert written == 1000
+    assert exchange.calls == [START + 2000 * MINUTE]
+    assert store.count("fake", "BTC/USDT", "1m") == 3000
+
+
+async def test_find_and_backfill_gaps(store):
+    """Gaps in stored history are detected and filled from the exchange."""
+    holey = FakeExchange(n_candles=1000, missing=range(100, 110))
+    await CandleDownloader(holey, store).download("ETH/USDT", "1m", START, START + 1000 * MINUTE)
+    
+    downloader = CandleDownloader(FakeExchange(n_candles=1000), store)
+    assert downloader.find_gaps("ETH/USDT", "1m") == [
+        (START + 100 * MINUTE, START + 110 * MINUTE)
+    ]
+    
+    written = await downloader.backfill_gaps("ETH/USDT", "1m")
+    
+    assert written == 10
+    assert downloader.find_gaps("ETH/USDT", "1m") == []
+    assert store.count("fake", "ETH/USDT", "1m") == 1000
+
+
+async def test_short_pages_are_continued(store):
+    """Pages capped below page_limit by the exchange are completed, leaving no holes."""
+    exchange = FakeExchange(n_candles=2500, max_limit=300)
+    downloader = CandleDownloader(exchange, store, page_limit=1000)
+    
+    written = await downloader.download("BTC/USDT", "1m", START, START + 2500 * MINUTE)
+    
+    candles = store.read("fake", "BTC/USDT", "1m")
+    assert written == 2500
+    assert np.all(np.diff(candles.timestamp) == MINUTE)
+    assert downloader.find_gaps("BTC/USDT", "1m") == []
+
+
+def test_page_limit_capped_per_exchange(store):
+    """Known exchange limits cap the requested page size."""
+    coinbase = FakeExchange(n_candles=0)
+    coinbase.id = "coinbase"
+    
+    assert CandleDownloader(coinbase, store).page_limit == 300
+    assert CandleDownloader(FakeExchange(n_candles=0), store).page_limit == 1000
+
+
+def test_timeframe_to_ms():
+    """Timeframe strings convert to milliseconds."""
+    assert timeframe_to_ms("4h") == 4 * 3_600_000
+    assert timeframe_to_ms("2d") == 2 * 86_400_000
+    with pytest.raises(ValueError):
+        timeframe_to_ms("1x")
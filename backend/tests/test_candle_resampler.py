@@ -0,0 +1,96 @@
+"""
+TradeForge AaaS - Candle Resampler Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for on-the-fly timeframe resampling and its cache.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.candle_resampler import CandleResampler
+from app.services.candle_store import CandleStore, to_epoch_ms
+from tests.test_candle_store import make_rows
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Candle store with three days of 1m BTC candles."""
+    store = CandleStore(tmp_path)
+    store.write("binance", "BTC/USDT", "1m", make_rows(to_epoch_ms("2024-01-01"), 3 * 1440))
+    return store
+
+
+def test_resample_matches_pandas(store):
+    """4h bars equal a pandas OHLCV resample of the base candles."""
+    base = store.read_frame("binance", "BTC/USDT", "1m")
+    expected = base.resample("4h").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+    
+    df = CandleResampler(store).read_frame("binance", "BTC/USDT", "4h")
+    
+    assert len(df) == 18
+    pd.testing.assert_frame_equal(df, expected, check_freq=False, check_names=False)
+
+
+def test_repeated_reads_hit_cache(store):
+    """Repeated reads of a derived timeframe are served from the cache."""
+    resampler = CandleResampler(store)
+    first = resampler.read("binance", "BTC/USDT", "1d")
+    second = resampler.read("binance", "BTC/USDT", "1d", start="2024-01-02")
+    
+    assert len(first) == 3
+    assert len(second) == 2
+    assert resampler.stats()["misses"] == 1
+    assert resampler.stats()["hits"] == 1
+
+
+def test_append_updates_incrementally(tmp_path):
+    """Appended base candles extend the cached bars without a rebuild."""
+    rows = make_rows(to_epoch_ms("2024-01-01"), 2000)
+    store = CandleStore(tmp_path)
+    store.write("binance", "BTC/USDT", "1m", rows[:1000])
+    resampler = CandleResampler(store)
+    
+    partial = resampler.read("binance", "BTC/USDT", "1h", include_partial=True)
+    store.write("binance", "BTC/USDT", "1m", rows[1000:])
+    extended = resampler.read("binance", "BTC/USDT", "1h", include_partial=True)
+    
+    rebuilt = CandleResampler(store).read("binance", "BTC/USDT", "1h", include_partial=True)
+    assert len(partial) == 17
+    assert resampler.stats()["incremental_updates"] == 1
+    for column in ("timestamp", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(getattr(extended, column), getattr(rebuilt, column))
+
+
+def test_partial_bar_excluded_by_default(tmp_path):
+    """A trailing bucket without all its base candles is dropped unless requested."""
+    store = CandleStore(tmp_path)
+    store.write("binance", "BTC/USDT", "1m", make_rows(to_epoch_ms("2024-01-01"), 90))
+    resampler = CandleResampler(store)
+    
+    assert len(resampler.read("binance", "BTC/USDT", "1h")) == 1
+    assert len(resampler.read("binance", "BTC/USDT", "1h", include_partial=True)) == 2
+
+
+def test_rewrite_rebuilds_and_lru_evicts(store):
+    """Base rewrites invalidate cached bars; the LRU keeps max_entries series."""
+    resampler = CandleResampler(store, max_entries=2)
+    before = resampler.read("binance", "BTC/USDT", "1d")
+    
+    patched = make_rows(to_epoch_ms("2024-01-01"), 10)
+    patched[:, 2] = 10_000.0
+    store.write("binance", "BTC/USDT", "1m", patched)
+    after = resampler.read("binance", "BTC/USDT", "1d")
+    
+    assert after.high[0] == 10_000.0 != before.high[0]
+    assert resampler.stats()["misses"] == 2
+    
+    resampler.read("binance", "BTC/USDT", "4h")
+    resampler.read("binance", "BTC/USDT", "1h")
+    assert resampler.stats()["entries"] == 2
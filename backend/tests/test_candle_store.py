@@ -0,0 +1,129 @@
+"""
+TradeForge AaaS - Candle Store Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the columnar on-disk candle store.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.candle_store import CandleStore, to_epoch_ms
+from app.strategies.sma_crossover import SMACrossoverStrategy
+
+
+def make_rows(start_ms: int, n: int, step_ms: int = 60_000) -> np.ndarray:
+    """Build CCXT-style [timestamp, o, h, l, c, v] rows."""
+    ts = start_ms + np.arange(n) * step_ms
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, n))
+    return np.column_stack([ts, close, close + 1, close - 1, close, np.full(n, 10.0)])
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty candle store in a temporary directory."""
+    return CandleStore(tmp_path)
+
+
+def test_append_and_range_read(store):
+    """Date-range reads return memory-mapped views of the requested rows."""
+    rows = make_rows(to_epoch_ms("2024-01-01"), 1000)
+    store.write("binance", "BTC/USDT", "1m", rows[:600])
+    store.write("binance", "BTC/USDT", "1m", rows[600:])
+    
+    candles = store.read(
+        "binance", "BTC/USDT", "1m", start="2024-01-01 01:00", end="2024-01-01 02:00"
+    )
+    
+    assert len(candles) == 60
+    assert candles.timestamp[0] == to_epoch_ms("2024-01-01 01:00")
+    assert isinstance(candles.close.base, np.memmap) or isinstance(candles.close, np.memmap)
+    np.testing.assert_array_equal(candles.close, rows[60:120, 4])
+    assert store.count("binance", "BTC/USDT", "1m") == 1000
+    assert store.last_timestamp("binance", "BTC/USDT", "1m") == rows[-1, 0]
+    assert store.list_series() == [("binance", "BTC/USDT", "1m")]
+
+
+def test_frame_shares_memory_and_backtests(store):
+    """read_frame wraps the mapped columns and feeds straight into a backtest."""
+    rows = make_rows(to_epoch_ms("2024-01-01"), 500)
+    store.write("binance", "ETH/USDT", "1m", rows)
+    
+    candles = store.read("binance", "ETH/USDT", "1m")
+    df = candles.to_frame()
+    
+    assert np.shares_memory(df["close"].to_numpy(), candles.close)
+    assert df.index[0] == pd.Timestamp("2024-01-01", tz="UTC")
+    results = SMACrossoverStrategy(fast_period=5, slow_period=20).backtest(df)
+    assert len(results["equity_curve"]) == 500 - 20 + 1
+
+
+def test_overlapping_write_merges(store):
+    """Overlapping writes are merged sorted and de-duplicated, new rows winning."""
+    rows = make_rows(to_epoch_ms("2024-01-01"), 100)
+    store.write("bybit", "SOL/USDT", "1m", rows[50:])
+    
+    patched = rows[:60].copy()
+    patched[:, 4] += 1000
+    length = store.write("bybit", "SOL/USDT", "1m", patched)
+    
+    candles = store.read("bybit", "SOL/USDT", "1m")
+    assert length == 100
+    assert np.all(np.diff(candles.timestamp) == 60_000)
+    np.testing.assert_array_equal(candles.close[:60], patched[:, 4])
+    np.testing.assert_array_equal(candles.close[60:], rows[60:, 4])
+
+
+def test_empty_series(store):
+    """Unknown series read as empty."""
+    assert len(store.read("kraken", "BTC/USD", "1h")) == 0
+    assert store.last_timestamp("kraken", "BTC/USD", "1h") is None
+
+
+def test_rewrite_by_another_store_invalidates_maps(tmp_path):
+    """A same-length rewrite through another instance is seen by existing readers."""
+    reader = CandleStore(tmp_path)
+    writer = CandleStore(tmp_path)
+    rows = make_rows(to_epoch_ms("2024-01-01"), 100)
+    writer.write("binance", "BTC/USDT", "1m", rows)
+    np.testing.assert_array_equal(reader.read("binance", "BTC/USDT", "1m").close, rows[:, 4])
+    
+    patched = rows.copy()
+    patched[:, 4] += 1000
+    writer.write("binance", "BTC/USDT", "1m", patched)
+    
+    candles = reader.read("binance", "BTC/USDT", "1m")
+    assert len(candles) == 100
+    np.testing.assert_array_equal(candles.close, patched[:, 4])
+    assert reader.range_version("binance", "BTC/USDT", "1m")[0] == 1
+
+
+def test_rewrite_switches_generations_atomically(store):
+    """Columns of an unfinished rewrite are never read; finished rewrites drop old generations."""
+    rows = make_rows(to_epoch_ms("2024-01-01"), 100)
+    store.write("binance", "BTC/USDT", "1m", rows)
+    path = store.series_path("binance", "BTC/USDT", "1m")
+    
+    # A rewrite that crashed after writing one column of generation 1
+    (path / "gen-1").mkdir()
+    (path / "gen-1" / "timestamp.bin").write_bytes(b"\0" * 8 * 100)
+    
+    fresh = CandleStore(store.root)
+    np.testing.assert_array_equal(fresh.read("binance", "BTC/USDT", "1m").timestamp, rows[:, 0])
+    assert fresh.version("binance", "BTC/USDT", "1m") == (0, 100)
+    
+    for offset in (1000, 2000):
+        patched = rows.copy()
+        patched[:, 4] += offset
+        store.write("binance", "BTC/USDT", "1m", patched)
+    
+    candles = fresh.read("binance", "BTC/USDT", "1m")
+    np.testing.assert_array_equal(candles.timestamp, rows[:, 0])
+    np.testing.assert_array_equal(candles.close, rows[:, 4] + 2000)
+    assert fresh.version("binance", "BTC/USDT", "1m") == (2, 100)
+    assert not (path / "timestamp.bin").exists()
+    assert store.list_series() == [("binance", "BTC/USDT", "1m")]
@@ -0,0 +1,406 @@
+"""
+TradeForge AaaS - DeFi Service Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for DeFiService on-chain reads against an in-memory fake chain.
+"""
+
+from decimal import Decimal
+import asyncio
+import time
+
+import pytest
+from eth_abi import decode, encode
+from eth_abi.grammar import parse
+from eth_utils import keccak, to_checksum_address
+from web3 import AsyncWeb3, Web3
+from web3.exceptions import ContractLogicError
+from web3.providers.async_base import AsyncBaseProvider
+
+from app.core.config import settings
+from app.services.contract_registry import ContractRegistry
+from app.services.defi_service import ERC20_ABI, DeFiService, Multicall
+from app.services.price_feed_cache import ChainlinkPriceCache, PriceQuote
+
+WALLET = to_checksum_address("0x" + "11" * 20)
+USDC = to_checksum_address("0x" + "a0" * 20)
+WETH = to_checksum_address("0x" + "c0" * 20)
+ETH_FEED = to_checksum_address(settings.CHAINLINK_ETH_USD)
+BTC_FEED = to_checksum_address(settings.CHAINLINK_BTC_USD)
+UPDATED_AT = 1_700_000_000
+
+
+class Revert(Exception):
+    """Raised by fake contract methods to revert the call."""
+
+
+def selector(signature: str) -> bytes:
+    return keccak(text=signature)[:4]
+
+
+class FakeContract:
+    """Contract whose view methods are Python callables keyed by signature."""
+    
+    def __init__(self, **methods):
+        # methods: signature -> (output types, callable)
+        self.methods = {
+            selector(signature): (signature, outputs, fn)
+            for signature, (outputs, fn) in methods.items()
+        }
+    
+    def call(self, chain: "FakeChain", data: bytes) -> bytes:
+        if data[:4] not in self.methods:
+            raise Revert("unknown selector")
+        signature, outputs, fn = self.methods[data[:4]]
+        inputs = signature[signature.index("("):]
+        types = [c.to_type_str() for c in parse(inputs).components] if inputs != "()" else []
+        return encode(outputs, fn(*decode(types, data[4:])))
+
+
+def erc20(balances, decimals):
+    return FakeContract(**{
+        "balanceOf(address)": (["uint256"], lambda owner: (balances.get(owner.lower(), 0),)),
+        "decimals()": (["uint8"], lambda: (decimals,)),
+    })
+
+
+class FakeFeed(FakeContract):
+    """Chainlink aggregator whose round the test can advance."""
+    
+    def __init__(self, answer, decimals, round_id=1, updated_at=UPDATED_AT):
+        self.answer = answer
+        self.round_id = round_id
+        self.updated_at = updated_at
+        super().__init__(**{
+            "latestRoundData()": (
+                ["uint80", "int256", "uint256", "uint256", "uint80"],
+                lambda: (
+                    self.round_id, self.answer, self.updated_at, self.updated_at, self.round_id
+                ),
+            ),
+            "decimals()": (["uint8"], lambda: (decimals,)),
+        })
+    
+    def advance(self, answer, updated_at):
+        self.round_id += 1
+        self.answer = answer
+        self.updated_at = updated_at
+
+
+class FakeChain(AsyncBaseProvider):
+    """
+    Async JSON-RPC provider executing eth_call against FakeContracts.
+    
+    Multicall3.aggregate3 is implemented natively so batched reads go through
+    the same contracts as direct ones. Every eth_call is recorded and takes
+    `latency` seconds.
+    """
+    
+    def __init__(self, block_number: int = 100, latency: float = 0.0):
+        super().__init__()
+        self.block_number = block_number
+        self.latency = latency
+        self.contracts = {}
+        self.eth_calls = []
+        self.multicalled = []
+        self.deploy(settings.MULTICALL3_ADDRESS, FakeContract(**{
+            "aggregate3((address,bool,bytes)[])": (["(bool,bytes)[]"], self.aggregate3),
+        }))
+    
+    def deploy(self, address: str, contract: FakeContract) -> None:
+        self.contracts[address.lower()] = contract
+    
+    def aggregate3(self, calls):
+        results = []
+        for target, allow_failure, data in calls:
+            self.multicalled.append((target.lower(), data[:4]))
+            try:
+                results.append((True, self.execute(target, data)))
+            except Revert:
+                if not allow_failure:
+                    raise Revert("Multicall3: call failed")
+                results.append((False, b""))
+        return (results,)
+    
+    def execute(self, target: str, data: bytes) -> bytes:
+        contract = self.contracts.get(target.lower())
+        # Calls to addresses without code succeed with no return data
+        return contract.call(self, data) if contract else b""
+    
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+    
+    async def make_request(self, method, params):
+        response = {"jsonrpc": "2.0", "id": 1}
+        if method == "eth_chainId":
+            response["result"] = hex(settings.ETH_CHAIN_ID)
+        elif method == "eth_blockNumber":
+            response["result"] = hex(self.block_number)
+        elif method == "eth_call":
+            transaction, block = params
+            self.eth_calls.append((transaction["to"], block))
+            await asyncio.sleep(self.latency)
+            try:
+                data = self.execute(transaction["to"], bytes.fromhex(transaction["data"][2:]))
+                response["result"] = "0x" + data.hex()
+            except Revert as e:
+                response["error"] = {"code": 3, "message": f"execution reverted: {e}"}
+        else:
+            raise NotImplementedError(method)
+        return response
+
+
+@pytest.fixture
+def chain():
+    """Fake chain with two tokens and the ETH/USD and BTC/USD feeds."""
+    chain = FakeChain()
+    chain.deploy(USDC, erc20({WALLET.lower(): 1_500_000_000}, 6))
+    chain.deploy(WETH, erc20({WALLET.lower(): 2 * 10**18}, 18))
+    chain.deploy(ETH_FEED, FakeFeed(3_000_12345678, 8))
+    chain.deploy(BTC_FEED, FakeFeed(65_000_00000000, 8))
+    return chain
+
+
+@pytest.fixture
+def service(chain):
+    """DeFiService reading from the fake chain."""
+    return DeFiService(w3=AsyncWeb3(chain), registry=ContractRegistry())
+
+
+async def test_token_balances_are_read_in_one_request(service, chain):
+    """Balance and decimals of every token come from a single aggregate3 call."""
+    balances = await service.get_token_balances([USDC, WETH], WALLET)
+    
+    assert balances == {USDC: Decimal("1500"), WETH: Decimal("2")}
+    assert [(to.lower(), block) for to, block in chain.eth_calls] == [
+        (settings.MULTICALL3_ADDRESS.lower(), "latest")
+    ]
+    assert await service.get_token_balance(USDC, WALLET) == Decimal("1500")
+    assert len(chain.eth_calls) == 2
+
+
+async def test_chainlink_prices_are_batched(service, chain):
+    """Several feeds are read with one request and keep the single-feed API."""
+    prices = await service.get_chainlink_prices([ETH_FEED, BTC_FEED])
+    
+    assert prices[ETH_FEED] == (Decimal("3000.12345678"), 8)
+    assert prices[BTC_FEED] == (Decimal("65000"), 8)
+    assert len(chain.eth_calls) == 1
+    assert await service.get_eth_usd_price() == Decimal("3000.12345678")
+    assert await service.get_btc_usd_price() == Decimal("65000")
+
+
+async def test_multicall_splits_batches_on_one_block(chain):
+    """Calls beyond batch_size go out in several requests pinned to the same block."""
+    w3 = AsyncWeb3(chain)
+    token = w3.eth.contract(address=USDC, abi=ERC20_ABI)
+    batch = Multicall(w3, batch_size=2)
+    for _ in range(5):
+        batch.add(token.functions.decimals())
+    
+    assert await batch.execute() == [6] * 5
+    assert len(batch) == 0
+    assert [block for _, block in chain.eth_calls] == [hex(chain.block_number)] * 3
+
+
+async def test_multicall_failures(chain):
+    """Allowed failures decode to None; any other failure raises."""
+    w3 = AsyncWeb3(chain)
+    missing = w3.eth.contract(address=to_checksum_address("0x" + "ee" * 20), abi=ERC20_ABI)
+    feed = w3.eth.contract(address=ETH_FEED, abi=ERC20_ABI)
+    
+    batch = Multicall(w3)
+    batch.add(missing.functions.decimals(), allow_failure=True)
+    batch.add(feed.functions.balanceOf(WALLET), allow_failure=True)
+    batch.add(feed.functions.decimals())
+    assert await batch.execute() == [None, None, 8]
+    
+    batch.add(feed.functions.balanceOf(WALLET))
+    with pytest.raises(ContractLogicError):
+        await batch.execute()
+    
+    batch.add(missing.functions.decimals())
+    with pytest.raises(ValueError, match="returned no data"):
+        await batch.execute()
+
+
+async def test_decimals_are_read_once_per_token(service, chain):
+    """Repeated balance and price reads only fetch the changing values."""
+    await service.get_token_balances([USDC, WETH], WALLET)
+    await service.get_chainlink_price(ETH_FEED)
+    chain.multicalled.clear()
+    
+    assert await service.get_token_balances([USDC, WETH], WALLET) == {
+        USDC: Decimal("1500"),
+        WETH: Decimal("2"),
+    }
+    assert await service.get_chainlink_price(ETH_FEED) == (Decimal("3000.12345678"), 8)
+    assert [call for _, call in chain.multicalled] == [
+        selector("balanceOf(address)"),
+        selector("balanceOf(address)"),
+        selector("latestRoundData()"),
+    ]
+
+
+def test_contract_registry_caches_handles():
+    """Handles are shared per (network, address, abi_id) and encode like web3."""
+    registry = ContractRegistry()
+    
+    usdc = registry.get("ethereum", USDC.lower(), "erc20")
+    assert registry.get("ethereum", USDC, "erc20") is usdc
+    assert registry.get("polygon", USDC, "erc20") is not usdc
+    assert usdc.address == USDC
+    assert len(registry) == 2
+    
+    call = usdc.call("balanceOf", WALLET)
+    expected = Web3().eth.contract(address=USDC, abi=ERC20_ABI).functions.balanceOf(WALLET)
+    assert call.data == bytes.fromhex(expected._encode_transaction_data()[2:])
+    assert call.function.decode(encode(["uint256"], [42])) == 42
+    
+    with pytest.raises(ValueError, match="no function"):
+        usdc.call("transfer", WALLET, 1)
+    with pytest.raises(ValueError, match="Unknown ABI"):
+        registry.get("ethereum", USDC, "uniswap_v3_pool")
+
+
+async def test_concurrent_reads_overlap(chain):
+    """Concurrent price reads wait on the RPC together instead of one after another."""
+    chain.latency = 0.05
+    service = DeFiService(w3=AsyncWeb3(chain), registry=ContractRegistry())
+    await service.get_chainlink_price(ETH_FEED)
+    
+    started = time.perf_counter()
+    prices = await asyncio.gather(*(service.get_chainlink_price(ETH_FEED) for _ in range(10)))
+    elapsed = time.perf_counter() - started
+    
+    assert prices == [(Decimal("3000.12345678"), 8)] * 10
+    assert elapsed < 5 * chain.latency
+
+
+class FakeClock:
+    """Settable unix time."""
+    
+    def __init__(self, now: float):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeStore:
+    """Shared quote store kept in a dict."""
+    
+    def __init__(self):
+        self.quotes = {}
+    
+    async def load(self, network, feed):
+        text = self.quotes.get((network, feed.lower()))
+        return PriceQuote.from_json(text) if text else None
+    
+    async def save(self, network, quote):
+        self.quotes[(network, quote.feed.lower())] = quote.to_json()
+
+
+async def test_price_cache_serves_reads_from_memory(service, chain):
+    """Only the first read of a feed goes to the chain; quotes carry staleness metadata."""
+    clock = FakeClock(UPDATED_AT + 120)
+    cache = ChainlinkPriceCache(service, clock=clock)
+    
+    quotes = await asyncio.gather(*(cache.get(ETH_FEED) for _ in range(50)))
+    
+    assert len(chain.eth_calls) == 1
+    assert {quote.price for quote in quotes} == {Decimal("3000.12345678")}
+    assert quotes[0].metadata(clock.now) == {
+        "round_id": 1,
+        "updated_at": UPDATED_AT,
+        "age_seconds": 120,
+        "heartbeat_seconds": settings.CHAINLINK_HEARTBEAT_SECONDS,
+        "stale": False,
+        "block_number": None,
+        "cache_age_seconds": 0,
+    }
+    assert quotes[0].is_stale(UPDATED_AT + settings.CHAINLINK_HEARTBEAT_SECONDS + 1)
+    assert cache.stats()["misses"] == 50 and cache.stats()["refreshes"] == 1
+    
+    # The service's price helpers go through its cache
+    assert await service.get_eth_usd_price() == Decimal("3000.12345678")
+    assert await service.get_eth_usd_price() == Decimal("3000.12345678")
+    assert len(chain.eth_calls) == 2
+
+
+async def test_price_cache_refreshes_on_new_block_or_heartbeat(service, chain):
+    """Feeds are re-read when the block moves or a heartbeat is near, not otherwise."""
+    clock = FakeClock(UPDATED_AT + 60)
+    cache = ChainlinkPriceCache(service, heartbeats={ETH_FEED: 600}, clock=clock)
+    feed = chain.contracts[ETH_FEED.lower()]
+    await cache.get_many([ETH_FEED, BTC_FEED])
+    
+    assert await cache.poll()
+    assert not await cache.poll()
+    assert len(chain.eth_calls) == 2
+    
+    feed.advance(3_100_00000000, UPDATED_AT + 90)
+    assert not await cache.poll()
+    chain.block_number += 1
+    assert await cache.poll()
+    quote = cache.peek(ETH_FEED)
+    assert (quote.price, quote.round_id, quote.block_number) == (
+        Decimal("3100"), 2, chain.block_number
+    )
+    
+    clock.now = UPDATED_AT + 90 + 600 - cache.heartbeat_margin
+    assert cache.due() == [ETH_FEED]
+    assert await cache.poll()
+    assert chain.eth_calls[-1][1] == hex(chain.block_number)
+
+
+async def test_price_cache_refreshes_on_read_without_background_task(service, chain):
+    """A cache nobody started re-reads due or stale feeds on read instead of freezing."""
+    clock = FakeClock(UPDATED_AT + 60)
+    cache = ChainlinkPriceCache(service, heartbeats={ETH_FEED: 600}, clock=clock)
+    feed = chain.contracts[ETH_FEED.lower()]
+    assert (await cache.get(ETH_FEED)).round_id == 1
+    
+    feed.advance(3_100_00000000, UPDATED_AT + 500)
+    clock.now = UPDATED_AT + 300
+    assert (await cache.get(ETH_FEED)).round_id == 1
+    clock.now = UPDATED_AT + 600 - cache.heartbeat_margin
+    quote = await cache.get(ETH_FEED)
+    assert (quote.price, quote.round_id) == (Decimal("3100"), 2)
+    assert len(chain.eth_calls) == 2
+    
+    # A feed the chain stopped updating is re-read at most once per poll interval
+    clock.now = UPDATED_AT + 500 + 601
+    quote = (await cache.get_many([ETH_FEED]))[ETH_FEED]
+    assert quote.is_stale(clock.now) and len(chain.eth_calls) == 3
+    assert (await cache.get(ETH_FEED)).is_stale(clock.now)
+    assert len(chain.eth_calls) == 3
+    clock.now += cache.poll_interval
+    await cache.get(ETH_FEED)
+    assert len(chain.eth_calls) == 4
+
+
+async def test_price_helpers_expose_staleness(chain):
+    """The USD quote helpers of a service with its own Web3 report round age and staleness."""
+    service = DeFiService(w3=AsyncWeb3(chain), registry=ContractRegistry())
+    
+    quote = await service.get_eth_usd_quote()
+    
+    assert quote.price == await service.get_eth_usd_price()
+    assert quote.metadata()["stale"] is True
+    assert quote.metadata()["age_seconds"] > settings.CHAINLINK_HEARTBEAT_SECONDS
+    assert (await service.get_btc_usd_quote()).price == Decimal("65000")
+
+
+async def test_price_cache_shares_quotes_through_store(service, chain):
+    """A second cache on the same store starts warm without reading the chain."""
+    store = FakeStore()
+    await ChainlinkPriceCache(service, store=store).get(ETH_FEED)
+    
+    quote = await ChainlinkPriceCache(service, store=store).get(ETH_FEED)
+    
+    assert quote.price == Decimal("3000.12345678")
+    assert len(chain.eth_calls) == 1
@@ -0,0 +1,101 @@
+"""
+TradeForge AaaS - Indicator Cache Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the indicator kernels and the shared indicator cache.
+"""
+
+import numpy as np
+import pytest
+
+from app.strategies.indicators import IndicatorCache, ema, rsi, sma
+from tests.test_sma_crossover import make_ohlcv
+
+
+def reference_rsi(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI computed bar by bar."""
+    out = np.full(len(values), np.nan)
+    delta = np.diff(values)
+    gains = np.clip(delta, 0, None)
+    losses = np.clip(-delta, 0, None)
+    avg_gain = gains[:period].mean()
+    avg_loss = losses[:period].mean()
+    out[period] = 100 - 100 / (1 + avg_gain / avg_loss)
+    for i in range(period, len(delta)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        out[i + 1] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return out
+
+
+def test_rsi_matches_wilder_reference():
+    """Vectorized RSI equals the textbook recursive definition."""
+    close = make_ohlcv(n=500)["close"].to_numpy()
+    
+    np.testing.assert_allclose(rsi(close, 14), reference_rsi(close, 14), rtol=1e-9)
+
+
+def test_cache_reuses_results_for_equal_series():
+    """Equal prices hit the same entries, even through different array objects."""
+    close = make_ohlcv(n=1000)["close"]
+    cache = IndicatorCache()
+    
+    first = cache.series(close).rsi(14)
+    second = cache.series(close.to_numpy().copy()).rsi(14)
+    
+    assert second is first
+    assert not first.flags.writeable
+    assert cache.stats()["hits"] == 1
+    
+    other = cache.series(close * 2).rsi(14)
+    assert other is not first
+    assert cache.stats()["misses"] == 2
+
+
+def test_composite_indicators_reuse_parts():
+    """MACD is built from the cached EMAs and Bollinger Bands from the cached SMA."""
+    close = make_ohlcv(n=1000)["close"].to_numpy()
+    cache = IndicatorCache()
+    series = cache.series(close)
+    
+    fast_ema = series.ema(12)
+    line, signal, hist = series.macd(12, 26, 9)
+    middle, upper, lower = series.bollinger(20, 2.0)
+    
+    np.testing.assert_allclose(line, ema(close, 12) - ema(close, 26))
+    np.testing.assert_allclose(hist, line - signal)
+    assert middle is series.sma(20)
+    np.testing.assert_allclose(middle, sma(close, 20))
+    np.testing.assert_allclose(upper - middle, middle - lower)
+    assert series.ema(12) is fast_ema
+    assert cache.stats()["hits"] >= 3
+
+
+def test_cache_evicts_least_recently_used_by_size():
+    """The cache stays under its byte budget."""
+    close = make_ohlcv(n=1000)["close"].to_numpy()
+    cache = IndicatorCache(max_bytes=3 * close.nbytes)
+    series = cache.series(close)
+    
+    for period in (5, 10, 20, 50):
+        series.sma(period)
+    
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= cache.max_bytes
+    series.sma(5)
+    assert cache.stats()["misses"] == 5
+
+
+def test_explicit_series_key_skips_hashing():
+    """Callers may key a series themselves."""
+    close = make_ohlcv(n=200)["close"].to_numpy()
+    cache = IndicatorCache()
+    
+    values = cache.series(close, key=("binance", "BTC/USDT", "1h")).sma(10)
+    
+    assert cache.series(close, key=("binance", "BTC/USDT", "1h")).sma(10) is values
+    assert values == pytest.approx(sma(close, 10), nan_ok=True)
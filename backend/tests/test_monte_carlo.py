@@ -0,0 +1,71 @@
+"""
+TradeForge AaaS - Monte Carlo Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for Monte Carlo trade resampling.
+"""
+
+import numpy as np
+import pytest
+
+from app.strategies.monte_carlo import MonteCarloSimulator, trade_growth_factors
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_sma_crossover import make_ohlcv
+
+
+@pytest.fixture
+def backtest():
+    """Backtest with a few dozen closed trades."""
+    df = make_ohlcv(n=4000, seed=21)
+    return SMACrossoverStrategy(fast_period=5, slow_period=20, position_size_pct=90.0).backtest(df)
+
+
+def test_growth_factors_rebuild_final_capital(backtest):
+    """Compounding the per-trade growth reproduces the backtest's closed-trade capital."""
+    growth = trade_growth_factors(backtest["trades"], 10000.0)
+    last_sell = [t for t in backtest["trades"] if t["type"] == "SELL"][-1]
+    
+    assert 10000.0 * np.prod(growth) == pytest.approx(last_sell["capital"])
+
+
+def test_shuffle_keeps_return_and_varies_drawdown(backtest):
+    """Reordering trades never changes the final return, only the path."""
+    results = MonteCarloSimulator(n_paths=2000, method="shuffle", seed=1).run(backtest["trades"])
+    
+    np.testing.assert_allclose(results["total_return"], results["original"]["total_return"])
+    assert results["max_drawdown"].std() > 0
+    assert (results["max_drawdown"] <= 0).all()
+
+
+def test_bootstrap_distribution(backtest):
+    """Bootstrap paths spread around the original result with ordered percentiles."""
+    results = MonteCarloSimulator(n_paths=5000, seed=2).run(backtest["trades"])
+    
+    assert results["total_return"].shape == (5000,)
+    assert results["percentiles"]["total_return"].is_monotonic_increasing
+    assert 0.0 <= results["probability_of_loss"] <= 1.0
+    bands = results["equity_bands"]
+    assert len(bands) == results["n_trades"] + 1
+    assert (bands["p5"] <= bands["p95"]).all()
+
+
+@pytest.mark.parametrize("method", ["bootstrap", "shuffle"])
+def test_chunking_does_not_change_results(backtest, method):
+    """Small chunks draw the same paths as one large chunk."""
+    trades = backtest["trades"]
+    whole = MonteCarloSimulator(n_paths=500, method=method, seed=3).run(trades)
+    chunked = MonteCarloSimulator(
+        n_paths=500, method=method, seed=3, max_batch_cells=1000
+    ).run(trades)
+    
+    np.testing.assert_allclose(whole["max_drawdown"], chunked["max_drawdown"])
+    np.testing.assert_allclose(whole["equity_bands"], chunked["equity_bands"])
+
+
+def test_requires_closed_trades():
+    """A backtest without closed trades cannot be resampled."""
+    with pytest.raises(ValueError):
+        MonteCarloSimulator().run([])
@@ -0,0 +1,140 @@
+"""
+TradeForge AaaS - Optimizer Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the SMA crossover grid optimizer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.strategies.optimizer import SMACrossoverOptimizer, evaluate_crossovers
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_sma_crossover import make_ohlcv
+
+
+METRICS = ["final_capital", "total_return", "total_trades", "winning_trades",
+           "win_rate", "max_drawdown", "sharpe_ratio"]
+
+
+def test_grid_matches_backtest():
+    """Every grid row reproduces the single-strategy backtest metrics."""
+    df = make_ohlcv(n=1500, seed=5)
+    optimizer = SMACrossoverOptimizer(
+        commission=0.001, position_size_pct=90.0, stop_loss_pct=None, take_profit_pct=None
+    )
+    
+    results = optimizer.run(df, fast_periods=[5, 10, 20], slow_periods=[20, 30, 60])
+    
+    assert len(results) == 8
+    for row in results.itertuples():
+        strategy = SMACrossoverStrategy(
+            fast_period=row.fast_period,
+            slow_period=row.slow_period,
+            stop_loss_pct=None,
+            take_profit_pct=None,
+            position_size_pct=90.0,
+        )
+        expected = strategy.backtest(df, commission=0.001)
+        for key in METRICS:
+            assert getattr(row, key) == pytest.approx(expected[key], rel=1e-8, abs=1e-8), key
+
+
+def test_default_stops_match_backtest():
+    """With default settings the grid trades the strategy's default stop loss and take profit."""
+    df = make_ohlcv(n=1500, seed=5)
+    
+    results = SMACrossoverOptimizer(position_size_pct=90.0).run(
+        df, fast_periods=[5, 10, 20], slow_periods=[20, 30, 60]
+    )
+    
+    assert (results["stop_loss_pct"] == 2.0).all()
+    for row in results.itertuples():
+        strategy = SMACrossoverStrategy(row.fast_period, row.slow_period, position_size_pct=90.0)
+        expected = strategy.backtest(df)
+        for key in METRICS:
+            assert getattr(row, key) == pytest.approx(expected[key], rel=1e-8, abs=1e-8), key
+
+
+def test_stop_loss_axis_matches_backtest():
+    """Every stop loss candidate (None disables it) matches a backtest with that stop."""
+    df = make_ohlcv(n=1500, seed=7)
+    optimizer = SMACrossoverOptimizer(position_size_pct=90.0, trailing_stop_pct=4.0)
+    
+    results = optimizer.run(
+        df, fast_periods=[5, 10], slow_periods=[30], stop_loss_pcts=[None, 1.0, 3.0]
+    )
+    
+    assert len(results) == 6
+    assert results["stop_loss_pct"].isna().sum() == 2
+    for row in results.itertuples():
+        strategy = SMACrossoverStrategy(
+            fast_period=row.fast_period,
+            slow_period=row.slow_period,
+            stop_loss_pct=None if np.isnan(row.stop_loss_pct) else row.stop_loss_pct,
+            trailing_stop_pct=4.0,
+            position_size_pct=90.0,
+        )
+        expected = strategy.backtest(df)
+        for key in METRICS:
+            assert getattr(row, key) == pytest.approx(expected[key], rel=1e-8, abs=1e-8), key
+
+
+def test_grid_ranking_and_top_n():
+    """Results are sorted best-first by the requested metric."""
+    df = make_ohlcv(n=1500, seed=5)
+    optimizer = SMACrossoverOptimizer(position_size_pct=90.0)
+    
+    results = optimizer.run(
+        df, fast_periods=range(5, 15), slow_periods=range(20, 40, 5),
+        rank_by="total_return", top_n=5,
+    )
+    
+    assert len(results) == 5
+    assert results["total_return"].is_monotonic_decreasing
+
+
+def test_batching_does_not_change_results():
+    """Small batches give the same metrics as one large batch."""
+    df = make_ohlcv(n=800, seed=9)
+    grid = dict(fast_periods=range(3, 12), slow_periods=range(15, 30, 3))
+    
+    single = SMACrossoverOptimizer(position_size_pct=80.0).run(df, **grid)
+    batched = SMACrossoverOptimizer(position_size_pct=80.0, max_batch_cells=2000).run(df, **grid)
+    
+    assert single.equals(batched)
+
+
+def test_sharpe_without_float_errors():
+    """Sharpe is 0 without returns, NaN for one return and stable for a steady climb."""
+    n = 300
+    close = 100 * np.cumprod(np.full(n, 1 + 1e-6))
+    fast = np.ones((3, n))
+    fast[:, 0] = -1
+    slow = np.zeros((3, n))
+    
+    with np.errstate(all="raise"):
+        metrics = evaluate_crossovers(
+            close, fast, slow, np.array([1, n - 1, n]), commission=0.0, include_equity=True
+        )
+    
+    returns = pd.Series(metrics["equity"][0]).pct_change().iloc[1:]
+    expected = returns.mean() / returns.std() * np.sqrt(252)
+    assert metrics["sharpe_ratio"][0] == pytest.approx(expected, rel=1e-9)
+    assert np.isnan(metrics["sharpe_ratio"][1])
+    assert metrics["sharpe_ratio"][2] == 0.0
+
+
+def test_invalid_arguments():
+    """Empty grids and unknown metrics are rejected."""
+    df = make_ohlcv(n=200)
+    optimizer = SMACrossoverOptimizer()
+    
+    with pytest.raises(ValueError):
+        optimizer.run(df, fast_periods=[50], slow_periods=[20])
+    with pytest.raises(ValueError):
+        optimizer.run(df, fast_periods=[5], slow_periods=[20], rank_by="profit")
@@ -0,0 +1,109 @@
+"""
+TradeForge AaaS - Portfolio Backtester Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the shared-capital multi-symbol backtester.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.strategies.portfolio import PortfolioBacktester
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_sma_crossover import make_ohlcv
+
+
+def make_basket(n_symbols: int, n: int = 2000) -> pd.DataFrame:
+    """Close matrix for n_symbols independent random walks."""
+    return pd.DataFrame({
+        f"SYM{i}/USDT": make_ohlcv(n=n, seed=100 + i)["close"] for i in range(n_symbols)
+    })
+
+
+def test_single_symbol_matches_strategy_backtest():
+    """With one symbol and one slot the portfolio equals the single-symbol backtest."""
+    df = make_ohlcv(n=3000, seed=31)
+    portfolio = PortfolioBacktester(
+        fast_period=10, slow_period=30, max_open_positions=1, max_position_size_pct=80.0
+    )
+    
+    results = portfolio.backtest({"BTC/USDT": df})
+    expected = SMACrossoverStrategy(
+        fast_period=10,
+        slow_period=30,
+        stop_loss_pct=None,
+        take_profit_pct=None,
+        position_size_pct=80.0,
+    ).backtest(df, mode="loop")
+    
+    assert results["final_capital"] == pytest.approx(expected["final_capital"])
+    assert results["total_trades"] == expected["total_trades"]
+    assert results["win_rate"] == pytest.approx(expected["win_rate"])
+    np.testing.assert_allclose(results["equity_curve"], expected["equity_curve"])
+    assert all(trade["symbol"] == "BTC/USDT" for trade in results["trades"])
+    assert results["stop_loss_pct"] is results["take_profit_pct"] is None
+
+
+def test_open_position_limit():
+    """Never more than max_open_positions positions at once."""
+    closes = make_basket(12)
+    
+    results = PortfolioBacktester(
+        fast_period=5, slow_period=20, max_open_positions=3, max_position_size_pct=20.0
+    ).backtest(closes)
+    
+    assert results["open_positions"].max() == 3
+    assert results["total_trades"] > 0
+
+
+def test_shared_capital_limits_entries():
+    """Position sizes come from one pool, so cash caps the number of positions."""
+    closes = make_basket(6)
+    
+    results = PortfolioBacktester(
+        fast_period=5, slow_period=20, max_open_positions=10, max_position_size_pct=40.0
+    ).backtest(closes)
+    
+    assert results["open_positions"].max() == 2
+    assert min(trade["capital"] for trade in results["trades"]) >= 0
+
+
+def test_misaligned_symbols_are_aligned():
+    """Symbols listed at different times trade on the union of timestamps."""
+    early = make_ohlcv(n=1500, seed=41)
+    late = make_ohlcv(n=1500, seed=42).iloc[500:]
+    
+    results = PortfolioBacktester(fast_period=5, slow_period=20).backtest(
+        {"EARLY/USDT": early, "LATE/USDT": late}
+    )
+    
+    assert len(results["equity_curve"]) == 1500 - 20 + 1
+    late_trades = [t for t in results["trades"] if t["symbol"] == "LATE/USDT"]
+    assert late_trades and min(t["date"] for t in late_trades) >= late.index[0]
+
+
+def test_staggered_symbols_trade_their_single_asset_crossovers():
+    """Late starts and missing bars leave each symbol's crossovers as in backtest()."""
+    early = make_ohlcv(n=1500, seed=43)
+    late = make_ohlcv(n=1500, seed=44).iloc[300:]
+    late = late.drop(late.index[100:1000:37])
+    
+    results = PortfolioBacktester(
+        fast_period=5, slow_period=20, max_open_positions=2, max_position_size_pct=10.0
+    ).backtest({"EARLY/USDT": early, "LATE/USDT": late})
+    
+    strategy = SMACrossoverStrategy(
+        fast_period=5,
+        slow_period=20,
+        stop_loss_pct=None,
+        take_profit_pct=None,
+        position_size_pct=10.0,
+    )
+    for symbol, df in (("EARLY/USDT", early), ("LATE/USDT", late)):
+        expected = [(t["date"], t["type"]) for t in strategy.backtest(df)["trades"]]
+        traded = [(t["date"], t["type"]) for t in results["trades"] if t["symbol"] == symbol]
+        assert traded == expected
@@ -0,0 +1,81 @@
+"""
+TradeForge AaaS - Reduced Precision Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the float32 indicator mode and its accuracy report.
+"""
+
+import numpy as np
+import pytest
+
+from app.strategies.indicators import IndicatorCache
+from app.strategies.optimizer import SMACrossoverOptimizer
+from app.strategies.precision import backtest_accuracy, optimizer_accuracy
+from app.strategies.registry import create_strategy
+from tests.test_sma_crossover import make_ohlcv
+from tests.test_strategy_registry import BUILT_IN
+
+
+def test_float32_cache_halves_indicator_bytes():
+    """A float32 cache stores rounded float64 results at half the size."""
+    close = make_ohlcv(n=1000, seed=3)["close"]
+    exact = IndicatorCache().series(close)
+    reduced = IndicatorCache(precision="float32").series(close)
+    
+    for name in ("sma", "ema", "rsi"):
+        values = getattr(reduced, name)(14)
+        assert values.dtype == np.float32
+        np.testing.assert_array_equal(values, getattr(exact, name)(14).astype(np.float32))
+    assert reduced.cache.stats()["bytes"] * 2 == exact.cache.stats()["bytes"]
+    # The MACD line is taken from float64 EMAs, not from the rounded cached ones
+    np.testing.assert_allclose(reduced.macd()[0], exact.macd()[0], rtol=1e-6)
+    
+    with pytest.raises(ValueError):
+        IndicatorCache(precision="float16")
+
+
+@pytest.mark.parametrize("strategy_type", sorted(BUILT_IN))
+def test_float32_backtest_accuracy(strategy_type):
+    """float32 indicators reproduce the float64 trades and metrics."""
+    df = make_ohlcv(n=3000, seed=11)
+    params = {**BUILT_IN[strategy_type], "position_size_pct": 90.0}
+    strategy = create_strategy(strategy_type, params)
+    
+    report = backtest_accuracy(strategy, df)
+    
+    assert report["trades_match"]
+    assert report["max_rel_error"] < 1e-9
+    assert report["metrics"]["total_trades"]["float64"] > 0
+
+
+def test_backtest_precision_must_match_cache():
+    """An explicit precision cannot contradict the shared cache."""
+    strategy = create_strategy("sma_crossover", BUILT_IN["sma_crossover"])
+    df = make_ohlcv(n=500)
+    
+    results = strategy.backtest(df, precision="float32")
+    assert results["total_trades"] == strategy.backtest(df)["total_trades"]
+    with pytest.raises(ValueError):
+        strategy.backtest(df, indicators=IndicatorCache(), precision="float32")
+
+
+def test_float32_optimizer_accuracy():
+    """A float32 grid search ranks the same best combination with half the SMA memory."""
+    df = make_ohlcv(n=3000, seed=11)
+    optimizer = SMACrossoverOptimizer(position_size_pct=90.0)
+    
+    report = optimizer_accuracy(df, [5, 10, 20], [30, 50, 100], optimizer=optimizer)
+    
+    assert report["combinations"] == 9
+    assert report["same_best"]
+    assert report["trade_count_mismatches"] == 0
+    assert report["sma_bytes"]["float32"] * 2 == report["sma_bytes"]["float64"]
+    
+    reduced = SMACrossoverOptimizer(position_size_pct=90.0, precision="float32").run(
+        df, [5, 10, 20], [30, 50, 100]
+    )
+    exact = optimizer.run(df, [5, 10, 20], [30, 50, 100])
+    assert reduced[["fast_period", "slow_period"]].equals(exact[["fast_period", "slow_period"]])
@@ -0,0 +1,106 @@
+"""
+TradeForge AaaS - Results Codec Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the compact binary backtest results format.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models import Backtest
+from app.services.results_codec import (
+    ResultsReader,
+    decode_results,
+    encode_results,
+    load_backtest_results,
+)
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_sma_crossover import make_ohlcv
+
+
+@pytest.fixture
+def results():
+    """Backtest output with trades on a UTC DatetimeIndex."""
+    df = make_ohlcv(n=5000, seed=4).tz_localize("UTC")
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20, position_size_pct=90.0)
+    return strategy.backtest(df)
+
+
+def test_round_trip(results):
+    """Decoding returns the original trades and equity curve."""
+    decoded = decode_results(encode_results(results))
+    
+    assert decoded["equity_curve"] == results["equity_curve"]
+    assert len(decoded["trades"]) == len(results["trades"])
+    for trade, expected in zip(decoded["trades"], results["trades"]):
+        assert trade.keys() == expected.keys()
+        for key, value in expected.items():
+            assert trade[key] == pytest.approx(value) if key != "date" else trade[key] == value
+
+
+def test_integer_index_round_trip():
+    """Trades on a RangeIndex keep their integer bar positions."""
+    df = make_ohlcv(n=1000, seed=5).reset_index(drop=True)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20, position_size_pct=90.0)
+    results = strategy.backtest(df)
+    
+    decoded = decode_results(encode_results(results))
+    
+    assert [trade["date"] for trade in decoded["trades"]] == [
+        trade["date"] for trade in results["trades"]
+    ]
+
+
+def test_other_index_round_trip():
+    """Trades on any other index (here bar labels) keep their index values."""
+    df = make_ohlcv(n=1000, seed=5)
+    df.index = [f"bar-{i:04d}" for i in range(len(df))]
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20, position_size_pct=90.0)
+    results = strategy.backtest(df)
+    
+    reader = ResultsReader(encode_results(results))
+    
+    assert reader.meta["date_kind"] == "object"
+    assert [trade["date"] for trade in reader.trades()] == [
+        trade["date"] for trade in results["trades"]
+    ]
+
+
+def test_reader_is_lazy_and_smaller_than_json(results):
+    """Counts come from the header and only requested columns are decompressed."""
+    blob = encode_results(results)
+    reader = ResultsReader(blob)
+    
+    assert reader.bar_count == len(results["equity_curve"])
+    assert reader.trade_count == len(results["trades"])
+    
+    reader.trades_frame()
+    
+    assert "equity_curve" not in reader._decoded
+    payload = {"trades": results["trades"], "equity_curve": results["equity_curve"]}
+    assert len(blob) * 4 < len(json.dumps(payload, default=str))
+
+
+def test_empty_results():
+    """A backtest without trades encodes and decodes."""
+    decoded = decode_results(encode_results({"trades": [], "equity_curve": [10000.0]}))
+    
+    assert decoded == {"trades": [], "equity_curve": [10000.0]}
+
+
+def test_legacy_json_rows_are_readable(results):
+    """Rows stored as results_json before results_blob load through the same reader."""
+    payload = {"trades": results["trades"], "equity_curve": results["equity_curve"]}
+    backtest = Backtest(results_json=json.dumps(payload, default=str))
+    
+    reader = load_backtest_results(backtest)
+    
+    np.testing.assert_array_equal(reader.equity_curve(), results["equity_curve"])
+    assert reader.trades_frame()["date"].iloc[0] == pd.Timestamp(results["trades"][0]["date"])
@@ -0,0 +1,362 @@
+"""
+TradeForge AaaS - SMA Crossover Strategy Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the SMA crossover strategy and its backtest engines.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.strategies.sma_crossover import SMACrossoverStrategy, SMACrossoverStream
+
+
+def make_ohlcv(n: int = 2000, seed: int = 42) -> pd.DataFrame:
+    """Build a synthetic random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start="2023-01-01", periods=n, freq="1h")
+    prices = 100 + np.cumsum(rng.normal(0, 1, n))
+    prices = np.maximum(prices, 1.0)
+    return pd.DataFrame({
+        "open": prices,
+        "high": prices * 1.01,
+        "low": prices * 0.99,
+        "close": prices,
+        "volume": rng.integers(1000, 10000, n),
+    }, index=dates)
+
+
+def assert_results_match(loop: dict, vectorized: dict) -> None:
+    """Assert two backtest result dicts are equivalent."""
+    for key in ("initial_capital", "final_capital", "total_return", "win_rate",
+                "max_drawdown", "sharpe_ratio"):
+        assert vectorized[key] == pytest.approx(loop[key], rel=1e-9, abs=1e-9, nan_ok=True), key
+    assert vectorized["total_trades"] == loop["total_trades"]
+    assert vectorized["winning_trades"] == loop["winning_trades"]
+    np.testing.assert_allclose(vectorized["equity_curve"], loop["equity_curve"], rtol=1e-9)
+    
+    assert len(vectorized["trades"]) == len(loop["trades"])
+    for expected, actual in zip(loop["trades"], vectorized["trades"]):
+        assert actual.keys() == expected.keys()
+        assert actual["date"] == expected["date"]
+        assert actual["type"] == expected["type"]
+        for key in ("price", "shares", "capital", "pnl", "pnl_pct"):
+            if key in expected:
+                assert actual[key] == pytest.approx(expected[key], rel=1e-9), key
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+@pytest.mark.parametrize("fast,slow", [(5, 20), (20, 50)])
+def test_vectorized_backtest_matches_loop(seed, fast, slow):
+    """Vectorized engine reproduces the row loop."""
+    df = make_ohlcv(seed=seed)
+    strategy = SMACrossoverStrategy(fast_period=fast, slow_period=slow, position_size_pct=95.0)
+    
+    loop = strategy.backtest(df, initial_capital=10000.0, commission=0.001, mode="loop")
+    vectorized = strategy.backtest(df, initial_capital=10000.0, commission=0.001, mode="vectorized")
+    
+    assert loop["total_trades"] > 0
+    assert_results_match(loop, vectorized)
+
+
+def test_vectorized_backtest_matches_loop_when_unaffordable():
+    """Full-size positions plus commission never fill in either engine."""
+    df = make_ohlcv()
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20)
+    
+    loop = strategy.backtest(df, commission=0.001, mode="loop")
+    vectorized = strategy.backtest(df, commission=0.001, mode="vectorized")
+    
+    assert loop["total_trades"] == 0
+    assert_results_match(loop, vectorized)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 7])
+@pytest.mark.parametrize("trailing", [None, 2.0])
+def test_full_size_entries_without_commission_match_loop(seed, trailing):
+    """An entry whose cost exceeds capital only by rounding fills in both engines."""
+    df = make_ohlcv(seed=seed)
+    strategy = SMACrossoverStrategy(
+        fast_period=2,
+        slow_period=15,
+        stop_loss_pct=None,
+        take_profit_pct=None,
+        position_size_pct=100.0,
+        trailing_stop_pct=trailing,
+    )
+    
+    loop = strategy.backtest(df, commission=0.0, mode="loop")
+    vectorized = strategy.backtest(df, commission=0.0, mode="vectorized")
+    
+    assert_results_match(loop, vectorized)
+
+
+def test_vectorized_backtest_open_position_at_end():
+    """A position still open on the last bar is marked to market."""
+    df = make_ohlcv(n=400, seed=3)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20, position_size_pct=50.0)
+    full = strategy.backtest(df, mode="loop")
+    last_buy = max(i for i, t in enumerate(full["trades"]) if t["type"] == "BUY")
+    cutoff = df.index.get_loc(full["trades"][last_buy]["date"]) + 1
+    
+    loop = strategy.backtest(df.iloc[:cutoff], mode="loop")
+    vectorized = strategy.backtest(df.iloc[:cutoff], mode="vectorized")
+    
+    assert loop["trades"][-1]["type"] == "BUY"
+    assert_results_match(loop, vectorized)
+
+
+def test_backtest_short_history():
+    """Histories shorter than the slow period produce no trades."""
+    df = make_ohlcv(n=30)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=50)
+    
+    results = strategy.backtest(df)
+    
+    assert results["total_trades"] == 0
+    assert results["equity_curve"] == [10000.0]
+
+
+def test_backtest_rejects_unknown_mode():
+    """Unknown engine names raise ValueError."""
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20)
+    
+    with pytest.raises(ValueError):
+        strategy.backtest(make_ohlcv(n=100), mode="turbo")
+
+
+def make_gapped_ohlcv(n: int = 2000, seed: int = 42) -> pd.DataFrame:
+    """Random-walk OHLCV whose opens gap away from the previous close."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.concatenate(([close[0]], close[:-1])) * (1 + rng.normal(0, 0.01, n))
+    return pd.DataFrame({
+        "open": open_,
+        "high": np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n))),
+        "low": np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n))),
+        "close": close,
+        "volume": rng.integers(1000, 10000, n),
+    }, index=pd.date_range(start="2023-01-01", periods=n, freq="1h"))
+
+
+@pytest.mark.parametrize("seed", [1, 7])
+@pytest.mark.parametrize("stop_loss,take_profit,trailing", [
+    (2.0, 5.0, None),
+    (1.0, None, None),
+    (None, 3.0, None),
+    (None, None, 1.5),
+    (3.0, 6.0, 1.0),
+])
+def test_vectorized_stops_match_loop(seed, stop_loss, take_profit, trailing):
+    """Both engines take the same intrabar exits at the same prices."""
+    df = make_gapped_ohlcv(seed=seed)
+    strategy = SMACrossoverStrategy(
+        fast_period=5,
+        slow_period=20,
+        stop_loss_pct=stop_loss,
+        take_profit_pct=take_profit,
+        position_size_pct=90.0,
+        trailing_stop_pct=trailing,
+    )
+    
+    loop = strategy.backtest(df, mode="loop")
+    vectorized = strategy.backtest(df, mode="vectorized")
+    
+    closes = df["close"]
+    assert any(t["type"] == "SELL" and t["price"] != closes[t["date"]] for t in loop["trades"])
+    assert_results_match(loop, vectorized)
+
+
+def first_entry(df: pd.DataFrame) -> int:
+    """Row number of the first golden cross a 5/20 strategy trades."""
+    signals = SMACrossoverStrategy(fast_period=5, slow_period=20).extract_signals(df)
+    return int(signals.loc[signals["side"] > 0, "bar"].iloc[0])
+
+
+def first_exit(df: pd.DataFrame, mode: str, **params) -> dict:
+    """First SELL trade of a 5/20 strategy with the given exit settings."""
+    strategy = SMACrossoverStrategy(
+        fast_period=5, slow_period=20, position_size_pct=50.0, **params
+    )
+    results = strategy.backtest(df, mode=mode)
+    return next(t for t in results["trades"] if t["type"] == "SELL")
+
+
+@pytest.mark.parametrize("mode", ["loop", "vectorized"])
+@pytest.mark.parametrize("bar_open,low,high,expected", [
+    (1.00, 0.97, 1.01, 0.98),  # low touches the stop
+    (0.95, 0.94, 0.96, 0.95),  # gap below the stop fills at the open
+    (1.00, 0.97, 1.06, 0.98),  # stop and take profit in one bar: stop first
+    (1.00, 0.99, 1.06, 1.05),  # high touches the take profit
+    (1.07, 1.06, 1.08, 1.07),  # gap above the take profit fills at the open
+])
+def test_stop_fill_policy(mode, bar_open, low, high, expected):
+    """Intrabar exits fill at the level, or at the open when the bar gaps through it."""
+    df = make_ohlcv(n=400, seed=3)
+    entry = first_entry(df)
+    entry_price = df["close"].iloc[entry]
+    df.iloc[entry + 1, :3] = [bar_open * entry_price, high * entry_price, low * entry_price]
+    
+    trade = first_exit(df, mode, stop_loss_pct=2.0, take_profit_pct=5.0)
+    
+    assert trade["date"] == df.index[entry + 1]
+    assert trade["price"] == pytest.approx(expected * entry_price)
+
+
+@pytest.mark.parametrize("mode", ["loop", "vectorized"])
+def test_trailing_stop_follows_highs(mode):
+    """The trailing stop ratchets up with the highs of earlier bars."""
+    df = make_ohlcv(n=400, seed=3)
+    entry = first_entry(df)
+    entry_price = df["close"].iloc[entry]
+    df.iloc[entry + 1, :3] = [entry_price, 1.10 * entry_price, entry_price]
+    df.iloc[entry + 2, :3] = [1.09 * entry_price, 1.09 * entry_price, 1.05 * entry_price]
+    
+    trade = first_exit(df, mode, stop_loss_pct=None, take_profit_pct=None, trailing_stop_pct=2.0)
+    
+    assert trade["date"] == df.index[entry + 2]
+    assert trade["price"] == pytest.approx(1.10 * 0.98 * entry_price)
+
+
+def reference_signals(strategy: SMACrossoverStrategy, df: pd.DataFrame) -> list:
+    """Row-by-row signal scan the columnar extractor replaced."""
+    df = strategy.calculate_indicators(df)
+    signals = []
+    for i in range(len(df)):
+        row = df.iloc[i]
+        if row["position"] == 2:
+            signals.append({
+                "timestamp": df.index[i],
+                "type": "BUY",
+                "price": row["close"],
+                "reason": "Golden Cross (Fast SMA crossed above Slow SMA)",
+                "stop_loss": row["close"] * (1 - strategy.stop_loss_pct / 100),
+                "take_profit": row["close"] * (1 + strategy.take_profit_pct / 100),
+                "position_size": strategy.position_size_pct,
+                "indicators": {"fast_sma": row["SMA_fast"], "slow_sma": row["SMA_slow"]},
+            })
+        elif row["position"] == -2:
+            signals.append({
+                "timestamp": df.index[i],
+                "type": "SELL",
+                "price": row["close"],
+                "reason": "Death Cross (Fast SMA crossed below Slow SMA)",
+                "indicators": {"fast_sma": row["SMA_fast"], "slow_sma": row["SMA_slow"]},
+            })
+    return signals
+
+
+def test_generate_signals_matches_row_scan():
+    """Columnar extraction yields the same signal dictionaries as the row scan."""
+    df = make_ohlcv(n=1500, seed=11)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20)
+    
+    assert strategy.generate_signals(df) == reference_signals(strategy, df)
+
+
+def test_extract_signals_columns():
+    """Columnar signals expose bar, side, price, SL/TP and SMA values."""
+    df = make_ohlcv(n=1500, seed=11)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20)
+    
+    signals = strategy.extract_signals(df)
+    
+    assert list(signals.columns) == [
+        "bar", "side", "price", "stop_loss", "take_profit", "fast_sma", "slow_sma"
+    ]
+    assert len(signals) > 0
+    assert set(signals["side"].unique()) <= {1, -1}
+    np.testing.assert_array_equal(signals.index, df.index[signals["bar"].to_numpy()])
+    
+    sells = signals[signals["side"] == -1]
+    assert sells["stop_loss"].isna().all()
+    assert sells["take_profit"].isna().all()
+    buys = signals[signals["side"] == 1]
+    np.testing.assert_allclose(buys["stop_loss"], buys["price"] * 0.98)
+
+
+def stream_signals(stream, closes) -> list:
+    """Feed closes into a stream and collect (bar, signal) pairs."""
+    signals = []
+    for bar, close in enumerate(closes):
+        signal = stream.update(close)
+        if signal is not None:
+            signals.append((bar, signal))
+    return signals
+
+
+def near_ties(strategy, df) -> set:
+    """Bars whose crossover depends on rounding (the SMAs tie there or on the bar before)."""
+    indicators = strategy.calculate_indicators(df)
+    fast = indicators["SMA_fast"].to_numpy()
+    slow = indicators["SMA_slow"].to_numpy()
+    tied = np.flatnonzero(np.abs(fast - slow) <= 1e-9 * np.abs(slow))
+    return set(tied) | set(tied + 1)
+
+
+def make_tick_ohlcv(n: int = 3000, seed: int = 0) -> pd.DataFrame:
+    """Build a random walk on a 0.1 tick grid that often stands still (many exact SMA ties)."""
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([-0.1, 0.0, 0.1], n, p=[0.2, 0.6, 0.2])
+    prices = 100 + np.round(np.cumsum(steps), 1)
+    return pd.DataFrame({
+        "open": prices,
+        "high": prices,
+        "low": prices,
+        "close": prices,
+        "volume": 1.0,
+    }, index=pd.date_range(start="2023-01-01", periods=n, freq="1h"))
+
+
+@pytest.mark.parametrize("df, fast_period, slow_period", [
+    (make_ohlcv(n=3000, seed=21), 7, 25),
+    (make_tick_ohlcv(seed=3), 2, 4),
+    (make_tick_ohlcv(seed=5), 5, 20),
+])
+def test_stream_matches_batch_signals(df, fast_period, slow_period):
+    """Incremental evaluation emits the same crossovers as extract_signals up to ties."""
+    strategy = SMACrossoverStrategy(fast_period=fast_period, slow_period=slow_period)
+    ties = near_ties(strategy, df)
+    
+    signals = strategy.extract_signals(df)
+    expected = [
+        (bar, "BUY" if side > 0 else "SELL")
+        for bar, side in zip(signals["bar"], signals["side"])
+        if bar not in ties
+    ]
+    streamed = stream_signals(strategy.create_stream(), df["close"])
+    
+    assert [(bar, signal) for bar, signal in streamed if bar not in ties] == expected
+
+
+def test_stream_snapshot_restore():
+    """A restored stream continues exactly like the original."""
+    df = make_ohlcv(n=2000, seed=4)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20)
+    closes = df["close"].to_numpy()
+    
+    original = strategy.create_stream()
+    stream_signals(original, closes[:1234])
+    restored = SMACrossoverStream.restore(json.loads(json.dumps(original.snapshot())))
+    
+    assert stream_signals(restored, closes[1234:]) == stream_signals(original, closes[1234:])
+    assert restored.slow_sma == original.slow_sma
+
+
+def test_stream_warm_up_matches_current_signal():
+    """A stream warmed from history agrees with get_current_signal on each new bar up to ties."""
+    df = make_ohlcv(n=1500, seed=8)
+    strategy = SMACrossoverStrategy(fast_period=5, slow_period=20)
+    stream = strategy.create_stream(df.iloc[:1000])
+    ties = near_ties(strategy, df)
+    
+    for i in range(1000, 1500):
+        signal = stream.update(df["close"].iloc[i])
+        if i not in ties:
+            assert signal == strategy.get_current_signal(df.iloc[:i + 1])
@@ -0,0 +1,153 @@
+"""
+TradeForge AaaS - Strategy Registry Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the strategy registry and the built-in indicator strategies.
+"""
+
+import numpy as np
+import pytest
+
+from app.strategies.base import BaseStrategy
+from app.strategies.indicators import IndicatorCache
+from app.strategies.registry import (
+    available_strategies,
+    create_strategy,
+    get_strategy_class,
+    register_strategy,
+)
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from tests.test_sma_crossover import assert_results_match, make_gapped_ohlcv
+
+BUILT_IN = {
+    "sma_crossover": {"fast_period": 5, "slow_period": 20},
+    "ema_crossover": {"fast_period": 5, "slow_period": 20},
+    "rsi": {"rsi_period": 14, "oversold": 35, "overbought": 65},
+    "macd": {},
+    "bollinger": {"period": 20, "num_std": 1.5},
+}
+
+
+def test_built_in_strategies_are_registered():
+    """Every strategy offered on the Backtest page has a registered type."""
+    assert set(BUILT_IN) <= set(available_strategies())
+    assert get_strategy_class("sma_crossover") is SMACrossoverStrategy
+
+
+def test_unknown_strategy_type_raises():
+    """Unregistered types raise ValueError."""
+    with pytest.raises(ValueError):
+        get_strategy_class("martingale")
+    with pytest.raises(ValueError):
+        get_strategy_class(None)
+
+
+@pytest.mark.parametrize("strategy_type", sorted(BUILT_IN))
+def test_built_in_strategies_trade_identically_in_both_engines(strategy_type):
+    """Each strategy's events run through the shared engines consistently."""
+    df = make_gapped_ohlcv(n=1500, seed=5)
+    params = {**BUILT_IN[strategy_type], "position_size_pct": 90.0}
+    strategy = create_strategy(strategy_type, params)
+    
+    loop = strategy.backtest(df, mode="loop")
+    vectorized = strategy.backtest(df, mode="vectorized")
+    
+    assert loop["total_trades"] > 0
+    assert_results_match(loop, vectorized)
+    assert all(trade["date"] >= df.index[strategy.warmup_bars] for trade in loop["trades"])
+
+
+@pytest.mark.parametrize("strategy_type", sorted(BUILT_IN))
+def test_indicator_arrays_match_calculate_indicators(strategy_type):
+    """The close-only path returns calculate_indicators' columns as float32/int8 arrays."""
+    df = make_gapped_ohlcv(n=1500, seed=5)
+    strategy = create_strategy(strategy_type, BUILT_IN[strategy_type])
+    
+    frame = strategy.calculate_indicators(df)
+    arrays = strategy.indicator_arrays(df["close"])
+    
+    assert set(arrays) == set(frame.columns) - set(df.columns)
+    for name, values in arrays.items():
+        expected = frame[name].to_numpy(dtype=np.float64)
+        if name in ("signal", "position"):
+            assert values.dtype == np.int8
+            np.testing.assert_array_equal(values, np.nan_to_num(expected))
+        else:
+            assert values.dtype == np.float32
+            np.testing.assert_allclose(values, expected, rtol=1e-6)
+    np.testing.assert_array_equal(strategy.signal_events(df), arrays["position"])
+
+
+def test_indicator_arrays_write_into_buffers():
+    """Caller buffers are filled in place and only the requested columns are built."""
+    df = make_gapped_ohlcv(n=1500, seed=5)
+    strategy = create_strategy("sma_crossover", BUILT_IN["sma_crossover"])
+    position = np.full(len(df), 99, dtype=np.int8)
+    fast = np.empty(len(df), dtype=np.float32)
+    
+    arrays = strategy.indicator_arrays(
+        df["close"], out={"position": position, "SMA_fast": fast}, columns=("SMA_fast", "position")
+    )
+    
+    assert set(arrays) == {"SMA_fast", "position"}
+    assert arrays["position"] is position and arrays["SMA_fast"] is fast
+    np.testing.assert_array_equal(position, strategy.indicator_arrays(df["close"])["position"])
+    assert strategy.signal_events(df, out=position) is position
+    with pytest.raises(ValueError):
+        strategy.indicator_arrays(df["close"], out={"position": position[:10]})
+
+
+def test_strategies_share_indicators_in_one_run():
+    """Strategies on the same prices reuse each other's indicator arrays."""
+    df = make_gapped_ohlcv(n=1500, seed=5)
+    cache = IndicatorCache()
+    
+    create_strategy("ema_crossover", {"fast_period": 12, "slow_period": 26}).backtest(
+        df, indicators=cache
+    )
+    misses = cache.stats()["misses"]
+    create_strategy("macd", {"fast_period": 12, "slow_period": 26}).backtest(df, indicators=cache)
+    create_strategy("bollinger", {"period": 20}).backtest(df, indicators=cache)
+    create_strategy("sma_crossover", {"fast_period": 5, "slow_period": 20}).backtest(
+        df, indicators=cache
+    )
+    
+    # MACD reused both EMAs; the SMA strategy reused Bollinger's SMA(20)
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == misses + 5
+    
+    shared = create_strategy("macd", {}).backtest(df, indicators=cache)
+    alone = create_strategy("macd", {}).backtest(df)
+    assert shared["final_capital"] == alone["final_capital"]
+
+
+def test_register_plugin_strategy():
+    """Plugins register BaseStrategy subclasses under their own type."""
+    
+    @register_strategy("test_always_long")
+    class AlwaysLongStrategy(BaseStrategy):
+        @property
+        def warmup_bars(self) -> int:
+            return 1
+        
+        def calculate_indicators(self, df, indicators=None):
+            df = df.copy()
+            df['position'] = self.events(np.arange(len(df)) >= 1, np.zeros(len(df), dtype=bool))
+            return df
+    
+    strategy = create_strategy(
+        "test_always_long",
+        {"stop_loss_pct": None, "take_profit_pct": None, "position_size_pct": 50.0},
+    )
+    results = strategy.backtest(make_gapped_ohlcv(n=100))
+    
+    assert AlwaysLongStrategy.strategy_type == "test_always_long"
+    assert results["total_trades"] == 1
+    assert strategy.signal_events(make_gapped_ohlcv(n=100)).dtype == np.int8
+    with pytest.raises(ValueError):
+        register_strategy("sma_crossover")(AlwaysLongStrategy)
+    with pytest.raises(TypeError):
+        register_strategy("not_a_strategy")(object)
@@ -0,0 +1,304 @@
+"""
+TradeForge AaaS - Tick Simulator Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the event-driven tick simulator and its fill model.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.schemas import OrderStatus
+from app.strategies.tick_simulator import (
+    QUOTE_DTYPE,
+    TRADE_DTYPE,
+    FillModel,
+    TickSimulator,
+    TickStrategy,
+    load_ticks,
+    save_ticks,
+)
+
+
+def make_trades(rows) -> np.ndarray:
+    """Trade ticks from (timestamp, price, size, side) tuples."""
+    return np.array(rows, dtype=TRADE_DTYPE)
+
+
+def make_quotes(rows) -> np.ndarray:
+    """Quotes from (timestamp, bid, ask, bid_size, ask_size) tuples."""
+    return np.array(rows, dtype=QUOTE_DTYPE)
+
+
+class OrderAt(TickStrategy):
+    """Places one order from a timer and records the callbacks it receives."""
+    
+    def __init__(self, at: int, **order):
+        self.at = at
+        self.order = order
+        self.placed = None
+        self.events = []
+    
+    def on_start(self, sim):
+        sim.schedule(self.at)
+    
+    def on_timer(self, sim, timestamp, data):
+        self.events.append(("timer", timestamp))
+        self.placed = sim.place_order("BTC/USDT", **self.order)
+    
+    def on_trade(self, sim, timestamp, symbol, price, size, side):
+        self.events.append(("trade", timestamp))
+    
+    def on_quote(self, sim, timestamp, symbol, bid, ask, bid_size, ask_size):
+        self.events.append(("quote", timestamp))
+    
+    def on_fill(self, sim, fill, order):
+        self.events.append(("fill", fill.timestamp))
+
+
+def simulate(strategy, trades=None, quotes=None, **fill_model):
+    """Run one BTC/USDT simulation."""
+    sim = TickSimulator(strategy, initial_capital=10_000.0, fill_model=FillModel(**fill_model))
+    if trades is not None:
+        sim.add_trades("BTC/USDT", trades)
+    if quotes is not None:
+        sim.add_quotes("BTC/USDT", quotes)
+    return sim, sim.run()
+
+
+def test_events_replay_in_time_order():
+    """Feeds are merged by timestamp and timers run before market events at the same time."""
+    strategy = OrderAt(20, side="buy", quantity=1.0)
+    trades = make_trades([(10, 100.0, 1.0, 1), (30, 101.0, 1.0, -1)])
+    quotes = make_quotes([(20, 99.9, 100.1, 5.0, 5.0), (40, 100.9, 101.1, 5.0, 5.0)])
+    
+    _, results = simulate(strategy, trades, quotes, commission=0.0)
+    
+    assert strategy.events == [
+        ("trade", 10), ("timer", 20), ("fill", 20), ("quote", 20), ("trade", 30), ("quote", 40),
+    ]
+    assert results["events_processed"] == 4
+
+
+def test_market_order_pays_latency_slippage_and_impact():
+    """A market buy arrives after latency and takes the ask of that moment."""
+    strategy = OrderAt(1, side="buy", quantity=2.0)
+    quotes = make_quotes([
+        (0, 99.0, 101.0, 1.0, 1.0),
+        (40, 101.0, 103.0, 1.0, 1.0),
+        (100, 102.0, 104.0, 1.0, 1.0),
+    ])
+    
+    sim, results = simulate(
+        strategy, quotes=quotes, latency_ms=50, slippage_bps=10, impact_bps=20, commission=0.001
+    )
+    
+    fill = sim.fills[0]
+    assert fill.timestamp == 51
+    # 10 bps slippage plus 20 bps for needing twice the displayed size
+    assert fill.price == pytest.approx(103.0 * 1.003)
+    assert fill.slippage_bps == pytest.approx((fill.price / 100.0 - 1) * 10_000)
+    assert sim.position("BTC/USDT") == 2.0
+    assert sim.cash == pytest.approx(10_000 - 2 * fill.price * 1.001)
+    assert results["final_capital"] == pytest.approx(sim.cash + 2 * 103.0)
+
+
+def test_limit_order_waits_for_the_queue_ahead():
+    """A resting bid fills only after the displayed size ahead of it has traded."""
+    strategy = OrderAt(1, side="buy", quantity=1.0, order_type="limit", price=100.0)
+    quotes = make_quotes([(0, 100.0, 100.5, 3.0, 2.0)])
+    trades = make_trades([
+        (10, 100.0, 2.0, -1),   # consumes 2 of the 3 ahead
+        (20, 100.0, 1.5, 1),    # buyer-initiated, does not hit bids
+        (30, 100.0, 1.5, -1),   # 1 ahead, then 0.5 for us
+        (40, 99.5, 0.1, -1),    # trades through: the rest fills
+    ])
+    
+    sim, results = simulate(strategy, trades, quotes, commission=0.0)
+    
+    assert [(fill.timestamp, fill.quantity, fill.liquidity) for fill in sim.fills] == [
+        (30, 0.5, "maker"), (40, 0.5, "maker"),
+    ]
+    assert all(fill.price == 100.0 for fill in sim.fills)
+    assert strategy.placed.status == OrderStatus.FILLED
+    assert results["maker_fills"] == 2
+
+
+def test_marketable_limit_never_fills_beyond_its_price():
+    """A limit above the ask fills immediately at the ask, capped at the limit."""
+    strategy = OrderAt(1, side="buy", quantity=1.0, order_type="limit", price=100.2)
+    quotes = make_quotes([(0, 99.9, 100.1, 5.0, 5.0), (10, 99.9, 100.1, 5.0, 5.0)])
+    
+    sim, _ = simulate(strategy, quotes=quotes, slippage_bps=50, commission=0.0)
+    
+    assert sim.fills[0].price == 100.2
+    assert sim.fills[0].liquidity == "taker"
+
+
+def test_stop_order_fills_through_gaps():
+    """A sell stop triggers on the first trade at or below it and fills at that trade."""
+    
+    class Long(OrderAt):
+        def on_fill(self, sim, fill, order):
+            super().on_fill(sim, fill, order)
+            if order is self.placed:
+                sim.place_order("BTC/USDT", "sell", 1.0, "stop", price=95.0)
+    
+    strategy = Long(1, side="buy", quantity=1.0)
+    trades = make_trades([
+        (0, 100.0, 1.0, 1),
+        (10, 97.0, 1.0, -1),
+        (20, 93.0, 1.0, -1),
+        (30, 92.0, 1.0, -1),
+    ])
+    
+    sim, _ = simulate(strategy, trades, commission=0.0)
+    
+    assert [(fill.timestamp, fill.price) for fill in sim.fills] == [(1, 100.0), (20, 93.0)]
+    assert sim.position("BTC/USDT") == 0.0
+
+
+def test_bracket_exits_cancel_each_other():
+    """stop_loss / take_profit on an entry become one-cancels-other exits."""
+    strategy = OrderAt(1, side="buy", quantity=1.0, stop_loss=95.0, take_profit=105.0)
+    trades = make_trades([
+        (0, 100.0, 1.0, 1),
+        (10, 104.0, 1.0, 1),
+        (20, 105.5, 1.0, 1),
+        (30, 94.0, 1.0, -1),
+    ])
+    
+    sim, results = simulate(strategy, trades, commission=0.0)
+    
+    entry, take_profit = sim.fills
+    assert (take_profit.timestamp, take_profit.price, take_profit.sign) == (20, 105.0, -1)
+    assert sim.position("BTC/USDT") == 0.0
+    assert results["cancelled_orders"] == 1
+    assert results["final_capital"] == pytest.approx(10_005.0)
+
+
+def test_bracket_exits_never_exceed_the_position():
+    """A bracket left after the position was closed another way is cancelled, not filled."""
+    class BuyThenSell(OrderAt):
+        def on_start(self, sim):
+            super().on_start(sim)
+            sim.schedule(15, "close")
+        
+        def on_timer(self, sim, timestamp, data):
+            if data == "close":
+                sim.place_order("BTC/USDT", "sell", 1.0)
+            else:
+                super().on_timer(sim, timestamp, data)
+    
+    strategy = BuyThenSell(1, side="buy", quantity=1.0, stop_loss=96.0, take_profit=110.0)
+    trades = make_trades([
+        (0, 100.0, 1.0, 1),
+        (10, 100.0, 1.0, 1),
+        (20, 101.0, 1.0, 1),
+        (30, 95.0, 1.0, -1),
+        (40, 111.0, 1.0, 1),
+    ])
+    
+    sim, results = simulate(strategy, trades, commission=0.0)
+    
+    stop, take_profit = strategy.placed.brackets
+    assert sim.position("BTC/USDT") == 0.0
+    assert [fill.sign for fill in sim.fills] == [1, -1]
+    assert stop.status == take_profit.status == OrderStatus.CANCELLED
+    assert stop.filled_quantity == 0.0
+    assert results["final_capital"] == pytest.approx(10_000.0)
+
+
+class Script(TickStrategy):
+    """Places the orders listed per timer timestamp and keeps them in order."""
+    
+    def __init__(self, orders):
+        self.orders = orders
+        self.placed = []
+    
+    def on_start(self, sim):
+        for at in self.orders:
+            sim.schedule(at)
+    
+    def on_timer(self, sim, timestamp, data):
+        for order in self.orders[timestamp]:
+            self.placed.append(sim.place_order("BTC/USDT", **order))
+
+
+def test_resting_sells_never_go_short():
+    """Sells count resting sells on arrival and re-check the position when they fill."""
+    strategy = Script({
+        1: [dict(side="buy", quantity=1.0, stop_loss=95.0)],
+        5: [dict(side="sell", quantity=1.0, order_type="limit", price=110.0)],
+        15: [dict(side="sell", quantity=1.0)],
+    })
+    trades = make_trades([
+        (0, 100.0, 1.0, 1),
+        (10, 100.0, 1.0, 1),
+        (20, 101.0, 1.0, 1),
+        (30, 94.0, 1.0, -1),
+        (40, 111.0, 1.0, 1),
+    ])
+    
+    sim, _ = simulate(strategy, trades, commission=0.0)
+    
+    entry, limit, market = strategy.placed
+    assert market.status == OrderStatus.FAILED
+    assert limit.status == OrderStatus.FAILED and limit.filled_quantity == 0.0
+    assert [fill.sign for fill in sim.fills] == [1, -1]
+    assert sim.position("BTC/USDT") == 0.0
+
+
+def test_resting_buys_never_overspend():
+    """A resting buy that is no longer affordable when reached fails instead of filling."""
+    strategy = Script({1: [
+        dict(side="buy", quantity=90.0, order_type="limit", price=99.0),
+        dict(side="buy", quantity=90.0, order_type="limit", price=98.0),
+    ]})
+    trades = make_trades([(0, 100.0, 1.0, 1), (10, 97.0, 1.0, -1)])
+    
+    sim, _ = simulate(strategy, trades, commission=0.0)
+    
+    first, second = strategy.placed
+    assert first.status == OrderStatus.FILLED
+    assert second.filled_quantity == pytest.approx((10_000.0 - 90 * 99.0) / 98.0)
+    assert sim.cash == pytest.approx(0.0, abs=1e-9)
+
+
+def test_orders_are_rejected_without_funds_or_position():
+    """Buys beyond cash and sells beyond the position fail on arrival."""
+    strategy = OrderAt(1, side="sell", quantity=1.0)
+    trades = make_trades([(0, 100.0, 1.0, 1), (10, 100.0, 1.0, 1)])
+    
+    _, results = simulate(strategy, trades)
+    
+    assert strategy.placed.status == OrderStatus.FAILED
+    assert results["rejected_orders"] == 1
+    with pytest.raises(ValueError):
+        TickSimulator(TickStrategy()).place_order("BTC/USDT", "buy", 1.0, "limit")
+
+
+def test_load_ticks_from_npy_and_csv(tmp_path):
+    """Tick files round-trip through .npy and parse from exchange style CSV."""
+    trades = make_trades([(1_700_000_000_000, 100.0, 0.5, 1), (1_700_000_000_250, 99.5, 1.0, -1)])
+    save_ticks(tmp_path / "trades.npy", trades)
+    np.testing.assert_array_equal(load_ticks(tmp_path / "trades.npy"), trades)
+    
+    pd.DataFrame({
+        "timestamp": ["2023-11-14T22:13:20Z", "2023-11-14T22:13:20.250Z"],
+        "price": [100.0, 99.5],
+        "amount": [0.5, 1.0],
+        "side": ["buy", "sell"],
+    }).to_csv(tmp_path / "trades.csv", index=False)
+    np.testing.assert_array_equal(load_ticks(tmp_path / "trades.csv"), trades)
+    
+    pd.DataFrame({"timestamp": [1, 2], "bid": [1.0, 2.0], "ask": [1.5, 2.5]}).to_csv(
+        tmp_path / "quotes.csv", index=False
+    )
+    quotes = load_ticks(tmp_path / "quotes.csv")
+    assert quotes.dtype == QUOTE_DTYPE
+    assert quotes["ask"].tolist() == [1.5, 2.5]
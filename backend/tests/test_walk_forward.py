@@ -0,0 +1,87 @@
+"""
+TradeForge AaaS - Walk-Forward Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for walk-forward analysis on the SMA crossover optimizer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.strategies.optimizer import SMACrossoverOptimizer
+from app.strategies.sma_crossover import SMACrossoverStrategy
+from app.strategies.walk_forward import WalkForwardAnalyzer
+from tests.test_sma_crossover import make_ohlcv
+
+
+GRID = dict(fast_periods=[5, 10, 15], slow_periods=[20, 40])
+
+
+def test_rolling_and_anchored_windows():
+    """Rolling windows slide by the out-of-sample length; anchored ones start at bar 0."""
+    rolling = WalkForwardAnalyzer(in_sample_bars=100, out_of_sample_bars=50).windows(260)
+    anchored = WalkForwardAnalyzer(100, 50, anchored=True).windows(260)
+    
+    assert rolling == [(0, 100, 100, 150), (50, 150, 150, 200), (100, 200, 200, 250),
+                       (150, 250, 250, 260)]
+    assert [w[0] for w in anchored] == [0, 0, 0, 0]
+    assert [w[2:] for w in anchored] == [w[2:] for w in rolling]
+
+
+@pytest.mark.parametrize("stops", [{}, {"stop_loss_pct": None, "take_profit_pct": None}])
+def test_out_of_sample_windows_match_backtests(stops):
+    """Each out-of-sample window trades like a backtest of that window with warm SMAs."""
+    df = make_ohlcv(n=3000, seed=11)
+    optimizer = SMACrossoverOptimizer(position_size_pct=90.0, **stops)
+    analyzer = WalkForwardAnalyzer(1000, 500, optimizer=optimizer)
+    
+    results = analyzer.run(df, **GRID)
+    
+    windows = analyzer.windows(len(df))
+    for row, (_, _, oos_start, oos_end) in zip(results["windows"].itertuples(), windows):
+        strategy = SMACrossoverStrategy(
+            fast_period=row.fast_period,
+            slow_period=row.slow_period,
+            position_size_pct=90.0,
+            **stops,
+        )
+        expected = strategy.backtest(df.iloc[oos_start - row.slow_period:oos_end])
+        assert row.total_return == pytest.approx(expected["total_return"], abs=1e-9)
+        assert row.total_trades == expected["total_trades"]
+
+
+def test_stitched_equity_compounds_windows():
+    """The stitched curve chains window returns and covers every out-of-sample bar."""
+    df = make_ohlcv(n=3000, seed=12)
+    optimizer = SMACrossoverOptimizer(position_size_pct=90.0)
+    analyzer = WalkForwardAnalyzer(800, 400, optimizer=optimizer)
+    
+    results = analyzer.run(df, **GRID)
+    
+    growth = np.prod(1 + results["windows"]["total_return"].to_numpy() / 100)
+    assert results["final_capital"] == pytest.approx(10000.0 * growth)
+    assert len(results["equity_curve"]) == 3000 - 800
+    assert results["equity_curve"].index[0] == df.index[800]
+    assert results["equity_curve"].iloc[-1] == pytest.approx(results["final_capital"])
+
+
+def test_parallel_matches_serial():
+    """Thread count does not change the results."""
+    df = make_ohlcv(n=2500, seed=13)
+    optimizer = SMACrossoverOptimizer(position_size_pct=90.0)
+    
+    serial = WalkForwardAnalyzer(600, 300, optimizer=optimizer, max_workers=1).run(df, **GRID)
+    parallel = WalkForwardAnalyzer(600, 300, optimizer=optimizer, max_workers=4).run(df, **GRID)
+    
+    pd.testing.assert_frame_equal(serial["windows"], parallel["windows"])
+    pd.testing.assert_series_equal(serial["equity_curve"], parallel["equity_curve"])
+
+
+def test_too_little_history():
+    """Histories shorter than one window are rejected."""
+    with pytest.raises(ValueError):
+        WalkForwardAnalyzer(1000, 500).run(make_ohlcv(n=900), **GRID)
@@ -0,0 +1,127 @@
+"""
+TradeForge AaaS - Web3 Provider Manager Tests
+Author: Ary HH
+Email: aryhharyanto@proton.me
+GitHub: https://github.com/AryHHAry
+© 2026
+
+Tests for the shared, health-checked AsyncWeb3 providers.
+"""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+from web3.providers.async_base import AsyncBaseProvider
+
+from app.services.defi_service import DeFiService
+from app.services.web3_providers import PooledAsyncHTTPProvider, Web3ProviderManager
+
+
+class FakeNode(AsyncBaseProvider):
+    """Provider answering eth_blockNumber, or failing while down."""
+    
+    def __init__(self, rpc_url: str):
+        super().__init__()
+        self.rpc_url = rpc_url
+        self.down = False
+        self.requests = 0
+    
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        raise AssertionError("services must not handshake per request")
+    
+    async def make_request(self, method, params):
+        self.requests += 1
+        if self.down:
+            raise ConnectionError("node unreachable")
+        return {"jsonrpc": "2.0", "id": 1, "result": hex(1234)}
+
+
+@pytest.fixture
+async def providers():
+    """Manager building FakeNodes, closed after the test."""
+    manager = Web3ProviderManager(
+        rpc_urls={"ethereum": "http://eth", "polygon": "http://polygon"},
+        health_check_interval=0.01,
+        provider_factory=FakeNode,
+    )
+    yield manager
+    await manager.close()
+
+
+def test_services_share_one_instance_per_network(providers):
+    """DeFiServices reuse the network's AsyncWeb3 and make no request when created."""
+    first = DeFiService("ethereum", providers=providers)
+    second = DeFiService("ethereum", providers=providers)
+    other = DeFiService("polygon", providers=providers)
+    
+    assert first.w3 is second.w3
+    assert other.w3 is not first.w3
+    assert other.w3.provider.rpc_url == "http://polygon"
+    assert first.w3.provider.requests == 0
+
+
+async def test_health_checks_gate_new_services(providers):
+    """A failed check makes services refuse the network until it recovers."""
+    node = providers.get("ethereum").provider
+    
+    health = (await providers.check("ethereum"))["ethereum"]
+    assert health.healthy and health.block_number == 1234
+    
+    node.down = True
+    await providers.check()
+    assert providers.health("ethereum").error == "node unreachable"
+    with pytest.raises(ConnectionError, match="node unreachable"):
+        DeFiService("ethereum", providers=providers)
+    
+    node.down = False
+    await providers.check()
+    assert DeFiService("ethereum", providers=providers).w3.provider is node
+
+
+async def test_background_checks_run_until_stopped(providers):
+    """start() checks every network in use on the interval; stop() ends the task."""
+    node = providers.get("ethereum").provider
+    
+    await providers.start()
+    for _ in range(200):
+        if providers.health("ethereum") is not None:
+            break
+        await asyncio.sleep(0.005)
+    assert providers.health("ethereum").healthy
+    
+    await providers.stop()
+    requests = node.requests
+    await asyncio.sleep(0.05)
+    assert node.requests == requests
+
+
+async def test_http_provider_reuses_pooled_connections():
+    """Concurrent requests go through one session and reuse its keep-alive connections."""
+    peers = set()
+    
+    async def rpc(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        await asyncio.sleep(0.01)
+        return web.json_response({"jsonrpc": "2.0", "id": body["id"], "result": "0x10"})
+    
+    app = web.Application()
+    app.router.add_post("/", rpc)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    
+    manager = Web3ProviderManager(rpc_urls={"ethereum": f"http://127.0.0.1:{port}"}, pool_size=4)
+    try:
+        w3 = manager.get("ethereum")
+        assert isinstance(w3.provider, PooledAsyncHTTPProvider)
+        for _ in range(3):
+            blocks = await asyncio.gather(*(w3.eth.block_number for _ in range(8)))
+            assert blocks == [16] * 8
+        assert len(peers) <= 4
+    finally:
+        await manager.close()
+        await runner.cleanup()